@@ -52,6 +52,8 @@ from app.database import Base  # Base SQLAlchemy com todos os models
 from app.models.user import User
 from app.models.order import Order
 from app.models.financial_entry import FinancialEntry
+from app.models.financial_daily_rollup import FinancialDailyRollup
+from app.models.report_cache_entry import ReportCacheEntry
 
 # =====================================
 # Configuração do Alembic
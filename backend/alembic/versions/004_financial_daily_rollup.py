@@ -0,0 +1,73 @@
+"""add financial_daily_rollup table
+
+Revision ID: 004_financial_daily_rollup
+Revises: 003
+Create Date: 2026-10-17 00:00:00.000000
+
+ROLLUP DIÁRIO FINANCEIRO
+========================
+
+Tabela pré-agregada por (user_id, day, kind, status) com soma e contagem
+dos lançamentos ativos. Base dos relatórios DRE e cashflow diário:
+- Dias fechados são lidos do rollup
+- Apenas o dia corrente é calculado a partir de core.financial_entries
+
+A migration já faz o backfill inicial. Para recalcular depois:
+    python scripts/rebuild_financial_rollup.py
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004_financial_daily_rollup'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Cria core.financial_daily_rollup e popula a partir dos lançamentos existentes.
+    """
+    op.create_table(
+        'financial_daily_rollup',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('kind', sa.VARCHAR(length=20), nullable=False),
+        sa.Column('status', sa.VARCHAR(length=20), nullable=False),
+        sa.Column('amount_total', sa.Numeric(precision=18, scale=2), server_default=sa.text('0'), nullable=False),
+        sa.Column('entry_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'kind', 'status', name='financial_daily_rollup_pkey'),
+        sa.ForeignKeyConstraint(['user_id'], ['core.users.id'], name='financial_daily_rollup_user_id_fkey', ondelete='CASCADE'),
+        schema='core'
+    )
+
+    # Relatórios de admin (sem user_id) filtram apenas por período
+    op.create_index('ix_financial_daily_rollup_day', 'financial_daily_rollup', ['day'], schema='core')
+
+    # Backfill inicial (lançamentos ativos)
+    op.execute("""
+        INSERT INTO core.financial_daily_rollup (user_id, day, kind, status, amount_total, entry_count)
+        SELECT user_id, occurred_at::date, kind, status, SUM(amount), COUNT(*)
+        FROM core.financial_entries
+        WHERE deleted_at IS NULL
+        GROUP BY user_id, occurred_at::date, kind, status
+    """)
+
+    # Comentários (1 op.execute por statement — psycopg v3 não aceita múltiplos)
+    op.execute("COMMENT ON TABLE core.financial_daily_rollup IS 'Rollup diário de lançamentos financeiros ativos (base dos relatórios)'")
+    op.execute("COMMENT ON COLUMN core.financial_daily_rollup.day IS 'Dia de ocorrência (occurred_at::date)'")
+    op.execute("COMMENT ON COLUMN core.financial_daily_rollup.amount_total IS 'Soma de amount dos lançamentos do grupo'")
+    op.execute("COMMENT ON COLUMN core.financial_daily_rollup.entry_count IS 'Quantidade de lançamentos do grupo'")
+
+
+def downgrade() -> None:
+    """
+    Remove tabela financial_daily_rollup.
+    """
+    op.drop_index('ix_financial_daily_rollup_day', table_name='financial_daily_rollup', schema='core')
+    op.drop_table('financial_daily_rollup', schema='core')
@@ -0,0 +1,57 @@
+"""add report_cache table
+
+Revision ID: 005_report_cache
+Revises: 004_financial_daily_rollup
+Create Date: 2026-10-17 00:00:00.000000
+
+CACHE DE RELATÓRIOS COMPARTILHADO
+=================================
+
+Tabela UNLOGGED usada pelo backend "postgres" do cache de relatórios
+(REPORT_CACHE_BACKEND=postgres), para que todos os workers uvicorn
+compartilhem os mesmos resultados e invalidações.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005_report_cache'
+down_revision: Union[str, None] = '004_financial_daily_rollup'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Cria core.report_cache (UNLOGGED).
+    """
+    op.create_table(
+        'report_cache',
+        sa.Column('cache_key', sa.Text(), nullable=False),
+        sa.Column('tenant', sa.Text(), nullable=False),
+        sa.Column('value', sa.LargeBinary(), nullable=False),
+        sa.Column('expires_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('last_access', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('cache_key', name='report_cache_pkey'),
+        schema='core',
+        prefixes=['UNLOGGED']
+    )
+
+    # Invalidação por tenant
+    op.create_index('ix_core_report_cache_tenant', 'report_cache', ['tenant'], schema='core')
+
+    # Comentários (1 op.execute por statement — psycopg v3 não aceita múltiplos)
+    op.execute("COMMENT ON TABLE core.report_cache IS 'Cache compartilhado de resultados de relatórios (UNLOGGED)'")
+    op.execute("COMMENT ON COLUMN core.report_cache.tenant IS 'user_id dono do relatório ou * para relatórios de admin'")
+
+
+def downgrade() -> None:
+    """
+    Remove tabela report_cache.
+    """
+    op.drop_index('ix_core_report_cache_tenant', table_name='report_cache', schema='core')
+    op.drop_table('report_cache', schema='core')
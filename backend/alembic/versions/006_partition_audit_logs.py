@@ -0,0 +1,214 @@
+"""partition audit_logs by month
+
+Revision ID: 006_partition_audit_logs
+Revises: 005_report_cache
+Create Date: 2026-10-17 00:00:00.000000
+
+AUDIT LOG PARTICIONADO
+======================
+
+core.audit_logs passa a ser particionada por RANGE (created_at), uma
+partição por mês (core.audit_logs_YYYY_MM) + core.audit_logs_default:
+
+- Consultas com date_from/date_to só leem as partições do período
+  (partition pruning); a API de consulta não muda
+- Retenção sem DELETE em massa: partições antigas são desanexadas,
+  exportadas e removidas (scripts/audit_log_retention.py)
+- core.ensure_audit_log_partitions(months_ahead) cria as partições dos
+  próximos meses (chamada no startup do app e pelo script de retenção).
+  Linhas que caíram na partição default são movidas para a partição nova
+- PK passa a ser (id, created_at): em tabela particionada a chave de
+  partição precisa fazer parte de toda constraint UNIQUE
+
+Os dados existentes são copiados para a tabela nova (a migration bloqueia
+core.audit_logs durante a cópia; rodar em janela de manutenção).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_partition_audit_logs'
+down_revision: Union[str, None] = '005_report_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Meses à frente criados na migration (o startup mantém a mesma folga)
+MONTHS_AHEAD = 3
+
+INDEXES = (
+    ('ix_audit_logs_user_id', 'user_id'),
+    ('ix_audit_logs_entity', 'entity_type, entity_id'),
+    ('ix_audit_logs_created_at', 'created_at DESC'),
+    ('ix_audit_logs_request_id', 'request_id'),
+)
+
+COMMENTS = (
+    ('user_id', 'Usuário que executou a ação'),
+    ('action', 'Tipo de operação: create, update, delete'),
+    ('entity_type', 'Tipo de entidade: order, financial_entry, user'),
+    ('entity_id', 'ID da entidade afetada'),
+    ('before', 'Estado anterior da entidade (NULL em create)'),
+    ('after', 'Estado atual da entidade (NULL em delete)'),
+    ('request_id', 'X-Request-ID do middleware para correlação'),
+    ('created_at', 'Timestamp da operação'),
+)
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION core.ensure_audit_log_partitions(months_ahead integer DEFAULT 3)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start date;
+    month_end date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    -- Serializa chamadas concorrentes (vários workers no startup)
+    PERFORM pg_advisory_xact_lock(hashtext('core.ensure_audit_log_partitions'));
+
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', now()::timestamp) + make_interval(months => i))::date;
+        month_end := (month_start + interval '1 month')::date;
+        partition_name := 'audit_logs_' || to_char(month_start, 'YYYY_MM');
+
+        CONTINUE WHEN to_regclass('core.' || partition_name) IS NOT NULL;
+
+        -- Linhas do mês na partição default impedem a criação: move antes
+        CREATE TEMP TABLE audit_logs_moving ON COMMIT DROP AS
+            SELECT * FROM core.audit_logs_default
+            WHERE created_at >= month_start AND created_at < month_end;
+        DELETE FROM core.audit_logs_default
+            WHERE created_at >= month_start AND created_at < month_end;
+
+        EXECUTE format(
+            'CREATE TABLE core.%I PARTITION OF core.audit_logs FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, month_end
+        );
+        INSERT INTO core.audit_logs SELECT * FROM audit_logs_moving;
+        DROP TABLE audit_logs_moving;
+        created := created + 1;
+    END LOOP;
+
+    RETURN created;
+END;
+$$
+"""
+
+
+def _create_indexes_and_comments() -> None:
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON core.audit_logs ({columns})")
+
+    # Comentários (1 op.execute por statement — psycopg v3 não aceita múltiplos)
+    op.execute("COMMENT ON TABLE core.audit_logs IS 'Registro de auditoria de todas operações críticas do sistema'")
+    for column, comment in COMMENTS:
+        op.execute(f"COMMENT ON COLUMN core.audit_logs.{column} IS '{comment}'")
+
+
+def _drop_legacy_indexes() -> None:
+    # Nomes dos índices são por schema: liberar para a tabela nova
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS core.{name}")
+
+
+def upgrade() -> None:
+    """
+    Recria core.audit_logs particionada por mês e copia os dados.
+    """
+    op.execute("LOCK TABLE core.audit_logs IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE core.audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER TABLE core.audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+    op.execute("ALTER TABLE core.audit_logs_legacy DROP CONSTRAINT audit_logs_user_id_fkey")
+    _drop_legacy_indexes()
+
+    op.execute("""
+        CREATE TABLE core.audit_logs (
+            id uuid NOT NULL DEFAULT gen_random_uuid(),
+            user_id uuid NOT NULL,
+            action varchar(20) NOT NULL,
+            entity_type varchar(50) NOT NULL,
+            entity_id uuid NOT NULL,
+            before jsonb,
+            after jsonb,
+            request_id varchar(36) NOT NULL,
+            created_at timestamp NOT NULL DEFAULT now(),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT audit_logs_user_id_fkey FOREIGN KEY (user_id)
+                REFERENCES core.users (id) ON DELETE CASCADE,
+            CONSTRAINT check_audit_action
+                CHECK (action IN ('create', 'update', 'delete')),
+            CONSTRAINT check_audit_entity_type
+                CHECK (entity_type IN ('order', 'financial_entry', 'user'))
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE core.audit_logs_default PARTITION OF core.audit_logs DEFAULT")
+    _create_indexes_and_comments()
+
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+
+    # Partições dos meses que já têm dados (histórico) ...
+    op.execute("""
+        DO $$
+        DECLARE
+            month_start date;
+        BEGIN
+            FOR month_start IN
+                SELECT DISTINCT date_trunc('month', created_at)::date
+                FROM core.audit_logs_legacy
+                WHERE created_at < date_trunc('month', now()::timestamp)
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE core.%I PARTITION OF core.audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+            END LOOP;
+        END
+        $$
+    """)
+    # ... e do mês corrente em diante
+    op.execute(f"SELECT core.ensure_audit_log_partitions({MONTHS_AHEAD})")
+
+    op.execute("INSERT INTO core.audit_logs SELECT * FROM core.audit_logs_legacy")
+    op.execute("DROP TABLE core.audit_logs_legacy")
+
+
+def downgrade() -> None:
+    """
+    Volta core.audit_logs para tabela simples (mantém os dados das partições anexadas).
+    """
+    op.execute("DROP FUNCTION IF EXISTS core.ensure_audit_log_partitions(integer)")
+    op.execute("ALTER TABLE core.audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE core.audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute("ALTER TABLE core.audit_logs_partitioned DROP CONSTRAINT audit_logs_user_id_fkey")
+    _drop_legacy_indexes()
+
+    op.execute("""
+        CREATE TABLE core.audit_logs (
+            id uuid NOT NULL DEFAULT gen_random_uuid(),
+            user_id uuid NOT NULL,
+            action varchar(20) NOT NULL,
+            entity_type varchar(50) NOT NULL,
+            entity_id uuid NOT NULL,
+            before jsonb,
+            after jsonb,
+            request_id varchar(36) NOT NULL,
+            created_at timestamp NOT NULL DEFAULT now(),
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id),
+            CONSTRAINT audit_logs_user_id_fkey FOREIGN KEY (user_id)
+                REFERENCES core.users (id) ON DELETE CASCADE,
+            CONSTRAINT check_audit_action
+                CHECK (action IN ('create', 'update', 'delete')),
+            CONSTRAINT check_audit_entity_type
+                CHECK (entity_type IN ('order', 'financial_entry', 'user'))
+        )
+    """)
+    _create_indexes_and_comments()
+
+    op.execute("INSERT INTO core.audit_logs SELECT * FROM core.audit_logs_partitioned")
+    op.execute("DROP TABLE core.audit_logs_partitioned CASCADE")
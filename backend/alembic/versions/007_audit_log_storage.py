@@ -0,0 +1,56 @@
+"""add audit_logs.storage (full/diff)
+
+Revision ID: 007_audit_log_storage
+Revises: 006_partition_audit_logs
+Create Date: 2026-10-17 00:00:00.000000
+
+AUDIT LOG COMPACTO
+==================
+
+Coluna storage indica a forma de before/after:
+- full: snapshots completos (todas as linhas existentes)
+- diff: update com só os campos alterados (AUDIT_LOG_STORAGE=diff);
+  get_entity_history reconstrói os estados completos
+
+Índice parcial (entity_type, entity_id, created_at) WHERE storage = 'full'
+para localizar o último snapshot da entidade na gravação.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_audit_log_storage'
+down_revision: Union[str, None] = '006_partition_audit_logs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Adiciona core.audit_logs.storage (default 'full').
+    """
+    op.add_column(
+        'audit_logs',
+        sa.Column('storage', sa.String(length=10), server_default=sa.text("'full'"), nullable=False),
+        schema='core'
+    )
+    op.create_check_constraint(
+        'check_audit_storage', 'audit_logs', "storage IN ('full', 'diff')", schema='core'
+    )
+    op.create_index(
+        'ix_audit_logs_entity_snapshot', 'audit_logs', ['entity_type', 'entity_id', 'created_at'],
+        schema='core', postgresql_where=sa.text("storage = 'full'")
+    )
+    op.execute("COMMENT ON COLUMN core.audit_logs.storage IS 'Forma de before/after: full (completo) ou diff (só campos alterados)'")
+
+
+def downgrade() -> None:
+    """
+    Remove a coluna storage. Linhas diff ficam com before/after parciais.
+    """
+    op.drop_index('ix_audit_logs_entity_snapshot', table_name='audit_logs', schema='core')
+    op.drop_constraint('check_audit_storage', 'audit_logs', schema='core', type_='check')
+    op.drop_column('audit_logs', 'storage', schema='core')
@@ -0,0 +1,109 @@
+"""add covering indexes for financial reports and listings
+
+Revision ID: 008_financial_covering_indexes
+Revises: 007_audit_log_storage
+Create Date: 2026-10-17 00:00:00.000000
+
+ÍNDICES DE COBERTURA (financial_entries)
+=======================================
+
+As consultas quentes filtram deleted_at IS NULL + user_id (exceto admin) +
+faixa de occurred_at (+ status/kind) e somam amount:
+- relatórios: parte "dia corrente" de _daily_source (dre_summary,
+  cashflow_daily, aging_pending) e rebuild do rollup
+- listagem: list_paginated/list_keyset (ORDER BY occurred_at DESC, id DESC)
+  e count_total
+
+Índices parciais (WHERE deleted_at IS NULL) com INCLUDE (amount, kind,
+status) permitem index-only scan nas agregações e contagens:
+- ix_financial_entries_active_user_occurred: por usuário
+- ix_financial_entries_active_occurred: admin (todos os usuários)
+
+Índices da baseline (001) que ficam redundantes são removidos: custavam
+escrita em todo INSERT/UPDATE e o planner às vezes os escolhia no lugar
+dos de cobertura (index scan + acesso à tabela):
+- idx_financial_entries_user_occurred (user_id, occurred_at DESC): coberto
+  por ix_financial_entries_active_user_occurred (consultas filtram ativos)
+- idx_financial_entries_status, idx_financial_entries_kind: baixa
+  seletividade; status/kind vêm do INCLUDE dos índices de cobertura
+O downgrade recria os três.
+
+Criados/removidos com CREATE/DROP INDEX CONCURRENTLY (sem bloquear
+escritas), fora da transação da migration. Se a criação falhar, o índice fica INVALID: a
+migration remove (IF EXISTS) e recria na próxima execução.
+
+Planos antes/depois: scripts/explain_report_queries.py
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_financial_covering_indexes'
+down_revision: Union[str, None] = '007_audit_log_storage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    (
+        'ix_financial_entries_active_user_occurred',
+        '(user_id, occurred_at DESC, id DESC) INCLUDE (amount, kind, status)',
+    ),
+    (
+        'ix_financial_entries_active_occurred',
+        '(occurred_at DESC, id DESC) INCLUDE (user_id, amount, kind, status)',
+    ),
+)
+
+# Índices da baseline substituídos pelos de cobertura: (nome, colunas, comentário)
+REDUNDANT_INDEXES = (
+    (
+        'idx_financial_entries_user_occurred',
+        '(user_id, occurred_at DESC)',
+        'Otimiza consultas multi-tenant ordenadas por data',
+    ),
+    (
+        'idx_financial_entries_status',
+        '(status)',
+        'Otimiza filtros por status (pending, paid, canceled)',
+    ),
+    (
+        'idx_financial_entries_kind',
+        '(kind)',
+        'Otimiza filtros por tipo (revenue/expense)',
+    ),
+)
+
+
+def upgrade() -> None:
+    """
+    Cria os índices parciais de cobertura e remove os redundantes (CONCURRENTLY).
+    """
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            # Resto de execução anterior interrompida (índice INVALID)
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {name} ON core.financial_entries {columns} "
+                f"WHERE deleted_at IS NULL"
+            )
+        # Só depois dos substitutos prontos
+        for name, _, _ in REDUNDANT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
+        # Index-only scan depende do visibility map atualizado
+        op.execute("VACUUM (ANALYZE) core.financial_entries")
+
+
+def downgrade() -> None:
+    """
+    Recria os índices da baseline e remove os de cobertura.
+    """
+    with op.get_context().autocommit_block():
+        for name, columns, comment in REDUNDANT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY {name} ON core.financial_entries {columns}")
+            op.execute(f"COMMENT ON INDEX core.{name} IS '{comment}'")
+        for name, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
@@ -0,0 +1,151 @@
+"""key financial rollup by timezone and add local-day expression indexes
+
+Revision ID: 009_report_timezones
+Revises: 008_financial_covering_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+DIA LOCAL NOS RELATÓRIOS
+========================
+
+Relatórios agrupam por (occurred_at AT TIME ZONE tz)::date em vez de
+occurred_at::date (timezone da sessão do banco). Para cada timezone de
+TIMEZONES (lista fixa desta revision, o padrão de REPORT_TIMEZONES na época;
+o schema não depende do ambiente do deploy):
+
+- core.financial_daily_rollup ganha a coluna tz na chave primária
+  (tz, user_id, day, kind, status); a tabela é recalculada aqui
+- dois índices parciais de expressão em core.financial_entries, com a
+  mesma expressão usada pelos relatórios (timezone(tz, occurred_at)::date):
+    ix_financial_entries_user_day_<tz>: por usuário
+    ix_financial_entries_day_<tz>: admin (todos os usuários)
+  Faixa de dias e GROUP BY por dia local usam o índice (index-only scan
+  com INCLUDE).
+
+Timezones fora da lista são aceitas pela API e calculadas direto de
+core.financial_entries (faixa de occurred_at, índices da migration 008).
+Timezone incluída depois em REPORT_TIMEZONES: o rebuild cria os índices
+(FinancialRollupRepository.ensure_local_day_indexes, mesmo padrão de nome)
+e recalcula o rollup:
+    python scripts/rebuild_financial_rollup.py --tz <timezone>
+
+Índices criados com CREATE INDEX CONCURRENTLY, fora da transação (ver 008).
+"""
+import hashlib
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_report_timezones'
+down_revision: Union[str, None] = '008_financial_covering_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Timezones com rollup e índices nesta revision (não ler app.config aqui)
+TIMEZONES = ('America/Sao_Paulo', 'UTC')
+
+
+def _index_name(prefix: str, tz: str) -> str:
+    """Nome do índice com a timezone (limite de 63 caracteres do Postgres)."""
+    name = f"{prefix}_{re.sub(r'[^a-z0-9]+', '_', tz.lower()).strip('_')}"
+    if len(name) > 63:
+        name = f"{name[:54]}_{hashlib.md5(tz.encode()).hexdigest()[:8]}"
+    return name
+
+
+def _local_day_indexes(tz: str):
+    """(nome, colunas) dos índices de dia local de uma timezone."""
+    literal = tz.replace("'", "''")
+    day = f"((timezone('{literal}', occurred_at))::date)"
+    return (
+        (_index_name('ix_financial_entries_user_day', tz), f"(user_id, {day}) INCLUDE (amount, kind, status)"),
+        (_index_name('ix_financial_entries_day', tz), f"({day}) INCLUDE (user_id, amount, kind, status)"),
+    )
+
+
+def upgrade() -> None:
+    """
+    Rollup por timezone (recalculado) + índices de expressão do dia local.
+    """
+    # Linhas atuais foram calculadas na timezone da sessão: recalcular
+    op.execute("TRUNCATE core.financial_daily_rollup")
+    op.add_column(
+        'financial_daily_rollup',
+        sa.Column('tz', sa.VARCHAR(length=64), nullable=False),
+        schema='core'
+    )
+    op.drop_constraint('financial_daily_rollup_pkey', 'financial_daily_rollup', type_='primary', schema='core')
+    op.create_primary_key(
+        'financial_daily_rollup_pkey',
+        'financial_daily_rollup',
+        ['tz', 'user_id', 'day', 'kind', 'status'],
+        schema='core'
+    )
+    op.drop_index('ix_financial_daily_rollup_day', table_name='financial_daily_rollup', schema='core')
+    op.create_index('ix_financial_daily_rollup_tz_day', 'financial_daily_rollup', ['tz', 'day'], schema='core')
+
+    # Backfill (lançamentos ativos) em cada timezone configurada
+    op.execute(
+        sa.text("""
+            INSERT INTO core.financial_daily_rollup (tz, user_id, day, kind, status, amount_total, entry_count)
+            SELECT z.tz, e.user_id, (timezone(z.tz, e.occurred_at))::date, e.kind, e.status, SUM(e.amount), COUNT(*)
+            FROM core.financial_entries e
+            CROSS JOIN unnest(CAST(:timezones AS text[])) AS z(tz)
+            WHERE e.deleted_at IS NULL
+            GROUP BY 1, 2, 3, 4, 5
+        """).bindparams(timezones=list(TIMEZONES))
+    )
+    op.execute("COMMENT ON COLUMN core.financial_daily_rollup.tz IS 'Timezone IANA do dia local'")
+    op.execute("COMMENT ON COLUMN core.financial_daily_rollup.day IS 'Dia local de ocorrência ((occurred_at AT TIME ZONE tz)::date)'")
+
+    with op.get_context().autocommit_block():
+        for tz in TIMEZONES:
+            for name, columns in _local_day_indexes(tz):
+                # Resto de execução anterior interrompida (índice INVALID)
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY {name} ON core.financial_entries {columns} "
+                    f"WHERE deleted_at IS NULL"
+                )
+        op.execute("VACUUM (ANALYZE) core.financial_entries")
+
+
+def downgrade() -> None:
+    """
+    Volta ao rollup por occurred_at::date (timezone da sessão) e remove os índices.
+
+    Inclui os índices criados depois pelo rebuild (timezones fora de TIMEZONES).
+    """
+    names = op.get_bind().execute(
+        sa.text("""
+            SELECT indexname FROM pg_indexes
+            WHERE schemaname = 'core' AND tablename = 'financial_entries'
+              AND indexname ~ '^ix_financial_entries_(user_)?day_'
+        """)
+    ).scalars().all()
+    with op.get_context().autocommit_block():
+        for name in names:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
+
+    op.execute("TRUNCATE core.financial_daily_rollup")
+    op.drop_index('ix_financial_daily_rollup_tz_day', table_name='financial_daily_rollup', schema='core')
+    op.drop_constraint('financial_daily_rollup_pkey', 'financial_daily_rollup', type_='primary', schema='core')
+    op.drop_column('financial_daily_rollup', 'tz', schema='core')
+    op.create_primary_key(
+        'financial_daily_rollup_pkey',
+        'financial_daily_rollup',
+        ['user_id', 'day', 'kind', 'status'],
+        schema='core'
+    )
+    op.create_index('ix_financial_daily_rollup_day', 'financial_daily_rollup', ['day'], schema='core')
+    op.execute("""
+        INSERT INTO core.financial_daily_rollup (user_id, day, kind, status, amount_total, entry_count)
+        SELECT user_id, occurred_at::date, kind, status, SUM(amount), COUNT(*)
+        FROM core.financial_entries
+        WHERE deleted_at IS NULL
+        GROUP BY user_id, occurred_at::date, kind, status
+    """)
+    op.execute("COMMENT ON COLUMN core.financial_daily_rollup.day IS 'Dia de ocorrência (occurred_at::date)'")
@@ -0,0 +1,92 @@
+"""add normalized description_key and top-entries indexes
+
+Revision ID: 010_financial_description_key
+Revises: 009_report_timezones
+Create Date: 2026-10-17 00:00:00.000000
+
+CHAVE DE AGRUPAMENTO DO TOP LANÇAMENTOS
+=======================================
+
+O top lançamentos agrupava pela description crua. Lançamentos de pedidos
+têm o UUID na descrição ("Pedido <uuid> - ..."): cada pedido virava um
+grupo e a agregação fazia hash de todo o texto do período.
+
+- description_key: coluna gerada (STORED), preenchida pelo banco em toda
+  escrita (ORM, INSERT em lote, COPY). Descrição sem UUIDs, espaços
+  colapsados, até 200 caracteres.
+- Índices parciais de cobertura para o formato da consulta (kind, status,
+  faixa de occurred_at; lê description_key e amount), permitindo
+  index-only scan + agregação por chave curta:
+    ix_financial_entries_active_user_top: por usuário
+    ix_financial_entries_active_top: admin (todos os usuários)
+
+ADD COLUMN ... GENERATED reescreve a tabela (lock exclusivo durante a
+migration): rodar fora do pico. Índices com CREATE INDEX CONCURRENTLY (ver 008).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_financial_description_key'
+down_revision: Union[str, None] = '009_report_timezones'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DESCRIPTION_KEY_SQL = (
+    "left(btrim(regexp_replace("
+    "regexp_replace(description, '[0-9A-Fa-f]{8}-([0-9A-Fa-f]{4}-){3}[0-9A-Fa-f]{12}', '', 'g'), "
+    "'\\s+', ' ', 'g')), 200)"
+)
+
+INDEXES = (
+    (
+        'ix_financial_entries_active_user_top',
+        '(user_id, kind, status, occurred_at) INCLUDE (description_key, amount)',
+    ),
+    (
+        'ix_financial_entries_active_top',
+        '(kind, status, occurred_at) INCLUDE (user_id, description_key, amount)',
+    ),
+)
+
+
+def upgrade() -> None:
+    """
+    Adiciona description_key (gerada) e os índices do top lançamentos.
+    """
+    op.add_column(
+        'financial_entries',
+        sa.Column(
+            'description_key',
+            sa.VARCHAR(length=200),
+            sa.Computed(DESCRIPTION_KEY_SQL, persisted=True),
+            comment='Descrição normalizada (sem UUIDs) para agrupamento'
+        ),
+        schema='core'
+    )
+
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            # Resto de execução anterior interrompida (índice INVALID)
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {name} ON core.financial_entries {columns} "
+                f"WHERE deleted_at IS NULL"
+            )
+        # Index-only scan depende do visibility map atualizado
+        op.execute("VACUUM (ANALYZE) core.financial_entries")
+
+
+def downgrade() -> None:
+    """
+    Remove os índices e a coluna description_key.
+    """
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS core.{name}")
+
+    op.drop_column('financial_entries', 'description_key', schema='core')
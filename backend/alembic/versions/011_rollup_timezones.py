@@ -0,0 +1,88 @@
+"""add rollup_timezones registry of fully built rollup timezones
+
+Revision ID: 011_rollup_timezones
+Revises: 010_financial_description_key
+Create Date: 2026-10-17 00:00:00.000000
+
+TIMEZONES COM ROLLUP COMPLETO
+=============================
+
+Até aqui os relatórios liam core.financial_daily_rollup de qualquer
+timezone de REPORT_TIMEZONES (variável de ambiente). Incluir uma timezone
+na variável sem rodar o rebuild fazia os relatórios lerem um rollup
+vazio/parcial (só os deltas gravados depois da mudança).
+
+core.rollup_timezones registra as timezones cujo rollup foi recalculado
+por inteiro (rebuild completo). Relatórios usam o rollup só para
+timezones registradas E em REPORT_TIMEZONES; as demais caem no scan de
+core.financial_entries. Timezone retirada de REPORT_TIMEZONES sai do
+registro no startup (deixa de ser mantida pelo listener).
+
+Esta migration recalcula o rollup das timezones de TIMEZONES (as mesmas
+da 009, lista fixa) e registra todas. Timezone incluída depois em
+REPORT_TIMEZONES (índices de dia local + rollup + registro):
+    python scripts/rebuild_financial_rollup.py --tz <timezone>
+Timezone registrada que não estiver em REPORT_TIMEZONES sai no startup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_rollup_timezones'
+down_revision: Union[str, None] = '010_financial_description_key'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Timezones da 009 (não ler app.config aqui)
+TIMEZONES = ('America/Sao_Paulo', 'UTC')
+
+
+def upgrade() -> None:
+    """
+    Cria core.rollup_timezones, recalcula o rollup de TIMEZONES e as registra.
+    """
+    op.create_table(
+        'rollup_timezones',
+        sa.Column('tz', sa.VARCHAR(length=64), nullable=False),
+        sa.Column('built_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('tz', name='rollup_timezones_pkey'),
+        schema='core'
+    )
+
+    # Rollup de timezones fora de TIMEZONES (incluídas sem rebuild) não é
+    # confiável: recalcular tudo (escritas em financial_entries bloqueadas
+    # até o fim da migration)
+    timezones = list(TIMEZONES)
+    op.execute("LOCK TABLE core.financial_entries IN SHARE MODE")
+    op.execute("TRUNCATE core.financial_daily_rollup")
+    op.execute(
+        sa.text("""
+            INSERT INTO core.financial_daily_rollup (tz, user_id, day, kind, status, amount_total, entry_count)
+            SELECT z.tz, e.user_id, (timezone(z.tz, e.occurred_at))::date, e.kind, e.status, SUM(e.amount), COUNT(*)
+            FROM core.financial_entries e
+            CROSS JOIN unnest(CAST(:timezones AS text[])) AS z(tz)
+            WHERE e.deleted_at IS NULL
+            GROUP BY 1, 2, 3, 4, 5
+        """).bindparams(timezones=timezones)
+    )
+    op.execute(
+        sa.text("""
+            INSERT INTO core.rollup_timezones (tz)
+            SELECT unnest(CAST(:timezones AS text[]))
+        """).bindparams(timezones=timezones)
+    )
+
+    # Comentários (1 op.execute por statement — psycopg v3 não aceita múltiplos)
+    op.execute("COMMENT ON TABLE core.rollup_timezones IS 'Timezones com core.financial_daily_rollup completo (rebuild concluído)'")
+    op.execute("COMMENT ON COLUMN core.rollup_timezones.built_at IS 'Fim do último rebuild completo da timezone'")
+
+
+def downgrade() -> None:
+    """
+    Remove tabela rollup_timezones.
+    """
+    op.drop_table('rollup_timezones', schema='core')
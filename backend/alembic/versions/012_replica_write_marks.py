@@ -0,0 +1,57 @@
+"""add replica_write_marks table for read-your-writes
+
+Revision ID: 012_replica_write_marks
+Revises: 011_rollup_timezones
+Create Date: 2026-10-17 00:00:00.000000
+
+MARCAS DE READ-YOUR-WRITES
+==========================
+
+Com DATABASE_URL_REPLICA, o usuário que acabou de escrever lê do primário
+por REPLICA_READ_YOUR_WRITES_SECONDS. As marcas ficavam em
+core.report_cache, sujeitas à evicção LRU do cache de relatórios (uma
+rajada de relatórios apagava marcas recentes) e lidas com UPDATE.
+
+core.replica_write_marks é só das marcas: uma linha por usuário (upsert
+a cada escrita), lida com SELECT ... WHERE expires_at > now(), sem evicção.
+UNLOGGED como core.report_cache (conteúdo transitório).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012_replica_write_marks'
+down_revision: Union[str, None] = '011_rollup_timezones'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Cria core.replica_write_marks (UNLOGGED).
+    """
+    op.create_table(
+        'replica_write_marks',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('expires_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', name='replica_write_marks_pkey'),
+        schema='core',
+        prefixes=['UNLOGGED']
+    )
+
+    # Marcas antigas no cache de relatórios (tenant 'read-your-writes')
+    op.execute("DELETE FROM core.report_cache WHERE tenant = 'read-your-writes'")
+
+    # Comentários (1 op.execute por statement — psycopg v3 não aceita múltiplos)
+    op.execute("COMMENT ON TABLE core.replica_write_marks IS 'Usuários que leem do primário até expires_at (read-your-writes da réplica)'")
+
+
+def downgrade() -> None:
+    """
+    Remove tabela replica_write_marks.
+    """
+    op.drop_table('replica_write_marks', schema='core')
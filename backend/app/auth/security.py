@@ -6,34 +6,10 @@ usando bcrypt para senhas e JWT (HS256) para tokens de acesso.
 """
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
-import bcrypt
 
 from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
-
-
-def hash_password(password: str) -> str:
-    """
-    Gera hash bcrypt de uma senha em texto plano.
-    Usa bcrypt diretamente para compatibilidade com Python 3.11+.
-    """
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verifica se uma senha em texto plano corresponde ao hash armazenado.
-    Usa bcrypt diretamente para compatibilidade com Python 3.11+.
-        
-    Example:
-        >>> verify_password("minhasenha123", "$2b$12$...")
-        True
-    
-    Note:
-        Bcrypt tem limite de 72 bytes. Trunca a senha antes de verificar.
-    """
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+# Hash de senhas: implementação única (pool dedicado de bcrypt)
+from app.security.password import hash_password, needs_rehash, verify_password  # noqa: F401
 
 
 def create_access_token(
@@ -2,12 +2,17 @@
 Serviço de autenticação.
 Camada de lógica de negócio para registro, login e validações de usuário.
 """
+import logging
+
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 from .repository import UserRepository
-from .security import hash_password, verify_password
-from app.exceptions.errors import ConflictError
+from .security import hash_password, needs_rehash, verify_password
+from app.exceptions.errors import AppException, ConflictError
+from app.security.user_cache import auth_user_cache
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -79,6 +84,9 @@ class AuthService:
         """
         Autentica um usuário com email e senha.
         
+        Se o hash armazenado usa custo bcrypt diferente de BCRYPT_ROUNDS,
+        ele é refeito de forma transparente após a validação.
+        
         Args:
             db: Sessão do SQLAlchemy
             email: Email do usuário
@@ -109,6 +117,15 @@ class AuthService:
         if not user.is_active:
             raise ValueError("Usuário inativo. Contate o administrador.")
         
+        # Hash com custo antigo (BCRYPT_ROUNDS mudou): refazer com a senha já validada
+        if needs_rehash(user.password_hash):
+            try:
+                user.password_hash = hash_password(password)
+                user = UserRepository.update(db, user)
+            except AppException as e:
+                # Pool de bcrypt cheio: login segue, rehash fica para o próximo
+                logger.warning(f"Rehash de senha adiado para {user.id}: {e.message}")
+        
         return user
     
     @staticmethod
@@ -143,4 +160,6 @@ class AuthService:
         
         # Atualizar senha
         user.password_hash = hash_password(new_password)
-        return UserRepository.update(db, user)
+        user = UserRepository.update(db, user)
+        auth_user_cache.invalidate(user.id)
+        return user
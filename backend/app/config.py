@@ -3,6 +3,8 @@ Arquivo de configuração centralizado do projeto.
 Carrega variáveis do .env e define configurações globais.
 """
 import os
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,6 +29,33 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL não encontrado no .env")
 
+# Pool de conexões (por worker e por engine: sync e async têm pools próprios)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Recicla conexões mais antigas que isso (evita conexões derrubadas por proxy/LB)
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Espera máxima por conexão livre; esgotado o prazo → 503 (em vez de pendurar)
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+
+# Timeouts por statement (ms, 0 = sem limite). CRUD usa o padrão da conexão;
+# rotas de relatório/exportação elevam com SET LOCAL no início da transação.
+# Timeout estourado → 503
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+DB_REPORT_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_REPORT_STATEMENT_TIMEOUT_MS", "30000"))
+DB_LOCK_TIMEOUT_MS = int(os.getenv("DB_LOCK_TIMEOUT_MS", "3000"))
+
+if DB_POOL_SIZE < 1 or DB_MAX_OVERFLOW < 0:
+    raise ValueError("DB_POOL_SIZE deve ser >= 1 e DB_MAX_OVERFLOW >= 0")
+
+# Réplica de leitura (opcional): relatórios, listagens e audit logs leem dela.
+# Mesmo pool/timeouts do primário (pools próprios).
+DATABASE_URL_REPLICA = os.getenv("DATABASE_URL_REPLICA") or None
+# Read-your-writes: após um commit, o mesmo usuário lê do primário por essa
+# janela (cobre o lag da réplica). Marca em core.replica_write_marks, compartilhada
+# entre workers (independe de REPORT_CACHE_BACKEND).
+REPLICA_READ_YOUR_WRITES_SECONDS = int(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5"))
+
 # ============================================================================
 # SECURITY / JWT
 # ============================================================================
@@ -41,6 +70,17 @@ if not SECRET_KEY or SECRET_KEY == "your-secret-key-change-in-production":
 
 ALGORITHM = "HS256"
 
+# Custo do bcrypt (log2 de iterações). Hashes com custo diferente são
+# refeitos no próximo login bem-sucedido.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+if not 4 <= BCRYPT_ROUNDS <= 31:
+    raise ValueError(f"BCRYPT_ROUNDS inválido: {BCRYPT_ROUNDS}. Use um valor entre 4 e 31.")
+
+# Pool dedicado para bcrypt (por worker): threads simultâneas e limite de
+# operações em andamento (em execução + na fila); acima dele → 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
 # Expiração do token de acesso (em minutos)
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 REFRESH_TOKEN_EXPIRE_DAYS = 7
@@ -72,6 +112,87 @@ else:
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
 
+# ============================================================================
+# CACHE DE RELATÓRIOS
+# ============================================================================
+# Backend: memory (por processo, padrão), postgres (compartilhado entre workers
+# via tabela UNLOGGED core.report_cache) ou none (desativado)
+REPORT_CACHE_BACKEND = os.getenv("REPORT_CACHE_BACKEND", "memory").lower()
+REPORT_CACHE_TTL_SECONDS = int(os.getenv("REPORT_CACHE_TTL_SECONDS", "60"))
+REPORT_CACHE_MAX_ENTRIES = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "1024"))
+
+if REPORT_CACHE_BACKEND not in ["memory", "postgres", "none"]:
+    raise ValueError(f"REPORT_CACHE_BACKEND inválido: '{REPORT_CACHE_BACKEND}'. Use 'memory', 'postgres' ou 'none'.")
+
+# ============================================================================
+# TIMEZONE DOS RELATÓRIOS
+# ============================================================================
+# Relatórios agrupam por dia local: (occurred_at AT TIME ZONE tz)::date.
+# REPORT_DEFAULT_TIMEZONE vale quando a request não informa tz (padrão:
+# America/Sao_Paulo, onde estão os usuários; antes da migration 009 o dia
+# era o da timezone da sessão do banco, em geral UTC).
+# REPORT_TIMEZONES: timezones com rollup diário e índice de expressão
+# (migrations 009 e 011); as demais são aceitas, mas calculadas direto de
+# core.financial_entries. As migrations cobrem America/Sao_Paulo e UTC; ao
+# incluir outra timezone, rodar scripts/rebuild_financial_rollup.py --tz
+# <timezone> (cria os índices de dia local e recalcula o rollup).
+REPORT_DEFAULT_TIMEZONE = os.getenv("REPORT_DEFAULT_TIMEZONE", "America/Sao_Paulo")
+REPORT_TIMEZONES = [
+    tz.strip() for tz in os.getenv("REPORT_TIMEZONES", "America/Sao_Paulo,UTC").split(",") if tz.strip()
+]
+
+if REPORT_DEFAULT_TIMEZONE not in REPORT_TIMEZONES:
+    REPORT_TIMEZONES.insert(0, REPORT_DEFAULT_TIMEZONE)
+
+for _tz in REPORT_TIMEZONES:
+    try:
+        ZoneInfo(_tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Timezone inválida em REPORT_DEFAULT_TIMEZONE/REPORT_TIMEZONES: '{_tz}'")
+
+# ============================================================================
+# CACHE DE USUÁRIO AUTENTICADO (get_current_user)
+# ============================================================================
+# (id, role, is_active) por user_id, em memória de cada worker. Alterações via
+# UserService/AuthService invalidam todos os workers (LISTEN/NOTIFY; ver
+# app.security.user_cache). 0 desativa o cache.
+AUTH_USER_CACHE_TTL_SECONDS = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30"))
+AUTH_USER_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", "10000"))
+
+# ============================================================================
+# AUDIT LOG (gravação em lote)
+# ============================================================================
+# AuditLogService.enqueue_action enfileira em memória; uma thread por worker
+# grava com INSERT multi-linha a cada intervalo ou ao juntar BATCH_SIZE eventos.
+# Fila cheia → o chamador grava o próprio evento (nunca descarta).
+AUDIT_LOG_FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_LOG_FLUSH_INTERVAL_MS", "200"))
+AUDIT_LOG_BATCH_SIZE = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "500"))
+AUDIT_LOG_QUEUE_MAX = int(os.getenv("AUDIT_LOG_QUEUE_MAX", "10000"))
+# core.audit_logs é particionada por mês. O startup cria as partições até
+# PARTITIONS_AHEAD meses à frente; scripts/audit_log_retention.py exporta para
+# ARCHIVE_DIR (csv.gz) e remove as partições além de RETENTION_MONTHS meses.
+AUDIT_LOG_PARTITIONS_AHEAD = int(os.getenv("AUDIT_LOG_PARTITIONS_AHEAD", "3"))
+AUDIT_LOG_RETENTION_MONTHS = int(os.getenv("AUDIT_LOG_RETENTION_MONTHS", "12"))
+AUDIT_LOG_ARCHIVE_DIR = os.getenv("AUDIT_LOG_ARCHIVE_DIR", "audit_archive")
+# full: before/after completos em todo evento. diff: updates guardam só os
+# campos alterados, com snapshot completo no primeiro update da entidade no
+# mês e a cada SNAPSHOT_EVERY updates (get_entity_history reconstrói).
+AUDIT_LOG_STORAGE = os.getenv("AUDIT_LOG_STORAGE", "full").lower()
+AUDIT_LOG_SNAPSHOT_EVERY = int(os.getenv("AUDIT_LOG_SNAPSHOT_EVERY", "20"))
+
+if AUDIT_LOG_STORAGE not in ["full", "diff"]:
+    raise ValueError(f"AUDIT_LOG_STORAGE inválido: '{AUDIT_LOG_STORAGE}'. Use 'full' ou 'diff'.")
+
+# ============================================================================
+# MÉTRICAS (/metrics, formato Prometheus)
+# ============================================================================
+# Com vários workers (uvicorn --workers N), definir PROMETHEUS_MULTIPROC_DIR
+# (diretório vazio a cada start) para agregar as métricas de todos os processos.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Se definido, /metrics exige header "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or None
+
 # ============================================================================
 # APP
 # ============================================================================
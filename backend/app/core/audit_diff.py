@@ -0,0 +1,168 @@
+"""
+Armazenamento compacto do audit log (AUDIT_LOG_STORAGE=diff).
+
+- create/delete: sempre snapshot completo (storage='full')
+- update: before/after só com os campos alterados (storage='diff')
+- Snapshot completo periódico: no primeiro update da entidade em cada mês
+  (partição) e a cada AUDIT_LOG_SNAPSHOT_EVERY updates. Assim qualquer
+  conjunto de partições retidas tem ponto de partida para reconstrução
+- AuditLogService.get_entity_history reconstrói os estados completos na
+  leitura (rebuild_states)
+
+Com AUDIT_LOG_STORAGE=full (padrão) tudo é gravado completo, como antes.
+get_logs/list_logs devolvem a forma gravada (campo storage na resposta).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Text, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, TIMESTAMP
+
+from app.config import AUDIT_LOG_SNAPSHOT_EVERY, AUDIT_LOG_STORAGE
+
+
+FULL = "full"
+DIFF = "diff"
+
+# Por evento candidato: mês do evento (no timezone da sessão, como a
+# partição), se já há snapshot completo da entidade no mês e quantos
+# diffs vieram depois do último
+_SNAPSHOT_STATE = text("""
+    SELECT
+        e.ord,
+        date_trunc('month', e.created_at) AS month,
+        last_full.created_at IS NOT NULL AS has_full,
+        (
+            SELECT count(*)
+            FROM core.audit_logs d
+            WHERE d.entity_type = e.entity_type
+              AND d.entity_id = e.entity_id
+              AND d.storage = 'diff'
+              AND d.created_at >= last_full.created_at
+              AND d.created_at < date_trunc('month', e.created_at) + interval '1 month'
+        ) AS diffs
+    FROM (
+        SELECT entity_type, entity_id, coalesce(created_at::timestamp, now()::timestamp) AS created_at, ord
+        FROM unnest(:entity_types, CAST(:entity_ids AS uuid[]), :created_ats)
+            WITH ORDINALITY AS u(entity_type, entity_id, created_at, ord)
+    ) e
+    LEFT JOIN LATERAL (
+        SELECT a.created_at
+        FROM core.audit_logs a
+        WHERE a.entity_type = e.entity_type
+          AND a.entity_id = e.entity_id
+          AND a.storage = 'full'
+          AND a.created_at >= date_trunc('month', e.created_at)
+          AND a.created_at < date_trunc('month', e.created_at) + interval '1 month'
+        ORDER BY a.created_at DESC
+        LIMIT 1
+    ) last_full ON true
+    ORDER BY e.ord
+""").bindparams(
+    bindparam("entity_types", type_=ARRAY(Text)),
+    bindparam("entity_ids", type_=ARRAY(Text)),
+    bindparam("created_ats", type_=ARRAY(TIMESTAMP(timezone=True))),
+)
+
+
+def diff_fields(before: Dict[str, Any], after: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Campos que mudaram entre dois snapshots: (valores antigos, valores novos).
+
+    Campo ausente em um dos lados conta como None.
+    """
+    keys = [k for k in after if before.get(k) != after[k]]
+    keys += [k for k in before if k not in after and before[k] is not None]
+    return {k: before.get(k) for k in keys}, {k: after.get(k) for k in keys}
+
+
+def _is_update_snapshot(row: Dict[str, Any]) -> bool:
+    return row["action"] == "update" and row.get("before") is not None and row.get("after") is not None
+
+
+def compact_rows(
+    conn,
+    rows: List[Dict[str, Any]],
+    storage: Optional[str] = None,
+    snapshot_every: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Define storage de cada evento e reduz os updates a diff (altera rows).
+
+    Uma consulta por lote, no mesmo conn da gravação. Eventos da mesma
+    entidade no lote são considerados em ordem.
+
+    Args:
+        conn: Session ou Connection SQLAlchemy
+        rows: eventos como em AuditLogWriter.enqueue (created_at pode ser None = now())
+        storage: full (não compacta) ou diff (default: AUDIT_LOG_STORAGE)
+        snapshot_every: snapshot completo a cada N updates da entidade
+            (default: AUDIT_LOG_SNAPSHOT_EVERY)
+
+    Returns:
+        rows
+    """
+    storage = storage or AUDIT_LOG_STORAGE
+    snapshot_every = snapshot_every or AUDIT_LOG_SNAPSHOT_EVERY
+    for row in rows:
+        row["storage"] = FULL
+    if storage != DIFF:
+        return rows
+
+    candidates = [row for row in rows if _is_update_snapshot(row)]
+    if not candidates:
+        return rows
+
+    result = conn.execute(_SNAPSHOT_STATE, {
+        "entity_types": [row["entity_type"] for row in candidates],
+        "entity_ids": [str(row["entity_id"]) for row in candidates],
+        "created_ats": [row.get("created_at") for row in candidates],
+    }).all()
+
+    # (entity_type, entity_id) -> [mês, diffs desde o último snapshot ou None]
+    seen: Dict[Tuple[str, Any], list] = {}
+    for row, state in zip(candidates, result):
+        key = (row["entity_type"], row["entity_id"])
+        current = seen.get(key)
+        if current is None or current[0] != state.month:
+            current = [state.month, state.diffs if state.has_full else None]
+            seen[key] = current
+
+        if current[1] is None or current[1] + 1 >= snapshot_every:
+            current[1] = 0
+            continue
+        current[1] += 1
+        row["before"], row["after"] = diff_fields(row["before"], row["after"])
+        row["storage"] = DIFF
+    return rows
+
+
+def rebuild_states(logs: Iterable[Any]) -> List[Any]:
+    """
+    Reconstrói before/after completos de um histórico em ordem cronológica.
+
+    Cada snapshot completo redefine o estado; cada diff é aplicado sobre o
+    estado anterior. Diff sem estado anterior conhecido (histórico
+    truncado pela retenção) é mantido como gravado.
+
+    Args:
+        logs: AuditLog (ou objetos com action/storage/before/after) desanexados
+            da sessão — os atributos são sobrescritos
+
+    Returns:
+        logs, com before/after completos e storage='full' nos reconstruídos
+    """
+    logs = list(logs)
+    state: Optional[Dict[str, Any]] = None
+    for log in logs:
+        if log.storage == DIFF:
+            if state is None:
+                continue
+            before = dict(state)
+            after = {**state, **(log.after or {})}
+            log.before, log.after, log.storage = before, after, FULL
+            state = after
+        elif log.action == "delete":
+            state = None
+        else:
+            state = dict(log.after) if log.after is not None else None
+    return logs
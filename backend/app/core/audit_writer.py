@@ -0,0 +1,238 @@
+"""
+Gravação em lote do audit log (AuditLogService.enqueue_action).
+
+- Eventos vão para uma fila em memória do worker; uma thread daemon grava
+  com um INSERT multi-linha quando junta AUDIT_LOG_BATCH_SIZE eventos ou
+  quando passa AUDIT_LOG_FLUSH_INTERVAL_MS desde o primeiro evento do lote
+- Gravação em conexão própria do engine primário, fora da transação do
+  request: o request não paga commit/round trip extra
+- created_at e request_id são capturados no enfileiramento (não na gravação)
+- Fila cheia (AUDIT_LOG_QUEUE_MAX): o chamador grava o próprio evento
+- stop() (shutdown do app e atexit) drena e grava o que estiver na fila
+- Falha ao gravar um lote: evento logado em ERROR com o conteúdo (para
+  recuperação manual) e contado em audit_log_events_total{result="failed"}
+- AUDIT_LOG_STORAGE=diff: updates reduzidos aos campos alterados na
+  gravação do lote (app.core.audit_diff, uma consulta por lote)
+
+Quem precisa do log na mesma transação da alteração de negócio usa
+AuditLogService.log_action(..., commit=False).
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.config import (
+    AUDIT_LOG_BATCH_SIZE,
+    AUDIT_LOG_FLUSH_INTERVAL_MS,
+    AUDIT_LOG_QUEUE_MAX,
+)
+from app.core.audit_diff import compact_rows
+from app.core.metrics import AUDIT_EVENTS, AUDIT_FLUSH_ROWS, AUDIT_FLUSH_SECONDS, AUDIT_QUEUE_DEPTH
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# Acorda a thread de fundo (flush/stop): grava o lote em formação sem
+# esperar o fim do intervalo
+_WAKE = object()
+
+
+class AuditLogWriter:
+    """Fila + thread de gravação em lote de core.audit_logs."""
+
+    def __init__(
+        self,
+        engine=None,
+        batch_size: int = AUDIT_LOG_BATCH_SIZE,
+        flush_interval_ms: int = AUDIT_LOG_FLUSH_INTERVAL_MS,
+        max_queue: int = AUDIT_LOG_QUEUE_MAX,
+        storage: Optional[str] = None,
+        snapshot_every: Optional[int] = None
+    ):
+        self._engine = engine
+        self.storage = storage
+        self.snapshot_every = snapshot_every
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._atexit_registered = False
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.database import engine
+            self._engine = engine
+        return self._engine
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        user_id,
+        action: str,
+        entity_type: str,
+        entity_id,
+        request_id: str,
+        before: Optional[dict] = None,
+        after: Optional[dict] = None
+    ) -> None:
+        """Enfileira um evento (não bloqueia; fila cheia → grava no chamador)."""
+        row = {
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "request_id": request_id,
+            "before": before,
+            "after": after,
+            "created_at": datetime.now(timezone.utc),
+        }
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            AUDIT_EVENTS.labels("direct").inc()
+            self._write([row])
+            return
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Grava tudo que foi enfileirado até agora.
+
+        Drena a fila na thread chamadora e espera o lote em andamento da
+        thread de fundo. Retorna False se o prazo esgotar.
+        """
+        self._wake()
+        self._drain()
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(
+                lambda: self._queue.unfinished_tasks == 0, timeout
+            )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Encerra a thread de fundo e grava o restante da fila (shutdown)."""
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._wake()
+            thread.join(timeout)
+        self._thread = None
+        self.flush(timeout)
+        self._stopping.clear()
+
+    # ------------------------------------------------------------------
+    # Thread de fundo
+    # ------------------------------------------------------------------
+
+    def _wake(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass  # fila cheia: o lote fecha por tamanho
+
+    def _ensure_started(self) -> None:
+        # Inicia sob demanda: scripts/alembic não criam thread; após fork
+        # (pid diferente) cada processo cria a sua
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write_and_ack(batch)
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        """Espera o primeiro evento e junta até batch_size ou flush_interval."""
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        if first is _WAKE:
+            self._queue.task_done()
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _WAKE:
+                self._queue.task_done()
+                break
+            batch.append(item)
+        return batch
+
+    def _drain(self) -> None:
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _WAKE:
+                    self._queue.task_done()
+                    continue
+                batch.append(item)
+            if not batch:
+                return
+            self._write_and_ack(batch)
+
+    def _write_and_ack(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self._write(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+            AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """Compactação (storage=diff) + INSERT multi-linha numa transação própria."""
+        start = time.perf_counter()
+        try:
+            with self.engine.begin() as conn:
+                compact_rows(conn, rows, self.storage, self.snapshot_every)
+                conn.execute(insert(AuditLog.__table__), rows)
+        except Exception as e:
+            AUDIT_EVENTS.labels("failed").inc(len(rows))
+            logger.error(f"Falha ao gravar {len(rows)} eventos de audit log: {e}")
+            for row in rows:
+                logger.error(f"Audit log não gravado: {json.dumps(row, default=str)}")
+            return
+        AUDIT_EVENTS.labels("written").inc(len(rows))
+        AUDIT_FLUSH_ROWS.observe(len(rows))
+        AUDIT_FLUSH_SECONDS.observe(time.perf_counter() - start)
+
+
+audit_writer = AuditLogWriter()
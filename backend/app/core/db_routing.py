@@ -0,0 +1,164 @@
+"""
+Roteamento de leituras para a réplica (DATABASE_URL_REPLICA).
+
+- Rotas só de leitura (relatórios, listagens, audit logs) usam
+  get_read_db/get_async_read_db: sessão da réplica quando configurada
+- Escritas e as demais rotas seguem em get_db (primário)
+- Read-your-writes: todo commit de sessão do primário dentro de um request
+  autenticado marca o usuário; por REPLICA_READ_YOUR_WRITES_SECONDS as
+  leituras dele vão para o primário (a réplica pode estar atrasada)
+
+Com réplica, a marca fica em core.replica_write_marks (PostgresWriteMarks,
+no primário): a escrita e a leitura seguinte podem cair em workers
+diferentes, e uma marca em memória só valeria no worker que escreveu. Tabela
+própria (sem a evicção LRU do cache de relatórios): upsert ao marcar, SELECT
+... WHERE expires_at > now() ao consultar.
+
+Sem DATABASE_URL_REPLICA tudo vai para o primário e nada é marcado.
+Relatórios de admin calculados na réplica podem ir para o cache com o lag
+da réplica (somado ao TTL do cache).
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app import database
+from app.config import DATABASE_URL_REPLICA, REPLICA_READ_YOUR_WRITES_SECONDS
+from app.core.request_context import get_current_user_id
+from app.models.replica_write_mark import ReplicaWriteMark
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryWriteMarks:
+    """Marcas por processo (sem réplica nada é marcado; testes)."""
+
+    def __init__(self):
+        self._expires: Dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: UUID, seconds: int) -> None:
+        with self._lock:
+            self._expires[user_id] = time.monotonic() + seconds
+
+    def active(self, user_id: UUID) -> bool:
+        with self._lock:
+            expires = self._expires.get(user_id)
+            if expires is not None and expires <= time.monotonic():
+                del self._expires[user_id]
+                expires = None
+        return expires is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires.clear()
+
+
+class PostgresWriteMarks:
+    """
+    Marcas em core.replica_write_marks, compartilhadas entre workers.
+
+    Conexões próprias do engine primário (fora da transação do request).
+    """
+
+    def __init__(self, engine=None):
+        if engine is None:
+            from app.database import engine
+        self.engine = engine
+
+    def mark(self, user_id: UUID, seconds: int) -> None:
+        stmt = pg_insert(ReplicaWriteMark).values(
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=seconds)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"expires_at": stmt.excluded.expires_at}
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt)
+
+    def active(self, user_id: UUID) -> bool:
+        stmt = select(ReplicaWriteMark.user_id).where(
+            ReplicaWriteMark.user_id == user_id,
+            ReplicaWriteMark.expires_at > func.now()
+        )
+        with self.engine.connect() as conn:
+            return conn.execute(stmt).first() is not None
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(ReplicaWriteMark))
+
+
+class RecentWriters:
+    """Usuários que escreveram há menos de window_seconds."""
+
+    def __init__(self, marks, window_seconds: int = REPLICA_READ_YOUR_WRITES_SECONDS):
+        self.marks = marks
+        self.window_seconds = window_seconds
+
+    def mark(self, user_id: UUID) -> None:
+        if self.window_seconds <= 0:
+            return
+        try:
+            self.marks.mark(user_id, self.window_seconds)
+        except Exception as e:
+            logger.warning(f"Falha ao marcar escrita recente: {e}")
+
+    def wrote_recently(self, user_id: UUID) -> bool:
+        if self.window_seconds <= 0:
+            return False
+        try:
+            return self.marks.active(user_id)
+        except Exception as e:
+            # Na dúvida, primário (consistência acima de distribuir carga)
+            logger.warning(f"Falha ao consultar escrita recente: {e}")
+            return True
+
+    def clear(self) -> None:
+        self.marks.clear()
+
+
+# Sem réplica nada é marcado (memória basta)
+recent_writers = RecentWriters(
+    PostgresWriteMarks() if DATABASE_URL_REPLICA else MemoryWriteMarks()
+)
+
+
+def replica_enabled() -> bool:
+    return database.ReplicaSessionLocal is not None
+
+
+def use_replica(user_id: Optional[UUID]) -> bool:
+    """True se a leitura deste usuário pode ir para a réplica."""
+    if not replica_enabled():
+        return False
+    return user_id is None or not recent_writers.wrote_recently(user_id)
+
+
+def read_sessionmaker(user_id: Optional[UUID]):
+    """Fábrica de sessão sync para leitura (réplica ou primário)."""
+    return database.ReplicaSessionLocal if use_replica(user_id) else database.SessionLocal
+
+
+def async_read_sessionmaker(user_id: Optional[UUID]):
+    """Fábrica de AsyncSession para leitura (réplica ou primário)."""
+    return database.AsyncReplicaSessionLocal if use_replica(user_id) else database.AsyncSessionLocal
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_recent_writer(session: Session) -> None:
+    """Commit no primário dentro de um request autenticado → usuário lê do primário."""
+    if not replica_enabled() or session.info.get("replica"):
+        return
+    user_id = get_current_user_id()
+    if user_id is not None:
+        recent_writers.mark(user_id)
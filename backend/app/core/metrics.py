@@ -0,0 +1,258 @@
+"""
+Métricas da aplicação no formato Prometheus (GET /metrics).
+
+- HTTP: contagem e latência por rota (template, ex: /orders/{order_id}),
+  método e status
+- Banco: quantidade de queries e tempo em SQL por request (eventos de
+  cursor do SQLAlchemy), separando tempo de banco do tempo em Python
+- Pool: conexões em uso, overflow e espera por conexão de app.database.engine
+- Sobrecarga: requests recusados com 503 por pool esgotado ou timeout de
+  statement/lock (db_unavailable_total)
+- Audit log: fila, tamanho/duração dos lotes e falhas do gravador em lote
+
+Multi-worker (uvicorn --workers N): com PROMETHEUS_MULTIPROC_DIR definido,
+cada processo grava seus valores em arquivos mmap nesse diretório e
+/metrics agrega todos (modo multiprocess do prometheus_client). O diretório
+deve ser esvaziado antes de subir os workers (ver render.yaml).
+
+Importado por app.database (TimedQueuePool): não depende de app.config no
+import, para não exigir SECRET_KEY em scripts/alembic.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Rotas sem match (404) ficam agrupadas para não explodir a cardinalidade
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Requests HTTP",
+    ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência de requests HTTP",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Queries SQL executadas por request",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+)
+DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Tempo gasto em queries SQL por request",
+    ["route"],
+    buckets=LATENCY_BUCKETS
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Conexões do pool em uso",
+    multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Conexões abertas além de pool_size",
+    multiprocess_mode="livesum"
+)
+POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Tamanho configurado do pool",
+    multiprocess_mode="livesum"
+)
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Espera para obter conexão do pool (inclui abrir conexão nova)",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+DB_UNAVAILABLE = Counter(
+    "db_unavailable_total",
+    "Operações de banco recusadas com 503",
+    ["reason"]  # pool_timeout, statement_timeout, lock_timeout
+)
+
+AUDIT_QUEUE_DEPTH = Gauge(
+    "audit_log_queue_depth",
+    "Eventos de audit log aguardando gravação",
+    multiprocess_mode="livesum"
+)
+AUDIT_FLUSH_ROWS = Histogram(
+    "audit_log_flush_rows",
+    "Eventos por INSERT em lote do audit log",
+    buckets=(1, 5, 10, 50, 100, 250, 500, 1000)
+)
+AUDIT_FLUSH_SECONDS = Histogram(
+    "audit_log_flush_seconds",
+    "Duração de cada gravação em lote do audit log",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+AUDIT_EVENTS = Counter(
+    "audit_log_events_total",
+    "Eventos de audit log por destino",
+    ["result"]  # written, direct (fila cheia), failed
+)
+
+AUTH_USER_CACHE = Counter(
+    "auth_user_cache_requests_total",
+    "Consultas ao cache de usuário autenticado",
+    ["result"]
+)
+
+PASSWORD_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Operações bcrypt aguardando thread do pool",
+    multiprocess_mode="livesum"
+)
+PASSWORD_ACTIVE = Gauge(
+    "password_hash_active",
+    "Operações bcrypt em execução",
+    multiprocess_mode="livesum"
+)
+PASSWORD_WAIT = Histogram(
+    "password_hash_wait_seconds",
+    "Tempo na fila do pool de bcrypt",
+    ["operation"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+PASSWORD_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Duração das operações bcrypt",
+    ["operation"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+PASSWORD_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Operações bcrypt recusadas (pool cheio)"
+)
+
+
+class QueryStats:
+    """Acumulador de queries do request corrente."""
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Mesmo objeto é visto pelo handler sync (threadpool copia o contexto)
+query_stats_var: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def observe_request(method: str, route: str, status_code: int, seconds: float, stats: QueryStats) -> None:
+    """Registra um request concluído."""
+    status = str(status_code)
+    HTTP_REQUESTS.labels(method, route, status).inc()
+    HTTP_LATENCY.labels(method, route, status).observe(seconds)
+    DB_QUERIES.labels(route).observe(stats.count)
+    DB_TIME.labels(route).observe(stats.seconds)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposição no formato texto do Prometheus (agregando workers se multiprocess)."""
+    from app.config import PROMETHEUS_MULTIPROC_DIR
+
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Remove gauges 'live' do worker que está encerrando (modo multiprocess)."""
+    from app.config import PROMETHEUS_MULTIPROC_DIR
+
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# ============================================================================
+# SQLALCHEMY
+# ============================================================================
+
+class TimedPoolMixin:
+    """Mede a espera por conexão do pool (db_pool_wait_seconds)."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    """QueuePool padrão + db_pool_wait_seconds (engine sync)."""
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool + db_pool_wait_seconds (engine async)."""
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = query_stats_var.get()
+    start = getattr(context, "_metrics_start", None)
+    if stats is None or start is None:
+        return
+    stats.count += 1
+    stats.seconds += time.perf_counter() - start
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Registra os hooks de métricas.
+    
+    - Tempo/contagem de queries: em todas as engines (eventos na classe Engine),
+      contabilizado só dentro de um request (query_stats_var definido)
+    - Gauges do pool: na engine informada (eventos checkout/checkin)
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    # checkin é disparado antes da conexão voltar ao pool: checked_out usa
+    # inc/dec; overflow/size são lidos do pool (corrigidos no próximo checkout)
+    def update_pool_gauges():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            POOL_OVERFLOW.set(max(pool.overflow(), 0))
+            POOL_SIZE.set(pool.size())
+
+    def on_checkout(*_args):
+        POOL_CHECKED_OUT.inc()
+        update_pool_gauges()
+
+    def on_checkin(*_args):
+        POOL_CHECKED_OUT.dec()
+        update_pool_gauges()
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    update_pool_gauges()
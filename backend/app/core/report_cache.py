@@ -0,0 +1,272 @@
+"""
+Cache de resultados de relatórios financeiros.
+
+Chave: (endpoint, user_id, parâmetros do relatório). Cada entrada pertence a
+um "tenant" (user_id do dono ou '*' para relatórios de admin sem filtro).
+
+Backends (REPORT_CACHE_BACKEND):
+- memory: LRU + TTL em memória do processo (padrão)
+- postgres: tabela UNLOGGED core.report_cache, compartilhada entre workers
+- none: sem cache
+
+Invalidação:
+- Listeners de sessão coletam o user_id de todo FinancialEntry criado,
+  alterado ou removido no flush e invalidam esses tenants (e '*') após o
+  commit. Rollback descarta a coleta.
+- Assim FinancialRepository e OrderService invalidam automaticamente;
+  escritas fora do ORM devem chamar report_cache.invalidate_users().
+- Um relatório calculado em paralelo a um commit pode ser gravado logo após
+  a invalidação; o TTL limita essa janela.
+"""
+import json
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, event, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import REPORT_CACHE_BACKEND, REPORT_CACHE_MAX_ENTRIES, REPORT_CACHE_TTL_SECONDS
+from app.models.financial_entry import FinancialEntry
+from app.models.report_cache_entry import ReportCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Tenant dos relatórios de admin (user_id=None): invalidado por qualquer escrita
+ADMIN_TENANT = "*"
+
+
+class MemoryCacheBackend:
+    """LRU com TTL em memória do processo (thread-safe)."""
+
+    def __init__(self, max_entries: int = REPORT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, _tenant, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, tenant: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, tenant, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_tenants(self, tenants: Iterable[str]) -> None:
+        tenants = set(tenants)
+        with self._lock:
+            for key in [k for k, (_, tenant, _) in self._entries.items() if tenant in tenants]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class PostgresCacheBackend:
+    """
+    Cache compartilhado em core.report_cache (UNLOGGED).
+
+    Todos os workers leem/gravam/invalidam a mesma tabela. Cada leitura
+    atualiza last_access; ao gravar, expirados e excedentes (LRU) são removidos.
+    Usa conexões próprias do engine (fora da transação do request).
+    """
+
+    def __init__(self, engine=None, max_entries: int = REPORT_CACHE_MAX_ENTRIES):
+        if engine is None:
+            from app.database import engine
+        self.engine = engine
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[Any]:
+        stmt = (
+            update(ReportCacheEntry)
+            .where(ReportCacheEntry.cache_key == key, ReportCacheEntry.expires_at > func.now())
+            .values(last_access=func.now())
+            .returning(ReportCacheEntry.value)
+        )
+        with self.engine.begin() as conn:
+            value = conn.execute(stmt).scalar()
+        return None if value is None else pickle.loads(value)
+
+    def set(self, key: str, tenant: str, value: Any, ttl: int) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        stmt = pg_insert(ReportCacheEntry).values(
+            cache_key=key,
+            tenant=tenant,
+            value=pickle.dumps(value),
+            expires_at=expires_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cache_key"],
+            set_={
+                "tenant": stmt.excluded.tenant,
+                "value": stmt.excluded.value,
+                "expires_at": stmt.excluded.expires_at,
+                "last_access": func.now(),
+            },
+        )
+        overflow = (
+            select(ReportCacheEntry.cache_key)
+            .order_by(ReportCacheEntry.last_access.desc())
+            .offset(self.max_entries)
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt)
+            conn.execute(
+                delete(ReportCacheEntry).where(
+                    (ReportCacheEntry.expires_at <= func.now())
+                    | ReportCacheEntry.cache_key.in_(overflow.scalar_subquery())
+                )
+            )
+
+    def invalidate_tenants(self, tenants: Iterable[str]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(ReportCacheEntry).where(ReportCacheEntry.tenant.in_(list(tenants))))
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(ReportCacheEntry))
+
+
+class NullCacheBackend:
+    """Cache desativado (sempre recalcula)."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, tenant: str, value: Any, ttl: int) -> None:
+        pass
+
+    def invalidate_tenants(self, tenants: Iterable[str]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class ReportCache:
+    """
+    Fachada do cache de relatórios.
+
+    Falhas do backend (ex: banco indisponível para o backend postgres)
+    são logadas e o relatório é calculado normalmente.
+    """
+
+    def __init__(self, backend, ttl: int = REPORT_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def tenant_for(user_id: Optional[UUID]) -> str:
+        return str(user_id) if user_id else ADMIN_TENANT
+
+    @staticmethod
+    def make_key(endpoint: str, user_id: Optional[UUID], params: Dict[str, Any]) -> str:
+        """Chave estável: endpoint, tenant e parâmetros ordenados."""
+        payload = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        return f"report:{endpoint}:{ReportCache.tenant_for(user_id)}:{payload}"
+
+    def get_or_compute(
+        self,
+        endpoint: str,
+        user_id: Optional[UUID],
+        params: Dict[str, Any],
+        compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Retorna o resultado em cache ou calcula e grava.
+
+        Args:
+            endpoint: Nome do relatório (dre, cashflow_daily, aging, top)
+            user_id: Filtro multi-tenant (None = admin)
+            params: Parâmetros que definem o resultado (datas, filtros, limit)
+            compute: Função que calcula o resultado
+        """
+        key = self.make_key(endpoint, user_id, params)
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Falha ao ler cache de relatório: {e}")
+            return compute()
+
+        if cached is not None:
+            return cached
+
+        value = compute()
+        try:
+            self.backend.set(key, self.tenant_for(user_id), value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Falha ao gravar cache de relatório: {e}")
+        return value
+
+    def invalidate_users(self, user_ids: Iterable[UUID]) -> None:
+        """Invalida relatórios dos usuários informados e os de admin."""
+        tenants = {str(user_id) for user_id in user_ids if user_id} | {ADMIN_TENANT}
+        try:
+            self.backend.invalidate_tenants(tenants)
+        except Exception as e:
+            logger.warning(f"Falha ao invalidar cache de relatório: {e}")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def _build_backend(name: str):
+    if name == "postgres":
+        return PostgresCacheBackend()
+    if name == "none":
+        return NullCacheBackend()
+    return MemoryCacheBackend()
+
+
+report_cache = ReportCache(_build_backend(REPORT_CACHE_BACKEND))
+
+
+# ============================================================================
+# INVALIDAÇÃO AUTOMÁTICA (escritas em FinancialEntry via ORM)
+# ============================================================================
+
+_PENDING_KEY = "report_cache_user_ids"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_tenants(session: Session, flush_context) -> None:
+    """Coleta user_ids (atual e anterior) de lançamentos alterados no flush."""
+    user_ids = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, FinancialEntry):
+            continue
+        user_ids.add(obj.user_id)
+        previous = inspect(obj).committed_state.get("user_id")
+        if isinstance(previous, UUID):
+            user_ids.add(previous)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    user_ids = session.info.pop(_PENDING_KEY, None)
+    if user_ids:
+        report_cache.invalidate_users(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
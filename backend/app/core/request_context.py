@@ -0,0 +1,25 @@
+"""
+Contexto da requisição corrente (contextvars).
+
+O RequestIDMiddleware grava o request_id aqui; services, repositories e o
+audit log leem com get_request_id() sem precisar receber o Request.
+get_current_user grava o id do usuário autenticado (roteamento de réplica).
+Handlers sync do FastAPI rodam no threadpool com cópia do contexto, então
+o valor também é visível neles.
+"""
+from contextvars import ContextVar
+from typing import Optional
+from uuid import UUID
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+current_user_id_var: ContextVar[Optional[UUID]] = ContextVar("current_user_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """Retorna o request_id da requisição corrente (None fora de um request)."""
+    return request_id_var.get()
+
+
+def get_current_user_id() -> Optional[UUID]:
+    """Retorna o id do usuário autenticado no request corrente (None se anônimo)."""
+    return current_user_id_var.get()
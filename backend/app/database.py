@@ -1,9 +1,30 @@
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import declarative_base
 
+from app.config import (
+    DATABASE_URL_REPLICA,
+    DB_LOCK_TIMEOUT_MS,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+from app.core import metrics
+from app.core.metrics import TimedAsyncQueuePool, TimedQueuePool
+from app.exceptions.errors import ServiceUnavailableError
+
 #Define a base para os modelos do SQLAlchemy
 Base = declarative_base()
 
@@ -17,11 +38,163 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL não encontrado. Crie/ajuste no .env do backend.")
 
+# ============================================================================
+# SOBRECARGA → 503
+# ============================================================================
+# Pool esgotado (DB_POOL_TIMEOUT_SECONDS) e statement/lock timeout viram
+# ServiceUnavailableError: o cliente recebe 503 rápido em vez de pendurar.
+UNAVAILABLE_MESSAGE = "Banco de dados sobrecarregado. Tente novamente em instantes."
+
+# SQLSTATE do Postgres: query_canceled (statement_timeout) e lock_not_available
+_TIMEOUT_SQLSTATES = {"57014": "statement_timeout", "55P03": "lock_timeout"}
+
+# statement_timeout (ms) das transações do request corrente; None = padrão da
+# conexão (DB_STATEMENT_TIMEOUT_MS). Definido por dependency (ver deps.statement_timeout)
+statement_timeout_var: ContextVar[Optional[int]] = ContextVar("statement_timeout", default=None)
+# lock_timeout (ms) das transações do contexto corrente; None = DB_LOCK_TIMEOUT_MS
+lock_timeout_var: ContextVar[Optional[int]] = ContextVar("lock_timeout", default=None)
+
+
+class _UnavailableOnPoolTimeout:
+    """Pool esgotado: conta em db_unavailable_total e levanta 503."""
+
+    def connect(self):
+        try:
+            return super().connect()
+        except PoolTimeoutError as exc:
+            metrics.DB_UNAVAILABLE.labels("pool_timeout").inc()
+            raise ServiceUnavailableError(UNAVAILABLE_MESSAGE) from exc
+
+
+class GuardedQueuePool(_UnavailableOnPoolTimeout, TimedQueuePool):
+    """Pool da engine sync."""
+
+
+class GuardedAsyncQueuePool(_UnavailableOnPoolTimeout, TimedAsyncQueuePool):
+    """Pool da engine async."""
+
+
+@event.listens_for(Engine, "handle_error")
+def _timeout_to_unavailable(context):
+    """Statement/lock timeout (qualquer engine, sync ou async) → 503."""
+    original = context.original_exception
+    sqlstate = getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+    reason = _TIMEOUT_SQLSTATES.get(sqlstate)
+    if reason is None:
+        return None
+    metrics.DB_UNAVAILABLE.labels(reason).inc()
+    error = ServiceUnavailableError(UNAVAILABLE_MESSAGE)
+    error.__cause__ = context.sqlalchemy_exception
+    return error
+
+
+@event.listens_for(Engine, "begin")
+def _apply_statement_timeout(conn):
+    """Rotas/tarefas com timeout próprio (ex: relatórios): SET LOCAL no início da transação."""
+    timeout_ms = statement_timeout_var.get()
+    if timeout_ms is not None and timeout_ms != DB_STATEMENT_TIMEOUT_MS:
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+    lock_ms = lock_timeout_var.get()
+    if lock_ms is not None and lock_ms != DB_LOCK_TIMEOUT_MS:
+        conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(lock_ms)}")
+
+
+@contextmanager
+def without_timeouts():
+    """
+    Manutenção (scripts, startup): transações sem statement_timeout/lock_timeout.
+
+    Os padrões da conexão (DB_STATEMENT_TIMEOUT_MS/DB_LOCK_TIMEOUT_MS) são
+    para requests curtos; rebuild do rollup e retenção do audit log fazem
+    LOCK/DETACH e agregações longas legítimas. Vale para as transações
+    iniciadas dentro do bloco (SET LOCAL ... = 0).
+
+    Uso:
+        with without_timeouts():
+            db = SessionLocal()
+            ...
+    """
+    statement_token = statement_timeout_var.set(0)
+    lock_token = lock_timeout_var.set(0)
+    try:
+        yield
+    finally:
+        lock_timeout_var.reset(lock_token)
+        statement_timeout_var.reset(statement_token)
+
+
+def _engine_options(driver: str) -> dict:
+    """Pool e timeouts padrão (app.config) no formato de cada driver."""
+    timeouts = {
+        "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS),
+        "lock_timeout": str(DB_LOCK_TIMEOUT_MS),
+    }
+    if driver == "asyncpg":
+        connect_args = {"server_settings": timeouts}
+    else:
+        # psycopg2/psycopg: parâmetros de sessão via libpq options
+        connect_args = {"options": " ".join(f"-c {name}={value}" for name, value in timeouts.items())}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "connect_args": connect_args,
+    }
+
+
 # 3. Cria a engine(conexão base)
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# GuardedQueuePool = QueuePool + métrica de espera por conexão (/metrics) + 503 se esgotado
+engine = create_engine(DATABASE_URL, poolclass=GuardedQueuePool, **_engine_options(make_url(DATABASE_URL).get_driver_name()))
 #4 Fábrica de sessões (cada request usa uma sessão)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> URL:
+    """
+    Mesma URL do banco com o driver asyncpg (postgresql+asyncpg).
+    asyncpg não entende sslmode: o valor é repassado como ssl.
+    """
+    parsed = make_url(url)
+    query = dict(parsed.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername="postgresql+asyncpg", query=query)
+
+
+# 5. Engine/sessões async (rotas async def migradas; ver app/utils/async_db.py)
+# Pool próprio: conta no limite de conexões do Postgres junto com o sync.
+async_engine = create_async_engine(
+    async_database_url(DATABASE_URL),
+    poolclass=GuardedAsyncQueuePool,
+    **_engine_options("asyncpg")
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# 6. Réplica de leitura opcional (roteamento em app/core/db_routing.py).
+# Sessões marcadas com info["replica"] (não contam como escrita do usuário).
+if DATABASE_URL_REPLICA:
+    replica_engine = create_engine(
+        DATABASE_URL_REPLICA,
+        poolclass=GuardedQueuePool,
+        **_engine_options(make_url(DATABASE_URL_REPLICA).get_driver_name())
+    )
+    ReplicaSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=replica_engine, info={"replica": True}
+    )
+    async_replica_engine = create_async_engine(
+        async_database_url(DATABASE_URL_REPLICA),
+        poolclass=GuardedAsyncQueuePool,
+        **_engine_options("asyncpg")
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        async_replica_engine, autoflush=False, expire_on_commit=False, info={"replica": True}
+    )
+else:
+    replica_engine = async_replica_engine = None
+    ReplicaSessionLocal = AsyncReplicaSessionLocal = None
+
 # Função utilitária para obter uma sessão
 def test_db_connection()-> None:
     """ Teste simples de conexão.
@@ -74,3 +74,9 @@ class ForbiddenError(AppException):
     """Acesso negado (403)"""
     def __init__(self, message: str = "Acesso negado"):
         super().__init__(message, status_code=403)
+
+
+class ServiceUnavailableError(AppException):
+    """Serviço temporariamente sobrecarregado/indisponível (503)"""
+    def __init__(self, message: str = "Serviço temporariamente indisponível"):
+        super().__init__(message, status_code=503)
@@ -30,7 +30,9 @@ def register_exception_handlers(app):
                 "error": exc.__class__.__name__,
                 "message": exc.message,
                 "request_id": request_id
-            }
+            },
+            # 503 (sobrecarga momentânea): cliente pode repetir em seguida
+            headers={"Retry-After": "1"} if exc.status_code == 503 else None
         )
     
     @app.exception_handler(RequestValidationError)
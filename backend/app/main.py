@@ -16,13 +16,16 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from app.config import APP_NAME, APP_VERSION, DEBUG, ENVIRONMENT, CORS_ALLOW_ORIGINS
+from app.config import APP_NAME, APP_VERSION, DEBUG, ENVIRONMENT, CORS_ALLOW_ORIGINS, METRICS_ENABLED
+from app.core import metrics
+from app.database import engine
 from app.middleware.request_id import RequestIDMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.metrics import MetricsMiddleware
 from app.exceptions.handlers import register_exception_handlers
 
 # Routers
-from app.routers import health_routes, user_routes, order_routes, financial_routes, report_routes, audit_log_routes
+from app.routers import health_routes, user_routes, order_routes, financial_routes, report_routes, audit_log_routes, metrics_routes
 from app.auth import router as auth_router
 
 
@@ -91,12 +94,17 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type"],
 )
 
-# 2. Request ID (deve vir antes do logging)
-app.add_middleware(RequestIDMiddleware)
+# 2. Métricas (mais interno: vê a rota resolvida e as queries do request)
+if METRICS_ENABLED:
+    metrics.instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
 
-# 3. Logging (usa request_id do middleware anterior)
+# 3. Logging (lê o request_id do contextvar gravado pelo RequestIDMiddleware)
 app.add_middleware(LoggingMiddleware)
 
+# 4. Request ID (adicionado por último = mais externo: envolve o logging)
+app.add_middleware(RequestIDMiddleware)
+
 
 # ========================================
 # EXCEPTION HANDLERS
@@ -114,6 +122,8 @@ app.include_router(order_routes.router)
 app.include_router(financial_routes.router)  # ETAPA 3A: Financeiro
 app.include_router(report_routes.router)  # ETAPA 4: Relatórios Financeiros
 app.include_router(audit_log_routes.router)  # ETAPA 6: Audit Logs
+if METRICS_ENABLED:
+    app.include_router(metrics_routes.router)  # /metrics (Prometheus)
 
 
 # ========================================
@@ -124,7 +134,7 @@ app.include_router(audit_log_routes.router)  # ETAPA 6: Audit Logs
 async def startup_event():
     """Executa ao iniciar aplicação"""
     from sqlalchemy import text
-    from app.database import SessionLocal
+    from app.database import SessionLocal, without_timeouts
     
     logging.info(f"🚀 {APP_NAME} v{APP_VERSION} iniciado")
     logging.info(f"📍 Environment: {ENVIRONMENT}")
@@ -141,8 +151,48 @@ async def startup_event():
         logging.error(f"❌ Database connection: FAILED - {str(e)}")
         # Não bloqueia startup (health check vai pegar isso)
 
+    # Partições de core.audit_logs dos próximos meses (sem elas, os eventos
+    # caem em audit_logs_default e não ganham partition pruning)
+    try:
+        from app.repositories.audit_log_partition_repository import AuditLogPartitionRepository
+
+        with without_timeouts():
+            db = SessionLocal()
+            try:
+                created = AuditLogPartitionRepository.ensure_partitions(db)
+                db.commit()
+            finally:
+                db.close()
+        if created:
+            logging.info(f"🗂️ Audit log: {created} partições criadas")
+    except Exception as e:
+        logging.warning(f"⚠️ Audit log: falha ao criar partições - {str(e)}")
+
+    # Rollup de timezones retiradas de REPORT_TIMEZONES deixa de ser mantido:
+    # tirar do registro para os relatórios não lerem dados desatualizados
+    try:
+        from app.repositories.financial_rollup_repository import FinancialRollupRepository
+
+        with without_timeouts():
+            db = SessionLocal()
+            try:
+                forgotten = FinancialRollupRepository.forget_unmaintained_timezones(db)
+                db.commit()
+            finally:
+                db.close()
+        if forgotten:
+            logging.info(f"🕒 Rollup: {forgotten} timezones fora de REPORT_TIMEZONES removidas")
+    except Exception as e:
+        logging.warning(f"⚠️ Rollup: falha ao limpar timezones - {str(e)}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Executa ao desligar aplicação"""
+    from app.core.audit_writer import audit_writer
+    from app.security.user_cache import auth_user_cache
+
+    audit_writer.stop()  # grava eventos de audit log ainda na fila
+    auth_user_cache.stop()  # encerra o LISTEN de invalidação do cache de usuário
+    metrics.mark_process_dead()
     logging.info(f"🛑 {APP_NAME} desligado")
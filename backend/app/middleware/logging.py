@@ -5,41 +5,57 @@ Loga todas as requests com:
 - method, path
 - status_code
 - tempo de processamento
+
+ASGI puro (sem BaseHTTPMiddleware). X-Process-Time é o tempo até o início
+da resposta (headers precisam sair antes do corpo); o log usa o tempo total,
+incluindo o corpo de respostas em streaming.
 """
 import time
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_context import get_request_id
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
     Loga informações de cada request/response
     NUNCA loga dados sensíveis (senha, token, etc)
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        # Pega request_id (se RequestIDMiddleware estiver antes)
-        request_id = getattr(request.state, "request_id", "unknown")
-        
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Marca tempo de início
-        start_time = time.time()
-        
-        # Processa request
-        response = await call_next(request)
-        
-        # Calcula tempo de processamento
-        process_time = time.time() - start_time
-        
-        # Log estruturado
-        logger.info(
-            f"[{request_id}] {request.method} {request.url.path} "
-            f"| status={response.status_code} | time={process_time:.3f}s"
-        )
-        
-        # Adiciona header com tempo de processamento
-        response.headers["X-Process-Time"] = f"{process_time:.3f}"
-        
-        return response
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Adiciona header com tempo de processamento
+                process_time = time.perf_counter() - start_time
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-process-time", f"{process_time:.3f}".encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_process_time)
+        finally:
+            process_time = time.perf_counter() - start_time
+
+            # Log estruturado (request_id vem do RequestIDMiddleware externo)
+            logger.info(
+                f"[{get_request_id() or 'unknown'}] {scope['method']} {scope['path']} "
+                f"| status={status_code} | time={process_time:.3f}s"
+            )
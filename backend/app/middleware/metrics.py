@@ -0,0 +1,43 @@
+"""
+Middleware de métricas (Prometheus)
+Mede cada request por rota (template), método e status, e acumula as
+queries SQL executadas durante o request (ver app.core.metrics).
+
+ASGI puro: deve ser o mais interno dos middlewares da aplicação.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import UNMATCHED_ROUTE, QueryStats, observe_request, query_stats_var
+
+
+class MetricsMiddleware:
+    """Registra contagem/latência HTTP e tempo de banco por request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500  # exceção sem resposta vira 500 no ServerErrorMiddleware
+        stats = QueryStats()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = query_stats_var.set(stats)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            query_stats_var.reset(token)
+            # O roteador grava a rota encontrada no scope (path com placeholders)
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            observe_request(scope["method"], route, status_code, time.perf_counter() - start_time, stats)
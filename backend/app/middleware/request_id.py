@@ -1,30 +1,48 @@
 """
 Middleware para Request ID
 Gera UUID único para cada request (rastreabilidade)
+
+ASGI puro (sem BaseHTTPMiddleware): não cria task extra nem reempacota o
+corpo da resposta, então não interfere em StreamingResponse.
 """
 import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_context import request_id_var
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Adiciona request_id único (UUID) em cada request
-    Disponível em request.state.request_id
+    Disponível em request.state.request_id e em get_request_id() (contextvar)
     Incluído no header de resposta: X-Request-ID
     """
-    
-    async def dispatch(self, request: Request, call_next):
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Gera UUID único para esta request
         request_id = str(uuid.uuid4())
-        
-        # Armazena no request.state (acessível em handlers/logs)
-        request.state.request_id = request_id
-        
-        # Processa request
-        response = await call_next(request)
-        
-        # Adiciona header na resposta
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
+
+        # Armazena no request.state (acessível em handlers/exception handlers)
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message) -> None:
+            # Adiciona header na resposta
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -7,10 +7,18 @@ from app.models.user import User
 from app.models.order import Order
 from app.models.financial_entry import FinancialEntry
 from app.models.audit_log import AuditLog
+from app.models.financial_daily_rollup import FinancialDailyRollup
+from app.models.rollup_timezone import RollupTimezone
+from app.models.report_cache_entry import ReportCacheEntry
+from app.models.replica_write_mark import ReplicaWriteMark
 
 __all__ = [
     "User",
     "Order",
     "FinancialEntry",
     "AuditLog",
+    "FinancialDailyRollup",
+    "RollupTimezone",
+    "ReportCacheEntry",
+    "ReplicaWriteMark",
 ]
@@ -32,6 +32,8 @@ class AuditLog(Base):
         entity_id: ID da entidade afetada
         before: Estado anterior (JSON) - NULL em create
         after: Estado atual (JSON) - NULL em delete
+        storage: full (before/after completos) ou diff (só campos alterados,
+            ver app.core.audit_diff)
         request_id: X-Request-ID do middleware para correlação
         created_at: Timestamp da operação
         
@@ -43,6 +45,12 @@ class AuditLog(Base):
         - (entity_type, entity_id): Histórico de uma entidade
         - created_at DESC: Eventos recentes
         - request_id: Rastreamento de requisição
+        
+    Particionamento (migration 006):
+        Tabela particionada por mês em created_at (core.audit_logs_YYYY_MM).
+        No banco a PK é (id, created_at); o ORM continua identificando a
+        linha só por id (gen_random_uuid, único na prática).
+        Filtrar por created_at sempre que possível (partition pruning).
     """
     __tablename__ = "audit_logs"
     __table_args__ = (
@@ -54,6 +62,10 @@ class AuditLog(Base):
             "entity_type IN ('order', 'financial_entry', 'user')",
             name='check_audit_entity_type'
         ),
+        CheckConstraint(
+            "storage IN ('full', 'diff')",
+            name='check_audit_storage'
+        ),
         {'schema': 'core'}
     )
     
@@ -102,6 +114,13 @@ class AuditLog(Base):
         comment="Estado atual da entidade (NULL em delete)"
     )
     
+    storage = Column(
+        String(10),
+        server_default=text("'full'"),
+        nullable=False,
+        comment="Forma de before/after: full (completo) ou diff (só campos alterados)"
+    )
+    
     request_id = Column(
         String(36),
         nullable=False,
@@ -145,6 +164,7 @@ class AuditLog(Base):
             "entity_id": str(self.entity_id),
             "before": self.before,
             "after": self.after,
+            "storage": self.storage,
             "request_id": self.request_id,
             "created_at": self.created_at.isoformat() if self.created_at else None
         }
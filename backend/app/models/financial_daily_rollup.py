@@ -0,0 +1,50 @@
+"""
+Model SQLAlchemy para tabela core.financial_daily_rollup
+Agregado diário pré-calculado dos lançamentos financeiros (base dos relatórios)
+"""
+from sqlalchemy import Column, Date, Integer, Numeric, VARCHAR, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class FinancialDailyRollup(Base):
+    """
+    Rollup diário de lançamentos financeiros.
+
+    Schema: core
+
+    Uma linha por (tz, user_id, day, kind, status) com a soma e a contagem
+    dos lançamentos ativos (deleted_at IS NULL) daquele dia local.
+    Mantido pelo listener de flush em app.repositories.financial_rollup_repository,
+    para cada timezone de REPORT_TIMEZONES.
+
+    Atributos:
+        tz: Timezone IANA em que o dia foi calculado
+        user_id: UUID do dono dos lançamentos (FK para core.users)
+        day: Dia local de ocorrência ((occurred_at AT TIME ZONE tz)::date)
+        kind: 'revenue' ou 'expense'
+        status: 'pending', 'paid', 'canceled'
+        amount_total: Soma de amount
+        entry_count: Quantidade de lançamentos
+    """
+    __tablename__ = "financial_daily_rollup"
+    __table_args__ = {"schema": "core"}
+
+    tz = Column(VARCHAR(64), primary_key=True)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("core.users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    kind = Column(VARCHAR(20), primary_key=True)
+    status = Column(VARCHAR(20), primary_key=True)
+    amount_total = Column(Numeric(18, 2), nullable=False, server_default=text("0"))
+    entry_count = Column(Integer, nullable=False, server_default=text("0"))
+
+    def __repr__(self):
+        return (
+            f"<FinancialDailyRollup(tz={self.tz}, user_id={self.user_id}, day={self.day}, "
+            f"kind={self.kind}, status={self.status}, amount_total={self.amount_total})>"
+        )
@@ -2,13 +2,22 @@
 Model SQLAlchemy para tabela core.financial_entries
 Lançamentos financeiros com integração automática de pedidos
 """
-from sqlalchemy import Column, Text, Numeric, VARCHAR, ForeignKey, text, CheckConstraint
+from sqlalchemy import Column, Computed, Text, Numeric, VARCHAR, ForeignKey, text, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+# Chave de agrupamento do top lançamentos: descrição sem UUIDs (pedidos geram
+# "Pedido <uuid> - ..."), espaços colapsados, até 200 caracteres (cabe no índice)
+DESCRIPTION_KEY_SQL = (
+    "left(btrim(regexp_replace("
+    "regexp_replace(description, '[0-9A-Fa-f]{8}-([0-9A-Fa-f]{4}-){3}[0-9A-Fa-f]{12}', '', 'g'), "
+    "'\\s+', ' ', 'g')), 200)"
+)
+
+
 class FinancialEntry(Base):
     """
     Tabela de lançamentos financeiros (receitas/despesas).
@@ -23,6 +32,7 @@ class FinancialEntry(Base):
         status: 'pending', 'paid', 'canceled'
         amount: Valor (>= 0)
         description: Descrição textual
+        description_key: Descrição normalizada (coluna gerada, agrupa o top lançamentos)
         occurred_at: Data de ocorrência do lançamento
         created_at: Data de criação do registro
         updated_at: Data de última atualização
@@ -98,6 +108,12 @@ class FinancialEntry(Base):
         comment="Descrição do lançamento"
     )
     
+    description_key = Column(
+        VARCHAR(200),
+        Computed(DESCRIPTION_KEY_SQL, persisted=True),
+        comment="Descrição normalizada (sem UUIDs) para agrupamento"
+    )
+    
     occurred_at = Column(
         TIMESTAMP(timezone=True),
         nullable=False,
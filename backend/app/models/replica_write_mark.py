@@ -0,0 +1,34 @@
+"""
+Model SQLAlchemy para tabela core.replica_write_marks
+Marcas de read-your-writes da réplica de leitura (app.core.db_routing)
+"""
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+
+from app.database import Base
+
+
+class ReplicaWriteMark(Base):
+    """
+    Usuário que escreveu no primário recentemente.
+
+    Schema: core
+
+    Enquanto expires_at > now(), as leituras do usuário vão para o
+    primário (a réplica pode não ter a escrita). Uma linha por usuário,
+    sobrescrita a cada escrita: a tabela não passa do número de usuários e
+    não tem evicção. UNLOGGED: marcas perdidas em crash do PostgreSQL
+    valem no máximo REPLICA_READ_YOUR_WRITES_SECONDS.
+
+    Atributos:
+        user_id: Usuário que escreveu (sem FK: marca transitória)
+        expires_at: Fim da janela de leitura no primário
+    """
+    __tablename__ = "replica_write_marks"
+    __table_args__ = {"schema": "core", "prefixes": ["UNLOGGED"]}
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ReplicaWriteMark(user_id={self.user_id}, expires_at={self.expires_at})>"
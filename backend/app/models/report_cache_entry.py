@@ -0,0 +1,37 @@
+"""
+Model SQLAlchemy para tabela core.report_cache
+Cache compartilhado de resultados de relatórios (backend "postgres")
+"""
+from sqlalchemy import Column, LargeBinary, Text, text
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+
+from app.database import Base
+
+
+class ReportCacheEntry(Base):
+    """
+    Entrada do cache de relatórios compartilhado entre workers.
+
+    Schema: core
+
+    Tabela UNLOGGED: sem WAL (escrita barata); o conteúdo é descartado
+    após crash do PostgreSQL, o que é aceitável para um cache.
+
+    Atributos:
+        cache_key: Chave (endpoint + parâmetros)
+        tenant: user_id dono do relatório ou '*' para relatórios de admin
+        value: Resultado serializado (pickle)
+        expires_at: Expiração (TTL)
+        last_access: Último acesso (evicção LRU)
+    """
+    __tablename__ = "report_cache"
+    __table_args__ = {"schema": "core", "prefixes": ["UNLOGGED"]}
+
+    cache_key = Column(Text, primary_key=True)
+    tenant = Column(Text, nullable=False, index=True)
+    value = Column(LargeBinary, nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    last_access = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"))
+
+    def __repr__(self):
+        return f"<ReportCacheEntry(cache_key={self.cache_key}, tenant={self.tenant}, expires_at={self.expires_at})>"
@@ -0,0 +1,34 @@
+"""
+Model SQLAlchemy para tabela core.rollup_timezones
+Registro das timezones com rollup diário completo (rebuild concluído)
+"""
+from sqlalchemy import Column, VARCHAR, text
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+
+from app.database import Base
+
+
+class RollupTimezone(Base):
+    """
+    Timezone cujo core.financial_daily_rollup foi recalculado por inteiro.
+
+    Schema: core
+
+    Gravada pelo rebuild completo (migration 011 ou
+    scripts/rebuild_financial_rollup.py sem filtro de usuário/período).
+    Relatórios só leem o rollup de timezones registradas aqui E presentes
+    em REPORT_TIMEZONES (mantidas pelo listener); as demais são calculadas
+    direto de core.financial_entries.
+
+    Atributos:
+        tz: Timezone IANA
+        built_at: Fim do último rebuild completo
+    """
+    __tablename__ = "rollup_timezones"
+    __table_args__ = {"schema": "core"}
+
+    tz = Column(VARCHAR(64), primary_key=True)
+    built_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text("now()"))
+
+    def __repr__(self):
+        return f"<RollupTimezone(tz={self.tz}, built_at={self.built_at})>"
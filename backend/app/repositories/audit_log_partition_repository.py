@@ -0,0 +1,177 @@
+"""
+Repository para as partições mensais de core.audit_logs.
+
+- core.audit_logs_YYYY_MM: uma partição por mês (RANGE em created_at)
+- core.audit_logs_default: recebe linhas fora das partições existentes
+- ensure_partitions: cria as partições dos próximos meses
+  (função core.ensure_audit_log_partitions, migration 006)
+- Retenção: detach → export (COPY, csv.gz) → conferência de linhas → drop
+
+Partições desanexadas e ainda não removidas (execução interrompida) são
+listadas por list_detached e retomadas pelo script de retenção.
+"""
+
+import csv
+import gzip
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import AUDIT_LOG_PARTITIONS_AHEAD
+
+
+PARTITION_NAME = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+
+
+def partition_name(month: date) -> str:
+    """Nome da partição do mês (core.audit_logs_YYYY_MM)."""
+    return f"audit_logs_{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> date:
+    """Primeiro dia do mês da partição; ValueError se o nome não for de partição mensal."""
+    match = PARTITION_NAME.match(name)
+    if not match:
+        raise ValueError(f"Nome de partição inválido: {name}")
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+class AuditLogPartitionRepository:
+    """Manutenção das partições mensais de core.audit_logs."""
+
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: int = AUDIT_LOG_PARTITIONS_AHEAD) -> int:
+        """
+        Cria as partições do mês corrente até months_ahead meses à frente.
+
+        Idempotente e seguro entre processos (advisory lock na função).
+        Não faz commit.
+
+        Returns:
+            int: Quantidade de partições criadas
+        """
+        return db.execute(
+            text("SELECT core.ensure_audit_log_partitions(:months_ahead)"),
+            {"months_ahead": months_ahead}
+        ).scalar()
+
+    @staticmethod
+    def create_month(db: Session, month: date) -> None:
+        """
+        Cria a partição de um mês passado ou futuro, se não existir (backfill/importação).
+
+        Falha se a partição default já tiver linhas do mês (usar
+        ensure_partitions, que move as linhas, para os meses à frente).
+        Não faz commit.
+        """
+        month = month.replace(day=1)
+        next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS core.{partition_name(month)} PARTITION OF core.audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        ))
+
+    @staticmethod
+    def list_partitions(db: Session) -> List[Dict]:
+        """Partições mensais anexadas, da mais antiga para a mais recente."""
+        names = db.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'core.audit_logs'::regclass
+        """)).scalars().all()
+        months = sorted(partition_month(name) for name in names if PARTITION_NAME.match(name))
+        return [{"name": partition_name(month), "month": month} for month in months]
+
+    @staticmethod
+    def list_detached(db: Session) -> List[str]:
+        """Tabelas audit_logs_YYYY_MM em core que não estão anexadas (retenção interrompida)."""
+        names = db.execute(text("""
+            SELECT c.relname
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'core'
+              AND c.relkind = 'r'
+              AND NOT c.relispartition
+              AND c.relname LIKE 'audit\\_logs\\_%'
+        """)).scalars().all()
+        return sorted(name for name in names if PARTITION_NAME.match(name))
+
+    @staticmethod
+    def expired_partitions(db: Session, keep_months: int, today: date) -> List[str]:
+        """
+        Partições inteiramente anteriores à janela de retenção.
+
+        keep_months=12 em 2026-10 mantém de 2025-11 em diante.
+        """
+        total = today.year * 12 + today.month - 1 - (keep_months - 1)
+        cutoff = date(total // 12, total % 12 + 1, 1)
+        return [p["name"] for p in AuditLogPartitionRepository.list_partitions(db) if p["month"] < cutoff]
+
+    @staticmethod
+    def detach(db: Session, name: str) -> None:
+        """Desanexa a partição (vira tabela comum em core). Não faz commit."""
+        partition_month(name)  # valida o nome antes de interpolar
+        db.execute(text(f"ALTER TABLE core.audit_logs DETACH PARTITION core.{name}"))
+
+    @staticmethod
+    def export(db: Session, name: str, archive_dir: Path) -> int:
+        """
+        Exporta uma partição desanexada para archive_dir/<name>.csv.gz (COPY CSV com cabeçalho).
+
+        Grava em arquivo temporário e renomeia só depois de conferir a
+        quantidade de linhas com a tabela.
+
+        Returns:
+            int: Linhas exportadas
+
+        Raises:
+            ValueError: Se a quantidade de linhas do arquivo divergir da tabela
+        """
+        partition_month(name)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        target = archive_dir / f"{name}.csv.gz"
+        partial = archive_dir / f"{name}.csv.gz.partial"
+
+        expected = db.execute(text(f"SELECT count(*) FROM core.{name}")).scalar()
+        cursor = db.connection().connection.cursor()
+        try:
+            with gzip.open(partial, "wb") as out:
+                cursor.copy_expert(
+                    f"COPY (SELECT * FROM core.{name} ORDER BY created_at, id) TO STDOUT WITH (FORMAT csv, HEADER)",
+                    out
+                )
+        finally:
+            cursor.close()
+
+        # Conferência: linhas do arquivo (menos cabeçalho) x tabela.
+        # csv do Postgres pode ter quebras de linha dentro de campos JSON:
+        # conta pelo leitor csv, não por "\n"
+        with gzip.open(partial, "rt", newline="") as f:
+            exported = sum(1 for _ in csv.reader(f)) - 1
+        if exported != expected:
+            partial.unlink()
+            raise ValueError(f"Exportação de {name} divergente: {exported} linhas no arquivo, {expected} na tabela")
+
+        with open(partial, "rb") as f:
+            os.fsync(f.fileno())
+        partial.replace(target)
+        return exported
+
+    @staticmethod
+    def drop(db: Session, name: str) -> None:
+        """
+        Remove uma partição já desanexada. Não faz commit.
+
+        Raises:
+            ValueError: Se a tabela ainda estiver anexada a core.audit_logs
+        """
+        partition_month(name)
+        if name not in AuditLogPartitionRepository.list_detached(db):
+            raise ValueError(f"{name} não é uma partição desanexada")
+        db.execute(text(f"DROP TABLE core.{name}"))
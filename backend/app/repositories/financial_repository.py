@@ -4,12 +4,27 @@ Camada exclusiva de persistência (queries SQLAlchemy).
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from sqlalchemy import Numeric, Text, and_, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
 from app.models.financial_entry import FinancialEntry
+from app.utils.pagination import estimate_count
+from app.utils.sql import array_param, uuid_array_param
+from app.utils.async_db import async_variant
+# Importar os módulos registra os listeners que mantêm core.financial_daily_rollup
+# e invalidam o cache de relatórios (create/update_status/soft_delete/restore)
+from app.repositories.financial_rollup_repository import FinancialRollupRepository
+from app.core.report_cache import report_cache
+
+
+# Colunas exportadas por stream_rows (ordem das colunas no CSV)
+EXPORT_COLUMNS = (
+    "id", "order_id", "user_id", "kind", "status", "amount",
+    "description", "occurred_at", "created_at", "updated_at",
+)
 
 
 class FinancialRepository:
@@ -32,6 +47,63 @@ class FinancialRepository:
         db.refresh(entry)
         return entry
 
+    @staticmethod
+    def bulk_create(db: Session, rows: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Cria vários lançamentos em um único INSERT ... SELECT unnest(...) RETURNING.
+        
+        Uma lista por coluna (não um bind por valor): o statement tem tamanho
+        fixo qualquer que seja o lote. Como não passa pelo flush do ORM,
+        atualiza o rollup diário na mesma transação e invalida o cache de
+        relatórios explicitamente.
+        
+        Args:
+            db: Sessão SQLAlchemy
+            rows: [{"user_id", "kind", "status", "amount", "description", "occurred_at"}, ...]
+                  (já validados)
+            
+        Returns:
+            Linhas criadas (Row com todas as colunas de FinancialEntry)
+        """
+        if not rows:
+            return []
+
+        table = FinancialEntry.__table__
+        source = func.unnest(
+            uuid_array_param(r["user_id"] for r in rows),
+            array_param([r["kind"] for r in rows], Text),
+            array_param([r["status"] for r in rows], Text),
+            array_param([r["amount"] for r in rows], Numeric(12, 2)),
+            array_param([r["description"] for r in rows], Text),
+            array_param([r["occurred_at"] for r in rows], TIMESTAMP(timezone=True)),
+        ).table_valued(
+            "user_id", "kind", "status", "amount", "description", "occurred_at"
+        ).render_derived(name="src")
+
+        columns = ["user_id", "kind", "status", "amount", "description", "occurred_at"]
+        stmt = (
+            insert(table)
+            .from_select(columns, select(*(source.c[name] for name in columns)))
+            .returning(*table.c)
+        )
+        created = db.execute(stmt).all()
+
+        FinancialRollupRepository.apply_deltas(db, [
+            {
+                "user_id": row.user_id,
+                "occurred_at": row.occurred_at,
+                "kind": row.kind,
+                "status": row.status,
+                "amount": row.amount,
+                "entry_count": 1,
+            }
+            for row in created
+        ])
+        db.commit()
+
+        report_cache.invalidate_users({row.user_id for row in created})
+        return created
+
     @staticmethod
     def get_by_id(db: Session, entry_id: UUID, include_deleted: bool = False) -> Optional[FinancialEntry]:
         """Busca lançamento por ID (exclui soft-deleted por padrão)."""
@@ -68,11 +140,13 @@ class FinancialRepository:
         kind: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
-        include_deleted: bool = False
+        include_deleted: bool = False,
+        extra_row: bool = False
     ) -> List[FinancialEntry]:
         """
         Lista lançamentos com paginação e filtros opcionais.
         Por padrão exclui soft-deleted.
+        Com extra_row=True busca page_size + 1 linhas (indica se há próxima página).
         
         Args:
             db: Sessão SQLAlchemy
@@ -89,46 +163,113 @@ class FinancialRepository:
             Lista de FinancialEntry
         """
         offset = (page - 1) * page_size
-        query = db.query(FinancialEntry)
-        
-        # Filtro de soft delete
-        if not include_deleted:
-            query = query.filter(FinancialEntry.deleted_at.is_(None))
-
-        # Filtros opcionais
-        if user_id:
-            query = query.filter(FinancialEntry.user_id == user_id)
-        if status:
-            query = query.filter(FinancialEntry.status == status)
-        if kind:
-            query = query.filter(FinancialEntry.kind == kind)
-        if date_from:
-            query = query.filter(FinancialEntry.occurred_at >= date_from)
-        if date_to:
-            query = query.filter(FinancialEntry.occurred_at <= date_to)
+        query = FinancialRepository._filtered_query(
+            db, user_id, status, kind, date_from, date_to, include_deleted
+        )
 
-        # Ordenação: mais recentes primeiro
+        # Ordenação: mais recentes primeiro (id desempata, mesma ordem do keyset)
         return (
             query
-            .order_by(FinancialEntry.occurred_at.desc())
+            .order_by(FinancialEntry.occurred_at.desc(), FinancialEntry.id.desc())
             .offset(offset)
-            .limit(page_size)
+            .limit(page_size + 1 if extra_row else page_size)
             .all()
         )
 
     @staticmethod
-    def count_total(
+    def list_keyset(
+        db: Session,
+        page_size: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        include_deleted: bool = False
+    ) -> List[FinancialEntry]:
+        """
+        Lista lançamentos por keyset (cursor), sem OFFSET.
+        
+        Busca page_size + 1 linhas: a linha extra indica que há próxima página.
+        O seek usa comparação de row-value (occurred_at, id) < (:v, :id), que o
+        índice (user_id, occurred_at) atende sem varrer as linhas já lidas.
+        
+        Args:
+            db: Sessão SQLAlchemy
+            page_size: Itens por página
+            after: (occurred_at, id) do último item da página anterior (None = início)
+            demais: mesmos filtros de list_paginated
+            
+        Returns:
+            Lista de FinancialEntry (até page_size + 1)
+        """
+        query = FinancialRepository._filtered_query(
+            db, user_id, status, kind, date_from, date_to, include_deleted
+        )
+        if after:
+            query = query.filter(
+                tuple_(FinancialEntry.occurred_at, FinancialEntry.id) < tuple_(*after)
+            )
+
+        return (
+            query
+            .order_by(FinancialEntry.occurred_at.desc(), FinancialEntry.id.desc())
+            .limit(page_size + 1)
+            .all()
+        )
+
+    @staticmethod
+    def stream_rows(
         db: Session,
+        batch_size: int = 1000,
         user_id: Optional[UUID] = None,
         status: Optional[str] = None,
         kind: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         include_deleted: bool = False
+    ) -> Iterator:
+        """
+        Itera lançamentos (linhas, não objetos ORM) para exportação.
+        
+        Usa cursor server-side (yield_per): o driver busca batch_size linhas
+        por vez, então a memória não cresce com o tamanho do resultado.
+        Mesmos filtros e ordenação de list_paginated.
+        
+        Args:
+            db: Sessão SQLAlchemy
+            batch_size: Linhas por fetch do cursor
+            demais: mesmos filtros de list_paginated
+            
+        Returns:
+            Iterator de Row com as colunas de EXPORT_COLUMNS
+        """
+        query = FinancialRepository._filtered_query(
+            db, user_id, status, kind, date_from, date_to, include_deleted
+        )
+        return (
+            query
+            .with_entities(*(getattr(FinancialEntry, name) for name in EXPORT_COLUMNS))
+            .order_by(FinancialEntry.occurred_at.desc(), FinancialEntry.id.desc())
+            .yield_per(batch_size)
+        )
+
+    @staticmethod
+    def count_total(
+        db: Session,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        include_deleted: bool = False,
+        estimate: bool = False
     ) -> int:
         """
         Conta total de lançamentos com filtros opcionais.
         Por padrão exclui soft-deleted.
+        Com estimate=True usa a estimativa do planner em vez de COUNT(*).
         
         Args:
             db: Sessão SQLAlchemy
@@ -138,17 +279,37 @@ class FinancialRepository:
             date_from: Data inicial
             date_to: Data final
             include_deleted: Se True, inclui soft-deleted
+            estimate: Se True, retorna estimativa (EXPLAIN) sem varrer a tabela
             
         Returns:
             Número total de registros
         """
+        # Aplicar mesmos filtros da lista
+        query = FinancialRepository._filtered_query(
+            db, user_id, status, kind, date_from, date_to, include_deleted
+        )
+        if estimate:
+            return estimate_count(db, query)
+        return query.count()
+
+    @staticmethod
+    def _filtered_query(
+        db: Session,
+        user_id: Optional[UUID],
+        status: Optional[str],
+        kind: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        include_deleted: bool
+    ):
+        """Query base com os filtros de listagem (compartilhada por lista, keyset e count)."""
         query = db.query(FinancialEntry)
         
         # Filtro de soft delete
         if not include_deleted:
             query = query.filter(FinancialEntry.deleted_at.is_(None))
 
-        # Aplicar mesmos filtros da lista
+        # Filtros opcionais
         if user_id:
             query = query.filter(FinancialEntry.user_id == user_id)
         if status:
@@ -160,7 +321,7 @@ class FinancialRepository:
         if date_to:
             query = query.filter(FinancialEntry.occurred_at <= date_to)
 
-        return query.count()
+        return query
 
     @staticmethod
     def update_status(db: Session, entry: FinancialEntry, new_status: str) -> FinancialEntry:
@@ -181,6 +342,120 @@ class FinancialRepository:
         db.refresh(entry)
         return entry
     
+    @staticmethod
+    def _pending_conditions(
+        ids: Optional[List[UUID]],
+        user_id: Optional[UUID],
+        kind: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime]
+    ) -> List[Any]:
+        """Condições dos lançamentos pending ativos alvo da atualização em lote."""
+        table = FinancialEntry.__table__
+        conditions = [table.c.status == "pending", table.c.deleted_at.is_(None)]
+        if ids is not None:
+            conditions.append(table.c.id == func.any(uuid_array_param(ids)))
+        if user_id:
+            conditions.append(table.c.user_id == user_id)
+        if kind:
+            conditions.append(table.c.kind == kind)
+        if date_from:
+            conditions.append(table.c.occurred_at >= date_from)
+        if date_to:
+            conditions.append(table.c.occurred_at <= date_to)
+        return conditions
+
+    @staticmethod
+    def count_pending(
+        db: Session,
+        user_id: Optional[UUID] = None,
+        kind: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> int:
+        """
+        Conta lançamentos pending ativos que casam com os filtros.
+        
+        Com limit, para de contar em limit (basta saber se passou do teto).
+        """
+        table = FinancialEntry.__table__
+        matching = select(table.c.id).where(
+            *FinancialRepository._pending_conditions(None, user_id, kind, date_from, date_to)
+        )
+        if limit is not None:
+            matching = matching.limit(limit)
+        return db.execute(select(func.count()).select_from(matching.subquery())).scalar_one()
+
+    @staticmethod
+    def bulk_update_status(
+        db: Session,
+        new_status: str,
+        ids: Optional[List[UUID]] = None,
+        user_id: Optional[UUID] = None,
+        kind: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Move lançamentos 'pending' para new_status em um único
+        UPDATE ... WHERE status = 'pending' RETURNING.
+        
+        Como não passa pelo flush do ORM, atualiza o rollup diário na mesma
+        transação e invalida o cache de relatórios explicitamente.
+        
+        Args:
+            db: Sessão SQLAlchemy
+            new_status: Status de destino
+            ids: Limita aos IDs informados (None = todos que casam com os filtros)
+            user_id: Filtro multi-tenant (None = admin)
+            kind, date_from, date_to: Filtros opcionais
+            limit: Máximo de linhas atualizadas (None = sem teto)
+            
+        Returns:
+            Linhas atualizadas (Row com todas as colunas de FinancialEntry)
+        """
+        table = FinancialEntry.__table__
+        conditions = FinancialRepository._pending_conditions(ids, user_id, kind, date_from, date_to)
+        stmt = update(table)
+        if limit is None:
+            stmt = stmt.where(*conditions)
+        else:
+            # UPDATE não aceita LIMIT: teto aplicado na seleção dos IDs
+            capped = select(table.c.id).where(*conditions).limit(limit).with_for_update()
+            stmt = stmt.where(table.c.id.in_(capped.scalar_subquery()), *conditions)
+        stmt = stmt.values(status=new_status, updated_at=datetime.utcnow()).returning(*table.c)
+
+        updated = db.execute(stmt).all()
+
+        deltas = []
+        for row in updated:
+            for status, sign in (("pending", -1), (new_status, 1)):
+                deltas.append({
+                    "user_id": row.user_id,
+                    "occurred_at": row.occurred_at,
+                    "kind": row.kind,
+                    "status": status,
+                    "amount": sign * row.amount,
+                    "entry_count": sign,
+                })
+        FinancialRollupRepository.apply_deltas(db, deltas)
+        db.commit()
+
+        if updated:
+            report_cache.invalidate_users({row.user_id for row in updated})
+        return updated
+
+    @staticmethod
+    def get_status_by_ids(db: Session, ids: List[UUID]) -> List[Any]:
+        """Retorna (id, user_id, status, deleted_at) dos IDs informados que existem."""
+        table = FinancialEntry.__table__
+        stmt = select(table.c.id, table.c.user_id, table.c.status, table.c.deleted_at).where(
+            table.c.id == func.any(uuid_array_param(ids))
+        )
+        return db.execute(stmt).all()
+
     @staticmethod
     def soft_delete(db: Session, entry: FinancialEntry, deleted_by_user_id: UUID) -> FinancialEntry:
         """
@@ -230,3 +505,16 @@ class FinancialRepository:
         """
         db.delete(entry)
         db.commit()
+
+
+class AsyncFinancialRepository:
+    """
+    Leituras de FinancialRepository para AsyncSession (asyncpg).
+    Mesmos parâmetros da versão sync; escritas continuam no caminho sync.
+    """
+
+    get_by_id = async_variant(FinancialRepository.get_by_id)
+    get_by_order_id = async_variant(FinancialRepository.get_by_order_id)
+    list_paginated = async_variant(FinancialRepository.list_paginated)
+    list_keyset = async_variant(FinancialRepository.list_keyset)
+    count_total = async_variant(FinancialRepository.count_total)
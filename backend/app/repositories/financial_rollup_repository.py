@@ -0,0 +1,395 @@
+"""
+Repository para o rollup diário de lançamentos financeiros.
+Mantém core.financial_daily_rollup sincronizado com core.financial_entries.
+
+Manutenção incremental:
+- Um listener after_flush calcula, para cada FinancialEntry novo, alterado
+  ou removido na sessão, a contribuição antiga e a nova para o rollup
+  e aplica a diferença com INSERT ... ON CONFLICT DO UPDATE na MESMA transação.
+- Assim FinancialRepository.create/update_status/soft_delete/restore e
+  OrderService.update_order mantêm o rollup correto sem chamadas explícitas
+  (commit e rollback valem para o lançamento e para o rollup juntos).
+
+Escritas que não passam pelo ORM (UPDATE/INSERT em massa) devem chamar
+FinancialRollupRepository.apply_deltas explicitamente.
+
+Timezones: o rollup guarda o dia local ((occurred_at AT TIME ZONE tz)::date)
+de cada timezone de REPORT_TIMEZONES; cada delta é aplicado em todas elas.
+Relatórios só leem o rollup de timezones com rebuild completo registrado em
+core.rollup_timezones (built_timezones); REPORT_TIMEZONES deve ser igual em
+todos os workers.
+
+Índices de dia local: a migration 009 cria os de America/Sao_Paulo e UTC;
+timezone incluída depois ganha os seus em ensure_local_day_indexes
+(scripts/rebuild_financial_rollup.py), com o mesmo nome e expressão.
+"""
+
+import hashlib
+import re
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Date, Integer, Numeric, Text, delete, event, func, inspect, literal, select, text, true
+from sqlalchemy.dialects.postgresql import TIMESTAMP, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from app.models.financial_daily_rollup import FinancialDailyRollup
+from app.config import REPORT_TIMEZONES
+from app.models.financial_entry import FinancialEntry
+from app.models.rollup_timezone import RollupTimezone
+from app.utils.sql import array_param, local_day, uuid_array_param
+
+
+# Campos de FinancialEntry que afetam o rollup
+ROLLUP_FIELDS = ("user_id", "occurred_at", "kind", "status", "amount", "deleted_at")
+
+# Segundos que cada worker reaproveita a leitura de core.rollup_timezones
+# (timezone recém-reconstruída por outro processo usa o scan até expirar)
+BUILT_TIMEZONES_TTL_SECONDS = 60
+
+_built_timezones_cache: Dict[str, Any] = {"zones": None, "expires_at": 0.0}
+
+
+def _local_day_index_name(prefix: str, tz: str) -> str:
+    """Nome do índice com a timezone (mesmo padrão da migration 009; limite de 63 caracteres)."""
+    name = f"{prefix}_{re.sub(r'[^a-z0-9]+', '_', tz.lower()).strip('_')}"
+    if len(name) > 63:
+        name = f"{name[:54]}_{hashlib.md5(tz.encode()).hexdigest()[:8]}"
+    return name
+
+
+def _local_day_indexes(tz: str):
+    """(nome, colunas) dos índices de dia local de uma timezone (ver migration 009)."""
+    literal_tz = tz.replace("'", "''")
+    day = f"((timezone('{literal_tz}', occurred_at))::date)"
+    return (
+        (_local_day_index_name('ix_financial_entries_user_day', tz), f"(user_id, {day}) INCLUDE (amount, kind, status)"),
+        (_local_day_index_name('ix_financial_entries_day', tz), f"({day}) INCLUDE (user_id, amount, kind, status)"),
+    )
+
+
+class FinancialRollupRepository:
+    """Repositório de manutenção e rebuild do rollup diário."""
+
+    @staticmethod
+    def timezones() -> List[str]:
+        """Timezones mantidas no rollup (REPORT_TIMEZONES)."""
+        return list(REPORT_TIMEZONES)
+
+    @staticmethod
+    def built_timezones(db) -> List[str]:
+        """
+        Timezones cujo rollup os relatórios podem ler.
+
+        Mantidas pelo listener (REPORT_TIMEZONES) e com rebuild completo
+        registrado em core.rollup_timezones. O registro é lido no máximo a
+        cada BUILT_TIMEZONES_TTL_SECONDS por worker.
+        """
+        now = time.monotonic()
+        if _built_timezones_cache["zones"] is None or now >= _built_timezones_cache["expires_at"]:
+            _built_timezones_cache["zones"] = set(db.execute(select(RollupTimezone.tz)).scalars())
+            _built_timezones_cache["expires_at"] = now + BUILT_TIMEZONES_TTL_SECONDS
+        return [tz for tz in FinancialRollupRepository.timezones() if tz in _built_timezones_cache["zones"]]
+
+    @staticmethod
+    def clear_built_timezones_cache() -> None:
+        """Força nova leitura de core.rollup_timezones na próxima consulta."""
+        _built_timezones_cache["zones"] = None
+
+    @staticmethod
+    def forget_unmaintained_timezones(db: Session) -> int:
+        """
+        Remove do registro (e do rollup) timezones fora de REPORT_TIMEZONES.
+
+        O listener não aplica deltas nessas timezones; se voltarem para a
+        configuração, o rollup só é lido de novo após outro rebuild completo.
+        Chamado no startup; o chamador faz commit.
+
+        Returns:
+            Quantidade de timezones removidas do registro
+        """
+        timezones = FinancialRollupRepository.timezones()
+        forgotten = db.execute(
+            delete(RollupTimezone).where(RollupTimezone.tz.not_in(timezones))
+        ).rowcount
+        db.execute(delete(FinancialDailyRollup).where(FinancialDailyRollup.tz.not_in(timezones)))
+        FinancialRollupRepository.clear_built_timezones_cache()
+        return forgotten
+
+    @staticmethod
+    def ensure_local_day_indexes(timezones: Optional[Sequence[str]] = None, engine=None) -> int:
+        """
+        Cria os índices de dia local que faltam em core.financial_entries.
+
+        Mesmos índices da migration 009 (por usuário e admin), para timezones
+        incluídas em REPORT_TIMEZONES depois dela. CREATE INDEX CONCURRENTLY
+        fora de transação (AUTOCOMMIT) e sem statement/lock timeout; índice
+        INVALID (execução anterior interrompida) é removido e recriado.
+        Rodar antes do rebuild, sem transação aberta na mesma sessão
+        (CONCURRENTLY espera as transações em andamento).
+
+        Args:
+            timezones: Timezones (None = todas de REPORT_TIMEZONES)
+            engine: Engine do banco (None = app.database.engine)
+
+        Returns:
+            Quantidade de índices criados
+
+        Raises:
+            ValueError: Timezone fora de REPORT_TIMEZONES
+        """
+        unknown = set(timezones or ()) - set(FinancialRollupRepository.timezones())
+        if unknown:
+            raise ValueError(f"Timezones fora de REPORT_TIMEZONES: {', '.join(sorted(unknown))}")
+
+        if engine is None:
+            from app.database import engine
+
+        created = 0
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("SET statement_timeout = 0")
+            conn.exec_driver_sql("SET lock_timeout = 0")
+            try:
+                for tz in timezones or FinancialRollupRepository.timezones():
+                    for name, columns in _local_day_indexes(tz):
+                        valid = conn.execute(
+                            text("""
+                                SELECT i.indisvalid FROM pg_index i
+                                JOIN pg_class c ON c.oid = i.indexrelid
+                                JOIN pg_namespace n ON n.oid = c.relnamespace
+                                WHERE n.nspname = 'core' AND c.relname = :name
+                            """),
+                            {"name": name}
+                        ).scalar()
+                        if valid:
+                            continue
+                        if valid is not None:
+                            conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY core.{name}")
+                        conn.exec_driver_sql(
+                            f"CREATE INDEX CONCURRENTLY {name} ON core.financial_entries {columns} "
+                            f"WHERE deleted_at IS NULL"
+                        )
+                        created += 1
+            finally:
+                # Conexão volta ao pool com os timeouts padrão
+                conn.exec_driver_sql("RESET statement_timeout")
+                conn.exec_driver_sql("RESET lock_timeout")
+        return created
+
+    @staticmethod
+    def apply_deltas(db, deltas: List[Dict[str, Any]]) -> None:
+        """
+        Aplica deltas no rollup (upsert somando amount_total/entry_count).
+
+        O dia local é calculado no banco para cada timezone do rollup
+        (deltas x timezones). Deltas do mesmo dia são agrupados antes
+        do upsert (ON CONFLICT não aceita a mesma chave duas vezes).
+        Os deltas seguem como arrays (unnest), então o custo não cresce com
+        a quantidade de binds (importante para escritas em lote).
+
+        Args:
+            db: Session ou Connection SQLAlchemy
+            deltas: [{"user_id", "occurred_at", "kind", "status", "amount", "entry_count"}, ...]
+        """
+        if not deltas:
+            return
+
+        # Um array por coluna + unnest: 6 parâmetros independente da quantidade de deltas
+        delta_values = func.unnest(
+            uuid_array_param(d["user_id"] for d in deltas),
+            array_param([d["occurred_at"] for d in deltas], TIMESTAMP(timezone=True)),
+            array_param([d["kind"] for d in deltas], Text),
+            array_param([d["status"] for d in deltas], Text),
+            array_param([d["amount"] for d in deltas], Numeric(18, 2)),
+            array_param([d["entry_count"] for d in deltas], Integer),
+        ).table_valued(
+            "user_id", "occurred_at", "kind", "status", "amount", "entry_count"
+        ).render_derived(name="delta")
+
+        zones = func.unnest(
+            array_param(FinancialRollupRepository.timezones(), Text)
+        ).table_valued("tz").render_derived(name="zone")
+
+        user_id = delta_values.c.user_id
+        day = func.timezone(zones.c.tz, delta_values.c.occurred_at).cast(Date)
+
+        grouped = (
+            select(
+                zones.c.tz,
+                user_id,
+                day,
+                delta_values.c.kind,
+                delta_values.c.status,
+                func.sum(delta_values.c.amount),
+                func.sum(delta_values.c.entry_count),
+            )
+            .select_from(delta_values.join(zones, true()))
+            .group_by(zones.c.tz, user_id, day, delta_values.c.kind, delta_values.c.status)
+        )
+
+        stmt = insert(FinancialDailyRollup).from_select(
+            ["tz", "user_id", "day", "kind", "status", "amount_total", "entry_count"],
+            grouped,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tz", "user_id", "day", "kind", "status"],
+            set_={
+                "amount_total": FinancialDailyRollup.amount_total + stmt.excluded.amount_total,
+                "entry_count": FinancialDailyRollup.entry_count + stmt.excluded.entry_count,
+            },
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def rebuild(
+        db: Session,
+        user_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        timezones: Optional[Sequence[str]] = None
+    ) -> int:
+        """
+        Recalcula o rollup a partir de core.financial_entries (backfill).
+
+        Apaga as linhas do escopo (usuário e/ou período) e as regrava com um
+        INSERT ... SELECT agregado por timezone. Bloqueia escritas em financial_entries
+        (LOCK SHARE) até o commit para que nenhum lançamento concorrente se perca.
+
+        Sem filtro de usuário/período, registra as timezones em
+        core.rollup_timezones: a partir daí os relatórios leem o rollup delas.
+
+        Args:
+            db: Sessão SQLAlchemy
+            user_id: Limita o rebuild a um usuário (None = todos)
+            date_from: Primeiro dia a recalcular (None = sem limite)
+            date_to: Último dia a recalcular (None = sem limite)
+            timezones: Timezones a recalcular (None = todas de REPORT_TIMEZONES)
+
+        Returns:
+            Quantidade de linhas de rollup gravadas
+
+        Raises:
+            ValueError: Timezone fora de REPORT_TIMEZONES (não seria mantida
+                pelo listener e ficaria desatualizada)
+        """
+        unknown = set(timezones or ()) - set(FinancialRollupRepository.timezones())
+        if unknown:
+            raise ValueError(f"Timezones fora de REPORT_TIMEZONES: {', '.join(sorted(unknown))}")
+
+        db.execute(text("LOCK TABLE core.financial_entries IN SHARE MODE"))
+
+        rows = 0
+        for tz in timezones or FinancialRollupRepository.timezones():
+            # Limpar escopo
+            purge = delete(FinancialDailyRollup).where(FinancialDailyRollup.tz == tz)
+            if user_id:
+                purge = purge.where(FinancialDailyRollup.user_id == user_id)
+            if date_from:
+                purge = purge.where(FinancialDailyRollup.day >= date_from)
+            if date_to:
+                purge = purge.where(FinancialDailyRollup.day <= date_to)
+            db.execute(purge)
+
+            # Recalcular a partir dos lançamentos ativos (faixa pelo índice de dia local)
+            day = local_day(FinancialEntry.occurred_at, tz)
+            source = (
+                select(
+                    literal(tz, Text),
+                    FinancialEntry.user_id,
+                    day,
+                    FinancialEntry.kind,
+                    FinancialEntry.status,
+                    func.sum(FinancialEntry.amount),
+                    func.count(FinancialEntry.id),
+                )
+                .where(FinancialEntry.deleted_at.is_(None))
+                .group_by(FinancialEntry.user_id, day, FinancialEntry.kind, FinancialEntry.status)
+            )
+            if user_id:
+                source = source.where(FinancialEntry.user_id == user_id)
+            if date_from:
+                source = source.where(day >= date_from)
+            if date_to:
+                source = source.where(day <= date_to)
+
+            result = db.execute(
+                insert(FinancialDailyRollup).from_select(
+                    ["tz", "user_id", "day", "kind", "status", "amount_total", "entry_count"],
+                    source,
+                )
+            )
+            rows += result.rowcount
+
+            if user_id is None and date_from is None and date_to is None:
+                mark = insert(RollupTimezone).values(tz=tz)
+                db.execute(mark.on_conflict_do_update(index_elements=["tz"], set_={"built_at": func.now()}))
+        db.commit()
+        FinancialRollupRepository.clear_built_timezones_cache()
+        return rows
+
+
+def _entry_contribution(entry: FinancialEntry, values_by_field: Dict[str, Any], sign: int) -> Optional[Dict[str, Any]]:
+    """Contribuição (com sinal) de um estado de lançamento para o rollup."""
+    if values_by_field["deleted_at"] is not None:
+        return None
+    if values_by_field["occurred_at"] is None or values_by_field["amount"] is None:
+        return None
+    return {
+        "user_id": values_by_field["user_id"],
+        "occurred_at": values_by_field["occurred_at"],
+        "kind": values_by_field["kind"],
+        "status": values_by_field["status"],
+        "amount": sign * values_by_field["amount"],
+        "entry_count": sign,
+    }
+
+
+def _current_values(entry: FinancialEntry) -> Dict[str, Any]:
+    return {field: getattr(entry, field) for field in ROLLUP_FIELDS}
+
+
+def _committed_values(entry: FinancialEntry) -> Dict[str, Any]:
+    """Valores antes das alterações pendentes (committed_state do ORM)."""
+    state = inspect(entry)
+    current = _current_values(entry)
+    committed = {}
+    for field in ROLLUP_FIELDS:
+        old = state.committed_state.get(field, current[field])
+        committed[field] = None if old is NO_VALUE else old
+    return committed
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_financial_rollup(session: Session, flush_context) -> None:
+    """
+    Propaga mudanças de FinancialEntry para o rollup na mesma transação.
+
+    Em after_flush as coleções new/dirty/deleted e o histórico dos atributos
+    ainda refletem o estado anterior ao flush.
+    """
+    deltas = []
+
+    for obj in session.new:
+        if isinstance(obj, FinancialEntry):
+            deltas.append(_entry_contribution(obj, _current_values(obj), +1))
+
+    for obj in session.dirty:
+        if not isinstance(obj, FinancialEntry) or not session.is_modified(obj):
+            continue
+        before = _committed_values(obj)
+        after = _current_values(obj)
+        if before == after:
+            continue
+        deltas.append(_entry_contribution(obj, before, -1))
+        deltas.append(_entry_contribution(obj, after, +1))
+
+    for obj in session.deleted:
+        if isinstance(obj, FinancialEntry):
+            deltas.append(_entry_contribution(obj, _committed_values(obj), -1))
+
+    deltas = [d for d in deltas if d is not None]
+    if deltas:
+        FinancialRollupRepository.apply_deltas(session.connection(), deltas)
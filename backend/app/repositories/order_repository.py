@@ -4,22 +4,32 @@ Camada exclusiva de persistência (queries SQLAlchemy).
 """
 
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import tuple_
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 
 from app.models.order import Order
+from app.utils.pagination import estimate_count
+from app.utils.async_db import async_variant
 
 
 class OrderRepository:
     """Repositório com queries de Order."""
 
     @staticmethod
-    def list_paginated(db: Session, page: int, page_size: int, include_deleted: bool = False) -> List[Order]:
+    def list_paginated(
+        db: Session,
+        page: int,
+        page_size: int,
+        include_deleted: bool = False,
+        extra_row: bool = False
+    ) -> List[Order]:
         """
         Lista pedidos com paginação.
         Ordena por created_at desc (mais recentes primeiro).
         Por padrão filtra registros soft-deleted.
+        Com extra_row=True busca page_size + 1 linhas (indica se há próxima página).
         """
         offset = (page - 1) * page_size
         query = db.query(Order)
@@ -29,26 +39,68 @@ class OrderRepository:
 
         return (
             query
-            .order_by(Order.created_at.desc())
+            .order_by(Order.created_at.desc(), Order.id.desc())
             .offset(offset)
-            .limit(page_size)
+            .limit(page_size + 1 if extra_row else page_size)
             .all()
         )
 
     @staticmethod
-    def count_total(db: Session, include_deleted: bool = False) -> int:
-        """Conta total de pedidos no banco (por padrão exclui soft-deleted)."""
+    def list_keyset(
+        db: Session,
+        page_size: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        user_id: Optional[UUID] = None,
+        include_deleted: bool = False
+    ) -> List[Order]:
+        """
+        Lista pedidos por keyset (cursor), sem OFFSET.
+        Ordena por (created_at, id) desc e busca page_size + 1 linhas
+        (a linha extra indica que há próxima página).
+        user_id None = todos os pedidos (admin).
+        """
         query = db.query(Order)
+        if user_id:
+            query = query.filter(Order.user_id == user_id)
         if not include_deleted:
             query = query.filter(Order.deleted_at.is_(None))
+        if after:
+            query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(*after))
+
+        return (
+            query
+            .order_by(Order.created_at.desc(), Order.id.desc())
+            .limit(page_size + 1)
+            .all()
+        )
+
+    @staticmethod
+    def count_total(db: Session, include_deleted: bool = False, estimate: bool = False) -> int:
+        """
+        Conta total de pedidos no banco (por padrão exclui soft-deleted).
+        estimate=True usa a estimativa do planner em vez de COUNT(*).
+        """
+        query = db.query(Order)
+        if not include_deleted:
+            query = query.filter(Order.deleted_at.is_(None))
+        if estimate:
+            return estimate_count(db, query)
         return query.count()
     
     @staticmethod
-    def list_by_user(db: Session, user_id: UUID, page: int, page_size: int, include_deleted: bool = False) -> List[Order]:
+    def list_by_user(
+        db: Session,
+        user_id: UUID,
+        page: int,
+        page_size: int,
+        include_deleted: bool = False,
+        extra_row: bool = False
+    ) -> List[Order]:
         """
         Lista pedidos de um usuário específico com paginação.
         Ordena por created_at desc (mais recentes primeiro).
         Por padrão exclui soft-deleted.
+        Com extra_row=True busca page_size + 1 linhas (indica se há próxima página).
         """
         offset = (page - 1) * page_size
         query = db.query(Order).filter(Order.user_id == user_id)
@@ -58,18 +110,23 @@ class OrderRepository:
 
         return (
             query
-            .order_by(Order.created_at.desc())
+            .order_by(Order.created_at.desc(), Order.id.desc())
             .offset(offset)
-            .limit(page_size)
+            .limit(page_size + 1 if extra_row else page_size)
             .all()
         )
     
     @staticmethod
-    def count_by_user(db: Session, user_id: UUID, include_deleted: bool = False) -> int:
-        """Conta total de pedidos de um usuário específico (exclui soft-deleted por padrão)."""
+    def count_by_user(db: Session, user_id: UUID, include_deleted: bool = False, estimate: bool = False) -> int:
+        """
+        Conta total de pedidos de um usuário específico (exclui soft-deleted por padrão).
+        estimate=True usa a estimativa do planner em vez de COUNT(*).
+        """
         query = db.query(Order).filter(Order.user_id == user_id)
         if not include_deleted:
             query = query.filter(Order.deleted_at.is_(None))
+        if estimate:
+            return estimate_count(db, query)
         return query.count()
 
     @staticmethod
@@ -168,3 +225,18 @@ class OrderRepository:
             order.total = total
         
         return order
+
+
+class AsyncOrderRepository:
+    """
+    Leituras de OrderRepository para AsyncSession (asyncpg).
+    Mesmos parâmetros da versão sync; escritas continuam no caminho sync.
+    """
+
+    list_paginated = async_variant(OrderRepository.list_paginated)
+    list_keyset = async_variant(OrderRepository.list_keyset)
+    count_total = async_variant(OrderRepository.count_total)
+    list_by_user = async_variant(OrderRepository.list_by_user)
+    count_by_user = async_variant(OrderRepository.count_by_user)
+    get_by_id = async_variant(OrderRepository.get_by_id)
+    get_by_id_and_user = async_variant(OrderRepository.get_by_id_and_user)
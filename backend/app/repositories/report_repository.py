@@ -4,24 +4,139 @@ Camada exclusiva de queries SQL com agregações (GROUP BY, SUM, COUNT).
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, and_, extract, cast, Date
-from typing import List, Optional, Dict, Any
+from sqlalchemy import func, case, and_, extract, cast, literal, literal_column, null, select, union_all, Date, DateTime, Float, Numeric, String
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from datetime import datetime, date, timedelta, time
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
+from app.config import REPORT_DEFAULT_TIMEZONE
 from app.models.financial_entry import FinancialEntry
+from app.models.financial_daily_rollup import FinancialDailyRollup
+from app.repositories.financial_rollup_repository import FinancialRollupRepository
+from app.utils.async_db import async_variant
+from app.utils.sql import local_day
+
+
+# Limites padrão do aging: 0-7, 8-30, 31+ dias
+DEFAULT_AGING_LIMITS = (7, 30)
+
+# Granularidades do cashflow: unidade do date_trunc -> passo do generate_series
+GRANULARITY_STEPS = {
+    "day": "1 day",
+    "week": "1 week",
+    "month": "1 month",
+    "quarter": "3 months",
+}
 
 
 class ReportRepository:
     """Repositório com queries agregadas para relatórios financeiros."""
 
+    @staticmethod
+    def local_bounds(date_from: date, date_to: date, tz: Optional[str] = None) -> Tuple[datetime, datetime]:
+        """
+        Intervalo [início de date_from, início de date_to + 1) no horário local de tz.
+        
+        Datetimes com timezone: o filtro em occurred_at (timestamptz) usa os
+        índices de occurred_at e não depende da timezone da sessão do banco.
+        """
+        zone = ZoneInfo(tz or REPORT_DEFAULT_TIMEZONE)
+        return (
+            datetime.combine(date_from, time.min, tzinfo=zone),
+            datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=zone)
+        )
+
+    @staticmethod
+    def _daily_source(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        user_id: Optional[UUID] = None,
+        include_canceled: bool = False,
+        statuses: Optional[Sequence[str]] = None,
+        tz: Optional[str] = None
+    ):
+        """
+        Fonte diária (day, kind, status, amount, entry_count) do período.
+        
+        day é o dia local em tz, (occurred_at AT TIME ZONE tz)::date (padrão:
+        REPORT_DEFAULT_TIMEZONE). Com rollup completo na tz (built_timezones:
+        REPORT_TIMEZONES com rebuild registrado em core.rollup_timezones):
+        - Dias fechados (day < hoje em tz): lidos de core.financial_daily_rollup
+        - Dia corrente (e futuros): scan em core.financial_entries, pois ainda
+          mudam; a faixa usa a mesma expressão dos índices de dia local
+        
+        Outras timezones: período inteiro no scan em core.financial_entries,
+        com a faixa em occurred_at (limites locais, ver local_bounds).
+
+        As partes são unidas com UNION ALL e agregadas pelo chamador.
+        Lançamentos soft-deleted não entram (o rollup só guarda ativos).
+        
+        statuses (se informado) substitui o filtro de include_canceled.
+        """
+        tz = tz or REPORT_DEFAULT_TIMEZONE
+        day = local_day(FinancialEntry.occurred_at, tz)
+
+        raw = select(
+            day.label('day'),
+            FinancialEntry.kind.label('kind'),
+            FinancialEntry.status.label('status'),
+            FinancialEntry.amount.label('amount'),
+            literal(1).label('entry_count')
+        ).where(FinancialEntry.deleted_at.is_(None))
+
+        # Filtro de status (excluir canceled por padrão)
+        if statuses is None and not include_canceled:
+            statuses = ['pending', 'paid']
+
+        # Multi-tenant
+        if user_id:
+            raw = raw.where(FinancialEntry.user_id == user_id)
+        if statuses is not None:
+            raw = raw.where(FinancialEntry.status.in_(statuses))
+
+        if tz not in FinancialRollupRepository.built_timezones(db):
+            # Sem rollup nessa timezone: faixa de timestamps (índices de occurred_at)
+            start_dt, end_dt = ReportRepository.local_bounds(date_from, date_to, tz)
+            raw = raw.where(and_(FinancialEntry.occurred_at >= start_dt, FinancialEntry.occurred_at < end_dt))
+            return raw.subquery('daily_source')
+
+        today = local_day(func.now(), tz)
+
+        # Parte 1: rollup (dias fechados)
+        rollup = select(
+            FinancialDailyRollup.day.label('day'),
+            FinancialDailyRollup.kind.label('kind'),
+            FinancialDailyRollup.status.label('status'),
+            FinancialDailyRollup.amount_total.label('amount'),
+            FinancialDailyRollup.entry_count.label('entry_count')
+        ).where(
+            and_(
+                FinancialDailyRollup.tz == tz,
+                FinancialDailyRollup.day >= date_from,
+                FinancialDailyRollup.day <= date_to,
+                FinancialDailyRollup.day < today
+            )
+        )
+        if user_id:
+            rollup = rollup.where(FinancialDailyRollup.user_id == user_id)
+        if statuses is not None:
+            rollup = rollup.where(FinancialDailyRollup.status.in_(statuses))
+
+        # Parte 2: scan bruto do dia corrente (índice de dia local)
+        raw = raw.where(and_(day >= date_from, day <= date_to, day >= today))
+
+        return union_all(rollup, raw).subquery('daily_source')
+
     @staticmethod
     def dre_summary(
         db: Session,
         date_from: date,
         date_to: date,
         user_id: Optional[UUID] = None,
-        include_canceled: bool = False
+        include_canceled: bool = False,
+        tz: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         DRE Simplificada - Demonstração de Resultado do Exercício.
@@ -35,12 +150,16 @@ class ReportRepository:
         - Resultado esperado (pago + pendente)
         - Total de lançamentos
         
+        Redução do vetor diário (daily_vector): a mesma agregação atende
+        o aging e pode ser reaproveitada (ReportService memoiza).
+        
         Args:
             db: Sessão SQLAlchemy
             date_from: Data inicial (occurred_at >= date_from)
             date_to: Data final (occurred_at <= date_to)
             user_id: Filtro multi-tenant (None = admin vê tudo)
             include_canceled: Se True, inclui status=canceled nos totais
+            tz: Timezone IANA dos dias (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             {
@@ -53,117 +172,10 @@ class ReportRepository:
                 "count_entries_total": int
             }
         """
-        # Query base com filtros de data e user_id
-        query = db.query(FinancialEntry).filter(
-            and_(
-                cast(FinancialEntry.occurred_at, Date) >= date_from,
-                cast(FinancialEntry.occurred_at, Date) <= date_to
-            )
-        )
-        
-        # Multi-tenant
-        if user_id:
-            query = query.filter(FinancialEntry.user_id == user_id)
-        
-        # Filtro de status (excluir canceled por padrão)
-        if not include_canceled:
-            query = query.filter(FinancialEntry.status.in_(['pending', 'paid']))
-        
-        # Filtros de data otimizados (timestamp interval para usar índice)
-        start_dt = datetime.combine(date_from, time.min)
-        end_dt = datetime.combine(date_to + timedelta(days=1), time.min)
-        
-        # Agregações condicionais via case
-        aggregations = db.query(
-            # Receitas pagas
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'revenue', FinancialEntry.status == 'paid'), FinancialEntry.amount),
-                        else_=0
-                    )
-                ),
-                0
-            ).label('revenue_paid_total'),
-            
-            # Despesas pagas
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'expense', FinancialEntry.status == 'paid'), FinancialEntry.amount),
-                        else_=0
-                    )
-                ),
-                0
-            ).label('expense_paid_total'),
-            
-            # Receitas pendentes
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'revenue', FinancialEntry.status == 'pending'), FinancialEntry.amount),
-                        else_=0
-                    )
-                ),
-                0
-            ).label('revenue_pending_total'),
-            
-            # Despesas pendentes
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'expense', FinancialEntry.status == 'pending'), FinancialEntry.amount),
-                        else_=0
-                    )
-                ),
-                0
-            ).label('expense_pending_total'),
-            
-            # Total de lançamentos
-            func.count(FinancialEntry.id).label('count_entries_total')
-        ).filter(
-            and_(
-                FinancialEntry.occurred_at >= start_dt,
-                FinancialEntry.occurred_at < end_dt
-            )
+        return ReportRepository.dre_from_daily(
+            ReportRepository.daily_vector(db, date_from, date_to, user_id=user_id, tz=tz),
+            include_canceled
         )
-        
-        # Multi-tenant
-        if user_id:
-            aggregations = aggregations.filter(FinancialEntry.user_id == user_id)
-        
-        # Filtro de status
-        if not include_canceled:
-            aggregations = aggregations.filter(FinancialEntry.status.in_(['pending', 'paid']))
-        
-        result = aggregations.first()
-        
-        if not result:
-            return {
-                "revenue_paid_total": 0,
-                "expense_paid_total": 0,
-                "net_paid": 0,
-                "revenue_pending_total": 0,
-                "expense_pending_total": 0,
-                "net_expected": 0,
-                "count_entries_total": 0
-            }
-        
-        # Converter para dict e calcular net
-        revenue_paid = float(result.revenue_paid_total)
-        expense_paid = float(result.expense_paid_total)
-        revenue_pending = float(result.revenue_pending_total)
-        expense_pending = float(result.expense_pending_total)
-        
-        return {
-            "revenue_paid_total": revenue_paid,
-            "expense_paid_total": expense_paid,
-            "net_paid": revenue_paid - expense_paid,
-            "revenue_pending_total": revenue_pending,
-            "expense_pending_total": expense_pending,
-            "net_expected": (revenue_paid + revenue_pending) - (expense_paid + expense_pending),
-            "count_entries_total": result.count_entries_total
-        }
 
     @staticmethod
     def cashflow_daily(
@@ -171,13 +183,23 @@ class ReportRepository:
         date_from: date,
         date_to: date,
         user_id: Optional[UUID] = None,
-        include_canceled: bool = False
+        include_canceled: bool = False,
+        granularity: str = "day",
+        tz: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Fluxo de caixa diário - agregações por data (occurred_at::date).
+        Fluxo de caixa por período (dia, semana, mês ou trimestre), série completa.
+        
+        Tudo no banco: date_trunc agrupa a fonte diária (ver _daily_source)
+        por período e generate_series gera todos os períodos de date_from a
+        date_to; períodos sem lançamentos saem com zeros (LEFT JOIN).
+        
+        "date" é o início do período (semana ISO começa na segunda): o
+        primeiro e o último períodos podem começar antes de date_from /
+        cobrir só parte do intervalo, mas só entram lançamentos do intervalo.
         
-        Retorna lista de dias com totais agregados.
-        NOTA: Dias sem lançamentos NÃO aparecem aqui (Service completa com zeros).
+        O painel usa o mesmo SELECT sobre o vetor diário agregado (ver
+        daily_vector_with_cashflow), sem segunda agregação.
         
         Args:
             db: Sessão SQLAlchemy
@@ -185,6 +207,8 @@ class ReportRepository:
             date_to: Data final
             user_id: Filtro multi-tenant
             include_canceled: Se True, inclui canceled
+            granularity: 'day', 'week', 'month' ou 'quarter' (ver GRANULARITY_STEPS)
+            tz: Timezone IANA dos dias (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             [
@@ -192,97 +216,308 @@ class ReportRepository:
                     "date": date,
                     "revenue_paid": float,
                     "expense_paid": float,
+                    "net_paid": float,
                     "revenue_pending": float,
-                    "expense_pending": float
+                    "expense_pending": float,
+                    "net_expected": float
                 },
                 ...
             ]
         """
-        # Filtros de data otimizados (timestamp interval)
-        start_dt = datetime.combine(date_from, time.min)
-        end_dt = datetime.combine(date_to + timedelta(days=1), time.min)
+        if granularity not in GRANULARITY_STEPS:
+            raise ValueError(f"granularity inválido: '{granularity}'")
         
-        # Agregação por dia (usar variável para GROUP BY e ORDER BY)
-        day = cast(FinancialEntry.occurred_at, Date)
+        source = ReportRepository._daily_source(
+            db, date_from, date_to, user_id=user_id, include_canceled=include_canceled, tz=tz
+        )
+        rows = db.execute(
+            ReportRepository._cashflow_select(source, date_from, date_to, granularity)
+        ).all()
         
-        query = db.query(
-            day.label('date'),
-            
-            # Receitas pagas
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'revenue', FinancialEntry.status == 'paid'), FinancialEntry.amount),
-                        else_=0
-                    )
-                ),
-                0
-            ).label('revenue_paid'),
-            
-            # Despesas pagas
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'expense', FinancialEntry.status == 'paid'), FinancialEntry.amount),
-                        else_=0
-                    )
-                ),
-                0
-            ).label('expense_paid'),
-            
-            # Receitas pendentes
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'revenue', FinancialEntry.status == 'pending'), FinancialEntry.amount),
-                        else_=0
-                    )
-                ),
-                0
-            ).label('revenue_pending'),
-            
-            # Despesas pendentes
-            func.coalesce(
-                func.sum(
-                    case(
-                        (and_(FinancialEntry.kind == 'expense', FinancialEntry.status == 'pending'), FinancialEntry.amount),
-                        else_=0
-                    )
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def _cashflow_select(source, date_from: date, date_to: date, granularity: str):
+        """
+        SELECT do cashflow sobre uma fonte com (day, kind, status, amount).
+        
+        Serve a fonte diária bruta (cashflow_daily) e o vetor diário já
+        agregado (daily_vector_with_cashflow): somas por período são iguais.
+        granularity já validado pelo chamador.
+        """
+        def period_start(value):
+            return cast(func.date_trunc(granularity, cast(value, DateTime)), Date)
+        
+        def total(kind: str, status: str):
+            return func.sum(
+                case((and_(source.c.kind == kind, source.c.status == status), source.c.amount), else_=0)
+            )
+        
+        bucket = period_start(source.c.day)
+        totals = (
+            select(
+                bucket.label('bucket'),
+                total('revenue', 'paid').label('revenue_paid'),
+                total('expense', 'paid').label('expense_paid'),
+                total('revenue', 'pending').label('revenue_pending'),
+                total('expense', 'pending').label('expense_pending')
+            )
+            .group_by(bucket)
+            .subquery('totals')
+        )
+        
+        # Todos os períodos do intervalo
+        series = select(
+            cast(
+                func.generate_series(
+                    cast(func.date_trunc(granularity, cast(literal(date_from, Date), DateTime)), DateTime),
+                    cast(literal(date_to, Date), DateTime),
+                    literal_column(f"interval '{GRANULARITY_STEPS[granularity]}'")
                 ),
-                0
-            ).label('expense_pending')
-        ).filter(
-            and_(
-                FinancialEntry.occurred_at >= start_dt,
-                FinancialEntry.occurred_at < end_dt
+                Date
+            ).label('bucket')
+        ).subquery('series')
+        
+        def amount(column):
+            return func.coalesce(column, 0)
+        
+        def as_float(expr):
+            return cast(expr, Float)
+        
+        return (
+            select(
+                series.c.bucket.label('date'),
+                as_float(amount(totals.c.revenue_paid)).label('revenue_paid'),
+                as_float(amount(totals.c.expense_paid)).label('expense_paid'),
+                as_float(amount(totals.c.revenue_paid) - amount(totals.c.expense_paid)).label('net_paid'),
+                as_float(amount(totals.c.revenue_pending)).label('revenue_pending'),
+                as_float(amount(totals.c.expense_pending)).label('expense_pending'),
+                as_float(
+                    amount(totals.c.revenue_paid) + amount(totals.c.revenue_pending)
+                    - amount(totals.c.expense_paid) - amount(totals.c.expense_pending)
+                ).label('net_expected')
             )
+            .select_from(series.outerjoin(totals, totals.c.bucket == series.c.bucket))
+            .order_by(series.c.bucket)
         )
+
+    @staticmethod
+    def _daily_aggregate(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        user_id: Optional[UUID] = None,
+        tz: Optional[str] = None
+    ):
+        """SELECT do vetor diário: soma da fonte diária por (day, kind, status), todos os status."""
+        source = ReportRepository._daily_source(
+            db, date_from, date_to, user_id=user_id, include_canceled=True, tz=tz
+        )
+        return select(
+            source.c.day,
+            source.c.kind,
+            source.c.status,
+            func.sum(source.c.amount).label('amount'),
+            func.sum(source.c.entry_count).label('entry_count')
+        ).group_by(source.c.day, source.c.kind, source.c.status)
+
+    @staticmethod
+    def _vector_row(row) -> Dict[str, Any]:
+        return {
+            "day": row.day,
+            "kind": row.kind,
+            "status": row.status,
+            "amount": row.amount,
+            "entry_count": int(row.entry_count)
+        }
+
+    @staticmethod
+    def daily_vector(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        user_id: Optional[UUID] = None,
+        tz: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vetor diário do período: uma linha por (dia, kind, status), todos os status.
         
-        # Multi-tenant
-        if user_id:
-            query = query.filter(FinancialEntry.user_id == user_id)
+        Base comum de DRE e aging (ver *_from_daily): uma única agregação
+        sobre a fonte diária atende os dois relatórios. Valores
+        ficam em Decimal para as reduções somarem exatamente como o SQL.
+        Dias locais em tz (ver _daily_source).
         
-        # Filtro de status
-        if not include_canceled:
-            query = query.filter(FinancialEntry.status.in_(['pending', 'paid']))
+        Returns:
+            [{"day": date, "kind": str, "status": str, "amount": Decimal, "entry_count": int}, ...]
+            ordenado por dia
+        """
+        daily = ReportRepository._daily_aggregate(db, date_from, date_to, user_id=user_id, tz=tz).subquery('daily')
+        rows = db.execute(
+            select(daily).order_by(daily.c.day, daily.c.kind, daily.c.status)
+        ).all()
+        return [ReportRepository._vector_row(row) for row in rows]
+
+    @staticmethod
+    def daily_vector_with_cashflow(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        granularity: str = "day",
+        user_id: Optional[UUID] = None,
+        tz: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        daily_vector e cashflow_daily do período em uma única consulta.
         
-        # Agrupar por dia e ordenar
-        query = query.group_by(day).order_by(day)
+        O vetor diário vira uma CTE (uma agregação da fonte diária); o
+        cashflow agrupa a CTE no banco (date_trunc + generate_series, ver
+        _cashflow_select) e sai no mesmo resultado, com UNION ALL
+        (coluna part: 'vector' ou 'cashflow'). Usado pelo painel.
         
-        results = query.all()
+        Returns:
+            (vetor diário, períodos do cashflow), nos formatos de
+            daily_vector e cashflow_daily
+        """
+        if granularity not in GRANULARITY_STEPS:
+            raise ValueError(f"granularity inválido: '{granularity}'")
+        
+        daily = ReportRepository._daily_aggregate(db, date_from, date_to, user_id=user_id, tz=tz).cte('daily')
+        cashflow = ReportRepository._cashflow_select(daily, date_from, date_to, granularity).subquery('cashflow')
+        flow_columns = ('revenue_paid', 'expense_paid', 'net_paid', 'revenue_pending', 'expense_pending', 'net_expected')
+        
+        parts = union_all(
+            select(
+                literal('vector').label('part'),
+                daily.c.day,
+                daily.c.kind,
+                daily.c.status,
+                daily.c.amount,
+                daily.c.entry_count,
+                *(cast(null(), Float).label(column) for column in flow_columns)
+            ),
+            select(
+                literal('cashflow').label('part'),
+                cashflow.c.date.label('day'),
+                cast(null(), String).label('kind'),
+                cast(null(), String).label('status'),
+                cast(null(), Numeric).label('amount'),
+                cast(null(), Numeric).label('entry_count'),
+                *(cashflow.c[column] for column in flow_columns)
+            )
+        ).subquery('parts')
+        rows = db.execute(
+            select(parts).order_by(parts.c.part, parts.c.day, parts.c.kind, parts.c.status)
+        ).all()
+        
+        vector = [ReportRepository._vector_row(row) for row in rows if row.part == 'vector']
+        periods = [
+            {"date": row.day, **{column: getattr(row, column) for column in flow_columns}}
+            for row in rows if row.part == 'cashflow'
+        ]
+        return vector, periods
+
+    @staticmethod
+    def dre_from_daily(vector: Sequence[Dict[str, Any]], include_canceled: bool = False) -> Dict[str, Any]:
+        """Mesmo resultado de dre_summary, reduzido do vetor diário."""
+        totals = {}
+        count = 0
+        for row in vector:
+            if row["status"] == "canceled" and not include_canceled:
+                continue
+            key = (row["kind"], row["status"])
+            totals[key] = totals.get(key, 0) + row["amount"]
+            count += row["entry_count"]
+        
+        revenue_paid = float(totals.get(('revenue', 'paid'), 0))
+        expense_paid = float(totals.get(('expense', 'paid'), 0))
+        revenue_pending = float(totals.get(('revenue', 'pending'), 0))
+        expense_pending = float(totals.get(('expense', 'pending'), 0))
         
-        # Converter para lista de dicts
-        daily_data = []
-        for row in results:
-            daily_data.append({
-                "date": row.date,
-                "revenue_paid": float(row.revenue_paid),
-                "expense_paid": float(row.expense_paid),
-                "revenue_pending": float(row.revenue_pending),
-                "expense_pending": float(row.expense_pending)
-            })
+        return {
+            "revenue_paid_total": revenue_paid,
+            "expense_paid_total": expense_paid,
+            "net_paid": revenue_paid - expense_paid,
+            "revenue_pending_total": revenue_pending,
+            "expense_pending_total": expense_pending,
+            "net_expected": (revenue_paid + revenue_pending) - (expense_paid + expense_pending),
+            "count_entries_total": count
+        }
+
+    @staticmethod
+    def aging_from_daily(
+        vector: Sequence[Dict[str, Any]],
+        reference_date: date,
+        bucket_limits: Sequence[int] = DEFAULT_AGING_LIMITS
+    ) -> Dict[str, Any]:
+        """Mesmo resultado de aging_pending, reduzido do vetor diário (linhas pending)."""
+        requested, ranges = ReportRepository._aging_ranges_with_legacy(bucket_limits)
+        sums = {(kind, r): 0 for kind in ('revenue', 'expense') for r in ranges}
+        for row in vector:
+            if row["status"] != "pending":
+                continue
+            days_old = max((reference_date - row["day"]).days, 0)
+            for min_days, max_days in ranges:
+                if days_old >= min_days and (max_days is None or days_old <= max_days):
+                    sums[(row["kind"], (min_days, max_days))] += row["amount"]
+        
+        return ReportRepository._aging_result(
+            requested,
+            {kind: {r: sums[(kind, r)] for r in ranges} for kind in ('revenue', 'expense')}
+        )
+
+    @staticmethod
+    def _aging_ranges_with_legacy(bucket_limits: Sequence[int]) -> Tuple[list, list]:
+        """(faixas pedidas, faixas pedidas + legadas que faltam)."""
+        requested = ReportRepository.aging_ranges(bucket_limits)
+        legacy = ReportRepository.aging_ranges(DEFAULT_AGING_LIMITS)
+        return requested, requested + [r for r in legacy if r not in requested]
+
+    @staticmethod
+    def _aging_result(requested: list, amounts_by_kind: Dict[str, Dict[tuple, Any]]) -> Dict[str, Any]:
+        """Monta a resposta de aging (chaves legadas + buckets) a partir das somas por faixa."""
+        legacy = ReportRepository.aging_ranges(DEFAULT_AGING_LIMITS)
+        result = {}
+        for kind, key in (('revenue', 'pending_revenue'), ('expense', 'pending_expense')):
+            amounts = {r: float(v) for r, v in amounts_by_kind[kind].items()}
+            
+            aging = {
+                ReportRepository.aging_label(*r): amounts[r] for r in legacy
+            }
+            aging["total"] = sum(amounts[r] for r in requested)
+            aging["buckets"] = [
+                {
+                    "label": ReportRepository.aging_label(min_days, max_days),
+                    "min_days": min_days,
+                    "max_days": max_days,
+                    "amount": amounts[(min_days, max_days)]
+                }
+                for min_days, max_days in requested
+            ]
+            result[key] = aging
         
-        return daily_data
+        return result
+
+    @staticmethod
+    def aging_ranges(bucket_limits: Sequence[int]) -> List[Tuple[int, Optional[int]]]:
+        """
+        Converte limites superiores em faixas fechadas de dias.
+        
+        Exemplo: (7, 30) -> [(0, 7), (8, 30), (31, None)]
+        """
+        ranges = []
+        lower = 0
+        for upper in bucket_limits:
+            ranges.append((lower, upper))
+            lower = upper + 1
+        ranges.append((lower, None))
+        return ranges
+
+    @staticmethod
+    def aging_label(min_days: int, max_days: Optional[int]) -> str:
+        """Rótulo da faixa no padrão da API (0_7_days, 31_plus_days)."""
+        if max_days is None:
+            return f"{min_days}_plus_days"
+        return f"{min_days}_{max_days}_days"
 
     @staticmethod
     def aging_pending(
@@ -290,24 +525,35 @@ class ReportRepository:
         date_from: date,
         date_to: date,
         reference_date: date,
-        user_id: Optional[UUID] = None
+        user_id: Optional[UUID] = None,
+        bucket_limits: Sequence[int] = DEFAULT_AGING_LIMITS,
+        tz: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Aging de pendências - classificação em faixas de dias.
         
-        Calcula: dias_atraso = reference_date - occurred_at
+        Calcula: dias_atraso = reference_date - occurred_at (mínimo 0)
         
-        Faixas:
+        Uma única agregação SQL sobre a fonte diária (rollup + dia corrente)
+        devolve a soma de cada faixa por kind (2 x N números). Nenhuma linha
+        de lançamento é carregada em Python.
+        
+        Faixas padrão (bucket_limits=(7, 30)):
         - 0-7 dias
         - 8-30 dias
         - 31+ dias
         
+        As chaves legadas (0_7_days, 8_30_days, 31_plus_days) são sempre
+        preenchidas; com limites customizados entram na mesma agregação.
+        
         Args:
             db: Sessão SQLAlchemy
             date_from: Data inicial (occurred_at)
             date_to: Data final (occurred_at)
             reference_date: Data de referência para cálculo de aging (ex: hoje)
             user_id: Filtro multi-tenant
+            bucket_limits: Limites superiores (inclusivos) das faixas, crescentes
+            tz: Timezone IANA dos dias (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             {
@@ -315,72 +561,42 @@ class ReportRepository:
                     "0_7_days": float,
                     "8_30_days": float,
                     "31_plus_days": float,
-                    "total": float
+                    "total": float,
+                    "buckets": [
+                        {"label": str, "min_days": int, "max_days": int | None, "amount": float},
+                        ...
+                    ]
                 },
-                "pending_expense": {
-                    "0_7_days": float,
-                    "8_30_days": float,
-                    "31_plus_days": float,
-                    "total": float
-                }
+                "pending_expense": {...}
             }
         """
-        # Filtros de data otimizados (timestamp interval)
-        start_dt = datetime.combine(date_from, time.min)
-        end_dt = datetime.combine(date_to + timedelta(days=1), time.min)
-        
-        # Query base: apenas pending no período
-        query = db.query(FinancialEntry).filter(
-            and_(
-                FinancialEntry.status == 'pending',
-                FinancialEntry.occurred_at >= start_dt,
-                FinancialEntry.occurred_at < end_dt
-            )
+        source = ReportRepository._daily_source(
+            db, date_from, date_to, user_id=user_id, statuses=['pending'], tz=tz
         )
         
-        # Multi-tenant
-        if user_id:
-            query = query.filter(FinancialEntry.user_id == user_id)
+        # Dias de atraso por dia de ocorrência (não permitir negativo)
+        days_old = func.greatest(literal(reference_date, Date) - source.c.day, 0)
         
-        # Buscar todos pending
-        entries = query.all()
+        requested, ranges = ReportRepository._aging_ranges_with_legacy(bucket_limits)
         
-        # Inicializar estruturas
-        revenue_aging = {"0_7_days": 0.0, "8_30_days": 0.0, "31_plus_days": 0.0, "total": 0.0}
-        expense_aging = {"0_7_days": 0.0, "8_30_days": 0.0, "31_plus_days": 0.0, "total": 0.0}
+        # Uma coluna SUM(CASE) por (kind, faixa)
+        columns = []
+        for kind in ('revenue', 'expense'):
+            for min_days, max_days in ranges:
+                condition = and_(source.c.kind == kind, days_old >= min_days)
+                if max_days is not None:
+                    condition = and_(condition, days_old <= max_days)
+                columns.append(
+                    func.coalesce(func.sum(case((condition, source.c.amount), else_=0)), 0)
+                )
         
-        # Calcular aging para cada entry
-        for entry in entries:
-            # Converter occurred_at para date
-            occurred_date = entry.occurred_at.date() if isinstance(entry.occurred_at, datetime) else entry.occurred_at
-            
-            # Calcular dias de atraso (não permitir negativo)
-            days_old = max(0, (reference_date - occurred_date).days)
-            
-            # Classificar em faixa
-            amount = float(entry.amount)
-            
-            if entry.kind == 'revenue':
-                revenue_aging["total"] += amount
-                if days_old <= 7:
-                    revenue_aging["0_7_days"] += amount
-                elif days_old <= 30:
-                    revenue_aging["8_30_days"] += amount
-                else:
-                    revenue_aging["31_plus_days"] += amount
-            else:  # expense
-                expense_aging["total"] += amount
-                if days_old <= 7:
-                    expense_aging["0_7_days"] += amount
-                elif days_old <= 30:
-                    expense_aging["8_30_days"] += amount
-                else:
-                    expense_aging["31_plus_days"] += amount
+        row = db.execute(select(*columns)).first()
+        sums = iter(row) if row else iter([0] * len(columns))
         
-        return {
-            "pending_revenue": revenue_aging,
-            "pending_expense": expense_aging
-        }
+        return ReportRepository._aging_result(
+            requested,
+            {kind: {r: next(sums) for r in ranges} for kind in ('revenue', 'expense')}
+        )
 
     @staticmethod
     def top_entries(
@@ -390,12 +606,21 @@ class ReportRepository:
         date_from: date,
         date_to: date,
         limit: int,
-        user_id: Optional[UUID] = None
+        user_id: Optional[UUID] = None,
+        tz: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Top lançamentos por valor (agregados por descrição).
+        Top lançamentos por valor (agregados por descrição normalizada).
+        
+        Agrupa por description_key (descrição sem UUIDs, coluna gerada no
+        banco: os lançamentos de pedidos "Pedido <uuid> - X" formam um grupo
+        por X), soma amounts e ordena por total DESC. Os índices parciais da
+        migration 010 cobrem filtros e colunas lidas (index-only scan); o
+        LIMIT vira top-N heapsort no banco. Soft-deleted não entram.
         
-        Agrupa por description e soma amounts, ordena por total DESC.
+        "description" é a descrição original do lançamento mais recente do
+        grupo (buscada só para os grupos retornados); a chave vai em
+        "description_key".
         
         Args:
             db: Sessão SQLAlchemy
@@ -405,11 +630,13 @@ class ReportRepository:
             date_to: Data final
             limit: Limite de resultados (max 50)
             user_id: Filtro multi-tenant
+            tz: Timezone IANA de date_from/date_to (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             [
                 {
-                    "description": str,
+                    "description": str,  # descrição do lançamento mais recente
+                    "description_key": str,  # chave de agrupamento
                     "total_amount": float,
                     "count": int,
                     "last_occurred_at": datetime
@@ -417,41 +644,71 @@ class ReportRepository:
                 ...
             ]
         """
-        # Filtros de data otimizados (timestamp interval)
-        start_dt = datetime.combine(date_from, time.min)
-        end_dt = datetime.combine(date_to + timedelta(days=1), time.min)
-        
-        query = db.query(
-            FinancialEntry.description,
-            func.sum(FinancialEntry.amount).label('total_amount'),
-            func.count(FinancialEntry.id).label('count'),
-            func.max(FinancialEntry.occurred_at).label('last_occurred_at')
-        ).filter(
-            and_(
-                FinancialEntry.kind == kind,
-                FinancialEntry.status == status,
-                FinancialEntry.occurred_at >= start_dt,
-                FinancialEntry.occurred_at < end_dt
-            )
-        )
+        # Filtros de data otimizados (timestamp interval, dias locais em tz)
+        start_dt, end_dt = ReportRepository.local_bounds(date_from, date_to, tz)
+        filters = [
+            FinancialEntry.kind == kind,
+            FinancialEntry.status == status,
+            FinancialEntry.occurred_at >= start_dt,
+            FinancialEntry.occurred_at < end_dt,
+            FinancialEntry.deleted_at.is_(None)
+        ]
         
         # Multi-tenant
         if user_id:
-            query = query.filter(FinancialEntry.user_id == user_id)
+            filters.append(FinancialEntry.user_id == user_id)
+        
+        # Agrupar pela chave normalizada e ordenar por total DESC (desempate estável)
+        total_amount = func.sum(FinancialEntry.amount)
+        top = (
+            select(
+                FinancialEntry.description_key,
+                total_amount.label('total_amount'),
+                func.count().label('count'),
+                func.max(FinancialEntry.occurred_at).label('last_occurred_at')
+            )
+            .where(*filters)
+            .group_by(FinancialEntry.description_key)
+            .order_by(total_amount.desc(), FinancialEntry.description_key)
+            .limit(limit)
+            .subquery('top')
+        )
         
-        # Agrupar por descrição e ordenar por total DESC
-        query = query.group_by(FinancialEntry.description).order_by(func.sum(FinancialEntry.amount).desc()).limit(limit)
+        # Descrição real do lançamento mais recente de cada grupo: só os
+        # `limit` grupos vão à tabela (a agregação continua index-only)
+        description = (
+            select(FinancialEntry.description)
+            .where(*filters, FinancialEntry.description_key == top.c.description_key)
+            .order_by(FinancialEntry.occurred_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
         
-        results = query.all()
+        results = db.execute(
+            select(top, description.label('description'))
+            .order_by(top.c.total_amount.desc(), top.c.description_key)
+        ).all()
         
         # Converter para lista de dicts
         top_list = []
         for row in results:
             top_list.append({
                 "description": row.description,
+                "description_key": row.description_key,
                 "total_amount": float(row.total_amount),
                 "count": row.count,
                 "last_occurred_at": row.last_occurred_at
             })
         
         return top_list
+
+
+class AsyncReportRepository:
+    """Consultas de ReportRepository para AsyncSession (asyncpg)."""
+
+    dre_summary = async_variant(ReportRepository.dre_summary)
+    daily_vector = async_variant(ReportRepository.daily_vector)
+    daily_vector_with_cashflow = async_variant(ReportRepository.daily_vector_with_cashflow)
+    cashflow_daily = async_variant(ReportRepository.cashflow_daily)
+    aging_pending = async_variant(ReportRepository.aging_pending)
+    top_entries = async_variant(ReportRepository.top_entries)
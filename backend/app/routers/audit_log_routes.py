@@ -5,18 +5,21 @@ Endpoints para consulta de audit logs.
 Apenas admins podem acessar.
 
 ETAPA 6 - Features Enterprise
+
+Rotas async def sobre AsyncSession (asyncpg): piloto da migração
+descrita em app/utils/async_db.py. Leem da réplica quando configurada.
 """
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.user import User
+from app.security.user_cache import AuthenticatedUser
 from app.schemas.audit_log_schema import AuditLogListResponse, AuditLogResponse
-from app.security.deps import get_current_user, require_admin, get_db
-from app.services.audit_log_service import AuditLogService
+from app.security.deps import get_current_user, require_admin, get_async_read_db
+from app.services.audit_log_service import AsyncAuditLogService
 
 router = APIRouter(prefix="/audit-logs", tags=["Audit Logs"])
 
@@ -27,7 +30,7 @@ router = APIRouter(prefix="/audit-logs", tags=["Audit Logs"])
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_admin)]
 )
-def get_audit_logs(
+async def get_audit_logs(
     user_id: Optional[UUID] = Query(None, description="Filtrar por usuário"),
     action: Optional[str] = Query(None, description="Filtrar por ação (create/update/delete)"),
     entity_type: Optional[str] = Query(None, description="Filtrar por tipo de entidade"),
@@ -36,8 +39,10 @@ def get_audit_logs(
     date_to: Optional[datetime] = Query(None, description="Data fim (YYYY-MM-DD ou ISO 8601)"),
     page: int = Query(1, ge=1, description="Número da página (começa em 1)"),
     page_size: int = Query(20, ge=1, le=100, description="Itens por página"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="next_cursor da resposta anterior (paginação keyset)"),
+    total_mode: str = Query("exact", description="Cálculo do total: exact, estimate ou none"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Lista audit logs com filtros opcionais.
@@ -51,6 +56,9 @@ def get_audit_logs(
     - Tipos específicos de ação (create/update/delete)
     
     Retorna resultados paginados ordenados por mais recente.
+    Para percorrer muitas páginas, use o next_cursor da resposta no
+    parâmetro cursor (keyset, sem OFFSET; page é ignorado).
+    total_mode=estimate ou none evita o COUNT(*) em cada página.
     
     Exemplos de uso:
     - `/audit-logs` → Últimos 20 logs
@@ -58,25 +66,32 @@ def get_audit_logs(
     - `/audit-logs?entity_type=order&entity_id={uuid}` → Histórico de um pedido
     - `/audit-logs?action=delete&date_from=2026-02-01` → Deleções desde fevereiro
     """
-    skip = (page - 1) * page_size
-    
-    logs, total = AuditLogService.get_logs(
-        db=db,
-        user_id=user_id,
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        date_from=date_from,
-        date_to=date_to,
-        skip=skip,
-        limit=page_size
-    )
+    try:
+        result = await AsyncAuditLogService.list_logs(
+            db=db,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            total_mode=total_mode,
+            user_id=user_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        # Cursor ou total_mode inválido
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     return AuditLogListResponse(
-        items=[AuditLogResponse.model_validate(log) for log in logs],
-        total=total,
-        page=page,
-        page_size=page_size
+        items=[AuditLogResponse.model_validate(log) for log in result["items"]],
+        total=result["total"],
+        total_mode=result["total_mode"],
+        has_more=result["has_more"],
+        page=result["page"],
+        page_size=result["page_size"],
+        next_cursor=result["next_cursor"]
     )
 
 
@@ -86,11 +101,11 @@ def get_audit_logs(
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_admin)]
 )
-def get_entity_history(
+async def get_entity_history(
     entity_type: str,
     entity_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Obtém histórico completo de uma entidade.
@@ -112,7 +127,7 @@ def get_entity_history(
     Returns:
         Lista de logs ordenada cronologicamente
     """
-    logs = AuditLogService.get_entity_history(
+    logs = await AsyncAuditLogService.get_entity_history(
         db=db,
         entity_type=entity_type,
         entity_id=entity_id
@@ -127,12 +142,12 @@ def get_entity_history(
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(require_admin)]
 )
-def get_user_actions(
+async def get_user_actions(
     user_id: UUID,
     date_from: Optional[datetime] = Query(None, description="Data início"),
     date_to: Optional[datetime] = Query(None, description="Data fim"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Obtém todas ações de um usuário em um período.
@@ -155,7 +170,7 @@ def get_user_actions(
     Returns:
         Lista de ações do usuário
     """
-    logs = AuditLogService.get_user_actions(
+    logs = await AsyncAuditLogService.get_user_actions(
         db=db,
         user_id=user_id,
         date_from=date_from,
@@ -9,18 +9,23 @@ from uuid import UUID
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.services.financial_service import FinancialService
 from app.schemas.financial_schema import (
     FinancialEntryCreate,
+    FinancialEntryBulkCreate,
+    FinancialEntryBulkResponse,
+    FinancialEntryBulkStatusUpdate,
+    FinancialEntryBulkStatusResponse,
     FinancialEntryResponse,
     FinancialEntryUpdateStatus,
     FinancialEntryListResponse
 )
-from app.security.deps import get_current_user, get_db
-from app.models.user import User
-from app.security.deps import get_db  # CENTRALIZADO
+from app.security.deps import get_current_user, get_db, get_read_db, report_statement_timeout
+from app.security.user_cache import AuthenticatedUser
+from app.exceptions.errors import ServiceUnavailableError
 
 
 router = APIRouter(prefix="/financial/entries", tags=["Financeiro"])
@@ -34,8 +39,10 @@ def list_entries(
     kind: Optional[str] = Query(None, description="Filtro: revenue, expense"),
     date_from: Optional[datetime] = Query(None, description="Data inicial (occurred_at >= date_from)"),
     date_to: Optional[datetime] = Query(None, description="Data final (occurred_at <= date_to)"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor da resposta anterior (paginação keyset)"),
+    total_mode: str = Query("exact", description="Cálculo do total: exact, estimate ou none"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
     Lista lançamentos financeiros com paginação e filtros opcionais.
@@ -53,13 +60,20 @@ def list_entries(
     - kind: filtro opcional (revenue, expense)
     - date_from: data inicial (ISO 8601)
     - date_to: data final (ISO 8601)
+    - cursor: next_cursor da resposta anterior (keyset, ignora page;
+      recomendado para percorrer muitas páginas)
+    - total_mode: exact (COUNT, padrão), estimate (estimativa do planner)
+      ou none (sem total; use has_more)
     
     Response:
     {
       "items": [...],
       "page": 1,
       "page_size": 20,
-      "total": 50
+      "total": 50,
+      "total_mode": "exact",
+      "has_more": true,
+      "next_cursor": "..." (null na última página)
     }
     """
     try:
@@ -74,7 +88,9 @@ def list_entries(
             status=status_filter,
             kind=kind,
             date_from=date_from,
-            date_to=date_to
+            date_to=date_to,
+            cursor=cursor,
+            total_mode=total_mode
         )
         
         # Converte ORM models para FinancialEntryResponse
@@ -84,7 +100,10 @@ def list_entries(
             "items": items_out,
             "page": result["page"],
             "page_size": result["page_size"],
-            "total": result["total"]
+            "total": result["total"],
+            "total_mode": result["total_mode"],
+            "has_more": result["has_more"],
+            "next_cursor": result["next_cursor"]
         }
     
     except ValueError as e:
@@ -93,6 +112,8 @@ def list_entries(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         # Erros inesperados (sanitizar em produção)
         from app.exceptions.errors import sanitize_error_message
@@ -103,10 +124,66 @@ def list_entries(
         )
 
 
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(report_statement_timeout)]  # exportação: timeout de relatório
+)
+def export_entries(
+    export_format: str = Query("csv", alias="format", description="Formato: csv ou ndjson"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filtro: pending, paid, canceled"),
+    kind: Optional[str] = Query(None, description="Filtro: revenue, expense"),
+    date_from: Optional[datetime] = Query(None, description="Data inicial (occurred_at >= date_from)"),
+    date_to: Optional[datetime] = Query(None, description="Data final (occurred_at <= date_to)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Exporta lançamentos financeiros em streaming (CSV ou NDJSON).
+    
+    **Autenticação obrigatória (Bearer token)**
+    
+    Regras multi-tenant (iguais à listagem):
+    - **admin**: exporta todos os lançamentos
+    - **outros roles**: exporta apenas seus próprios lançamentos
+    
+    Query params:
+    - format: csv (default) ou ndjson
+    - status, kind, date_from, date_to: mesmos filtros de GET /financial/entries
+    
+    Sem paginação e sem COUNT: as linhas são lidas do banco por cursor
+    server-side e enviadas em blocos, com memória constante.
+    """
+    try:
+        user_id_filter = None if current_user.role == "admin" else current_user.id
+        
+        chunks = FinancialService.export_entries(
+            db=db,
+            export_format=export_format,
+            user_id=user_id_filter,
+            status=status_filter,
+            kind=kind,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    media_type = "text/csv; charset=utf-8" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="financial_entries.{export_format}"'}
+    )
+
+
 @router.get("/{entry_id}", response_model=FinancialEntryResponse, status_code=status.HTTP_200_OK)
 def get_entry(
     entry_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -142,6 +219,8 @@ def get_entry(
     
     except HTTPException:
         raise
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.exceptions.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao buscar lançamento")
@@ -154,7 +233,7 @@ def get_entry(
 @router.post("", response_model=FinancialEntryResponse, status_code=status.HTTP_201_CREATED)
 def create_manual_entry(
     entry_data: FinancialEntryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -194,6 +273,8 @@ def create_manual_entry(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.exceptions.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao criar lançamento")
@@ -203,11 +284,132 @@ def create_manual_entry(
         )
 
 
+@router.post("/bulk", response_model=FinancialEntryBulkResponse, status_code=status.HTTP_201_CREATED)
+def bulk_create_manual_entries(
+    bulk_data: FinancialEntryBulkCreate,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Cria lançamentos financeiros manuais em lote (até 10000 itens).
+    
+    **Autenticação obrigatória (Bearer token)**
+    
+    Regras:
+    - Mesmas validações de POST /financial/entries, aplicadas a cada item
+    - user_id de todos os itens é obtido do token JWT
+    - status inicial: 'pending'
+    - Inserção em um único INSERT ... RETURNING
+    
+    Modos (campo mode):
+    - all_or_nothing (padrão): qualquer item inválido → 400 com a lista de
+      erros e nada é gravado
+    - per_row: grava os itens válidos; os inválidos voltam em errors
+    
+    Response: FinancialEntryBulkResponse (criados + erros por índice)
+    """
+    try:
+        result = FinancialService.bulk_create_manual_entries(
+            db=db,
+            user_id=current_user.id,  # user_id vem do token
+            items=[item.model_dump() for item in bulk_data.items],
+            mode=bulk_data.mode
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        from app.exceptions.errors import sanitize_error_message
+        detail = sanitize_error_message(e, "Erro ao criar lançamentos em lote")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=detail
+        )
+
+    if result["mode"] == "all_or_nothing" and result["errors"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": "Lote rejeitado: nenhum lançamento foi criado",
+                "errors": result["errors"]
+            }
+        )
+
+    return FinancialEntryBulkResponse(
+        mode=result["mode"],
+        created=result["created"],
+        failed=result["failed"],
+        items=[FinancialEntryResponse.model_validate(row) for row in result["items"]],
+        errors=result["errors"]
+    )
+
+
+@router.patch("/bulk/status", response_model=FinancialEntryBulkStatusResponse, status_code=status.HTTP_200_OK)
+def bulk_update_entry_status(
+    bulk_data: FinancialEntryBulkStatusUpdate,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Atualiza status de vários lançamentos em uma única operação.
+    
+    **Autenticação obrigatória (Bearer token)**
+    
+    Regras multi-tenant:
+    - **admin**: pode atualizar qualquer lançamento
+    - **outros roles**: apenas seus próprios lançamentos (demais IDs → not_found)
+    
+    Regras de transição: as mesmas de PATCH /financial/entries/{id}/status
+    (apenas pending → paid/canceled).
+    
+    Body:
+    - status: 'paid' ou 'canceled'
+    - ids: lista de IDs (até 10000) **ou**
+    - filter: {kind, date_from, date_to} (aplica a todos os pending que casarem;
+      período obrigatório, recusado se passar de 10000 lançamentos)
+    
+    Response: FinancialEntryBulkStatusResponse (resultado por ID; só contagens no filtro)
+    """
+    try:
+        # Multi-tenant: admin vê tudo, outros só os próprios
+        user_id = None if current_user.role == "admin" else current_user.id
+        filters = bulk_data.filter.model_dump() if bulk_data.filter else {}
+
+        result = FinancialService.bulk_update_status(
+            db=db,
+            new_status=bulk_data.status,
+            user_id=user_id,
+            ids=bulk_data.ids,
+            **filters
+        )
+
+        return FinancialEntryBulkStatusResponse(**result)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        from app.exceptions.errors import sanitize_error_message
+        detail = sanitize_error_message(e, "Erro ao atualizar status em lote")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=detail
+        )
+
+
 @router.patch("/{entry_id}/status", response_model=FinancialEntryResponse, status_code=status.HTTP_200_OK)
 def update_entry_status(
     entry_id: UUID,
     status_data: FinancialEntryUpdateStatus,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -264,6 +466,8 @@ def update_entry_status(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.exceptions.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao atualizar status")
@@ -276,7 +480,7 @@ def update_entry_status(
 @router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_entry(
     entry_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -324,6 +528,8 @@ def delete_entry(
     
     except HTTPException:
         raise
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.exceptions.errors import sanitize_error_message
         # ConflictError (status='paid') retorna 409
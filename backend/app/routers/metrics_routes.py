@@ -0,0 +1,34 @@
+"""
+Router de métricas (formato Prometheus)
+Não depende de services - apenas expõe app.core.metrics
+"""
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from app.config import METRICS_TOKEN
+from app.core.metrics import render_metrics
+
+
+router = APIRouter(prefix="", tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    """
+    Métricas para scraping do Prometheus
+    
+    Se METRICS_TOKEN estiver definido, exige "Authorization: Bearer <token>".
+    Com PROMETHEUS_MULTIPROC_DIR, agrega todos os workers.
+    """
+    if METRICS_TOKEN:
+        expected = f"Bearer {METRICS_TOKEN}"
+        if not authorization or not secrets.compare_digest(authorization, expected):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token de métricas inválido"
+            )
+
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
@@ -5,7 +5,7 @@ Responsabilidade: receber requests e chamar OrderService.
  contém lógica de negócio nem queries SQL.
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -13,9 +13,9 @@ from sqlalchemy.orm import Session
 
 from app.services.order_service import OrderService
 from app.schemas.order_schema import OrderCreate, OrderCreateRequest, OrderOut, OrderUpdate
-from app.security.deps import get_current_user, get_db, require_admin
-from app.models.user import User
-from app.exceptions.errors import ConflictError, NotFoundError, ValidationError
+from app.security.deps import get_current_user, get_db, get_read_db, require_admin
+from app.security.user_cache import AuthenticatedUser
+from app.exceptions.errors import ConflictError, NotFoundError, ServiceUnavailableError, ValidationError
 
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
@@ -25,8 +25,10 @@ router = APIRouter(prefix="/orders", tags=["Orders"])
 def list_orders(
     page: int = 1,
     page_size: int = 20,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    total_mode: str = "exact",
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
     Lista pedidos com paginação.
@@ -40,13 +42,19 @@ def list_orders(
     Query params:
     - page: número da página (default 1, min 1)
     - page_size: itens por página (default 20, max 100)
+    - cursor: next_cursor da resposta anterior (paginação keyset, ignora page)
+    - total_mode: exact (COUNT, padrão), estimate (estimativa do planner)
+      ou none (sem total; use has_more)
     
     Response:
     {
       "items": [...],
       "page": 1,
       "page_size": 20,
-      "total": 123
+      "total": 123,
+      "total_mode": "exact",
+      "has_more": true,
+      "next_cursor": "..." (null na última página)
     }
     """
     try:
@@ -57,7 +65,9 @@ def list_orders(
             db=db, 
             page=page, 
             page_size=page_size,
-            user_id=user_id_filter
+            user_id=user_id_filter,
+            cursor=cursor,
+            total_mode=total_mode
         )
         
         # Converte ORM models para OrderOut (Pydantic)
@@ -67,9 +77,20 @@ def list_orders(
             "items": items_out,
             "page": result["page"],
             "page_size": result["page_size"],
-            "total": result["total"]
+            "total": result["total"],
+            "total_mode": result["total_mode"],
+            "has_more": result["has_more"],
+            "next_cursor": result["next_cursor"]
         }
     
+    except ValueError as e:
+        # Cursor ou total_mode inválido
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.core.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao listar pedidos")
@@ -82,7 +103,7 @@ def list_orders(
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=OrderOut)
 def create_order(
     order_data: OrderCreateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -119,6 +140,8 @@ def create_order(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.core.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao criar pedido")
@@ -131,7 +154,7 @@ def create_order(
 @router.get("/{order_id}", status_code=status.HTTP_200_OK, response_model=OrderOut)
 def get_order(
     order_id: UUID,
-    current_user: User = Depends(get_current_user),  # Adicionado para multi-tenant
+    current_user: AuthenticatedUser = Depends(get_current_user),  # Adicionado para multi-tenant
     db: Session = Depends(get_db)
 ):
     """
@@ -164,6 +187,8 @@ def get_order(
     
     except HTTPException:
         raise
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         # Sanitizar erro usando utilitário
         from app.core.errors import sanitize_error_message
@@ -178,7 +203,7 @@ def get_order(
 def update_order(
     order_id: UUID,
     order_data: OrderUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -238,6 +263,8 @@ def update_order(
     except HTTPException:
         raise
     
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.core.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao atualizar pedido")
@@ -250,7 +277,7 @@ def update_order(
 @router.delete("/{order_id}", status_code=status.HTTP_200_OK)
 def delete_order(
     order_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -294,6 +321,8 @@ def delete_order(
         )
     except HTTPException:
         raise
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.core.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao deletar pedido")
@@ -306,7 +335,7 @@ def delete_order(
 @router.post("/{order_id}/restore", status_code=status.HTTP_200_OK)
 def restore_order(
     order_id: UUID,
-    current_user: User = Depends(require_admin),  # Apenas admin pode restaurar
+    current_user: AuthenticatedUser = Depends(require_admin),  # Apenas admin pode restaurar
     db: Session = Depends(get_db)
 ):
     """
@@ -349,6 +378,8 @@ def restore_order(
         
     except HTTPException:
         raise
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.core.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao restaurar pedido")
@@ -14,14 +14,20 @@ from app.schemas.report_schema import (
     DREResponse,
     CashflowDailyResponse,
     AgingResponse,
-    TopEntriesResponse
+    TopEntriesResponse,
+    DashboardResponse
 )
-from app.security.deps import get_current_user, get_db
-from app.models.user import User
-from app.security.deps import get_db  # CENTRALIZADO
+from app.security.deps import get_current_user, get_read_db, report_statement_timeout
+from app.security.user_cache import AuthenticatedUser
+from app.exceptions.errors import ServiceUnavailableError
 
 
-router = APIRouter(prefix="/reports/financial", tags=["Reports"])
+# statement_timeout maior que o de CRUD (DB_REPORT_STATEMENT_TIMEOUT_MS)
+router = APIRouter(
+    prefix="/reports/financial",
+    tags=["Reports"],
+    dependencies=[Depends(report_statement_timeout)]
+)
 
 
 @router.get("/dre", response_model=DREResponse, status_code=status.HTTP_200_OK)
@@ -29,8 +35,9 @@ def get_dre_report(
     date_from: date = Query(..., description="Data inicial (YYYY-MM-DD)"),
     date_to: date = Query(..., description="Data final (YYYY-MM-DD)"),
     include_canceled: bool = Query(False, description="Incluir lançamentos cancelados"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    tz: Optional[str] = Query(None, description="Timezone IANA dos dias, ex: America/Sao_Paulo (default: REPORT_DEFAULT_TIMEZONE)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
     DRE Simplificada - Demonstração de Resultado do Exercício.
@@ -55,6 +62,7 @@ def get_dre_report(
     - date_from: Data inicial (obrigatório, formato YYYY-MM-DD)
     - date_to: Data final (obrigatório, formato YYYY-MM-DD)
     - include_canceled: Se true, inclui lançamentos cancelados (default: false)
+    - tz: Timezone IANA que define o dia de cada lançamento (default: REPORT_DEFAULT_TIMEZONE)
     """
     try:
         # Multi-tenant: admin vê tudo, outros veem só seus
@@ -65,7 +73,8 @@ def get_dre_report(
             date_from=date_from,
             date_to=date_to,
             user_id=user_id_filter,
-            include_canceled=include_canceled
+            include_canceled=include_canceled,
+            tz=tz
         )
         
         return result
@@ -76,6 +85,8 @@ def get_dre_report(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         # Erros inesperados (sanitizar em produção)
         from app.exceptions.errors import sanitize_error_message
@@ -91,20 +102,24 @@ def get_cashflow_daily_report(
     date_from: date = Query(..., description="Data inicial (YYYY-MM-DD)"),
     date_to: date = Query(..., description="Data final (YYYY-MM-DD)"),
     include_canceled: bool = Query(False, description="Incluir lançamentos cancelados"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    granularity: str = Query("day", description="Período: day, week, month ou quarter"),
+    tz: Optional[str] = Query(None, description="Timezone IANA dos dias, ex: America/Sao_Paulo (default: REPORT_DEFAULT_TIMEZONE)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
-    Fluxo de Caixa Diário - série temporal completa.
+    Fluxo de Caixa - série temporal completa por dia, semana, mês ou trimestre.
     
     **Autenticação obrigatória (Bearer token)**
     
-    Retorna lista de dias (de date_from até date_to) com:
+    Retorna lista de períodos (de date_from até date_to) com:
     - Receitas e despesas pagas
     - Receitas e despesas pendentes
     - Resultado líquido (pago e esperado)
     
-    **Importante:** Dias sem lançamentos aparecem com valores zero (série completa).
+    **Importante:** Períodos sem lançamentos aparecem com valores zero (série completa).
+    Com granularity != day, "date" é o início do período (semana começa na
+    segunda); o primeiro período pode começar antes de date_from.
     
     Regras multi-tenant:
     - **admin**: consolidado de todos usuários
@@ -112,12 +127,14 @@ def get_cashflow_daily_report(
     
     Validações:
     - date_from <= date_to
-    - Intervalo máximo: 366 dias
+    - Intervalo máximo: 366 dias (day), ~3 anos (week), ~10 anos (month, quarter)
     
     Query params:
     - date_from: Data inicial (obrigatório)
     - date_to: Data final (obrigatório)
     - include_canceled: Se true, inclui lançamentos cancelados (default: false)
+    - granularity: day (default), week, month ou quarter
+    - tz: Timezone IANA que define o dia de cada lançamento (default: REPORT_DEFAULT_TIMEZONE)
     """
     try:
         # Multi-tenant
@@ -128,7 +145,9 @@ def get_cashflow_daily_report(
             date_from=date_from,
             date_to=date_to,
             user_id=user_id_filter,
-            include_canceled=include_canceled
+            include_canceled=include_canceled,
+            granularity=granularity,
+            tz=tz
         )
         
         return result
@@ -138,6 +157,8 @@ def get_cashflow_daily_report(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.exceptions.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao gerar cashflow diário")
@@ -152,8 +173,10 @@ def get_pending_aging_report(
     date_from: date = Query(..., description="Data inicial (occurred_at)"),
     date_to: date = Query(..., description="Data final (occurred_at)"),
     reference_date: Optional[date] = Query(None, description="Data de referência para aging (default: hoje)"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    buckets: Optional[str] = Query(None, description="Limites das faixas em dias, ex: 15,45,90 (default: 7,30)"),
+    tz: Optional[str] = Query(None, description="Timezone IANA dos dias, ex: America/Sao_Paulo (default: REPORT_DEFAULT_TIMEZONE)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
     Aging de Pendências - classificação por faixa de dias.
@@ -168,6 +191,10 @@ def get_pending_aging_report(
     Cálculo de aging: reference_date - occurred_at (em dias)
     Se reference_date não for informado, usa data atual.
     
+    Faixas configuráveis via buckets (limites superiores, inclusivos):
+    - buckets=15,45,90 → 0-15, 16-45, 46-90, 91+ (lista em "buckets" de cada kind)
+    - As chaves 0_7_days / 8_30_days / 31_plus_days continuam sempre presentes
+    
     Regras multi-tenant:
     - **admin**: consolidado de todos usuários
     - **outros roles**: apenas lançamentos do próprio usuário
@@ -179,7 +206,9 @@ def get_pending_aging_report(
     Query params:
     - date_from: Data inicial (occurred_at >= date_from)
     - date_to: Data final (occurred_at <= date_to)
-    - reference_date: Data de referência (default: hoje)
+    - reference_date: Data de referência (default: hoje em tz)
+    - buckets: Limites das faixas (default: 7,30)
+    - tz: Timezone IANA que define o dia de cada lançamento (default: REPORT_DEFAULT_TIMEZONE)
     """
     try:
         # Multi-tenant
@@ -190,7 +219,9 @@ def get_pending_aging_report(
             date_from=date_from,
             date_to=date_to,
             user_id=user_id_filter,
-            reference_date=reference_date
+            reference_date=reference_date,
+            buckets=buckets,
+            tz=tz
         )
         
         return result
@@ -200,6 +231,8 @@ def get_pending_aging_report(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.exceptions.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao gerar aging de pendências")
@@ -216,8 +249,9 @@ def get_top_entries_report(
     date_to: date = Query(..., description="Data final (YYYY-MM-DD)"),
     status_filter: str = Query("paid", alias="status", description="Status: 'paid', 'pending', 'canceled'"),
     limit: int = Query(10, ge=1, le=50, description="Limite de resultados (default: 10, max: 50)"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    tz: Optional[str] = Query(None, description="Timezone IANA dos dias, ex: America/Sao_Paulo (default: REPORT_DEFAULT_TIMEZONE)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """
     Top Lançamentos por Valor - agregados por descrição.
@@ -225,7 +259,8 @@ def get_top_entries_report(
     **Autenticação obrigatória (Bearer token)**
     
     Retorna top N lançamentos ordenados por valor total (soma de amounts).
-    Agrupa por description e soma os valores.
+    Agrupa pela descrição normalizada (sem UUIDs e espaços repetidos) e soma
+    os valores: pedidos "Pedido <uuid> - X" entram num único grupo "Pedido - X".
     
     Exemplo: Se houver 3 lançamentos "Venda Produto X" (1000, 1500, 2500),
     retorna um item com total_amount=5000 e count=3.
@@ -247,6 +282,7 @@ def get_top_entries_report(
     - date_to: Data final - obrigatório
     - status: Status (default: paid)
     - limit: Limite de resultados (default: 10, max: 50)
+    - tz: Timezone IANA de date_from/date_to (default: REPORT_DEFAULT_TIMEZONE)
     """
     try:
         # Multi-tenant
@@ -259,7 +295,8 @@ def get_top_entries_report(
             date_from=date_from,
             date_to=date_to,
             limit=limit,
-            user_id=user_id_filter
+            user_id=user_id_filter,
+            tz=tz
         )
         
         return result
@@ -269,6 +306,8 @@ def get_top_entries_report(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         from app.exceptions.errors import sanitize_error_message
         detail = sanitize_error_message(e, "Erro ao gerar top lançamentos")
@@ -276,3 +315,76 @@ def get_top_entries_report(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=detail
         )
+
+
+@router.get("/dashboard", response_model=DashboardResponse, status_code=status.HTTP_200_OK)
+def get_dashboard_report(
+    date_from: date = Query(..., description="Data inicial (YYYY-MM-DD)"),
+    date_to: date = Query(..., description="Data final (YYYY-MM-DD)"),
+    include_canceled: bool = Query(False, description="Incluir lançamentos cancelados (DRE e cashflow)"),
+    reference_date: Optional[date] = Query(None, description="Data de referência para aging (default: hoje)"),
+    buckets: Optional[str] = Query(None, description="Limites das faixas de aging, ex: 15,45,90 (default: 7,30)"),
+    top_kind: str = Query("revenue", description="Tipo do top lançamentos: 'revenue' ou 'expense'"),
+    top_status: str = Query("paid", description="Status do top lançamentos: 'paid', 'pending', 'canceled'"),
+    top_limit: int = Query(10, ge=1, le=50, description="Limite do top lançamentos (default: 10, max: 50)"),
+    granularity: str = Query("day", description="Períodos do cashflow: day, week, month ou quarter"),
+    tz: Optional[str] = Query(None, description="Timezone IANA dos dias, ex: America/Sao_Paulo (default: REPORT_DEFAULT_TIMEZONE)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Painel Financeiro - DRE, cashflow diário, aging e top lançamentos numa chamada.
+    
+    **Autenticação obrigatória (Bearer token)**
+    
+    Substitui as quatro chamadas do painel: uma autenticação, uma validação
+    de período e uma agregação diária para DRE e aging (cashflow e top
+    lançamentos em consultas próprias).
+    
+    Cada parte tem o mesmo formato do endpoint individual
+    (dre, cashflow/daily, pending/aging, top).
+    
+    Regras multi-tenant:
+    - **admin**: consolidado de todos usuários
+    - **outros roles**: apenas lançamentos do próprio usuário
+    
+    Validações:
+    - date_from <= date_to
+    - Intervalo máximo: 366 dias
+    - buckets, top_kind, top_status, top_limit, granularity e tz como nos endpoints individuais
+    """
+    try:
+        # Multi-tenant
+        user_id_filter = None if current_user.role == "admin" else current_user.id
+        
+        result = ReportService.get_dashboard(
+            db=db,
+            date_from=date_from,
+            date_to=date_to,
+            user_id=user_id_filter,
+            include_canceled=include_canceled,
+            reference_date=reference_date,
+            buckets=buckets,
+            top_kind=top_kind,
+            top_status=top_status,
+            top_limit=top_limit,
+            granularity=granularity,
+            tz=tz
+        )
+        
+        return result
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ServiceUnavailableError:
+        raise
+    except Exception as e:
+        from app.exceptions.errors import sanitize_error_message
+        detail = sanitize_error_message(e, "Erro ao gerar painel financeiro")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=detail
+        )
@@ -33,6 +33,7 @@ class AuditLogResponse(AuditLogBase):
     user_id: UUID
     before: Optional[dict[str, Any]] = None
     after: Optional[dict[str, Any]] = None
+    storage: str = Field("full", description="full: before/after completos; diff: só campos alterados")
     request_id: str
     created_at: datetime
     
@@ -53,6 +54,7 @@ class AuditLogResponse(AuditLogBase):
                     "description": "Updated Order",
                     "total": 150.00
                 },
+                "storage": "full",
                 "request_id": "req-abc-123",
                 "created_at": "2026-02-18T10:00:00"
             }
@@ -83,9 +85,12 @@ class AuditLogFilter(BaseModel):
 class AuditLogListResponse(BaseModel):
     """Schema para lista paginada de audit logs."""
     items: list[AuditLogResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Total de registros (null quando total_mode=none)")
+    total_mode: str = Field("exact", description="Como o total foi calculado: exact, estimate ou none")
+    has_more: bool = Field(False, description="Há próxima página")
     page: int
     page_size: int
+    next_cursor: Optional[str] = Field(None, description="Cursor da próxima página (null na última)")
     
     class Config:
         json_schema_extra = {
@@ -99,12 +104,16 @@ class AuditLogListResponse(BaseModel):
                         "entity_id": "123e4567-e89b-12d3-a456-426614174002",
                         "before": None,
                         "after": {"description": "New Order", "total": 100.00},
+                        "storage": "full",
                         "request_id": "req-abc-123",
                         "created_at": "2026-02-18T10:00:00"
                     }
                 ],
                 "total": 1,
+                "total_mode": "exact",
+                "has_more": False,
                 "page": 1,
-                "page_size": 20
+                "page_size": 20,
+                "next_cursor": None
             }
         }
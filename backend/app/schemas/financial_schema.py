@@ -3,11 +3,11 @@ Schemas Pydantic para FinancialEntry.
 Separação: Request (entrada) e Response (saída).
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Literal, Optional
 
 
 class FinancialEntryCreate(BaseModel):
@@ -32,6 +32,46 @@ class FinancialEntryCreate(BaseModel):
     }}
 
 
+class FinancialEntryBulkItem(BaseModel):
+    """
+    Item de criação em lote.
+    
+    Sem restrições de valor no schema: kind/amount/description são validados
+    no service, linha a linha, para que o modo per_row possa reportar o erro
+    de cada índice em vez de rejeitar o lote inteiro com 422.
+    """
+    kind: str = Field(..., description="Tipo: 'revenue' ou 'expense'")
+    amount: Decimal = Field(..., description="Valor (>= 0)")
+    description: str = Field(..., description="Descrição do lançamento (1-500 chars)")
+    occurred_at: Optional[datetime] = Field(None, description="Data de ocorrência (default: now)")
+
+
+class FinancialEntryBulkCreate(BaseModel):
+    """Schema para criação de lançamentos manuais em lote."""
+    items: list[FinancialEntryBulkItem] = Field(..., min_length=1, max_length=10000)
+    mode: Literal["all_or_nothing", "per_row"] = Field(
+        "all_or_nothing",
+        description="all_or_nothing: qualquer linha inválida rejeita o lote; per_row: cria as válidas"
+    )
+    
+    model_config = {"json_schema_extra": {
+        "example": {
+            "mode": "per_row",
+            "items": [
+                {"kind": "expense", "amount": 150.50, "description": "Tarifa bancária"},
+                {"kind": "revenue", "amount": 980.00, "description": "Recebimento boleto 123",
+                 "occurred_at": "2026-02-15T10:30:00"}
+            ]
+        }
+    }}
+
+
+class FinancialEntryBulkError(BaseModel):
+    """Erro de validação de uma linha do lote."""
+    index: int = Field(..., description="Posição do item no lote (0-based)")
+    error: str
+
+
 class FinancialEntryResponse(BaseModel):
     """Schema de saída de lançamento financeiro."""
     id: UUID
@@ -59,9 +99,73 @@ class FinancialEntryUpdateStatus(BaseModel):
     }}
 
 
+class FinancialEntryBulkStatusFilter(BaseModel):
+    """Filtro de lançamentos pending para atualização em lote (período obrigatório)."""
+    kind: Optional[str] = Field(None, description="Tipo: 'revenue' ou 'expense'")
+    date_from: datetime = Field(..., description="Data inicial (occurred_at >=)")
+    date_to: datetime = Field(..., description="Data final (occurred_at <=)")
+
+
+class FinancialEntryBulkStatusUpdate(BaseModel):
+    """
+    Schema para atualização de status em lote.
+    
+    Informar ids OU filter (não ambos).
+    """
+    status: str = Field(..., description="Novo status: 'paid' ou 'canceled'")
+    ids: Optional[list[UUID]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[FinancialEntryBulkStatusFilter] = None
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Informe ids ou filter (exatamente um)")
+        return self
+    
+    model_config = {"json_schema_extra": {
+        "example": {
+            "status": "paid",
+            "filter": {
+                "kind": "revenue",
+                "date_from": "2026-02-15T00:00:00",
+                "date_to": "2026-02-15T23:59:59"
+            }
+        }
+    }}
+
+
+class FinancialEntryBulkStatusResult(BaseModel):
+    """Resultado por ID da atualização em lote."""
+    id: UUID
+    outcome: str = Field(..., description="updated, unchanged, invalid_transition ou not_found")
+    error: Optional[str] = None
+
+
+class FinancialEntryBulkStatusResponse(BaseModel):
+    """Schema de resposta da atualização de status em lote."""
+    status: str
+    updated: int = Field(..., description="Quantidade de lançamentos atualizados")
+    rejected: int = Field(..., description="IDs rejeitados (not_found ou invalid_transition)")
+    results: list[FinancialEntryBulkStatusResult] = Field(
+        ..., description="Resultado por ID (vazio na atualização por filtro)"
+    )
+
+
 class FinancialEntryListResponse(BaseModel):
     """Schema de resposta paginada."""
     items: list[FinancialEntryResponse]
     page: int
     page_size: int
-    total: int
+    total: Optional[int] = Field(None, description="Total de registros (null quando total_mode=none)")
+    total_mode: str = Field("exact", description="Como o total foi calculado: exact, estimate ou none")
+    has_more: bool = Field(False, description="Há próxima página")
+    next_cursor: Optional[str] = Field(None, description="Cursor da próxima página (null na última)")
+
+
+class FinancialEntryBulkResponse(BaseModel):
+    """Schema de resposta da criação em lote."""
+    mode: str
+    created: int = Field(..., description="Quantidade de lançamentos criados")
+    failed: int = Field(..., description="Quantidade de linhas rejeitadas")
+    items: list[FinancialEntryResponse]
+    errors: list[FinancialEntryBulkError]
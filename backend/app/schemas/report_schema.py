@@ -17,6 +17,7 @@ class DREPeriod(BaseModel):
     """Período do relatório DRE."""
     date_from: date
     date_to: date
+    tz: Optional[str] = Field(None, description="Timezone IANA dos dias do relatório")
 
 
 class DREResponse(BaseModel):
@@ -50,25 +51,29 @@ class DREResponse(BaseModel):
 # ========================================
 
 class CashflowDailyItem(BaseModel):
-    """Item de fluxo de caixa de um dia."""
-    date: date
-    revenue_paid: float = Field(..., description="Receitas pagas no dia")
-    expense_paid: float = Field(..., description="Despesas pagas no dia")
+    """Item de fluxo de caixa de um período (dia, semana, mês ou trimestre)."""
+    date: date  # Início do período
+    revenue_paid: float = Field(..., description="Receitas pagas no período")
+    expense_paid: float = Field(..., description="Despesas pagas no período")
     net_paid: float = Field(..., description="Resultado líquido pago (receita - despesa)")
-    revenue_pending: float = Field(..., description="Receitas pendentes com occurred_at neste dia")
-    expense_pending: float = Field(..., description="Despesas pendentes com occurred_at neste dia")
+    revenue_pending: float = Field(..., description="Receitas pendentes com occurred_at no período")
+    expense_pending: float = Field(..., description="Despesas pendentes com occurred_at no período")
     net_expected: float = Field(..., description="Resultado esperado (pago + pendente)")
 
 
 class CashflowDailyResponse(BaseModel):
-    """Resposta do endpoint cashflow diário."""
+    """Resposta do endpoint cashflow (diário ou agregado por semana/mês/trimestre)."""
     period: DREPeriod
-    days: List[CashflowDailyItem] = Field(..., description="Lista de dias (pode ter dias com zeros)")
+    granularity: str = Field("day", description="day, week, month ou quarter")
+    days: List[CashflowDailyItem] = Field(
+        ..., description="Lista de períodos (date = início do período; períodos sem dados com zeros)"
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
                 "period": {"date_from": "2026-02-01", "date_to": "2026-02-05"},
+                "granularity": "day",
                 "days": [
                     {
                         "date": "2026-02-01",
@@ -97,12 +102,21 @@ class CashflowDailyResponse(BaseModel):
 # Aging de Pendências
 # ========================================
 
+class AgingBucketRange(BaseModel):
+    """Faixa de aging configurável (limites em dias, inclusivos)."""
+    label: str = Field(..., description="Rótulo da faixa (ex: 0_15_days, 91_plus_days)")
+    min_days: int = Field(..., description="Limite inferior em dias")
+    max_days: Optional[int] = Field(None, description="Limite superior em dias (None = sem limite)")
+    amount: float = Field(..., description="Pendências na faixa")
+
+
 class AgingBucket(BaseModel):
     """Faixa de aging (0-7, 8-30, 31+)."""
     days_0_7: float = Field(..., alias="0_7_days", description="Pendências de 0 a 7 dias")
     days_8_30: float = Field(..., alias="8_30_days", description="Pendências de 8 a 30 dias")
     days_31_plus: float = Field(..., alias="31_plus_days", description="Pendências acima de 31 dias")
     total: float = Field(..., description="Total de pendências")
+    buckets: List[AgingBucketRange] = Field(default_factory=list, description="Faixas solicitadas (parâmetro buckets)")
 
     class Config:
         populate_by_name = True  # Permite usar alias
@@ -120,6 +134,7 @@ class AgingResponse(BaseModel):
     """Resposta do endpoint aging de pendências."""
     period: DREPeriod
     reference_date: date = Field(..., description="Data de referência para cálculo de aging")
+    bucket_limits: List[int] = Field(default_factory=lambda: [7, 30], description="Limites superiores das faixas (dias)")
     pending_revenue: AgingBucket = Field(..., description="Receitas pendentes por faixa")
     pending_expense: AgingBucket = Field(..., description="Despesas pendentes por faixa")
 
@@ -150,7 +165,8 @@ class AgingResponse(BaseModel):
 
 class TopEntryItem(BaseModel):
     """Item de top lançamento."""
-    description: str
+    description: str = Field(..., description="Descrição do lançamento mais recente do grupo")
+    description_key: str = Field(..., description="Chave do grupo: descrição sem UUIDs, espaços colapsados")
     total_amount: float = Field(..., description="Soma dos valores desta descrição")
     count: int = Field(..., description="Quantidade de lançamentos")
     last_occurred_at: datetime = Field(..., description="Data do último lançamento")
@@ -185,3 +201,16 @@ class TopEntriesResponse(BaseModel):
                 ]
             }
         }
+
+
+# ========================================
+# Painel (dashboard)
+# ========================================
+
+class DashboardResponse(BaseModel):
+    """Resposta do endpoint painel: os quatro relatórios do mesmo período."""
+    period: DREPeriod
+    dre: DREResponse
+    cashflow: CashflowDailyResponse
+    aging: AgingResponse
+    top: TopEntriesResponse
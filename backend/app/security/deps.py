@@ -3,13 +3,18 @@ Dependencies de segurança (preparação para implementação futura)
 """
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from typing import AsyncGenerator
 from uuid import UUID
 
-from app.database import SessionLocal
+from app.config import DB_REPORT_STATEMENT_TIMEOUT_MS
+from app.core.db_routing import async_read_sessionmaker, read_sessionmaker
+from app.core.request_context import current_user_id_var
+from app.database import AsyncSessionLocal, SessionLocal, statement_timeout_var
 from app.security.jwt import decode_access_token
 from app.repositories.user_repo import UserRepository
-from app.models.user import User
+from app.security.user_cache import AuthenticatedUser, auth_user_cache
 from app.exceptions.errors import UnauthorizedError
 
 
@@ -26,16 +31,45 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependência de banco async (asyncpg) para rotas async def"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def statement_timeout(timeout_ms: int):
+    """
+    Dependency factory: statement_timeout (ms) das transações do request.
+    
+    Aplicado com SET LOCAL no início de cada transação; sem ela vale o
+    padrão da conexão (DB_STATEMENT_TIMEOUT_MS, curto para CRUD).
+    
+    Uso:
+        router = APIRouter(dependencies=[Depends(report_statement_timeout)])
+    """
+    async def set_statement_timeout() -> None:
+        # async: roda na task do request, o contexto chega ao endpoint sync
+        statement_timeout_var.set(timeout_ms)
+    return set_statement_timeout
+
+
+# Relatórios e exportações: consultas longas legítimas
+report_statement_timeout = statement_timeout(DB_REPORT_STATEMENT_TIMEOUT_MS)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Dependency para obter usuário autenticado
     
+    Retorna o principal (id, role, is_active), servido do auth_user_cache
+    quando possível: só consulta core.users em cache miss.
+    
     Uso:
         @app.get("/protected")
-        def protected_route(user: User = Depends(get_current_user)):
+        def protected_route(user: AuthenticatedUser = Depends(get_current_user)):
             return {"user_id": user.id}
     
     Raises:
@@ -54,26 +88,54 @@ async def get_current_user(
     except Exception:
         raise UnauthorizedError("Token inválido ou expirado")
     
-    # Busca usuário
-    repo = UserRepository(db)
-    user = repo.get_by_id(user_id)
-    
-    if user is None:
-        raise UnauthorizedError("Usuário não encontrado")
+    # Busca usuário (cache → banco)
+    principal = auth_user_cache.get(user_id)
+    if principal is None:
+        user = UserRepository(db).get_by_id(user_id)
+        
+        if user is None:
+            raise UnauthorizedError("Usuário não encontrado")
+        
+        principal = AuthenticatedUser(id=user.id, role=user.role, is_active=user.is_active)
+        auth_user_cache.set(principal)
     
-    if not user.is_active:
+    if not principal.is_active:
         raise UnauthorizedError("Usuário inativo")
     
-    return user
+    # Commits deste request marcam o usuário (read-your-writes da réplica)
+    current_user_id_var.set(principal.id)
+    return principal
+
+
+def get_read_db(current_user: AuthenticatedUser = Depends(get_current_user)):
+    """
+    Dependência de banco para rotas só de leitura (relatórios, listagens).
+    
+    Sessão da réplica (DATABASE_URL_REPLICA) quando configurada, exceto se
+    o usuário escreveu há pouco (read-your-writes): aí, primário.
+    """
+    db = read_sessionmaker(current_user.id)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Versão async de get_read_db (rotas async def)"""
+    async with async_read_sessionmaker(current_user.id)() as db:
+        yield db
 
 
-async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+async def require_admin(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
     """
     Dependency para exigir role admin
     
     Uso:
         @app.delete("/users/{id}")
-        def delete_user(user: User = Depends(require_admin)):
+        def delete_user(user: AuthenticatedUser = Depends(require_admin)):
             # Só admin pode acessar
     
     Raises:
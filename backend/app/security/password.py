@@ -1,23 +1,121 @@
 """
 Utilitários para hash e verificação de senhas
-Usa bcrypt via passlib
+Usa bcrypt diretamente (compatível com Python 3.11+)
+
+Cada hash/verify custa ~250ms de CPU (BCRYPT_ROUNDS=12). As operações rodam
+em um pool de threads dedicado e limitado (o bcrypt libera o GIL, então as
+threads usam vários núcleos):
+- no máximo PASSWORD_HASH_WORKERS operações simultâneas por worker, deixando
+  CPU para os demais requests
+- no máximo PASSWORD_HASH_MAX_PENDING operações em andamento (em execução +
+  fila); acima disso ServiceUnavailableError (503) em vez de prender mais
+  threads do threadpool do FastAPI esperando
+- métricas de fila/execução em /metrics (password_hash_*)
 """
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from app.config import BCRYPT_ROUNDS, PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_WORKERS
+from app.core.metrics import (
+    PASSWORD_ACTIVE,
+    PASSWORD_DURATION,
+    PASSWORD_QUEUE_DEPTH,
+    PASSWORD_REJECTED,
+    PASSWORD_WAIT,
+)
+from app.exceptions.errors import ServiceUnavailableError
+
+# bcrypt usa apenas os primeiros 72 bytes; o bcrypt 5 recusa senhas maiores.
+# Truncar mantém o comportamento (e os hashes) das versões anteriores.
+BCRYPT_MAX_BYTES = 72
+
+
+def _encode(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
+class PasswordHasher:
+    """Executa bcrypt no pool dedicado, com limite de operações pendentes."""
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        rounds: int = BCRYPT_ROUNDS
+    ):
+        self.rounds = rounds
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _run(self, operation: str, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                PASSWORD_REJECTED.inc()
+                raise ServiceUnavailableError(
+                    "Servidor ocupado processando senhas. Tente novamente em instantes."
+                )
+            self._pending += 1
+        PASSWORD_QUEUE_DEPTH.inc()
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            PASSWORD_QUEUE_DEPTH.dec()
+            PASSWORD_ACTIVE.inc()
+            PASSWORD_WAIT.labels(operation).observe(started_at - submitted_at)
+            try:
+                return func(*args)
+            finally:
+                PASSWORD_ACTIVE.dec()
+                PASSWORD_DURATION.labels(operation).observe(time.perf_counter() - started_at)
+
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def hash(self, password: str) -> str:
+        """Gera hash bcrypt com o custo configurado."""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self._run("hash", bcrypt.hashpw, _encode(password), salt).decode("utf-8")
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifica se a senha corresponde ao hash."""
+        return self._run("verify", bcrypt.checkpw, _encode(plain_password), hashed_password.encode("utf-8"))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """True se o hash foi gerado com custo diferente do configurado ($2b$<custo>$...)."""
+        try:
+            return int(hashed_password.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+password_hasher = PasswordHasher()
+
 
 def hash_password(password: str) -> str:
     """
     Gera hash bcrypt de uma senha.
-    Usa bcrypt diretamente para compatibilidade com Python 3.11+.
+    Executa no pool dedicado de bcrypt.
     """
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-    return hashed.decode("utf-8")
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se senha corresponde ao hash.
-    Usa bcrypt diretamente para compatibilidade com Python 3.11+.
+    Executa no pool dedicado de bcrypt.
     """
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return password_hasher.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Verifica se o hash deve ser refeito com o custo atual (BCRYPT_ROUNDS)."""
+    return password_hasher.needs_rehash(hashed_password)
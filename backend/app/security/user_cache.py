@@ -0,0 +1,217 @@
+"""
+Cache do usuário autenticado (principal) usado por get_current_user.
+
+Guarda apenas (id, role, is_active) por user_id, com TTL e limite de
+entradas (LRU), para que requests autenticados não consultem core.users
+a cada chamada.
+
+Invalidação (todos os workers):
+- UserService.update_user/delete_user e AuthService.change_password
+  chamam auth_user_cache.invalidate(user_id): remove do worker local e
+  publica NOTIFY auth_user_cache '<user_id>' no Postgres
+- Cada worker mantém uma conexão própria em LISTEN (thread daemon,
+  psycopg2) e remove o user_id ao receber a notificação
+- O cache só é servido enquanto o LISTEN do worker está ativo: sem ele
+  (falha de conexão, reconexão), get_current_user lê core.users. Ao
+  (re)conectar o cache é esvaziado, pois notificações podem ter sido perdidas
+
+Hits/misses: métrica auth_user_cache_requests_total{result="hit"|"miss"}.
+"""
+import logging
+import os
+import select
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.config import AUTH_USER_CACHE_MAX_ENTRIES, AUTH_USER_CACHE_TTL_SECONDS
+from app.core.metrics import AUTH_USER_CACHE
+from app.core.report_cache import MemoryCacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Canal NOTIFY das invalidações (payload: user_id)
+INVALIDATION_CHANNEL = "auth_user_cache"
+# Espera máxima por notificação antes de testar a conexão (SELECT 1)
+LISTEN_POLL_SECONDS = 5
+# Intervalo entre tentativas de reconectar o LISTEN
+LISTEN_RETRY_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Principal do request: o que as rotas usam do usuário autenticado."""
+    id: UUID
+    role: str
+    is_active: bool
+
+
+class AuthenticatedUserCache:
+    """LRU + TTL de AuthenticatedUser por user_id, invalidado via LISTEN/NOTIFY."""
+
+    def __init__(
+        self,
+        ttl: int = AUTH_USER_CACHE_TTL_SECONDS,
+        max_entries: int = AUTH_USER_CACHE_MAX_ENTRIES,
+        engine=None
+    ):
+        self.ttl = ttl
+        self.backend = MemoryCacheBackend(max_entries=max_entries)
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._wake_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._listening = False
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app.database import engine
+            self._engine = engine
+        return self._engine
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def get(self, user_id: UUID) -> Optional[AuthenticatedUser]:
+        if self.ttl <= 0:
+            return None
+        principal = self.backend.get(str(user_id)) if self._ensure_listener() else None
+        AUTH_USER_CACHE.labels("hit" if principal is not None else "miss").inc()
+        return principal
+
+    def set(self, principal: AuthenticatedUser) -> None:
+        # Sem LISTEN a entrada não seria servida (e seria descartada ao reconectar)
+        if self.ttl > 0 and self._listening:
+            key = str(principal.id)
+            self.backend.set(key, key, principal, self.ttl)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Remove o principal deste worker e notifica os demais (chamar após o commit)."""
+        self.backend.invalidate_tenants({str(user_id)})
+        if self.ttl <= 0:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    text("SELECT pg_notify(:channel, :user_id)"),
+                    {"channel": INVALIDATION_CHANNEL, "user_id": str(user_id)}
+                )
+        except Exception as e:
+            logger.error(f"Falha ao notificar invalidação do usuário {user_id}: {e}")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Encerra a thread de LISTEN (shutdown do app); o próximo get() reabre."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._listening = False
+            if thread is None or self._pid != os.getpid():
+                return
+            self._stopping.set()
+            wake = self._wake_w
+            os.write(wake, b"\0")
+        thread.join(timeout)
+        os.close(wake)
+
+    # ------------------------------------------------------------------
+    # LISTEN
+    # ------------------------------------------------------------------
+    def _ensure_listener(self) -> bool:
+        """Inicia o LISTEN do processo no primeiro uso; True se ativo."""
+        if self._thread is None or self._pid != os.getpid():
+            with self._lock:
+                if self._thread is None or self._pid != os.getpid():
+                    self._start()
+        return self._listening
+
+    def _start(self) -> None:
+        """Abre o LISTEN e inicia a thread (chamado com self._lock)."""
+        self._pid = os.getpid()
+        # Estado por thread: uma thread antiga ainda encerrando não afeta a nova
+        self._stopping = threading.Event()
+        wake, self._wake_w = os.pipe()
+        # Primeira conexão no chamador: o cache já vale neste request
+        conn = self._connect()
+        self._listening = conn is not None
+        self._thread = threading.Thread(
+            target=self._run, args=(conn, self._stopping, wake),
+            name="auth-user-cache-listener", daemon=True
+        )
+        self._thread.start()
+
+    def _connect(self):
+        """Conexão psycopg2 dedicada (fora do pool) em LISTEN; None se falhar."""
+        conn = None
+        try:
+            fairy = self.engine.raw_connection()
+            conn = fairy.driver_connection
+            fairy.detach()
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+        except Exception as e:
+            logger.warning(f"Cache de usuário desativado: falha no LISTEN ({e})")
+            self._close(conn)
+            return None
+        # Notificações perdidas enquanto não havia LISTEN
+        self.backend.clear()
+        return conn
+
+    def _set_listening(self, stopping: threading.Event, value: bool) -> None:
+        with self._lock:
+            if not stopping.is_set():
+                self._listening = value
+
+    def _run(self, conn, stopping: threading.Event, wake: int) -> None:
+        try:
+            while not stopping.is_set():
+                if conn is None:
+                    if stopping.wait(LISTEN_RETRY_SECONDS):
+                        break
+                    conn = self._connect()
+                    self._set_listening(stopping, conn is not None)
+                    continue
+                try:
+                    self._wait_notifications(conn, wake)
+                except Exception as e:
+                    logger.warning(f"Cache de usuário desativado: LISTEN interrompido ({e})")
+                    self._set_listening(stopping, False)
+                    self._close(conn)
+                    conn = None
+        finally:
+            self._close(conn)
+            os.close(wake)
+
+    def _wait_notifications(self, conn, wake: int) -> None:
+        """Aplica as notificações recebidas em até LISTEN_POLL_SECONDS (stop() acorda)."""
+        readable, _, _ = select.select([conn, wake], [], [], LISTEN_POLL_SECONDS)
+        if wake in readable:
+            return
+        if not readable:
+            # Sem notificações: confirmar que a conexão segue viva
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        conn.poll()
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            self.backend.invalidate_tenants({notify.payload})
+
+    @staticmethod
+    def _close(conn) -> None:
+        if conn is None:
+            return
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+auth_user_cache = AuthenticatedUserCache()
@@ -10,11 +10,16 @@ from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
 
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, tuple_
 from sqlalchemy.orm import Session
 
+from app.core.audit_diff import compact_rows, rebuild_states
+from app.core.audit_writer import audit_writer
+from app.core.request_context import get_request_id
 from app.models.audit_log import AuditLog
 from app.schemas.audit_log_schema import AuditLogCreate, AuditLogResponse
+from app.utils.async_db import async_variant
+from app.utils.pagination import decode_cursor, estimate_count, keyset_page, validate_total_mode
 
 
 class AuditLogService:
@@ -34,12 +39,18 @@ class AuditLogService:
         action: str,
         entity_type: str,
         entity_id: UUID,
-        request_id: str,
+        request_id: Optional[str] = None,
         before: Optional[dict[str, Any]] = None,
-        after: Optional[dict[str, Any]] = None
+        after: Optional[dict[str, Any]] = None,
+        commit: bool = True
     ) -> AuditLog:
         """
-        Registra uma ação no audit log.
+        Registra uma ação no audit log (modo síncrono, na sessão do chamador).
+        
+        Com commit=False o log entra na transação corrente (flush) e é
+        persistido junto com a alteração de negócio no commit do chamador
+        (ou descartado no rollback). Sem essa necessidade, prefira
+        enqueue_action (gravação em lote, sem transação extra no request).
         
         Args:
             db: Sessão do banco de dados
@@ -47,9 +58,11 @@ class AuditLogService:
             action: Tipo de operação (create/update/delete)
             entity_type: Tipo de entidade (order/financial_entry/user)
             entity_id: ID da entidade afetada
-            request_id: X-Request-ID da requisição
+            request_id: X-Request-ID da requisição (default: request_id do
+                contexto corrente, gravado pelo RequestIDMiddleware)
             before: Estado anterior (opcional, NULL em create)
             after: Estado atual (opcional, NULL em delete)
+            commit: Se False, apenas flush (commit fica com o chamador)
             
         Returns:
             AuditLog: Log criado
@@ -73,21 +86,55 @@ class AuditLogService:
             ...     before={"description": "Old", "total": 100}, after=None
             ... )
         """
-        audit_log = AuditLog(
+        row = {
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "before": before,
+            "after": after,
+            "request_id": request_id or get_request_id() or "unknown",
+            "created_at": None
+        }
+        # AUDIT_LOG_STORAGE=diff: update vira diff (ou snapshot periódico)
+        compact_rows(db, [row])
+        row.pop("created_at")
+        audit_log = AuditLog(**row)
+        
+        db.add(audit_log)
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        
+        return audit_log
+    
+    @staticmethod
+    def enqueue_action(
+        user_id: UUID,
+        action: str,
+        entity_type: str,
+        entity_id: UUID,
+        request_id: Optional[str] = None,
+        before: Optional[dict[str, Any]] = None,
+        after: Optional[dict[str, Any]] = None
+    ) -> None:
+        """
+        Registra uma ação no audit log de forma assíncrona (em lote).
+        
+        O evento vai para a fila do audit_writer (app.core.audit_writer) e é
+        gravado em até AUDIT_LOG_FLUSH_INTERVAL_MS, fora da transação do
+        request. Mesmos parâmetros de log_action; não retorna o log.
+        """
+        audit_writer.enqueue(
             user_id=user_id,
             action=action,
             entity_type=entity_type,
             entity_id=entity_id,
+            request_id=request_id or get_request_id() or "unknown",
             before=before,
-            after=after,
-            request_id=request_id
+            after=after
         )
-        
-        db.add(audit_log)
-        db.commit()
-        db.refresh(audit_log)
-        
-        return audit_log
     
     @staticmethod
     def get_logs(
@@ -118,6 +165,107 @@ class AuditLogService:
         Returns:
             tuple[list[AuditLog], int]: (logs, total_count)
         """
+        query = AuditLogService._filtered_query(
+            db, user_id, action, entity_type, entity_id, date_from, date_to
+        )
+        
+        # Total count
+        total = query.count()
+        
+        # Ordenar por mais recente e paginar (id desempata, mesma ordem do keyset)
+        logs = (
+            query
+            .order_by(desc(AuditLog.created_at), desc(AuditLog.id))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        
+        return logs, total
+    
+    @staticmethod
+    def list_logs(
+        db: Session,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact",
+        user_id: Optional[UUID] = None,
+        action: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[UUID] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> dict:
+        """
+        Lista audit logs paginados por page/page_size ou por cursor (keyset).
+        
+        Com cursor, page é ignorado e a busca continua após (created_at, id)
+        do último item da página anterior via comparação de row-value,
+        sem OFFSET (custo constante em páginas profundas).
+        
+        Args:
+            db: Sessão do banco de dados
+            page: Número da página (modo OFFSET)
+            page_size: Itens por página
+            cursor: next_cursor da resposta anterior (opcional)
+            total_mode: exact (COUNT), estimate (planner) ou none (sem total)
+            demais: mesmos filtros de get_logs
+            
+        Returns:
+            {"items": [...], "total": int | None, "total_mode": str, "has_more": bool,
+             "page": int, "page_size": int, "next_cursor": str | None}
+            
+        Raises:
+            ValueError: Se cursor ou total_mode inválido
+        """
+        validate_total_mode(total_mode)
+        
+        query = AuditLogService._filtered_query(
+            db, user_id, action, entity_type, entity_id, date_from, date_to
+        )
+        
+        # page_size + 1 linhas: a extra indica has_more
+        page_query = query.order_by(desc(AuditLog.created_at), desc(AuditLog.id))
+        if cursor:
+            after = decode_cursor(cursor)
+            page_query = page_query.filter(
+                tuple_(AuditLog.created_at, AuditLog.id) < tuple_(*after),
+                # Redundante, mas o planner só poda partições com o created_at isolado
+                AuditLog.created_at <= after[0]
+            )
+        else:
+            page_query = page_query.offset((page - 1) * page_size)
+        rows = page_query.limit(page_size + 1).all()
+        logs, next_cursor = keyset_page(rows, page_size, "created_at")
+        
+        total = None
+        if total_mode == "exact":
+            total = query.count()
+        elif total_mode == "estimate":
+            total = estimate_count(db, query)
+        
+        return {
+            "items": logs,
+            "total": total,
+            "total_mode": total_mode,
+            "has_more": next_cursor is not None,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor
+        }
+    
+    @staticmethod
+    def _filtered_query(
+        db: Session,
+        user_id: Optional[UUID],
+        action: Optional[str],
+        entity_type: Optional[str],
+        entity_id: Optional[UUID],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime]
+    ):
+        """Query base com os filtros de consulta (compartilhada por get_logs e list_logs)."""
         query = db.query(AuditLog)
         
         # Aplicar filtros
@@ -144,13 +292,7 @@ class AuditLogService:
         if conditions:
             query = query.filter(and_(*conditions))
         
-        # Total count
-        total = query.count()
-        
-        # Ordenar por mais recente e paginar
-        logs = query.order_by(desc(AuditLog.created_at)).offset(skip).limit(limit).all()
-        
-        return logs, total
+        return query
     
     @staticmethod
     def get_entity_history(
@@ -161,6 +303,10 @@ class AuditLogService:
         """
         Obtém histórico completo de uma entidade.
         
+        Eventos gravados como diff (AUDIT_LOG_STORAGE=diff) voltam com
+        before/after completos, reconstruídos a partir do último snapshot.
+        Os logs retornados ficam fora da sessão (não usar para alterações).
+        
         Args:
             db: Sessão do banco de dados
             entity_type: Tipo de entidade
@@ -169,7 +315,7 @@ class AuditLogService:
         Returns:
             list[AuditLog]: Histórico ordenado por data
         """
-        return (
+        logs = (
             db.query(AuditLog)
             .filter(
                 and_(
@@ -180,6 +326,10 @@ class AuditLogService:
             .order_by(AuditLog.created_at)
             .all()
         )
+        # Reconstrução sobrescreve before/after: desanexar para não virar UPDATE
+        for log in logs:
+            db.expunge(log)
+        return rebuild_states(logs)
     
     @staticmethod
     def get_user_actions(
@@ -209,3 +359,15 @@ class AuditLogService:
             query = query.filter(AuditLog.created_at <= date_to)
         
         return query.order_by(desc(AuditLog.created_at)).all()
+
+
+class AsyncAuditLogService:
+    """
+    Consultas de AuditLogService para AsyncSession (asyncpg).
+    Para registrar: enqueue_action (não bloqueia) ou log_action sync.
+    """
+
+    get_logs = async_variant(AuditLogService.get_logs)
+    list_logs = async_variant(AuditLogService.list_logs)
+    get_entity_history = async_variant(AuditLogService.get_entity_history)
+    get_user_actions = async_variant(AuditLogService.get_user_actions)
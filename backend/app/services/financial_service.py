@@ -3,14 +3,18 @@ Service para FinancialEntry - regras de negócio.
 Camada de validações e lógica financeira.
 """
 
-from typing import Dict, List, Optional
+import csv
+import io
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 from datetime import datetime
 from decimal import Decimal
 
 from app.models.financial_entry import FinancialEntry
-from app.repositories.financial_repository import FinancialRepository
+from app.repositories.financial_repository import EXPORT_COLUMNS, FinancialRepository
+from app.utils.pagination import decode_cursor, keyset_page, validate_total_mode
 from app.exceptions.errors import ConflictError
 
 
@@ -21,6 +25,12 @@ class FinancialService:
     VALID_KINDS = ['revenue', 'expense']
     VALID_STATUSES = ['pending', 'paid', 'canceled']
     MAX_PAGE_SIZE = 100
+    EXPORT_FORMATS = ['csv', 'ndjson']
+    EXPORT_BATCH_SIZE = 1000
+    BULK_MODES = ['all_or_nothing', 'per_row']
+    MAX_BULK_ITEMS = 10000
+    MAX_AMOUNT = Decimal("10000000000")  # limite de Numeric(12, 2)
+    MAX_DESCRIPTION_LENGTH = 500
 
     @staticmethod
     def list_entries(
@@ -31,11 +41,19 @@ class FinancialService:
         status: Optional[str] = None,
         kind: Optional[str] = None,
         date_from: Optional[datetime] = None,
-        date_to: Optional[datetime] = None
+        date_to: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
     ) -> Dict:
         """
         Lista lançamentos com paginação e filtros.
         
+        Dois modos:
+        - page/page_size (OFFSET): comportamento padrão
+        - cursor (keyset): informado o cursor, page é ignorado e a busca
+          continua após o último item da página anterior (custo constante
+          mesmo em páginas profundas)
+        
         Args:
             db: Sessão SQLAlchemy
             page: Número da página (>= 1)
@@ -45,9 +63,12 @@ class FinancialService:
             kind: Filtro por tipo (revenue, expense)
             date_from: Data inicial (occurred_at >= date_from)
             date_to: Data final (occurred_at <= date_to)
+            cursor: next_cursor da resposta anterior (opcional)
+            total_mode: exact (COUNT), estimate (planner) ou none (sem total)
             
         Returns:
-            {"items": [...], "page": 1, "page_size": 20, "total": 50}
+            {"items": [...], "page": 1, "page_size": 20, "total": 50 | None,
+             "total_mode": "exact", "has_more": bool, "next_cursor": "..." | None}
         """
         # Validação de paginação
         if page < 1:
@@ -58,6 +79,7 @@ class FinancialService:
             page_size = 1
 
         # Validação de filtros opcionais
+        validate_total_mode(total_mode)
         if status and status not in FinancialService.VALID_STATUSES:
             raise ValueError(
                 f"status inválido: '{status}'. Use: {', '.join(FinancialService.VALID_STATUSES)}"
@@ -67,33 +89,134 @@ class FinancialService:
                 f"kind inválido: '{kind}'. Use: {', '.join(FinancialService.VALID_KINDS)}"
             )
 
-        # Busca dados
-        entries = FinancialRepository.list_paginated(
-            db=db,
-            page=page,
-            page_size=page_size,
-            user_id=user_id,
-            status=status,
-            kind=kind,
-            date_from=date_from,
-            date_to=date_to
-        )
+        filters = {
+            "user_id": user_id,
+            "status": status,
+            "kind": kind,
+            "date_from": date_from,
+            "date_to": date_to
+        }
+
+        # Busca dados (page_size + 1 linhas: a extra indica has_more)
+        if cursor:
+            rows = FinancialRepository.list_keyset(
+                db=db,
+                page_size=page_size,
+                after=decode_cursor(cursor),
+                **filters
+            )
+        else:
+            rows = FinancialRepository.list_paginated(
+                db=db,
+                page=page,
+                page_size=page_size,
+                extra_row=True,
+                **filters
+            )
+        entries, next_cursor = keyset_page(rows, page_size, "occurred_at")
+
+        total = None
+        if total_mode != "none":
+            total = FinancialRepository.count_total(
+                db=db, estimate=(total_mode == "estimate"), **filters
+            )
+
+        return {
+            "items": entries,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_mode": total_mode,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor
+        }
+
+    @staticmethod
+    def export_entries(
+        db: Session,
+        export_format: str = "csv",
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """
+        Exporta lançamentos em CSV ou NDJSON, em blocos de texto.
+        
+        Valida os parâmetros imediatamente (ValueError antes de iniciar o
+        stream) e devolve um gerador que lê o banco por cursor server-side,
+        um bloco por batch: a memória fica constante independente do volume.
+        
+        Args:
+            db: Sessão SQLAlchemy (deve permanecer aberta durante o stream)
+            export_format: 'csv' ou 'ndjson'
+            user_id: Filtro multi-tenant (None = admin exporta tudo)
+            status, kind, date_from, date_to: mesmos filtros de list_entries
+            
+        Returns:
+            Iterator de blocos de texto (cabeçalho CSV incluso)
+        """
+        if export_format not in FinancialService.EXPORT_FORMATS:
+            raise ValueError(
+                f"format inválido: '{export_format}'. Use: {', '.join(FinancialService.EXPORT_FORMATS)}"
+            )
+        if status and status not in FinancialService.VALID_STATUSES:
+            raise ValueError(
+                f"status inválido: '{status}'. Use: {', '.join(FinancialService.VALID_STATUSES)}"
+            )
+        if kind and kind not in FinancialService.VALID_KINDS:
+            raise ValueError(
+                f"kind inválido: '{kind}'. Use: {', '.join(FinancialService.VALID_KINDS)}"
+            )
 
-        total = FinancialRepository.count_total(
+        rows = FinancialRepository.stream_rows(
             db=db,
+            batch_size=FinancialService.EXPORT_BATCH_SIZE,
             user_id=user_id,
             status=status,
             kind=kind,
             date_from=date_from,
             date_to=date_to
         )
+        if export_format == "csv":
+            return FinancialService._iter_csv(rows)
+        return FinancialService._iter_ndjson(rows)
 
-        return {
-            "items": entries,
-            "page": page,
-            "page_size": page_size,
-            "total": total
-        }
+    @staticmethod
+    def _iter_csv(rows) -> Iterator[str]:
+        """Gera CSV em blocos de EXPORT_BATCH_SIZE linhas."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for count, row in enumerate(rows, start=1):
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else ("" if value is None else value)
+                for value in row
+            ])
+            if count % FinancialService.EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    def _iter_ndjson(rows) -> Iterator[str]:
+        """Gera NDJSON (um objeto por linha) em blocos de EXPORT_BATCH_SIZE linhas."""
+        lines = []
+        for row in rows:
+            item = dict(zip(EXPORT_COLUMNS, row))
+            item["amount"] = float(item["amount"])  # mesmo tipo de FinancialEntryResponse
+            lines.append(json.dumps(
+                item,
+                default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v),
+                ensure_ascii=False
+            ))
+            if len(lines) == FinancialService.EXPORT_BATCH_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
 
     @staticmethod
     def get_entry_by_id(db: Session, entry_id: UUID) -> Optional[FinancialEntry]:
@@ -128,6 +251,32 @@ class FinancialService:
         Returns:
             FinancialEntry criado
         """
+        amount, description = FinancialService._validate_manual_fields(kind, amount, description)
+
+        # Criar lançamento
+        entry = FinancialEntry(
+            user_id=user_id,
+            order_id=None,  # Lançamento manual
+            kind=kind,
+            status='pending',
+            amount=amount,
+            description=description,
+            occurred_at=occurred_at or datetime.utcnow()
+        )
+
+        return FinancialRepository.create(db=db, entry=entry)
+
+    @staticmethod
+    def _validate_manual_fields(kind: str, amount, description: str) -> Tuple[Decimal, str]:
+        """
+        Regras de kind/amount/description do lançamento manual.
+        
+        Returns:
+            (amount como Decimal, description sem espaços nas pontas)
+            
+        Raises:
+            ValueError: Se algum campo for inválido
+        """
         # Validação de kind
         if kind not in FinancialService.VALID_KINDS:
             raise ValueError(
@@ -137,24 +286,85 @@ class FinancialService:
         # Validação de amount
         if amount is None or amount < 0:
             raise ValueError("amount deve ser >= 0")
+        amount = Decimal(str(amount))
+        if amount >= FinancialService.MAX_AMOUNT:
+            raise ValueError(f"amount deve ser < {FinancialService.MAX_AMOUNT}")
 
         # Validação de description
         description = (description or "").strip()
         if not description:
             raise ValueError("description é obrigatório e não pode estar vazio")
+        if len(description) > FinancialService.MAX_DESCRIPTION_LENGTH:
+            raise ValueError(
+                f"description deve ter no máximo {FinancialService.MAX_DESCRIPTION_LENGTH} caracteres"
+            )
 
-        # Criar lançamento
-        entry = FinancialEntry(
-            user_id=user_id,
-            order_id=None,  # Lançamento manual
-            kind=kind,
-            status='pending',
-            amount=Decimal(str(amount)),
-            description=description,
-            occurred_at=occurred_at or datetime.utcnow()
-        )
+        return amount, description
 
-        return FinancialRepository.create(db=db, entry=entry)
+    @staticmethod
+    def bulk_create_manual_entries(
+        db: Session,
+        user_id: UUID,
+        items: List[Dict],
+        mode: str = "all_or_nothing"
+    ) -> Dict:
+        """
+        Cria lançamentos manuais em lote (um único INSERT ... RETURNING).
+        
+        Cada item passa pelas mesmas regras de create_manual_entry.
+        
+        Modos:
+        - all_or_nothing: se alguma linha for inválida nada é gravado
+          (created=0 e errors preenchido)
+        - per_row: grava as linhas válidas e reporta as inválidas
+        
+        Args:
+            db: Sessão SQLAlchemy
+            user_id: UUID do usuário (vem do token JWT)
+            items: [{"kind", "amount", "description", "occurred_at"}, ...]
+            mode: 'all_or_nothing' ou 'per_row'
+            
+        Returns:
+            Dict com mode, created, failed, items (criados) e errors [{index, error}]
+        """
+        if mode not in FinancialService.BULK_MODES:
+            raise ValueError(
+                f"mode inválido: '{mode}'. Use: {', '.join(FinancialService.BULK_MODES)}"
+            )
+        if len(items) > FinancialService.MAX_BULK_ITEMS:
+            raise ValueError(f"máximo de {FinancialService.MAX_BULK_ITEMS} itens por lote")
+
+        now = datetime.utcnow()
+        rows = []
+        errors = []
+        for index, item in enumerate(items):
+            try:
+                amount, description = FinancialService._validate_manual_fields(
+                    item.get("kind"), item.get("amount"), item.get("description")
+                )
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+            rows.append({
+                "user_id": user_id,
+                "kind": item["kind"],
+                "status": "pending",
+                "amount": amount,
+                "description": description,
+                "occurred_at": item.get("occurred_at") or now
+            })
+
+        if errors and mode == "all_or_nothing":
+            rows = []
+
+        created = FinancialRepository.bulk_create(db=db, rows=rows)
+        return {
+            "mode": mode,
+            "created": len(created),
+            "failed": len(errors),
+            "items": created,
+            "errors": errors
+        }
 
     @staticmethod
     def create_from_order(
@@ -271,6 +481,128 @@ class FinancialService:
             "Apenas 'pending' pode mudar para 'paid' ou 'canceled'."
         )
 
+    @staticmethod
+    def bulk_update_status(
+        db: Session,
+        new_status: str,
+        user_id: Optional[UUID] = None,
+        ids: Optional[List[UUID]] = None,
+        kind: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Atualiza status em lote com as regras de update_status.
+        
+        Um único UPDATE ... WHERE status = 'pending' RETURNING aplica a
+        transição a todos os elegíveis (por lista de IDs ou por filtro).
+        Por filtro, date_from e date_to são obrigatórios e o lote é recusado
+        se mais de MAX_BULK_ITEMS pending casarem (contagem antes do UPDATE,
+        que também é limitado); a resposta traz só as contagens.
+        Para lista de IDs, cada ID não atualizado recebe o motivo:
+        - unchanged: já estava no status desejado
+        - invalid_transition: status atual não permite a transição
+        - not_found: inexistente, deletado ou de outro usuário
+        
+        Args:
+            db: Sessão SQLAlchemy
+            new_status: Status de destino
+            user_id: Filtro multi-tenant (None = admin)
+            ids: IDs a atualizar (exclusivo com os filtros)
+            kind, date_from, date_to: Filtros (aplicados quando ids é None)
+            
+        Returns:
+            Dict com status, updated, rejected e results [{id, outcome, error}]
+            (results vazio no modo filtro)
+        """
+        if new_status not in FinancialService.VALID_STATUSES:
+            raise ValueError(
+                f"status inválido: '{new_status}'. Use: {', '.join(FinancialService.VALID_STATUSES)}"
+            )
+        if kind and kind not in FinancialService.VALID_KINDS:
+            raise ValueError(
+                f"kind inválido: '{kind}'. Use: {', '.join(FinancialService.VALID_KINDS)}"
+            )
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))  # remove duplicados mantendo a ordem
+            if len(ids) > FinancialService.MAX_BULK_ITEMS:
+                raise ValueError(f"máximo de {FinancialService.MAX_BULK_ITEMS} IDs por lote")
+        else:
+            if date_from is None or date_to is None:
+                raise ValueError("Filtro exige date_from e date_to")
+            if date_from > date_to:
+                raise ValueError("date_from deve ser anterior ou igual a date_to")
+
+        # Só pending sai do lugar (pending → paid/canceled)
+        updated = []
+        if new_status != 'pending':
+            limit = None
+            if ids is None:
+                limit = FinancialService.MAX_BULK_ITEMS
+                matching = FinancialRepository.count_pending(
+                    db=db,
+                    user_id=user_id,
+                    kind=kind,
+                    date_from=date_from,
+                    date_to=date_to,
+                    limit=limit + 1
+                )
+                if matching > limit:
+                    raise ValueError(
+                        f"Filtro atinge mais de {limit} lançamentos pending; reduza o período"
+                    )
+            updated = FinancialRepository.bulk_update_status(
+                db=db,
+                new_status=new_status,
+                ids=ids,
+                user_id=user_id,
+                kind=kind,
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit
+            )
+
+        results = []
+
+        if ids is not None:
+            updated_ids = {row.id for row in updated}
+            remaining = [entry_id for entry_id in ids if entry_id not in updated_ids]
+            current = {
+                row.id: row
+                for row in FinancialRepository.get_status_by_ids(db=db, ids=remaining)
+            } if remaining else {}
+
+            results = []
+            for entry_id in ids:
+                row = current.get(entry_id)
+                if entry_id in updated_ids:
+                    results.append({"id": entry_id, "outcome": "updated", "error": None})
+                elif row is None or row.deleted_at is not None or (user_id and row.user_id != user_id):
+                    # Mesmo tratamento do endpoint unitário: não revela existência
+                    results.append({
+                        "id": entry_id,
+                        "outcome": "not_found",
+                        "error": f"Lançamento {entry_id} não encontrado"
+                    })
+                elif row.status == new_status:
+                    results.append({"id": entry_id, "outcome": "unchanged", "error": None})
+                else:
+                    results.append({
+                        "id": entry_id,
+                        "outcome": "invalid_transition",
+                        "error": (
+                            f"Transição inválida: {row.status} → {new_status}. "
+                            "Apenas 'pending' pode mudar para 'paid' ou 'canceled'."
+                        )
+                    })
+
+        return {
+            "status": new_status,
+            "updated": len(updated),
+            "rejected": sum(1 for r in results if r["outcome"] in ("not_found", "invalid_transition")),
+            "results": results
+        }
+
     @staticmethod
     def cancel_entry_by_order(db: Session, order_id: UUID) -> Optional[FinancialEntry]:
         """
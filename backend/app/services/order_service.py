@@ -12,6 +12,7 @@ from app.models.order import Order
 from app.models.user import User
 from app.models.financial_entry import FinancialEntry
 from app.repositories.order_repository import OrderRepository
+from app.utils.pagination import decode_cursor, keyset_page, validate_total_mode
 from app.services.financial_service import FinancialService
 from app.exceptions.errors import NotFoundError, ValidationError
 
@@ -24,7 +25,9 @@ class OrderService:
         db: Session, 
         page: int = 1, 
         page_size: int = 20,
-        user_id: Optional[UUID] = None
+        user_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
     ) -> Dict:
         """
         Lista pedidos com paginação.
@@ -35,8 +38,11 @@ class OrderService:
         Regras de negócio:
         - page mínimo: 1
         - page_size máximo: 100 (proteção de performance)
+        - cursor informado: paginação keyset (page é ignorado)
+        - total_mode: exact (COUNT), estimate (planner) ou none (sem total)
         
-        Retorna: {"items": [...], "page": 1, "page_size": 20, "total": 123}
+        Retorna: {"items": [...], "page": 1, "page_size": 20, "total": 123 | None,
+                  "total_mode": "exact", "has_more": bool, "next_cursor": "..." | None}
         """
         # Validação: page >= 1
         if page < 1:
@@ -48,19 +54,37 @@ class OrderService:
         if page_size < 1:
             page_size = 1
 
-        # Busca dados (filtrando por user_id se fornecido)
-        if user_id:
-            orders = OrderRepository.list_by_user(db=db, user_id=user_id, page=page, page_size=page_size)
-            total = OrderRepository.count_by_user(db=db, user_id=user_id)
+        validate_total_mode(total_mode)
+
+        # Busca dados (filtrando por user_id se fornecido; page_size + 1 indica has_more)
+        if cursor:
+            rows = OrderRepository.list_keyset(
+                db=db, page_size=page_size, after=decode_cursor(cursor), user_id=user_id
+            )
+        elif user_id:
+            rows = OrderRepository.list_by_user(
+                db=db, user_id=user_id, page=page, page_size=page_size, extra_row=True
+            )
         else:
-            orders = OrderRepository.list_paginated(db=db, page=page, page_size=page_size)
-            total = OrderRepository.count_total(db=db)
+            rows = OrderRepository.list_paginated(db=db, page=page, page_size=page_size, extra_row=True)
+        orders, next_cursor = keyset_page(rows, page_size, "created_at")
+
+        total = None
+        if total_mode != "none":
+            estimate = total_mode == "estimate"
+            if user_id:
+                total = OrderRepository.count_by_user(db=db, user_id=user_id, estimate=estimate)
+            else:
+                total = OrderRepository.count_total(db=db, estimate=estimate)
 
         return {
             "items": orders,
             "page": page,
             "page_size": page_size,
-            "total": total
+            "total": total,
+            "total_mode": total_mode,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor
         }
 
     @staticmethod
@@ -3,45 +3,230 @@ Service para Relatórios Financeiros - regras de negócio e validações.
 Camada de validações, transformações e lógica de negócio para relatórios.
 """
 
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from app.repositories.report_repository import ReportRepository
+from app.config import REPORT_DEFAULT_TIMEZONE
+from app.repositories.report_repository import ReportRepository, DEFAULT_AGING_LIMITS
+from app.core.report_cache import report_cache
+
+
+# Chave em Session.info da memo do vetor diário e dos períodos do cashflow
+# (ver ReportService.daily_vector e ReportService.cashflow_periods)
+DAILY_VECTOR_MEMO = "report_daily_vector"
 
 
 class ReportService:
-    """Service com regras de negócio para relatórios financeiros."""
+    """
+    Service com regras de negócio para relatórios financeiros.
+    
+    Resultados agregados passam pelo report_cache (chave: relatório, user_id
+    e parâmetros, incluindo a timezone), invalidado quando lançamentos do
+    tenant mudam.
+    
+    Dias dos relatórios são dias locais na timezone tz (IANA, ex.:
+    America/Sao_Paulo; padrão REPORT_DEFAULT_TIMEZONE).
+    """
 
     # Constantes de validação
     MAX_DATE_RANGE_DAYS = 366  # Máximo 1 ano de dados
+    # Cashflow agregado: mais períodos de histórico com poucas linhas na resposta
+    MAX_DATE_RANGE_DAYS_BY_GRANULARITY = {
+        "day": MAX_DATE_RANGE_DAYS,
+        "week": 3 * 366,     # ~157 semanas
+        "month": 10 * 366,   # ~120 meses
+        "quarter": 10 * 366  # ~40 trimestres
+    }
     MAX_TOP_LIMIT = 50
     DEFAULT_TOP_LIMIT = 10
     VALID_KINDS = ['revenue', 'expense']
     VALID_STATUSES = ['pending', 'paid', 'canceled']
+    MAX_AGING_BUCKETS = 10
 
     @staticmethod
-    def validate_date_range(date_from: date, date_to: date) -> None:
+    def validate_date_range(date_from: date, date_to: date, max_days: Optional[int] = None) -> None:
         """
         Valida intervalo de datas.
         
         Regras:
         - date_from <= date_to
-        - Intervalo máximo de 366 dias
+        - Intervalo máximo de max_days (padrão: MAX_DATE_RANGE_DAYS = 366 dias)
         
         Raises:
             ValueError: Se validação falhar
         """
+        if max_days is None:
+            max_days = ReportService.MAX_DATE_RANGE_DAYS
+        
         if date_from > date_to:
             raise ValueError(f"date_from ({date_from}) não pode ser maior que date_to ({date_to})")
         
         days_diff = (date_to - date_from).days
-        if days_diff > ReportService.MAX_DATE_RANGE_DAYS:
+        if days_diff > max_days:
             raise ValueError(
                 f"Intervalo muito grande: {days_diff} dias. "
-                f"Máximo permitido: {ReportService.MAX_DATE_RANGE_DAYS} dias"
+                f"Máximo permitido: {max_days} dias"
+            )
+
+    @staticmethod
+    def validate_granularity(granularity: str) -> int:
+        """
+        Valida a granularidade do cashflow.
+        
+        Returns:
+            int: Intervalo máximo (dias) permitido para a granularidade
+        
+        Raises:
+            ValueError: Se granularidade inválida
+        """
+        if granularity not in ReportService.MAX_DATE_RANGE_DAYS_BY_GRANULARITY:
+            raise ValueError(
+                f"granularity inválido: '{granularity}'. "
+                f"Use: {', '.join(ReportService.MAX_DATE_RANGE_DAYS_BY_GRANULARITY)}"
+            )
+        return ReportService.MAX_DATE_RANGE_DAYS_BY_GRANULARITY[granularity]
+
+    @staticmethod
+    def validate_timezone(tz: Optional[str]) -> str:
+        """
+        Valida a timezone dos relatórios.
+        
+        Returns:
+            str: Nome IANA (None/vazio = REPORT_DEFAULT_TIMEZONE)
+        
+        Raises:
+            ValueError: Se a timezone não existir
+        """
+        if tz is None or not tz.strip():
+            return REPORT_DEFAULT_TIMEZONE
+        
+        tz = tz.strip()
+        try:
+            ZoneInfo(tz)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"tz inválido: '{tz}'. Use um nome IANA (ex: America/Sao_Paulo, UTC)")
+        return tz
+
+    @staticmethod
+    def validate_top_filters(kind: str, status: str) -> None:
+        """
+        Valida kind/status do top lançamentos.
+        
+        Raises:
+            ValueError: Se kind ou status inválido
+        """
+        if kind not in ReportService.VALID_KINDS:
+            raise ValueError(
+                f"kind inválido: '{kind}'. Use: {', '.join(ReportService.VALID_KINDS)}"
+            )
+        
+        if status not in ReportService.VALID_STATUSES:
+            raise ValueError(
+                f"status inválido: '{status}'. Use: {', '.join(ReportService.VALID_STATUSES)}"
+            )
+
+    @staticmethod
+    def parse_aging_buckets(buckets: Optional[str]) -> tuple:
+        """
+        Converte "15,45,90" em limites superiores de faixas de aging.
+        
+        Regras:
+        - Inteiros positivos, estritamente crescentes
+        - Máximo de MAX_AGING_BUCKETS limites
+        - None/vazio = padrão (7, 30)
+        
+        Raises:
+            ValueError: Se formato inválido
+        """
+        if buckets is None or not buckets.strip():
+            return DEFAULT_AGING_LIMITS
+        
+        try:
+            limits = tuple(int(part) for part in buckets.split(",") if part.strip())
+        except ValueError:
+            raise ValueError(f"buckets inválido: '{buckets}'. Use inteiros separados por vírgula (ex: 15,45,90)")
+        
+        if not limits:
+            return DEFAULT_AGING_LIMITS
+        if len(limits) > ReportService.MAX_AGING_BUCKETS:
+            raise ValueError(f"buckets: máximo de {ReportService.MAX_AGING_BUCKETS} limites")
+        if limits[0] < 1 or any(b <= a for a, b in zip(limits, limits[1:])):
+            raise ValueError("buckets deve conter inteiros positivos em ordem crescente (ex: 15,45,90)")
+        
+        return limits
+
+    @staticmethod
+    def daily_vector(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        user_id: Optional[UUID] = None,
+        tz: str = REPORT_DEFAULT_TIMEZONE,
+        granularity: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Vetor diário (dia, kind, status) do período, base de DRE e aging.
+        
+        Memoizado em dois níveis:
+        - db.info: mesma sessão/transação (ex.: dashboard calcula os dois
+          relatórios com uma consulta, mesmo com REPORT_CACHE_BACKEND=none)
+        - report_cache ("daily_vector"): entre requests; o cliente que pede
+          DRE e aging do mesmo período paga uma agregação só
+        
+        Com granularity, a agregação (se não estiver em cache) sai junto com
+        os períodos do cashflow na mesma consulta
+        (ReportRepository.daily_vector_with_cashflow), memoizados para
+        cashflow_periods.
+        
+        A memo da sessão é descartada em flush/commit/rollback.
+        """
+        memo = db.info.setdefault(DAILY_VECTOR_MEMO, {})
+        key = ("vector", user_id, date_from, date_to, tz)
+        
+        def compute():
+            if granularity is None:
+                return ReportRepository.daily_vector(db, date_from, date_to, user_id=user_id, tz=tz)
+            vector, periods = ReportRepository.daily_vector_with_cashflow(
+                db, date_from, date_to, granularity, user_id=user_id, tz=tz
+            )
+            memo[("cashflow", user_id, date_from, date_to, tz, granularity)] = periods
+            return vector
+        
+        if key not in memo:
+            memo[key] = report_cache.get_or_compute(
+                "daily_vector",
+                user_id,
+                {"date_from": date_from, "date_to": date_to, "tz": tz},
+                compute
+            )
+        return memo[key]
+
+    @staticmethod
+    def cashflow_periods(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        user_id: Optional[UUID] = None,
+        granularity: str = "day",
+        tz: str = REPORT_DEFAULT_TIMEZONE
+    ) -> List[dict]:
+        """
+        Períodos do cashflow, agrupados e completados no banco (cashflow_daily).
+        
+        Memoizado na sessão como daily_vector: o painel já os recebe da
+        consulta do vetor diário.
+        """
+        memo = db.info.setdefault(DAILY_VECTOR_MEMO, {})
+        key = ("cashflow", user_id, date_from, date_to, tz, granularity)
+        if key not in memo:
+            memo[key] = ReportRepository.cashflow_daily(
+                db, date_from, date_to, user_id=user_id, granularity=granularity, tz=tz
             )
+        return memo[key]
 
     @staticmethod
     def get_dre(
@@ -49,7 +234,8 @@ class ReportService:
         date_from: date,
         date_to: date,
         user_id: Optional[UUID] = None,
-        include_canceled: bool = False
+        include_canceled: bool = False,
+        tz: Optional[str] = None
     ) -> dict:
         """
         DRE Simplificada - Demonstração de Resultado do Exercício.
@@ -60,10 +246,11 @@ class ReportService:
             date_to: Data final (obrigatório)
             user_id: Filtro multi-tenant (None = admin vê tudo)
             include_canceled: Se True, inclui lançamentos cancelados
+            tz: Timezone IANA dos dias (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             {
-                "period": {"date_from": date, "date_to": date},
+                "period": {"date_from": date, "date_to": date, "tz": str},
                 "revenue_paid_total": float,
                 "expense_paid_total": float,
                 "net_paid": float,
@@ -73,23 +260,27 @@ class ReportService:
                 "count_entries_total": int
             }
         """
-        # Validar intervalo de datas
+        # Validar intervalo de datas e timezone
         ReportService.validate_date_range(date_from, date_to)
+        tz = ReportService.validate_timezone(tz)
         
-        # Buscar dados agregados
-        summary = ReportRepository.dre_summary(
-            db=db,
-            date_from=date_from,
-            date_to=date_to,
-            user_id=user_id,
-            include_canceled=include_canceled
+        # Buscar dados agregados (cache por tenant + parâmetros)
+        summary = report_cache.get_or_compute(
+            "dre",
+            user_id,
+            {"date_from": date_from, "date_to": date_to, "include_canceled": include_canceled, "tz": tz},
+            lambda: ReportRepository.dre_from_daily(
+                ReportService.daily_vector(db, date_from, date_to, user_id, tz),
+                include_canceled
+            )
         )
         
         # Montar resposta
         return {
             "period": {
                 "date_from": date_from,
-                "date_to": date_to
+                "date_to": date_to,
+                "tz": tz
             },
             **summary
         }
@@ -100,10 +291,19 @@ class ReportService:
         date_from: date,
         date_to: date,
         user_id: Optional[UUID] = None,
-        include_canceled: bool = False
+        include_canceled: bool = False,
+        granularity: str = "day",
+        tz: Optional[str] = None
     ) -> dict:
         """
-        Fluxo de caixa diário com série temporal completa (preenche zeros).
+        Fluxo de caixa com série temporal completa (períodos sem dados com zeros).
+        
+        Períodos agrupados (date_trunc) e completados (generate_series) no
+        banco: a resposta tem uma linha por período (ver cashflow_periods).
+        
+        granularity agrupa por dia, semana (ISO, início na segunda), mês ou
+        trimestre; "date" de cada item é o início do período. O intervalo
+        máximo cresce com a granularidade (MAX_DATE_RANGE_DAYS_BY_GRANULARITY).
         
         Args:
             db: Sessão SQLAlchemy
@@ -111,10 +311,13 @@ class ReportService:
             date_to: Data final
             user_id: Filtro multi-tenant
             include_canceled: Se True, inclui canceled
+            granularity: 'day' (padrão), 'week', 'month' ou 'quarter'
+            tz: Timezone IANA dos dias (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             {
-                "period": {"date_from": date, "date_to": date},
+                "period": {"date_from": date, "date_to": date, "tz": str},
+                "granularity": str,
                 "days": [
                     {
                         "date": date,
@@ -129,57 +332,33 @@ class ReportService:
                 ]
             }
         """
-        # Validar intervalo
-        ReportService.validate_date_range(date_from, date_to)
-        
-        # Buscar dados agregados do banco (apenas dias com dados)
-        daily_data = ReportRepository.cashflow_daily(
-            db=db,
-            date_from=date_from,
-            date_to=date_to,
-            user_id=user_id,
-            include_canceled=include_canceled
+        # Validar granularidade e intervalo (limite depende da granularidade)
+        ReportService.validate_date_range(
+            date_from, date_to, ReportService.validate_granularity(granularity)
         )
+        tz = ReportService.validate_timezone(tz)
         
-        # Criar dict de lookup rápido: date -> data
-        data_by_date = {item["date"]: item for item in daily_data}
-        
-        # Preencher série temporal completa (todos os dias)
-        complete_days = []
-        current_date = date_from
-        
-        while current_date <= date_to:
-            if current_date in data_by_date:
-                # Dia com dados: copiar para não mutar original
-                day_data = dict(data_by_date[current_date])
-            else:
-                # Dia sem dados: criar com zeros
-                day_data = {
-                    "date": current_date,
-                    "revenue_paid": 0.0,
-                    "expense_paid": 0.0,
-                    "revenue_pending": 0.0,
-                    "expense_pending": 0.0
-                }
-            
-            # Garantir tipos float e calcular net (sempre)
-            rp = float(day_data["revenue_paid"])
-            ep = float(day_data["expense_paid"])
-            rpen = float(day_data["revenue_pending"])
-            epen = float(day_data["expense_pending"])
-            
-            day_data["net_paid"] = rp - ep
-            day_data["net_expected"] = (rp + rpen) - (ep + epen)
-            
-            complete_days.append(day_data)
-            current_date += timedelta(days=1)
+        periods = report_cache.get_or_compute(
+            "cashflow_daily",
+            user_id,
+            {
+                "date_from": date_from,
+                "date_to": date_to,
+                "include_canceled": include_canceled,
+                "granularity": granularity,
+                "tz": tz
+            },
+            lambda: ReportService.cashflow_periods(db, date_from, date_to, user_id, granularity, tz)
+        )
         
         return {
             "period": {
                 "date_from": date_from,
-                "date_to": date_to
+                "date_to": date_to,
+                "tz": tz
             },
-            "days": complete_days
+            "granularity": granularity,
+            "days": periods
         }
 
     @staticmethod
@@ -188,7 +367,9 @@ class ReportService:
         date_from: date,
         date_to: date,
         user_id: Optional[UUID] = None,
-        reference_date: Optional[date] = None
+        reference_date: Optional[date] = None,
+        buckets: Optional[str] = None,
+        tz: Optional[str] = None
     ) -> dict:
         """
         Aging de pendências - classificação em faixas de dias.
@@ -201,17 +382,21 @@ class ReportService:
             date_from: Data inicial (occurred_at)
             date_to: Data final (occurred_at)
             user_id: Filtro multi-tenant
-            reference_date: Data de referência (default: hoje)
+            reference_date: Data de referência (default: hoje em tz)
+            buckets: Limites das faixas em dias, ex: "15,45,90" (default: "7,30")
+            tz: Timezone IANA dos dias (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             {
-                "period": {"date_from": date, "date_to": date},
+                "period": {"date_from": date, "date_to": date, "tz": str},
                 "reference_date": date,
+                "bucket_limits": [int, ...],
                 "pending_revenue": {
                     "0_7_days": float,
                     "8_30_days": float,
                     "31_plus_days": float,
-                    "total": float
+                    "total": float,
+                    "buckets": [{"label": str, "min_days": int, "max_days": int | None, "amount": float}]
                 },
                 "pending_expense": {...}
             }
@@ -219,25 +404,40 @@ class ReportService:
         # Validar intervalo
         ReportService.validate_date_range(date_from, date_to)
         
-        # Reference date padrão: hoje
+        # Validar faixas e timezone
+        bucket_limits = ReportService.parse_aging_buckets(buckets)
+        tz = ReportService.validate_timezone(tz)
+        
+        # Reference date padrão: hoje na timezone do relatório
         if reference_date is None:
-            reference_date = date.today()
+            reference_date = datetime.now(ZoneInfo(tz)).date()
         
         # Buscar aging
-        aging_data = ReportRepository.aging_pending(
-            db=db,
-            date_from=date_from,
-            date_to=date_to,
-            reference_date=reference_date,
-            user_id=user_id
+        aging_data = report_cache.get_or_compute(
+            "aging",
+            user_id,
+            {
+                "date_from": date_from,
+                "date_to": date_to,
+                "reference_date": reference_date,
+                "bucket_limits": list(bucket_limits),
+                "tz": tz
+            },
+            lambda: ReportRepository.aging_from_daily(
+                ReportService.daily_vector(db, date_from, date_to, user_id, tz),
+                reference_date,
+                bucket_limits
+            )
         )
         
         return {
             "period": {
                 "date_from": date_from,
-                "date_to": date_to
+                "date_to": date_to,
+                "tz": tz
             },
             "reference_date": reference_date,
+            "bucket_limits": list(bucket_limits),
             **aging_data
         }
 
@@ -249,10 +449,11 @@ class ReportService:
         date_from: date,
         date_to: date,
         limit: int = DEFAULT_TOP_LIMIT,
-        user_id: Optional[UUID] = None
+        user_id: Optional[UUID] = None,
+        tz: Optional[str] = None
     ) -> dict:
         """
-        Top lançamentos por valor (agregados por descrição).
+        Top lançamentos por valor (agregados por descrição normalizada).
         
         Args:
             db: Sessão SQLAlchemy
@@ -262,15 +463,17 @@ class ReportService:
             date_to: Data final
             limit: Limite de resultados (default 10, max 50)
             user_id: Filtro multi-tenant
+            tz: Timezone IANA de date_from/date_to (None = REPORT_DEFAULT_TIMEZONE)
             
         Returns:
             {
-                "period": {"date_from": date, "date_to": date},
+                "period": {"date_from": date, "date_to": date, "tz": str},
                 "kind": str,
                 "status": str,
                 "items": [
                     {
                         "description": str,
+                        "description_key": str,
                         "total_amount": float,
                         "count": int,
                         "last_occurred_at": datetime
@@ -282,17 +485,9 @@ class ReportService:
         # Validar intervalo
         ReportService.validate_date_range(date_from, date_to)
         
-        # Validar kind
-        if kind not in ReportService.VALID_KINDS:
-            raise ValueError(
-                f"kind inválido: '{kind}'. Use: {', '.join(ReportService.VALID_KINDS)}"
-            )
-        
-        # Validar status
-        if status not in ReportService.VALID_STATUSES:
-            raise ValueError(
-                f"status inválido: '{status}'. Use: {', '.join(ReportService.VALID_STATUSES)}"
-            )
+        # Validar kind, status e timezone
+        ReportService.validate_top_filters(kind, status)
+        tz = ReportService.validate_timezone(tz)
         
         # Validar e ajustar limit
         if limit < 1:
@@ -301,22 +496,110 @@ class ReportService:
             limit = ReportService.MAX_TOP_LIMIT
         
         # Buscar top entries
-        items = ReportRepository.top_entries(
-            db=db,
-            kind=kind,
-            status=status,
-            date_from=date_from,
-            date_to=date_to,
-            limit=limit,
-            user_id=user_id
+        items = report_cache.get_or_compute(
+            "top",
+            user_id,
+            {"kind": kind, "status": status, "date_from": date_from, "date_to": date_to, "limit": limit, "tz": tz},
+            lambda: ReportRepository.top_entries(
+                db=db,
+                kind=kind,
+                status=status,
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit,
+                user_id=user_id,
+                tz=tz
+            )
         )
         
         return {
             "period": {
                 "date_from": date_from,
-                "date_to": date_to
+                "date_to": date_to,
+                "tz": tz
             },
             "kind": kind,
             "status": status,
             "items": items
         }
+
+
+    @staticmethod
+    def get_dashboard(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        user_id: Optional[UUID] = None,
+        include_canceled: bool = False,
+        reference_date: Optional[date] = None,
+        buckets: Optional[str] = None,
+        top_kind: str = "revenue",
+        top_status: str = "paid",
+        top_limit: int = DEFAULT_TOP_LIMIT,
+        granularity: str = "day",
+        tz: Optional[str] = None
+    ) -> dict:
+        """
+        Painel: DRE, cashflow, aging e top lançamentos do mesmo período.
+        
+        DRE, aging e cashflow saem de uma consulta: o vetor diário (CTE,
+        base de DRE e aging) e os períodos do cashflow agrupados sobre ele no
+        banco (ver daily_vector com granularity). Top lançamentos (agrupa por
+        descrição) tem consulta própria. Os resultados usam as mesmas chaves
+        de cache dos endpoints individuais.
+        
+        Args:
+            db: Sessão SQLAlchemy
+            date_from: Data inicial
+            date_to: Data final
+            user_id: Filtro multi-tenant
+            include_canceled: DRE/cashflow incluem cancelados
+            reference_date: Referência do aging (default: hoje)
+            buckets: Faixas do aging (ver get_aging_pending)
+            top_kind, top_status, top_limit: Parâmetros do top lançamentos
+            granularity: Períodos do cashflow (ver get_cashflow_daily)
+            tz: Timezone IANA dos dias (mesma para os quatro relatórios)
+            
+        Returns:
+            {"period": {...}, "dre": {...}, "cashflow": {...}, "aging": {...}, "top": {...}}
+        """
+        # Validar tudo antes de consultar
+        ReportService.validate_date_range(date_from, date_to)
+        ReportService.parse_aging_buckets(buckets)
+        ReportService.validate_top_filters(top_kind, top_status)
+        ReportService.validate_granularity(granularity)
+        tz = ReportService.validate_timezone(tz)
+        
+        # Vetor diário + cashflow numa consulta (memo da sessão)
+        ReportService.daily_vector(db, date_from, date_to, user_id, tz, granularity=granularity)
+        
+        return {
+            "period": {
+                "date_from": date_from,
+                "date_to": date_to,
+                "tz": tz
+            },
+            "dre": ReportService.get_dre(
+                db, date_from, date_to, user_id=user_id, include_canceled=include_canceled, tz=tz
+            ),
+            "cashflow": ReportService.get_cashflow_daily(
+                db, date_from, date_to, user_id=user_id,
+                include_canceled=include_canceled, granularity=granularity, tz=tz
+            ),
+            "aging": ReportService.get_aging_pending(
+                db, date_from, date_to, user_id=user_id,
+                reference_date=reference_date, buckets=buckets, tz=tz
+            ),
+            "top": ReportService.get_top_entries(
+                db, kind=top_kind, status=top_status, date_from=date_from, date_to=date_to,
+                limit=top_limit, user_id=user_id, tz=tz
+            )
+        }
+
+
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _discard_daily_vector_memo(session: Session, *args) -> None:
+    """Escrita ou fim de transação invalida a memo do vetor diário da sessão."""
+    session.info.pop(DAILY_VECTOR_MEMO, None)
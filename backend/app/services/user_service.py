@@ -7,6 +7,7 @@ from typing import List, Dict
 
 from app.models.user import User
 from app.repositories.user_repo import UserRepository
+from app.security.user_cache import auth_user_cache
 from app.schemas.user_schema import UserCreate, UserUpdate
 from app.exceptions.errors import NotFoundError, ConflictError
 
@@ -88,9 +89,12 @@ class UserService:
         if user_data.is_active is not None:
             user.is_active = user_data.is_active
         
-        return self.repo.update(user)
+        user = self.repo.update(user)
+        auth_user_cache.invalidate(user_id)
+        return user
     
     def delete_user(self, user_id: UUID) -> None:
         """Deleta usuário"""
         user = self.get_user_by_id(user_id)
         self.repo.delete(user)
+        auth_user_cache.invalidate(user_id)
@@ -0,0 +1,44 @@
+"""
+Utilitários para o caminho async de banco (AsyncSession + asyncpg)
+
+As consultas continuam escritas uma única vez, nos repositórios/services
+sync. As variantes async (AsyncFinancialRepository, AsyncOrderRepository,
+AsyncReportRepository, AsyncAuditLogService) executam o mesmo código via
+AsyncSession.run_sync: o I/O passa pelo asyncpg sem ocupar thread do
+threadpool e o SQL gerado é idêntico ao do caminho sync.
+
+Migrando uma rota (uma por vez):
+1. Trocar `def` por `async def`
+2. Trocar `db: Session = Depends(get_db)` por
+   `db: AsyncSession = Depends(get_async_db)`
+3. Chamar a variante Async* com `await` (mesmos parâmetros)
+
+Piloto: app/routers/audit_log_routes.py.
+
+Escritas e streaming permanecem no caminho sync: invalidação do
+report_cache e do rollup dependem de listeners da Session sync e do
+backend de cache sync.
+"""
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def async_variant(func: Callable[..., Any]) -> staticmethod:
+    """
+    Cria a versão async de um método estático que recebe `db: Session`
+    como primeiro argumento.
+
+    Args:
+        func: método sync (ex: FinancialRepository.list_paginated)
+
+    Returns:
+        staticmethod async com a assinatura (db: AsyncSession, *args, **kwargs)
+    """
+    async def wrapper(db: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+        return await db.run_sync(func, *args, **kwargs)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__qualname__ = f"Async{func.__qualname__}"
+    wrapper.__doc__ = f"Versão async de {func.__qualname__} (AsyncSession.run_sync)."
+    return staticmethod(wrapper)
@@ -1,9 +1,25 @@
 """
 Utilitários para paginação
 """
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+
 from app.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
+# Modos de cálculo do total em listagens paginadas
+# - exact: COUNT(*) com os mesmos filtros (padrão)
+# - estimate: estimativa de linhas do planner (EXPLAIN), sem varrer a tabela
+# - none: sem total; cliente usa has_more / next_cursor
+TOTAL_MODES = ("exact", "estimate", "none")
+
+
 def validate_pagination(page: int, page_size: int) -> tuple:
     """
     Valida e normaliza parâmetros de paginação
@@ -30,6 +46,44 @@ def validate_pagination(page: int, page_size: int) -> tuple:
     return page, page_size
 
 
+def validate_total_mode(total_mode: str) -> str:
+    """
+    Valida modo de cálculo do total
+    
+    Raises:
+        ValueError se total_mode não estiver em TOTAL_MODES
+    """
+    if total_mode not in TOTAL_MODES:
+        raise ValueError(f"total_mode inválido: '{total_mode}'. Use: {', '.join(TOTAL_MODES)}")
+    return total_mode
+
+
+def estimate_count(db, query) -> int:
+    """
+    Estima a quantidade de linhas de uma query pelo planner (EXPLAIN)
+    
+    Não executa a query: custo constante mesmo em tabelas grandes.
+    A precisão depende das estatísticas (ANALYZE / autovacuum).
+    
+    Args:
+        db: sessão SQLAlchemy
+        query: Query ORM já filtrada (sem ORDER BY/LIMIT)
+    
+    Returns:
+        int: linhas estimadas (>= 0)
+    """
+    compiled = query.statement.compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    # Escapar ":" para text() não interpretar literais (ex: horários) como binds
+    sql = str(compiled).replace(":", "\\:")
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+
+
 def calculate_skip(page: int, page_size: int) -> int:
     """
     Calcula offset (skip) para query SQL
@@ -69,3 +123,58 @@ def paginate_response(items: list, page: int, page_size: int, total: int) -> dic
         "page_size": page_size,
         "total": total
     }
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """
+    Gera cursor opaco para paginação keyset
+    
+    Args:
+        sort_value: valor da coluna de ordenação do último item (occurred_at/created_at)
+        row_id: id do último item (desempate)
+    
+    Returns:
+        str: cursor base64 url-safe (sem padding)
+    """
+    payload = json.dumps({"v": sort_value.isoformat(), "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decodifica cursor gerado por encode_cursor
+    
+    Args:
+        cursor: cursor opaco recebido do cliente
+    
+    Returns:
+        tuple (sort_value, row_id)
+    
+    Raises:
+        ValueError se cursor inválido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["v"]), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValueError("cursor inválido")
+
+
+def keyset_page(rows: list, page_size: int, sort_attr: str) -> Tuple[list, Optional[str]]:
+    """
+    Separa página e próximo cursor a partir de page_size + 1 linhas
+    
+    Args:
+        rows: resultado da query keyset (até page_size + 1 itens)
+        page_size: tamanho da página
+        sort_attr: atributo de ordenação (ex: "occurred_at")
+    
+    Returns:
+        tuple (items, next_cursor) — next_cursor None na última página
+    """
+    items = rows[:page_size]
+    if len(rows) <= page_size:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(getattr(last, sort_attr), last.id)
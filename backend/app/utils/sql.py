@@ -0,0 +1,45 @@
+"""
+Utilitários para construção de SQL
+"""
+from typing import Any, Iterable, List
+from uuid import UUID
+
+from sqlalchemy import Date, Text, bindparam, cast, func
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
+
+
+def array_param(items: List[Any], item_type):
+    """
+    Parâmetro array tipado para uso com unnest()
+    
+    Escritas em lote enviam uma lista por coluna (1 bind cada) em vez de
+    um bind por valor: o custo de compilar/enviar não cresce com o lote.
+    
+    Args:
+        items: valores da coluna
+        item_type: tipo SQLAlchemy de cada item (ex: Text, Numeric(12, 2))
+    
+    Returns:
+        BindParameter do tipo ARRAY(item_type)
+    """
+    return bindparam(None, items, type_=ARRAY(item_type))
+
+
+def uuid_array_param(items: Iterable[UUID]):
+    """
+    Array de UUIDs (uuid[]) para unnest() ou = ANY(...)
+    
+    O psycopg2 não adapta lista de UUID: envia como text[] e converte no banco.
+    """
+    return cast(array_param([str(item) for item in items], Text), ARRAY(PGUUID(as_uuid=True)))
+
+
+def local_day(column, tz: str):
+    """
+    Dia local de um timestamptz: (timezone(tz, column))::date
+    
+    A timezone vai literal no SQL (não como bind) para a expressão bater com
+    os índices de expressão da migration 009 também em statements preparados
+    (asyncpg). tz deve vir validada (ReportService.validate_timezone).
+    """
+    return cast(func.timezone(bindparam(None, tz, type_=Text, literal_execute=True), column), Date)
@@ -0,0 +1,16 @@
+"""
+Suíte de benchmarks reproduzível (dados sintéticos + matriz fixa de cenários).
+
+Uso (a partir de backend/, banco dedicado — o seed apaga os dados com --reset):
+
+    python -m benchmarks seed --entries 100000 --users 50 --reset
+    python -m benchmarks run --iterations 50 --output bench_<commit>.json
+    python -m benchmarks compare bench_antes.json bench_depois.json
+
+- seed.py: gerador determinístico (COPY) de usuários, pedidos, lançamentos e audit log
+- scenarios.py: cenários HTTP (TestClient) e de service, como admin e como tenant
+- runner.py: medição (p50/p95/p99, throughput), metadados e comparação
+
+Resultados só são comparáveis entre execuções sobre o mesmo dataset
+(mesma SeedConfig → mesmo fingerprint em metadata.dataset).
+"""
@@ -0,0 +1,143 @@
+"""
+CLI dos benchmarks: python -m benchmarks {seed,run,compare} (ver benchmarks/__init__.py).
+"""
+import argparse
+import json
+import sys
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal, engine, without_timeouts
+
+from benchmarks.runner import COMPARE_THRESHOLD, build_context, collect_metadata, compare, run_suite
+from benchmarks.scenarios import scenario_matrix
+from benchmarks.seed import SeedConfig, analyze, seed_database
+
+
+@without_timeouts()
+def cmd_seed(args) -> int:
+    config = SeedConfig(
+        entries=args.entries,
+        users=args.users,
+        months=args.months,
+        seed=args.seed,
+        anchor=date.fromisoformat(args.anchor) if args.anchor else date.today(),
+    )
+    db = SessionLocal()
+    try:
+        result = seed_database(db, config, reset=args.reset)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        db.close()
+    analyze(engine)
+    print(f"✅ Dataset criado em {result['seconds']}s")
+    for table, rows in result["rows"].items():
+        print(f"   {table:<20} {rows:>10}")
+    return 0
+
+
+def _print_result(key: str, result: dict) -> None:
+    latency = result.get("latency_ms")
+    if latency:
+        line = (f"   {key:<42} p50 {latency['p50']:8.2f}  p95 {latency['p95']:8.2f}  "
+                f"p99 {latency['p99']:8.2f} ms  {result['throughput_rps']:8.1f} req/s")
+        if "db_ms" in result:
+            line += f"  db {result['db_ms']['p50']:7.2f} ms/{result['queries']:g} q"
+    else:
+        line = f"   {key:<42} sem amostras"
+    if result["errors"]:
+        line += f"  ⚠️ {result['errors']} erros"
+    print(line)
+
+
+def cmd_run(args) -> int:
+    scenarios = [s for s in scenario_matrix() if not args.filter or args.filter in s.key]
+    if not scenarios:
+        print(f"❌ Nenhum cenário corresponde a '{args.filter}'")
+        return 1
+
+    db = SessionLocal()
+    try:
+        metadata = collect_metadata(db)
+    finally:
+        db.close()
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        try:
+            ctx = build_context(client, SessionLocal)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"📊 {len(scenarios)} cenários × {args.iterations} iterações "
+              f"(warmup {args.warmup}, concorrência {args.concurrency})")
+        results = run_suite(ctx, scenarios, args.iterations, args.warmup, args.concurrency, _print_result)
+
+    output = {
+        "metadata": metadata,
+        "run": {"iterations": args.iterations, "warmup": args.warmup, "concurrency": args.concurrency},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2, default=str)
+        print(f"✅ Resultados gravados em {args.output}")
+    return 1 if any(r["errors"] for r in results.values()) else 0
+
+
+def cmd_compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    report = compare(baseline, current, args.threshold)
+    for warning in report["warnings"]:
+        print(f"⚠️  {warning}")
+    icons = {"regression": "🔴", "improvement": "🟢", "same": "⚪", "missing": "❔"}
+    for key, entry in report["scenarios"].items():
+        if entry["status"] == "missing":
+            print(f"   {icons['missing']} {key:<42} sem base de comparação")
+            continue
+        p50, p95 = entry["p50"], entry["p95"]
+        print(f"   {icons[entry['status']]} {key:<42} p50 {p50['before']:8.2f} → {p50['after']:8.2f} ms "
+              f"({p50['change_pct']:+.1f}%)  p95 {p95['before']:8.2f} → {p95['after']:8.2f} ms")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks de desempenho do ERP")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed = sub.add_parser("seed", help="Gera o dataset sintético (COPY)")
+    seed.add_argument("--entries", type=int, default=SeedConfig.entries, help="Lançamentos financeiros")
+    seed.add_argument("--users", type=int, default=SeedConfig.users, help="Tenants (usuários comuns)")
+    seed.add_argument("--months", type=int, default=SeedConfig.months, help="Meses de histórico")
+    seed.add_argument("--seed", type=int, default=SeedConfig.seed, help="Semente do gerador")
+    seed.add_argument("--anchor", type=str, default=None, help="Último dia dos dados (YYYY-MM-DD, padrão hoje)")
+    seed.add_argument("--reset", action="store_true", help="Apaga os dados existentes antes")
+    seed.set_defaults(func=cmd_seed)
+
+    run = sub.add_parser("run", help="Executa a matriz de cenários")
+    run.add_argument("--iterations", type=int, default=30)
+    run.add_argument("--warmup", type=int, default=3)
+    run.add_argument("--concurrency", type=int, default=1)
+    run.add_argument("--filter", type=str, default=None, help="Só cenários cujo nome contém o texto")
+    run.add_argument("--output", type=str, default=None, help="Grava o resultado em JSON")
+    run.set_defaults(func=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="Compara dois resultados JSON")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=COMPARE_THRESHOLD, help="Variação de p50 (%%) considerada relevante")
+    cmp_.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
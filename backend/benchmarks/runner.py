@@ -0,0 +1,291 @@
+"""
+Execução dos cenários e comparação de resultados.
+
+Cada cenário: `warmup` chamadas descartadas + `iterations` medidas
+(perf_counter), em `concurrency` threads. Saída JSON com p50/p95/p99,
+média, throughput (chamadas/s de parede) e erros, mais metadados da
+execução (commit, versões, configurações, fingerprint dos dados).
+
+Com concorrência 1 cada chamada também registra o tempo gasto em
+statements SQL (db_ms) e a quantidade de statements (queries), medidos
+por eventos de cursor em todos os engines síncronos do processo.
+"""
+import os
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app import config as app_config
+from app.auth.security import create_access_token
+from app.core.report_cache import report_cache
+from app.services.financial_service import FinancialService
+from app.services.order_service import OrderService
+
+from benchmarks.scenarios import BenchContext, Scenario
+from benchmarks.seed import ADMIN_EMAIL, describe_dataset
+
+# Variação (%) de p50 a partir da qual compare() marca regressão/melhoria
+COMPARE_THRESHOLD = 10.0
+
+SETTINGS_KEYS = (
+    "ENVIRONMENT", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "REPORT_CACHE_BACKEND",
+    "REPORT_CACHE_TTL_SECONDS", "AUDIT_LOG_STORAGE", "BCRYPT_ROUNDS",
+)
+
+
+class DbTimer:
+    """Acumula tempo e quantidade de statements SQL (before/after_cursor_execute)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seconds = 0.0
+        self.statements = 0
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("bench_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["bench_started"].pop()
+        with self.lock:
+            self.seconds += time.perf_counter() - started
+            self.statements += 1
+
+    def snapshot(self):
+        with self.lock:
+            return self.seconds, self.statements
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._before)
+        event.listen(Engine, "after_cursor_execute", self._after)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self._before)
+        event.remove(Engine, "after_cursor_execute", self._after)
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect_metadata(db) -> Dict[str, Any]:
+    """Ambiente da execução (duas execuções só se comparam com o mesmo dataset)."""
+    return {
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "postgres": db.execute(text("SHOW server_version")).scalar(),
+        "cpu_count": os.cpu_count(),
+        "settings": {key: getattr(app_config, key, None) for key in SETTINGS_KEYS},
+        "dataset": describe_dataset(db),
+    }
+
+
+def percentile_summary(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/média/máx em ms (quantis método 'inclusive')."""
+    if len(samples_ms) == 1:
+        value = round(samples_ms[0], 3)
+        return {"p50": value, "p95": value, "p99": value, "mean": value, "max": value}
+    cuts = statistics.quantiles(samples_ms, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49], 3),
+        "p95": round(cuts[94], 3),
+        "p99": round(cuts[98], 3),
+        "mean": round(statistics.fmean(samples_ms), 3),
+        "max": round(max(samples_ms), 3),
+    }
+
+
+def run_scenario(
+    ctx: BenchContext,
+    scenario: Scenario,
+    iterations: int,
+    warmup: int,
+    concurrency: int = 1
+) -> Dict[str, Any]:
+    """
+    Mede um cenário.
+
+    Com cold_cache, report_cache.clear() roda antes de cada chamada e fica
+    fora do tempo medido. Com concorrência > 1 a limpeza é feita por chamada
+    mesmo assim (uma thread pode limpar o cache de outra em andamento: o
+    cenário frio continua frio).
+    """
+    errors: List[str] = []
+    db_samples: List[float] = []
+    query_counts: List[int] = []
+    timer = DbTimer()
+
+    def one_call() -> Optional[float]:
+        if scenario.cold_cache:
+            report_cache.clear()
+        db_before = timer.snapshot()
+        start = time.perf_counter()
+        try:
+            scenario.call(ctx, scenario.role)
+        except Exception as exc:  # noqa: BLE001 - erro vira contagem no resultado
+            errors.append(f"{type(exc).__name__}: {exc}"[:300])
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        if concurrency == 1:
+            db_after = timer.snapshot()
+            db_samples.append((db_after[0] - db_before[0]) * 1000)
+            query_counts.append(db_after[1] - db_before[1])
+        return elapsed
+
+    for _ in range(warmup):
+        one_call()
+    errors.clear()
+    db_samples.clear()
+    query_counts.clear()
+
+    with timer:
+        wall_start = time.perf_counter()
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                samples = list(pool.map(lambda _: one_call(), range(iterations)))
+        else:
+            samples = [one_call() for _ in range(iterations)]
+        wall = time.perf_counter() - wall_start
+
+    ok = [s for s in samples if s is not None]
+    result: Dict[str, Any] = {
+        "scenario": scenario.name,
+        "role": scenario.role,
+        "cold_cache": scenario.cold_cache,
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "throughput_rps": round(len(ok) / wall, 2) if wall > 0 else None,
+    }
+    if ok:
+        result["latency_ms"] = percentile_summary(ok)
+    if db_samples:
+        result["db_ms"] = percentile_summary(db_samples)
+        result["queries"] = round(statistics.fmean(query_counts), 2)
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+def run_suite(
+    ctx: BenchContext,
+    scenarios: List[Scenario],
+    iterations: int,
+    warmup: int,
+    concurrency: int = 1,
+    progress=None
+) -> Dict[str, Dict[str, Any]]:
+    """Roda os cenários em ordem; retorna {scenario.key: resultado}."""
+    results = {}
+    for scenario in scenarios:
+        results[scenario.key] = run_scenario(ctx, scenario, iterations, warmup, concurrency)
+        if progress:
+            progress(scenario.key, results[scenario.key])
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = COMPARE_THRESHOLD) -> Dict[str, Any]:
+    """
+    Diferença de p50/p95 (e db_ms p50, se houver) entre duas execuções (arquivos JSON do runner).
+
+    Returns:
+        {"comparable": bool, "warnings": [...], "scenarios": {key: {...}}}
+        status de cada cenário: "regression" | "improvement" | "same" | "missing"
+    """
+    warnings = []
+    if baseline["metadata"]["dataset"] != current["metadata"]["dataset"]:
+        warnings.append("Conjuntos de dados diferentes (fingerprint): comparação não é confiável")
+    for key in ("iterations", "concurrency"):
+        if baseline["run"].get(key) != current["run"].get(key):
+            warnings.append(f"Parâmetro {key} diferente: {baseline['run'].get(key)} → {current['run'].get(key)}")
+
+    scenarios = {}
+    for key, after in current["results"].items():
+        before = baseline["results"].get(key)
+        if not before or "latency_ms" not in before or "latency_ms" not in after:
+            scenarios[key] = {"status": "missing"}
+            continue
+        entry = {}
+        for metric in ("p50", "p95"):
+            old, new = before["latency_ms"][metric], after["latency_ms"][metric]
+            entry[metric] = {
+                "before": old,
+                "after": new,
+                "change_pct": round((new - old) / old * 100, 1) if old else None,
+            }
+        if "db_ms" in before and "db_ms" in after:
+            old, new = before["db_ms"]["p50"], after["db_ms"]["p50"]
+            entry["db_p50"] = {
+                "before": old,
+                "after": new,
+                "change_pct": round((new - old) / old * 100, 1) if old else None,
+            }
+        change = entry["p50"]["change_pct"] or 0.0
+        entry["status"] = (
+            "regression" if change > threshold else "improvement" if change < -threshold else "same"
+        )
+        scenarios[key] = entry
+
+    return {"comparable": not warnings, "warnings": warnings, "scenarios": scenarios}
+
+
+def build_context(client, session_factory) -> BenchContext:
+    """
+    Prepara o contexto a partir do dataset: admin do seed, tenant com mais
+    lançamentos, tokens e cursores da 2ª página das listagens keyset.
+
+    Raises:
+        ValueError: Se o banco não tiver um dataset de benchmark
+    """
+    db = session_factory()
+    try:
+        admin_id = db.execute(
+            text("SELECT id FROM core.users WHERE email = :email"), {"email": ADMIN_EMAIL}
+        ).scalar()
+        row = db.execute(text("""
+            SELECT user_id, max(occurred_at)::date AS last_day
+            FROM core.financial_entries
+            GROUP BY user_id ORDER BY count(*) DESC, user_id LIMIT 1
+        """)).first()
+        if admin_id is None or row is None:
+            raise ValueError("Dataset de benchmark não encontrado: rodar `python -m benchmarks seed` antes")
+        last_day = db.execute(text("SELECT max(occurred_at)::date FROM core.financial_entries")).scalar()
+
+        user_ids = {"user": row.user_id, "admin": None}
+        cursors = {}
+        for role, user_id in user_ids.items():
+            entries = FinancialService.list_entries(db, page=1, page_size=50, user_id=user_id)
+            orders = OrderService.list_orders(db, page=1, page_size=50, user_id=user_id)
+            cursors[f"entries[{role}]"] = entries["next_cursor"]
+            cursors[f"orders[{role}]"] = orders["next_cursor"]
+    finally:
+        db.close()
+
+    headers = {
+        "user": {"Authorization": f"Bearer {create_access_token(subject=str(row.user_id))}"},
+        "admin": {"Authorization": f"Bearer {create_access_token(subject=str(admin_id))}"},
+    }
+    return BenchContext(
+        client=client,
+        session_factory=session_factory,
+        headers=headers,
+        user_ids=user_ids,
+        last_day=last_day,
+        cursors=cursors,
+    )
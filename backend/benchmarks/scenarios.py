@@ -0,0 +1,145 @@
+"""
+Matriz fixa de cenários dos benchmarks.
+
+Cada cenário roda como admin (todos os tenants) e como o maior tenant.
+Períodos são relativos ao último dia do conjunto de dados (não a hoje),
+para que execuções em dias diferentes sobre o mesmo seed sejam comparáveis.
+
+- http:*    endpoint completo (TestClient em processo: auth, validação,
+            serialização, dependências de sessão)
+- service:* função de service direto numa sessão (sem HTTP)
+
+Relatórios rodam com o cache frio (report_cache limpo a cada chamada),
+exceto os cenários marcados "warm".
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from app.services.financial_service import FinancialService
+from app.services.order_service import OrderService
+from app.services.report_service import ReportService
+
+ROLES = ("user", "admin")
+
+
+@dataclass
+class BenchContext:
+    """Estado compartilhado pelos cenários de uma execução."""
+    client: Any
+    session_factory: Callable
+    headers: Dict[str, Dict[str, str]]
+    user_ids: Dict[str, Optional[UUID]]  # admin → None (sem filtro multi-tenant)
+    last_day: date
+    cursors: Dict[str, str]
+
+    def period(self, days: int) -> Dict[str, str]:
+        return {
+            "date_from": (self.last_day - timedelta(days=days - 1)).isoformat(),
+            "date_to": self.last_day.isoformat(),
+        }
+
+    def get(self, role: str, path: str, params: Optional[dict] = None) -> None:
+        response = self.client.get(path, params=params, headers=self.headers[role])
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} → {response.status_code}: {response.text[:200]}")
+
+    def service(self, func: Callable, **kwargs) -> None:
+        db = self.session_factory()
+        try:
+            func(db, **kwargs)
+        finally:
+            db.close()
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    role: str
+    call: Callable[[BenchContext, str], None]
+    cold_cache: bool = True
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.role}]"
+
+
+def _period_dates(ctx: BenchContext, days: int) -> Dict[str, date]:
+    return {k: date.fromisoformat(v) for k, v in ctx.period(days).items()}
+
+
+def _http(path: str, days: Optional[int] = None, **params) -> Callable[[BenchContext, str], None]:
+    def call(ctx: BenchContext, role: str) -> None:
+        query = dict(params)
+        if days:
+            query.update(ctx.period(days))
+        ctx.get(role, path, query)
+    return call
+
+
+def _http_cursor(path: str, cursor_key: str, **params) -> Callable[[BenchContext, str], None]:
+    def call(ctx: BenchContext, role: str) -> None:
+        cursor = ctx.cursors[f"{cursor_key}[{role}]"]
+        ctx.get(role, path, {**params, **({"cursor": cursor} if cursor else {})})
+    return call
+
+
+def _http_separate_reports(days: int) -> Callable[[BenchContext, str], None]:
+    """As quatro chamadas que o painel substitui (mesmos parâmetros do dashboard)."""
+    def call(ctx: BenchContext, role: str) -> None:
+        period = ctx.period(days)
+        ctx.get(role, "/reports/financial/dre", period)
+        ctx.get(role, "/reports/financial/cashflow/daily", period)
+        ctx.get(role, "/reports/financial/pending/aging", period)
+        ctx.get(role, "/reports/financial/top", {**period, "kind": "revenue", "status": "paid"})
+    return call
+
+
+def _report_service(func: Callable, days: int, **kwargs) -> Callable[[BenchContext, str], None]:
+    def call(ctx: BenchContext, role: str) -> None:
+        ctx.service(func, user_id=ctx.user_ids[role], **_period_dates(ctx, days), **kwargs)
+    return call
+
+
+def _list_service(func: Callable, **kwargs) -> Callable[[BenchContext, str], None]:
+    def call(ctx: BenchContext, role: str) -> None:
+        ctx.service(func, user_id=ctx.user_ids[role], **kwargs)
+    return call
+
+
+def scenario_matrix() -> List[Scenario]:
+    """Lista fixa (ordem e nomes estáveis entre commits)."""
+    definitions = [
+        ("http:reports/dre/30d", _http("/reports/financial/dre", 30), True),
+        ("http:reports/dre/365d", _http("/reports/financial/dre", 365), True),
+        ("http:reports/dre/30d/warm", _http("/reports/financial/dre", 30), False),
+        ("http:reports/cashflow/90d", _http("/reports/financial/cashflow/daily", 90), True),
+        ("http:reports/cashflow/365d/month", _http("/reports/financial/cashflow/daily", 365, granularity="month"), True),
+        ("http:reports/cashflow/90d/sao-paulo", _http(
+            "/reports/financial/cashflow/daily", 90, tz="America/Sao_Paulo"
+        ), True),
+        ("http:reports/aging/365d", _http("/reports/financial/pending/aging", 365), True),
+        ("http:reports/top/90d", _http("/reports/financial/top", 90, kind="expense", status="paid"), True),
+        ("http:reports/dashboard/90d", _http("/reports/financial/dashboard", 90), True),
+        ("http:reports/separate4/90d", _http_separate_reports(90), True),
+        ("http:financial/entries/page1", _http("/financial/entries", page_size=50), True),
+        ("http:financial/entries/page20", _http("/financial/entries", page=20, page_size=50), True),
+        ("http:financial/entries/keyset", _http_cursor("/financial/entries", "entries", page_size=50), True),
+        ("http:financial/entries/no-total", _http("/financial/entries", page_size=50, total_mode="none"), True),
+        ("http:orders/page1", _http("/orders", page_size=50), True),
+        ("http:orders/keyset", _http_cursor("/orders", "orders", page_size=50), True),
+        ("service:report.dre/365d", _report_service(ReportService.get_dre, 365), True),
+        ("service:report.cashflow/90d", _report_service(ReportService.get_cashflow_daily, 90), True),
+        ("service:report.top/90d", _report_service(
+            ReportService.get_top_entries, 90, kind="expense", status="paid"
+        ), True),
+        ("service:report.dashboard/90d", _report_service(ReportService.get_dashboard, 90), True),
+        ("service:financial.list/page1", _list_service(FinancialService.list_entries, page_size=50), True),
+        ("service:order.list/page1", _list_service(OrderService.list_orders, page_size=50), True),
+    ]
+    return [
+        Scenario(name=name, role=role, call=call, cold_cache=cold)
+        for name, call, cold in definitions
+        for role in ROLES
+    ]
@@ -0,0 +1,289 @@
+"""
+Gerador de dados sintéticos multi-tenant para os benchmarks (COPY).
+
+- Usuários: 1 admin + N tenants com volumes desiguais (poucos grandes, muitos pequenos)
+- Pedidos com FinancialEntry vinculado (revenue, order_id) + lançamentos
+  avulsos (despesas e receitas) até completar `entries`
+- Soft delete em uma fração de pedidos/lançamentos
+- Audit log: create + updates por pedido, nas partições mensais do período
+- Determinístico: mesma SeedConfig → mesmos dados (ids inclusive)
+
+COPY não passa pelo ORM: o rollup diário é recalculado no final
+(FinancialRollupRepository.rebuild) e o cache de relatórios é limpo.
+"""
+import csv
+import io
+import json
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+
+from app.auth.security import hash_password
+from app.config import ENVIRONMENT
+from app.core.report_cache import report_cache
+from app.repositories.audit_log_partition_repository import AuditLogPartitionRepository
+from app.repositories.financial_rollup_repository import FinancialRollupRepository
+
+BENCH_PASSWORD = "benchpass123"
+ADMIN_EMAIL = "bench-admin@bench.local"
+
+# Linhas por COPY (limita a memória do buffer CSV)
+COPY_CHUNK = 50_000
+
+PRODUCTS = [f"Produto {i:03d}" for i in range(1, 121)]
+EXPENSES = (
+    ["Aluguel", "Energia", "Água", "Internet", "Folha de pagamento", "Impostos", "Manutenção"]
+    + [f"Fornecedor {i:02d}" for i in range(1, 61)]
+)
+STATUSES = ("paid", "pending", "canceled")
+STATUS_WEIGHTS = (0.6, 0.3, 0.1)
+
+USER_COLUMNS = ("id", "name", "email", "password_hash", "role", "is_active", "created_at")
+ORDER_COLUMNS = ("id", "user_id", "description", "total", "created_at", "updated_at", "deleted_at")
+ENTRY_COLUMNS = (
+    "id", "order_id", "user_id", "kind", "status", "amount", "description",
+    "occurred_at", "created_at", "deleted_at"
+)
+AUDIT_COLUMNS = ("user_id", "action", "entity_type", "entity_id", "before", "after", "request_id", "created_at")
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    """Escala e forma do conjunto de dados."""
+    entries: int = 100_000
+    users: int = 50
+    order_ratio: float = 0.4
+    audit_updates_per_order: int = 2
+    months: int = 12
+    deleted_ratio: float = 0.03
+    seed: int = 42
+    anchor: date = field(default_factory=date.today)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["anchor"] = self.anchor.isoformat()
+        return data
+
+
+class _CopyBuffer:
+    """
+    Buffer CSV de uma tabela; envia por COPY a cada COPY_CHUNK linhas.
+
+    depends_on: buffers referenciados por FK, enviados antes deste.
+    """
+
+    def __init__(self, cursor, table: str, columns: tuple, depends_on: tuple = ()):
+        self.cursor = cursor
+        self.depends_on = depends_on
+        self.sql = f"COPY core.{table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.pending = 0
+        self.total = 0
+
+    def add(self, row) -> None:
+        self.writer.writerow(["" if value is None else value for value in row])
+        self.pending += 1
+        if self.pending >= COPY_CHUNK:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        for parent in self.depends_on:
+            parent.flush()
+        self.buffer.seek(0)
+        self.cursor.copy_expert(self.sql, self.buffer)
+        self.total += self.pending
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.pending = 0
+
+
+class _Generator:
+    """Valores aleatórios determinísticos (random.Random(seed))."""
+
+    def __init__(self, config: SeedConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.end = datetime.combine(config.anchor, dt_time(18, 0), tzinfo=timezone.utc)
+        self.span_seconds = config.months * 30 * 86400
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def moment(self) -> datetime:
+        return self.end - timedelta(seconds=self.rng.randrange(self.span_seconds))
+
+    def amount(self) -> float:
+        return round(min(max(self.rng.lognormvariate(5, 1.2), 1.0), 999_999.0), 2)
+
+    def status(self) -> str:
+        return self.rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+
+    def deleted(self, moment: datetime):
+        if self.rng.random() < self.config.deleted_ratio:
+            return moment + timedelta(days=1)
+        return None
+
+
+def _naive(moment: datetime) -> datetime:
+    """Colunas TIMESTAMP sem timezone guardam UTC."""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _months(config: SeedConfig) -> List[date]:
+    first = config.anchor - timedelta(days=config.months * 30 + 1)
+    months, current = [], first.replace(day=1)
+    last = (config.anchor + timedelta(days=1)).replace(day=1)
+    while current <= last:
+        months.append(current)
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+    return months
+
+
+def reset_database(db) -> None:
+    """Apaga os dados de negócio (usuários em cascata, rollup e audit log)."""
+    db.execute(text(
+        "TRUNCATE TABLE core.audit_logs, core.financial_daily_rollup, "
+        "core.financial_entries, core.orders, core.users CASCADE"
+    ))
+    db.commit()
+    report_cache.clear()
+
+
+def seed_database(db, config: SeedConfig, reset: bool = False) -> Dict[str, Any]:
+    """
+    Popula o banco da sessão `db` com o conjunto descrito por config.
+
+    Args:
+        db: Sessão SQLAlchemy (commit ao final)
+        config: escala/forma dos dados
+        reset: apaga os dados existentes antes (obrigatório se já houver usuários)
+
+    Returns:
+        {"config": ..., "rows": {tabela: linhas}, "seconds": float}
+
+    Raises:
+        ValueError: Em produção, ou com dados existentes sem reset
+    """
+    if ENVIRONMENT == "production":
+        raise ValueError("Seed de benchmark não pode rodar com ENVIRONMENT=production")
+    if reset:
+        reset_database(db)
+    elif db.execute(text("SELECT EXISTS (SELECT 1 FROM core.users)")).scalar():
+        raise ValueError("Banco já tem usuários: usar reset=True (--reset) para recriar o conjunto")
+
+    start = time.perf_counter()
+    gen = _Generator(config)
+    rng = gen.rng
+
+    for month in _months(config):
+        AuditLogPartitionRepository.create_month(db, month)
+    db.commit()
+
+    cursor = db.connection().connection.cursor()
+    users = _CopyBuffer(cursor, "users", USER_COLUMNS)
+    orders = _CopyBuffer(cursor, "orders", ORDER_COLUMNS)
+    entries = _CopyBuffer(cursor, "financial_entries", ENTRY_COLUMNS, depends_on=(orders,))
+    audit = _CopyBuffer(cursor, "audit_logs", AUDIT_COLUMNS)
+
+    # Usuários: mesmo hash para todos (bcrypt é caro)
+    password_hash = hash_password(BENCH_PASSWORD)
+    created = _naive(gen.end - timedelta(seconds=gen.span_seconds))
+    users.add((gen.uuid(), "Bench Admin", ADMIN_EMAIL, password_hash, "admin", True, created))
+    tenant_ids = []
+    for i in range(config.users):
+        tenant_id = gen.uuid()
+        tenant_ids.append(tenant_id)
+        users.add((tenant_id, f"Bench User {i:04d}", f"bench-user-{i:04d}@bench.local",
+                   password_hash, "user", True, created))
+    users.flush()  # FKs de pedidos/lançamentos
+
+    # Volume por tenant ~ Zipf: poucos tenants grandes, cauda longa de pequenos
+    weights = [1 / (i + 1) ** 0.8 for i in range(config.users)]
+    cum_weights = []
+    for weight in weights:
+        cum_weights.append((cum_weights[-1] if cum_weights else 0) + weight)
+
+    def tenant():
+        return rng.choices(tenant_ids, cum_weights=cum_weights)[0]
+
+    order_count = int(config.entries * config.order_ratio)
+    for i in range(order_count):
+        order_id, entry_id, user_id = gen.uuid(), gen.uuid(), tenant()
+        moment = gen.moment()
+        total = gen.amount()
+        description = f"Pedido {rng.choice(PRODUCTS)} x{rng.randint(1, 20)}"
+        deleted_at = gen.deleted(moment)
+        updated = moment + timedelta(minutes=config.audit_updates_per_order)
+        orders.add((order_id, user_id, description, total, _naive(moment), _naive(updated),
+                    _naive(deleted_at) if deleted_at else None))
+        entries.add((entry_id, order_id, user_id, "revenue", gen.status(), total, f"Venda {description}",
+                     moment.isoformat(), moment.isoformat(), _naive(deleted_at) if deleted_at else None))
+
+        snapshot = {"description": description, "total": total}
+        audit.add((user_id, "create", "order", order_id, None, json.dumps(snapshot),
+                   f"bench-{i}-0", _naive(moment)))
+        for update in range(1, config.audit_updates_per_order + 1):
+            previous, snapshot = snapshot, {**snapshot, "total": gen.amount()}
+            audit.add((user_id, "update", "order", order_id, json.dumps(previous), json.dumps(snapshot),
+                       f"bench-{i}-{update}", _naive(moment + timedelta(minutes=update))))
+
+    for _ in range(config.entries - order_count):
+        moment = gen.moment()
+        kind = "expense" if rng.random() < 0.6 else "revenue"
+        description = rng.choice(EXPENSES) if kind == "expense" else f"Venda avulsa {rng.choice(PRODUCTS)}"
+        deleted_at = gen.deleted(moment)
+        entries.add((gen.uuid(), None, tenant(), kind, gen.status(), gen.amount(), description,
+                     moment.isoformat(), moment.isoformat(), _naive(deleted_at) if deleted_at else None))
+
+    for buffer in (orders, entries, audit):
+        buffer.flush()
+    cursor.close()
+    db.commit()
+
+    # COPY não passa pelo listener do rollup: recalcular tudo
+    FinancialRollupRepository.rebuild(db)
+    report_cache.clear()
+
+    return {
+        "config": config.to_dict(),
+        "rows": {
+            "users": users.total,
+            "orders": orders.total,
+            "financial_entries": entries.total,
+            "audit_logs": audit.total,
+        },
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def analyze(engine) -> None:
+    """VACUUM ANALYZE das tabelas populadas (estatísticas + visibility map)."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("users", "orders", "financial_entries", "financial_daily_rollup", "audit_logs"):
+            conn.execute(text(f"VACUUM (ANALYZE) core.{table}"))
+
+
+def describe_dataset(db) -> Dict[str, Any]:
+    """
+    Impressão digital do conjunto de dados (para comparar execuções).
+
+    Duas execuções só são comparáveis com o mesmo fingerprint.
+    """
+    row = db.execute(text("""
+        SELECT
+            (SELECT count(*) FROM core.users) AS users,
+            (SELECT count(*) FROM core.orders) AS orders,
+            (SELECT count(*) FROM core.financial_entries) AS financial_entries,
+            (SELECT count(*) FROM core.audit_logs) AS audit_logs,
+            (SELECT coalesce(sum(amount), 0)::text FROM core.financial_entries WHERE deleted_at IS NULL) AS active_amount,
+            (SELECT max(occurred_at)::date::text FROM core.financial_entries) AS last_day
+    """)).mappings().one()
+    return dict(row)
@@ -0,0 +1,114 @@
+"""
+Script de retenção do audit log particionado (core.audit_logs).
+
+Executar (agendar mensalmente, ex.: cron no dia 1):
+    cd backend
+    python scripts/audit_log_retention.py
+    python scripts/audit_log_retention.py --keep-months 24 --archive-dir /mnt/archive/audit
+    python scripts/audit_log_retention.py --dry-run
+
+Comportamento:
+1. Cria as partições dos próximos meses (AUDIT_LOG_PARTITIONS_AHEAD)
+2. Para cada partição inteiramente anterior a --keep-months meses:
+   detach (commit) → COPY para <archive-dir>/audit_logs_YYYY_MM.csv.gz →
+   conferência de linhas → DROP
+3. Partições desanexadas por uma execução interrompida são retomadas no passo 2
+
+O arquivo só é gravado com o nome final depois da conferência; a tabela
+só é removida depois disso. Em caso de erro a partição fica desanexada
+(fora das consultas, dados intactos) até a próxima execução.
+"""
+import argparse
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+# Adicionar diretório backend ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import AUDIT_LOG_ARCHIVE_DIR, AUDIT_LOG_PARTITIONS_AHEAD, AUDIT_LOG_RETENTION_MONTHS
+from app.database import SessionLocal, without_timeouts
+from app.repositories.audit_log_partition_repository import AuditLogPartitionRepository
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Arquiva e remove partições antigas de core.audit_logs")
+    parser.add_argument("--keep-months", type=int, default=AUDIT_LOG_RETENTION_MONTHS,
+                        help="Meses mantidos no banco, incluindo o corrente")
+    parser.add_argument("--archive-dir", type=Path, default=Path(AUDIT_LOG_ARCHIVE_DIR),
+                        help="Diretório dos arquivos .csv.gz")
+    parser.add_argument("--months-ahead", type=int, default=AUDIT_LOG_PARTITIONS_AHEAD,
+                        help="Partições futuras a garantir")
+    parser.add_argument("--dry-run", action="store_true", help="Só lista o que seria arquivado")
+    return parser.parse_args(argv)
+
+
+def run_retention(db, keep_months: int, archive_dir: Path, months_ahead: int,
+                  dry_run: bool = False, today: date = None) -> list:
+    """
+    Executa a retenção e retorna [(partição, linhas arquivadas)].
+
+    Com dry_run, linhas = None e nada é alterado.
+    """
+    if keep_months < 1:
+        raise ValueError("keep_months deve ser >= 1")
+    today = today or date.today()
+
+    if not dry_run:
+        created = AuditLogPartitionRepository.ensure_partitions(db, months_ahead)
+        db.commit()
+        if created:
+            print(f"🗂️ {created} partições criadas")
+
+    expired = AuditLogPartitionRepository.expired_partitions(db, keep_months, today)
+    pending = AuditLogPartitionRepository.list_detached(db) + expired
+    if dry_run:
+        return [(name, None) for name in pending]
+
+    for name in expired:
+        AuditLogPartitionRepository.detach(db, name)
+        db.commit()
+
+    archived = []
+    for name in pending:
+        rows = AuditLogPartitionRepository.export(db, name, archive_dir)
+        AuditLogPartitionRepository.drop(db, name)
+        db.commit()
+        archived.append((name, rows))
+    return archived
+
+
+@without_timeouts()
+def main(argv=None):
+    """Executa a retenção com os argumentos da linha de comando (sem statement/lock timeout)."""
+    args = parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        print(f"🔄 Retenção do audit log: mantendo {args.keep_months} meses...")
+        archived = run_retention(
+            db,
+            keep_months=args.keep_months,
+            archive_dir=args.archive_dir,
+            months_ahead=args.months_ahead,
+            dry_run=args.dry_run
+        )
+        for name, rows in archived:
+            if rows is None:
+                print(f"   (dry-run) {name}")
+            else:
+                print(f"   📦 {name}: {rows} linhas → {args.archive_dir / (name + '.csv.gz')}")
+        print(f"✅ {len(archived)} partições {'a arquivar' if args.dry_run else 'arquivadas'}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark de carga: rotas sync (Session/psycopg2) vs async (AsyncSession/asyncpg).
+
+Duas rotas equivalentes, cada uma com COUNT de lançamentos + pg_sleep
+simulando a latência de rede/consulta de um banco remoto:
+- sync:   def + get_db (threadpool do Starlette, 40 threads por padrão)
+- async:  async def + get_async_db (AsyncFinancialRepository via run_sync)
+
+Os clientes concorrentes (httpx + ASGITransport, sem rede) disparam requests
+até completar o total; os dois engines usam o mesmo tamanho de pool.
+
+Executar:
+    cd backend
+    python scripts/bench_async_db.py
+    python scripts/bench_async_db.py --clients 400 --requests 8000 --latency-ms 20 --pool-size 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Adicionar diretório backend ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import DATABASE_URL, async_database_url
+from app.repositories.financial_repository import AsyncFinancialRepository, FinancialRepository
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Carga sync vs async nas rotas de banco")
+    parser.add_argument("--clients", type=int, default=200, help="Clientes concorrentes")
+    parser.add_argument("--requests", type=int, default=4000, help="Total de requests por cenário")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="pg_sleep por request (latência simulada)")
+    parser.add_argument("--pool-size", type=int, default=100, help="pool_size dos dois engines (sem overflow)")
+    return parser.parse_args()
+
+
+def build_app(args: argparse.Namespace):
+    """App com as duas rotas e seus engines (mesmo pool_size)."""
+    sleep = text("SELECT pg_sleep(:seconds)").bindparams(seconds=args.latency_ms / 1000)
+
+    sync_engine = create_engine(DATABASE_URL, pool_size=args.pool_size, max_overflow=0)
+    SyncSession = sessionmaker(bind=sync_engine)
+    async_engine = create_async_engine(
+        async_database_url(DATABASE_URL), pool_size=args.pool_size, max_overflow=0
+    )
+    AsyncSessionFactory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def async_db():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_route(db: Session = Depends(sync_db)):
+        db.execute(sleep)
+        return {"total": FinancialRepository.count_total(db)}
+
+    @app.get("/async")
+    async def async_route(db: AsyncSession = Depends(async_db)):
+        await db.execute(sleep)
+        return {"total": await AsyncFinancialRepository.count_total(db)}
+
+    return app, sync_engine, async_engine
+
+
+async def load(app, path: str, clients: int, requests: int) -> dict:
+    """Dispara `requests` GETs com `clients` concorrentes; retorna estatísticas."""
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        # Aquecimento (abre conexões do pool)
+        await asyncio.gather(*(client.get(path) for _ in range(min(clients, 50))))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def main() -> None:
+    args = parse_args()
+    app, sync_engine, async_engine = build_app(args)
+
+    print(
+        f"clients={args.clients} requests={args.requests} "
+        f"latency={args.latency_ms}ms pool_size={args.pool_size}"
+    )
+    print(f"{'rota':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'erros':>8}")
+    try:
+        for path in ("/sync", "/async"):
+            result = await load(app, path, args.clients, args.requests)
+            print(
+                f"{path:<8}{result['rps']:>10.1f}{result['p50']:>10.1f}"
+                f"{result['p95']:>10.1f}{result['p99']:>10.1f}{result['errors']:>8}"
+            )
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
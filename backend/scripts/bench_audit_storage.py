@@ -0,0 +1,156 @@
+"""
+Benchmark do armazenamento do audit log: full x diff (AUDIT_LOG_STORAGE).
+
+Grava o mesmo histórico sintético (create + N updates por pedido, cada
+update alterando 1-2 campos) nos dois formatos e mede:
+- bytes por evento: pg_column_size da linha (inclui before/after em TOAST)
+- leitura do histórico: latência de AuditLogService.get_entity_history
+  (com reconstrução no modo diff), p50/p95
+
+Tudo roda numa transação desfeita no final (banco de DATABASE_URL).
+
+Executar:
+    cd backend
+    python scripts/bench_audit_storage.py
+    python scripts/bench_audit_storage.py --entities 200 --updates 50 --snapshot-every 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+# Adicionar diretório backend ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.core.audit_diff import compact_rows
+from app.database import engine
+from app.models.audit_log import AuditLog
+from app.services.audit_log_service import AuditLogService
+
+BATCH_SIZE = 500
+
+
+def order_history(updates: int, rng: random.Random) -> list:
+    """Snapshots completos de um pedido: create + `updates` alterações."""
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    state = {
+        "id": str(uuid4()),
+        "user_id": str(uuid4()),
+        "description": f"Pedido {rng.randint(1, 99999)} - " + "item " * rng.randint(5, 30),
+        "total": round(rng.uniform(10, 5000), 2),
+        "status": "pending",
+        "created_at": now.isoformat(),
+        "updated_at": now.isoformat(),
+        "deleted_at": None,
+        "deleted_by": None,
+    }
+    states = [state]
+    for i in range(updates):
+        state = {**state, "updated_at": (now + timedelta(minutes=i + 1)).isoformat()}
+        field = rng.choice(["total", "status", "description"])
+        if field == "total":
+            state["total"] = round(state["total"] * rng.uniform(0.9, 1.1), 2)
+        elif field == "status":
+            state["status"] = rng.choice(["pending", "paid", "shipped", "canceled"])
+        else:
+            state["description"] = state["description"] + " (rev)"
+        states.append(state)
+    return states
+
+
+def write_histories(conn, user_id, histories, storage, snapshot_every, tag) -> list:
+    """Grava os históricos no formato `storage`; retorna os entity_id."""
+    base = datetime.now(timezone.utc)
+    rows = []
+    entity_ids = [uuid4() for _ in histories]
+    # Ordem cronológica (como em produção): evento i de todas as entidades
+    for i in range(len(histories[0])):
+        for entity_id, states in zip(entity_ids, histories):
+            rows.append({
+                "user_id": user_id,
+                "action": "create" if i == 0 else "update",
+                "entity_type": "order",
+                "entity_id": entity_id,
+                "request_id": tag,
+                "before": None if i == 0 else states[i - 1],
+                "after": states[i],
+                "created_at": base + timedelta(microseconds=len(rows)),
+            })
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        compact_rows(conn, batch, storage, snapshot_every)
+        conn.execute(insert(AuditLog.__table__), batch)
+    return entity_ids
+
+
+def bytes_per_event(conn, tag) -> float:
+    return conn.execute(
+        text("SELECT avg(pg_column_size(a.*)) FROM core.audit_logs a WHERE request_id = :tag"),
+        {"tag": tag}
+    ).scalar()
+
+
+def history_latency(conn, entity_ids, reads) -> list:
+    """Latências (ms) de get_entity_history em entidades aleatórias."""
+    rng = random.Random(1)
+    latencies = []
+    for _ in range(reads):
+        db = Session(bind=conn)
+        entity_id = rng.choice(entity_ids)
+        start = time.perf_counter()
+        AuditLogService.get_entity_history(db, "order", entity_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+        db.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit log: bytes por evento e leitura de histórico, full x diff")
+    parser.add_argument("--entities", type=int, default=100, help="Pedidos com histórico")
+    parser.add_argument("--updates", type=int, default=40, help="Updates por pedido")
+    parser.add_argument("--snapshot-every", type=int, default=20, help="Snapshot completo a cada N updates (diff)")
+    parser.add_argument("--reads", type=int, default=200, help="Leituras de histórico por formato")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    histories = [order_history(args.updates, rng) for _ in range(args.entities)]
+    events = args.entities * (args.updates + 1)
+    print(f"📊 {args.entities} pedidos x {args.updates + 1} eventos = {events} eventos por formato")
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            user_id = conn.execute(text("""
+                INSERT INTO core.users (name, email, password_hash, role)
+                VALUES ('Bench', :email, 'x', 'user') RETURNING id
+            """), {"email": f"bench-{uuid4()}@bench.local"}).scalar()
+
+            results = {}
+            for storage in ("full", "diff"):
+                tag = f"bench-{storage}"
+                entity_ids = write_histories(conn, user_id, histories, storage, args.snapshot_every, tag)
+                conn.execute(text("ANALYZE core.audit_logs"))
+                latencies = history_latency(conn, entity_ids, args.reads)
+                results[storage] = (
+                    bytes_per_event(conn, tag),
+                    statistics.median(latencies),
+                    statistics.quantiles(latencies, n=20)[18],
+                )
+
+            for storage, (size, p50, p95) in results.items():
+                print(f"   {storage:<5} {size:8.0f} bytes/evento   histórico p50 {p50:6.2f} ms   p95 {p95:6.2f} ms")
+            full_size, diff_size = results["full"][0], results["diff"][0]
+            print(f"✅ diff: {diff_size / full_size:.0%} do tamanho do full por evento")
+        finally:
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark do overhead por request dos middlewares de request_id/logging.
+
+Compara, chamando a aplicação ASGI diretamente (sem rede/servidor):
+- bare:     rota sem middlewares
+- legacy:   implementação anterior (BaseHTTPMiddleware), reproduzida aqui
+- asgi:     RequestIDMiddleware + LoggingMiddleware atuais (ASGI puro)
+
+Executar:
+    cd backend
+    python scripts/bench_middleware.py
+    python scripts/bench_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+# Adicionar diretório backend ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = getattr(request.state, "request_id", "unknown")
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logging.getLogger("bench").info(
+            f"[{request_id}] {request.method} {request.url.path} "
+            f"| status={response.status_code} | time={process_time:.3f}s"
+        )
+        response.headers["X-Process-Time"] = f"{process_time:.3f}"
+        return response
+
+
+async def ping(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(middlewares) -> Starlette:
+    app = Starlette(routes=[Route("/ping", ping)])
+    for middleware in middlewares:
+        app.add_middleware(middleware)
+    return app
+
+
+async def run(app, requests: int) -> float:
+    """Executa N requests GET /ping direto no ASGI e retorna µs/request."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/ping", "raw_path": b"/ping",
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # aquecimento
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Overhead por request dos middlewares")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Logs desligados: mede o custo dos middlewares, não do handler de log
+    logging.disable(logging.CRITICAL)
+
+    variants = {
+        "bare": [],
+        "legacy": [LegacyLoggingMiddleware, LegacyRequestIDMiddleware],
+        "asgi": [LoggingMiddleware, RequestIDMiddleware],
+    }
+    results = {name: asyncio.run(run(build_app(mws), args.requests)) for name, mws in variants.items()}
+
+    print(f"📊 {args.requests} requests por variante")
+    for name, per_request in results.items():
+        overhead = per_request - results["bare"]
+        print(f"   {name:<7} {per_request:8.1f} µs/request   overhead {overhead:+8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
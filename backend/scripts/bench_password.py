@@ -0,0 +1,59 @@
+"""
+Benchmark de throughput de login (bcrypt verify) por tamanho do pool.
+
+Simula uma rajada de logins: N threads (como o threadpool do FastAPI)
+chamando PasswordHasher.verify ao mesmo tempo, para pools de 1 até
+--max-workers threads de bcrypt. Como o bcrypt libera o GIL, o throughput
+deve crescer até o número de núcleos e estabilizar depois.
+
+Executar:
+    cd backend
+    python scripts/bench_password.py
+    python scripts/bench_password.py --rounds 12 --logins 64 --max-workers 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Adicionar diretório backend ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+
+from app.security.password import PasswordHasher
+
+
+def run(workers: int, rounds: int, logins: int, callers: int) -> float:
+    """Executa `logins` verificações com `callers` threads concorrentes; retorna logins/s."""
+    hasher = PasswordHasher(workers=workers, max_pending=logins, rounds=rounds)
+    stored = bcrypt.hashpw(b"senha-benchmark", bcrypt.gensalt(rounds)).decode()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as request_threads:
+        results = list(request_threads.map(lambda _: hasher.verify("senha-benchmark", stored), range(logins)))
+    elapsed = time.perf_counter() - start
+
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput de login por tamanho do pool de bcrypt")
+    parser.add_argument("--rounds", type=int, default=12, help="Custo bcrypt (default: 12)")
+    parser.add_argument("--logins", type=int, default=32, help="Logins por rodada")
+    parser.add_argument("--callers", type=int, default=40, help="Threads chamadoras (threadpool do FastAPI = 40)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Maior pool testado")
+    args = parser.parse_args()
+
+    print(f"📊 bcrypt rounds={args.rounds}, {args.logins} logins, {args.callers} chamadores, {os.cpu_count()} núcleos")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        throughput = run(workers, args.rounds, args.logins, args.callers)
+        baseline = baseline or throughput
+        print(f"   pool={workers:<3} {throughput:7.1f} logins/s   ({throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Captura os planos (EXPLAIN ANALYZE) das consultas de relatório e listagem.
+
+Executa as funções reais dos repositórios, registra o SQL que elas emitem
+e roda EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) de cada statement com os
+mesmos parâmetros. Serve para comparar planos antes/depois de uma
+mudança de índices (ex.: migration 008):
+
+    cd backend
+    python scripts/explain_report_queries.py --output plans_before.json
+    alembic upgrade head
+    python scripts/explain_report_queries.py --output plans_after.json --compare plans_before.json
+
+Consultas (por usuário com mais lançamentos e como admin):
+dre_summary, cashflow_daily, aging_pending, top_entries,
+list_paginated, list_keyset e count_total.
+
+Tudo roda numa transação desfeita no final (EXPLAIN ANALYZE executa a consulta).
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+# Adicionar diretório backend ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.repositories.financial_repository import FinancialRepository
+from app.repositories.report_repository import ReportRepository
+
+
+def report_queries(date_from: date, date_to: date):
+    """(nome, função(db, user_id)) das consultas analisadas."""
+    return [
+        ("dre_summary", lambda db, user_id: ReportRepository.dre_summary(db, date_from, date_to, user_id)),
+        ("cashflow_daily", lambda db, user_id: ReportRepository.cashflow_daily(db, date_from, date_to, user_id)),
+        ("aging_pending", lambda db, user_id: ReportRepository.aging_pending(db, date_from, date_to, date_to, user_id)),
+        ("top_entries", lambda db, user_id: ReportRepository.top_entries(
+            db, "expense", "paid", date_from, date_to, 10, user_id
+        )),
+        ("list_paginated", lambda db, user_id: FinancialRepository.list_paginated(db, 5, 50, user_id=user_id)),
+        ("list_keyset", lambda db, user_id: FinancialRepository.list_keyset(db, 50, user_id=user_id)),
+        ("count_total", lambda db, user_id: FinancialRepository.count_total(db, user_id=user_id)),
+    ]
+
+
+def capture_statements(conn, func, user_id) -> list:
+    """Executa func numa Session sobre conn e retorna [(sql, params)] emitidos."""
+    statements = []
+
+    def record(conn_, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(conn, "before_cursor_execute", record)
+    db = Session(bind=conn)
+    try:
+        func(db, user_id)
+    finally:
+        db.close()
+        event.remove(conn, "before_cursor_execute", record)
+    return statements
+
+
+def plan_nodes(plan: dict) -> list:
+    """Tipos de nó do plano ('Index Only Scan on ix_...') em pré-ordem."""
+    label = plan["Node Type"]
+    if plan.get("Index Name"):
+        label += f" using {plan['Index Name']}"
+    elif plan.get("Relation Name"):
+        label += f" on {plan['Relation Name']}"
+    if "Heap Fetches" in plan:
+        label += f" (heap fetches {plan['Heap Fetches']})"
+    nodes = [label]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def explain(conn, statement, parameters) -> dict:
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+        result = cursor.fetchone()[0][0]
+    finally:
+        cursor.close()
+    return {
+        "execution_ms": result["Execution Time"],
+        "shared_hit": result["Plan"].get("Shared Hit Blocks", 0),
+        "shared_read": result["Plan"].get("Shared Read Blocks", 0),
+        "nodes": [n for n in plan_nodes(result["Plan"]) if "Scan" in n],
+        "plan": result["Plan"],
+    }
+
+
+def collect(days: int) -> dict:
+    date_to = date.today()
+    date_from = date_to - timedelta(days=days)
+    plans = {}
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            user_id = conn.execute(text("""
+                SELECT user_id FROM core.financial_entries
+                GROUP BY user_id ORDER BY count(*) DESC LIMIT 1
+            """)).scalar()
+            for scope, scope_user in (("user", user_id), ("admin", None)):
+                for name, func in report_queries(date_from, date_to):
+                    for i, (statement, params) in enumerate(capture_statements(conn, func, scope_user)):
+                        key = f"{name}[{scope}]" + (f"#{i + 1}" if i else "")
+                        plans[key] = explain(conn, statement, params)
+        finally:
+            transaction.rollback()
+    return plans
+
+
+def print_plans(plans: dict, baseline: dict = None) -> None:
+    for key, plan in plans.items():
+        line = f"   {key:<28} {plan['execution_ms']:9.2f} ms"
+        before = (baseline or {}).get(key)
+        if before:
+            line += f"   (antes {before['execution_ms']:9.2f} ms)"
+        print(line)
+        if before and before["nodes"] != plan["nodes"]:
+            for node in before["nodes"]:
+                print(f"        - {node}")
+        for node in plan["nodes"]:
+            print(f"        {'+' if before and before['nodes'] != plan['nodes'] else ' '} {node}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE das consultas de relatório/listagem")
+    parser.add_argument("--days", type=int, default=90, help="Período dos relatórios (até hoje)")
+    parser.add_argument("--output", type=str, default=None, help="Grava os planos em JSON")
+    parser.add_argument("--compare", type=str, default=None, help="JSON de uma captura anterior")
+    args = parser.parse_args()
+
+    plans = collect(args.days)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print(f"📊 {len(plans)} statements (período de {args.days} dias)")
+    print_plans(plans, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(plans, f, indent=2, default=str)
+        print(f"✅ Planos gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Script para recalcular o rollup diário financeiro (core.financial_daily_rollup).
+
+Executar:
+    cd backend
+    python scripts/rebuild_financial_rollup.py
+    python scripts/rebuild_financial_rollup.py --date-from 2026-01-01 --date-to 2026-01-31
+    python scripts/rebuild_financial_rollup.py --user-id <uuid>
+    python scripts/rebuild_financial_rollup.py --tz America/Sao_Paulo
+
+Quando usar:
+- Backfill após importação direta no banco (fora da API/ORM)
+- Correção após manutenção manual em core.financial_entries
+- Timezone nova em REPORT_TIMEZONES (rollup por dia local de cada timezone)
+
+Comportamento:
+- Cria antes os índices de dia local que faltam (CREATE INDEX CONCURRENTLY;
+  as migrations só criam os de America/Sao_Paulo e UTC)
+- Idempotente: apaga e recalcula o escopo informado
+- Sem --user-id/--date-from/--date-to, registra as timezones em
+  core.rollup_timezones: só então os relatórios passam a ler o rollup delas
+- Bloqueia escritas em core.financial_entries durante o rebuild (rodar fora do pico)
+"""
+import argparse
+import os
+import sys
+from datetime import date
+from uuid import UUID
+
+# Adicionar diretório backend ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, without_timeouts
+from app.repositories.financial_rollup_repository import FinancialRollupRepository
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recalcula core.financial_daily_rollup")
+    parser.add_argument("--user-id", type=UUID, default=None, help="Limita a um usuário")
+    parser.add_argument("--date-from", type=date.fromisoformat, default=None, help="Primeiro dia (YYYY-MM-DD)")
+    parser.add_argument("--date-to", type=date.fromisoformat, default=None, help="Último dia (YYYY-MM-DD)")
+    parser.add_argument(
+        "--tz", action="append", default=None,
+        help="Timezone a recalcular (repetível; padrão: todas de REPORT_TIMEZONES)"
+    )
+    return parser.parse_args()
+
+
+@without_timeouts()
+def rebuild_rollup():
+    """Executa o rebuild com os filtros da linha de comando (sem statement/lock timeout)."""
+    args = parse_args()
+
+    db = SessionLocal()
+    try:
+        print("🔄 Conferindo índices de dia local...")
+        created = FinancialRollupRepository.ensure_local_day_indexes(args.tz)
+        print(f"✅ Índices criados: {created}")
+
+        print("🔄 Recalculando rollup financeiro diário...")
+        rows = FinancialRollupRepository.rebuild(
+            db,
+            user_id=args.user_id,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            timezones=args.tz
+        )
+        print(f"✅ Rollup recalculado: {rows} linhas gravadas")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_rollup()
@@ -9,25 +9,34 @@ Provides:
 - Automatic migration application
 """
 
+import asyncio
 import os
 import subprocess
 from typing import Generator
 from datetime import datetime, timedelta
 
+# Dias dos relatórios em UTC (fixtures usam datetime.utcnow); precisa vir
+# antes de importar app.config. Variáveis já definidas prevalecem.
+os.environ.setdefault("REPORT_DEFAULT_TIMEZONE", "UTC")
+os.environ.setdefault("REPORT_TIMEZONES", "UTC")
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.database import Base
-from app.security.deps import get_db
+from app.database import Base, async_database_url
+from app.security.deps import get_async_db, get_async_read_db, get_db, get_read_db
 from app.config import SECRET_KEY, ALGORITHM
 from app.models.user import User
 from app.models.order import Order
 from app.models.financial_entry import FinancialEntry
 from app.auth.security import hash_password, create_access_token
+from app.core.report_cache import report_cache
+from app.security.user_cache import auth_user_cache
 
 
 # ============================================================================
@@ -102,6 +111,11 @@ def db_session(setup_test_database) -> Generator[Session, None, None]:
         session.execute(text("TRUNCATE TABLE core.users CASCADE"))
         session.commit()
         session.close()
+        engine.dispose()
+        
+        # TRUNCATE não passa pelo ORM: limpar caches manualmente
+        report_cache.clear()
+        auth_user_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -115,12 +129,28 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
         finally:
             pass  # Session cleanup handled by db_session fixture
     
+    # Rotas async (get_async_db): asyncpg no banco de teste. NullPool porque
+    # cada TestClient roda seu próprio event loop (conexões não sobrevivem a ele).
+    async_engine = create_async_engine(async_database_url(get_test_database_url()), poolclass=NullPool)
+
+    async def override_get_async_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    # Sem réplica nos testes: leituras usam o mesmo banco/sessão
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     
-    with TestClient(app) as test_client:
-        yield test_client
-    
-    app.dependency_overrides.clear()
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+        # Engine por teste: liberar (NullPool não guarda conexões, mas o
+        # engine e seu dialeto asyncpg ficariam vivos até o fim da sessão)
+        asyncio.run(async_engine.dispose())
 
 
 @pytest.fixture
@@ -240,6 +240,104 @@ class TestListFinancialEntries:
         assert data["page_size"] == 2
         assert data["total"] == 5
     
+    def test_list_entries_cursor_walks_all_pages(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Cursor deve percorrer todos os itens sem repetir (mesmo occurred_at desempata por id)"""
+        same_instant = datetime(2026, 3, 1, 10, 0, 0)
+        for i in range(5):
+            db_session.add(FinancialEntry(
+                user_id=seed_user_normal.id,
+                description=f"Entry {i}",
+                amount=10,
+                kind="revenue",
+                status="pending",
+                occurred_at=same_instant
+            ))
+        db_session.commit()
+        
+        client.headers.update(auth_headers_user)
+        
+        response = client.get("/financial/entries?page_size=2")
+        data = response.json()
+        seen = [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        assert cursor is not None
+        
+        while cursor:
+            response = client.get(f"/financial/entries?page_size=2&cursor={cursor}")
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+        
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+    
+    @pytest.mark.parametrize("total_mode", ["estimate", "none"])
+    def test_list_entries_total_mode(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session,
+        total_mode: str
+    ):
+        """total_mode deve ser informado na resposta; none omite total e usa has_more"""
+        for i in range(3):
+            db_session.add(FinancialEntry(
+                user_id=seed_user_normal.id,
+                description=f"Entry {i}",
+                amount=10,
+                kind="revenue",
+                status="pending",
+                occurred_at=datetime.now()
+            ))
+        db_session.commit()
+        
+        client.headers.update(auth_headers_user)
+        response = client.get(f"/financial/entries?page_size=2&total_mode={total_mode}")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_mode"] == total_mode
+        assert data["has_more"] is True
+        assert len(data["items"]) == 2
+        if total_mode == "none":
+            assert data["total"] is None
+        else:
+            assert isinstance(data["total"], int)
+        
+        last = client.get(f"/financial/entries?page=2&page_size=2&total_mode={total_mode}").json()
+        assert last["has_more"] is False
+        assert len(last["items"]) == 1
+    
+    def test_list_entries_invalid_total_mode(
+        self,
+        client: TestClient,
+        auth_headers_user: dict
+    ):
+        """Deve retornar 400 para total_mode desconhecido"""
+        client.headers.update(auth_headers_user)
+        response = client.get("/financial/entries?total_mode=approx")
+        
+        assert response.status_code == 400
+    
+    def test_list_entries_invalid_cursor(
+        self,
+        client: TestClient,
+        auth_headers_user: dict
+    ):
+        """Deve retornar 400 para cursor inválido"""
+        client.headers.update(auth_headers_user)
+        response = client.get("/financial/entries?cursor=nao-e-um-cursor")
+        
+        assert response.status_code == 400
+    
     def test_list_entries_date_range_filter(
         self,
         client: TestClient,
@@ -286,6 +384,94 @@ class TestListFinancialEntries:
         assert data["total"] >= 1
 
 
+class TestExportFinancialEntries:
+    """Testes para GET /financial/entries/export"""
+    
+    def _seed(self, db_session, user, count, kind="revenue"):
+        for i in range(count):
+            db_session.add(FinancialEntry(
+                user_id=user.id,
+                description=f"Export {i}, \"com aspas\"",
+                amount=10 + i,
+                kind=kind,
+                status="pending",
+                occurred_at=datetime(2026, 3, 1, 10, 0, 0) + timedelta(hours=i)
+            ))
+        db_session.commit()
+    
+    def test_export_requires_authentication(self, client: TestClient):
+        """Deve retornar 401 sem token"""
+        response = client.get("/financial/entries/export")
+        
+        assert response.status_code == 401
+    
+    def test_export_csv_multi_tenant(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        seed_user_other: User,
+        auth_headers_user: dict,
+        db_session: Session,
+        monkeypatch
+    ):
+        """CSV deve conter apenas lançamentos do usuário, em vários blocos"""
+        import csv
+        import io
+        from app.services.financial_service import FinancialService
+        
+        monkeypatch.setattr(FinancialService, "EXPORT_BATCH_SIZE", 2)
+        self._seed(db_session, seed_user_normal, 5)
+        self._seed(db_session, seed_user_other, 3)
+        
+        client.headers.update(auth_headers_user)
+        response = client.get("/financial/entries/export?format=csv")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 5
+        assert {row["user_id"] for row in rows} == {str(seed_user_normal.id)}
+        assert rows[0]["description"] == 'Export 4, "com aspas"'
+        assert rows[0]["order_id"] == ""
+    
+    def test_export_ndjson_with_filter(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """NDJSON deve respeitar filtros e serializar cada linha como JSON"""
+        import json
+        
+        self._seed(db_session, seed_user_normal, 2, kind="revenue")
+        self._seed(db_session, seed_user_normal, 3, kind="expense")
+        
+        client.headers.update(auth_headers_user)
+        response = client.get("/financial/entries/export?format=ndjson&kind=expense")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = [json.loads(line) for line in response.text.splitlines()]
+        assert len(items) == 3
+        assert all(item["kind"] == "expense" for item in items)
+        assert isinstance(items[0]["amount"], float)
+        assert items[0]["occurred_at"].startswith("2026-03-01T")
+    
+    @pytest.mark.parametrize("query", ["format=xml", "status=invalid", "kind=invalid"])
+    def test_export_invalid_params(
+        self,
+        client: TestClient,
+        auth_headers_user: dict,
+        query: str
+    ):
+        """Deve retornar 400 para parâmetros inválidos"""
+        client.headers.update(auth_headers_user)
+        response = client.get(f"/financial/entries/export?{query}")
+        
+        assert response.status_code == 400
+
+
 class TestCreateFinancialEntry:
     """Testes para POST /financial/entries"""
     
@@ -315,6 +501,145 @@ class TestCreateFinancialEntry:
         assert response.status_code == 422
 
 
+class TestBulkCreateFinancialEntries:
+    """Testes para POST /financial/entries/bulk"""
+    
+    def _items(self, count):
+        return [
+            {
+                "kind": "revenue" if i % 2 else "expense",
+                "amount": 10 + i,
+                "description": f"Conciliação {i}",
+                "occurred_at": "2026-01-10T12:00:00"
+            }
+            for i in range(count)
+        ]
+    
+    def test_bulk_requires_authentication(self, client: TestClient):
+        """Deve retornar 401 sem token"""
+        response = client.post("/financial/entries/bulk", json={"items": self._items(1)})
+        
+        assert response.status_code == 401
+    
+    def test_bulk_all_or_nothing_creates_batch(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Lote válido deve ser criado inteiro, com user_id do token e status pending"""
+        from datetime import date
+        from decimal import Decimal
+        from app.models.financial_daily_rollup import FinancialDailyRollup
+        
+        client.headers.update(auth_headers_user)
+        response = client.post("/financial/entries/bulk", json={"items": self._items(500)})
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created"] == 500
+        assert data["failed"] == 0
+        assert data["errors"] == []
+        assert {item["user_id"] for item in data["items"]} == {str(seed_user_normal.id)}
+        assert {item["status"] for item in data["items"]} == {"pending"}
+        
+        count = db_session.query(FinancialEntry).filter(
+            FinancialEntry.user_id == seed_user_normal.id
+        ).count()
+        assert count == 500
+        
+        # Rollup diário atualizado na mesma transação
+        rollup = {
+            r.kind: (Decimal(r.amount_total), r.entry_count)
+            for r in db_session.query(FinancialDailyRollup).filter(
+                FinancialDailyRollup.user_id == seed_user_normal.id,
+                FinancialDailyRollup.day == date(2026, 1, 10)
+            )
+        }
+        assert rollup["expense"] == (Decimal(sum(10 + i for i in range(0, 500, 2))), 250)
+        assert rollup["revenue"] == (Decimal(sum(10 + i for i in range(1, 500, 2))), 250)
+    
+    def test_bulk_all_or_nothing_rejects_batch(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Qualquer item inválido deve retornar 400 com os erros e não gravar nada"""
+        items = self._items(3)
+        items[1]["kind"] = "invalid"
+        items[2]["amount"] = -5
+        
+        client.headers.update(auth_headers_user)
+        response = client.post("/financial/entries/bulk", json={"items": items})
+        
+        assert response.status_code == 400
+        errors = response.json()["detail"]["errors"]
+        assert [error["index"] for error in errors] == [1, 2]
+        assert "kind inválido" in errors[0]["error"]
+        
+        count = db_session.query(FinancialEntry).filter(
+            FinancialEntry.user_id == seed_user_normal.id
+        ).count()
+        assert count == 0
+    
+    def test_bulk_per_row_creates_valid_items(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Modo per_row deve criar os válidos e reportar os inválidos por índice"""
+        items = self._items(4)
+        items[0]["description"] = "   "
+        items[3]["amount"] = 10 ** 10
+        
+        client.headers.update(auth_headers_user)
+        response = client.post("/financial/entries/bulk", json={"items": items, "mode": "per_row"})
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 2
+        assert [error["index"] for error in data["errors"]] == [0, 3]
+        assert sorted(item["description"] for item in data["items"]) == ["Conciliação 1", "Conciliação 2"]
+    
+    def test_bulk_invalidates_report_cache(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict
+    ):
+        """Relatórios em cache devem refletir o lote logo após a criação"""
+        client.headers.update(auth_headers_user)
+        url = "/reports/financial/dre?date_from=2026-01-01&date_to=2026-01-31"
+        before = client.get(url).json()
+        
+        client.post("/financial/entries/bulk", json={"items": self._items(4)})
+        after = client.get(url).json()
+        
+        assert after["count_entries_total"] == before["count_entries_total"] + 4
+    
+    @pytest.mark.parametrize("payload", [
+        {"items": []},
+        {"items": [{"kind": "revenue", "amount": 1, "description": "x"}], "mode": "invalid"},
+    ])
+    def test_bulk_invalid_payload(
+        self,
+        client: TestClient,
+        auth_headers_user: dict,
+        payload: dict
+    ):
+        """Deve retornar 422 para lote vazio ou mode inválido"""
+        client.headers.update(auth_headers_user)
+        response = client.post("/financial/entries/bulk", json=payload)
+        
+        assert response.status_code == 422
+
+
 class TestGetFinancialEntryById:
     """Testes para GET /financial/entries/{entry_id}"""
     
@@ -351,6 +676,178 @@ class TestUpdateFinancialEntryStatus:
         assert response.status_code == 401
 
 
+class TestBulkUpdateFinancialEntryStatus:
+    """Testes para PATCH /financial/entries/bulk/status"""
+    
+    def _entry(self, db_session, user, status="pending", kind="revenue", day=10, amount=100):
+        entry = FinancialEntry(
+            user_id=user.id,
+            description="Bulk status",
+            amount=amount,
+            kind=kind,
+            status=status,
+            occurred_at=datetime(2026, 1, day, 12, 0, 0)
+        )
+        db_session.add(entry)
+        db_session.commit()
+        return entry
+    
+    def test_bulk_status_requires_authentication(self, client: TestClient):
+        """Deve retornar 401 sem token"""
+        response = client.patch("/financial/entries/bulk/status", json={"status": "paid", "ids": [str(uuid4())]})
+        
+        assert response.status_code == 401
+    
+    def test_bulk_status_by_ids_reports_outcomes(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        seed_user_other: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Cada ID deve receber seu resultado; só os pending do usuário mudam"""
+        pending = self._entry(db_session, seed_user_normal)
+        already_paid = self._entry(db_session, seed_user_normal, status="paid")
+        canceled = self._entry(db_session, seed_user_normal, status="canceled")
+        other_tenant = self._entry(db_session, seed_user_other)
+        missing = uuid4()
+        ids = [pending.id, already_paid.id, canceled.id, other_tenant.id, missing]
+        
+        client.headers.update(auth_headers_user)
+        response = client.patch(
+            "/financial/entries/bulk/status",
+            json={"status": "paid", "ids": [str(i) for i in ids]}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["updated"] == 1
+        assert data["rejected"] == 3
+        outcomes = {r["id"]: r["outcome"] for r in data["results"]}
+        assert outcomes == {
+            str(pending.id): "updated",
+            str(already_paid.id): "unchanged",
+            str(canceled.id): "invalid_transition",
+            str(other_tenant.id): "not_found",
+            str(missing): "not_found",
+        }
+        
+        db_session.refresh(other_tenant)
+        db_session.refresh(pending)
+        assert other_tenant.status == "pending"
+        assert pending.status == "paid"
+    
+    def test_bulk_status_by_filter_updates_rollup(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Filtro deve atualizar apenas os pending do dia e mover o valor no rollup"""
+        from datetime import date
+        from decimal import Decimal
+        from app.models.financial_daily_rollup import FinancialDailyRollup
+        
+        self._entry(db_session, seed_user_normal, amount=100)
+        self._entry(db_session, seed_user_normal, amount=50)
+        self._entry(db_session, seed_user_normal, kind="expense", amount=30)
+        self._entry(db_session, seed_user_normal, day=11, amount=70)
+        
+        client.headers.update(auth_headers_user)
+        response = client.patch("/financial/entries/bulk/status", json={
+            "status": "paid",
+            "filter": {
+                "kind": "revenue",
+                "date_from": "2026-01-10T00:00:00",
+                "date_to": "2026-01-10T23:59:59"
+            }
+        })
+        
+        assert response.status_code == 200
+        assert response.json()["updated"] == 2
+        assert response.json()["results"] == []
+        
+        rollup = {
+            (r.kind, r.status): (Decimal(r.amount_total), r.entry_count)
+            for r in db_session.query(FinancialDailyRollup).filter(
+                FinancialDailyRollup.user_id == seed_user_normal.id,
+                FinancialDailyRollup.day == date(2026, 1, 10),
+                FinancialDailyRollup.entry_count != 0
+            )
+        }
+        assert rollup == {
+            ("revenue", "paid"): (Decimal("150.00"), 2),
+            ("expense", "pending"): (Decimal("30.00"), 1),
+        }
+    
+    def test_bulk_status_by_filter_rejects_over_limit(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session,
+        monkeypatch
+    ):
+        """Filtro que casa com mais de MAX_BULK_ITEMS pending deve ser recusado sem atualizar nada"""
+        from app.services.financial_service import FinancialService
+        
+        monkeypatch.setattr(FinancialService, "MAX_BULK_ITEMS", 1)
+        entries = [self._entry(db_session, seed_user_normal, amount=10) for _ in range(2)]
+        
+        client.headers.update(auth_headers_user)
+        response = client.patch("/financial/entries/bulk/status", json={
+            "status": "paid",
+            "filter": {"date_from": "2026-01-10T00:00:00", "date_to": "2026-01-10T23:59:59"}
+        })
+        
+        assert response.status_code == 400
+        assert "mais de 1" in response.json()["detail"]
+        for entry in entries:
+            db_session.refresh(entry)
+            assert entry.status == "pending"
+    
+    def test_bulk_status_invalidates_report_cache(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """DRE em cache deve refletir a transição logo após o lote"""
+        entry = self._entry(db_session, seed_user_normal, amount=40)
+        
+        client.headers.update(auth_headers_user)
+        url = "/reports/financial/dre?date_from=2026-01-01&date_to=2026-01-31"
+        assert client.get(url).json()["revenue_paid_total"] == 0.0
+        
+        client.patch("/financial/entries/bulk/status", json={"status": "paid", "ids": [str(entry.id)]})
+        
+        assert client.get(url).json()["revenue_paid_total"] == 40.0
+    
+    @pytest.mark.parametrize("payload,expected", [
+        ({"status": "paid"}, 422),
+        ({"status": "paid", "ids": [], "filter": {"kind": "revenue"}}, 422),
+        ({"status": "paid", "filter": {}}, 422),
+        ({"status": "paid", "filter": {"kind": "revenue", "date_from": "2026-01-01T00:00:00"}}, 422),
+        ({"status": "paid", "filter": {"date_from": "2026-01-31T00:00:00", "date_to": "2026-01-01T00:00:00"}}, 400),
+        ({"status": "invalid", "ids": ["00000000-0000-0000-0000-000000000001"]}, 400),
+    ])
+    def test_bulk_status_invalid_payload(
+        self,
+        client: TestClient,
+        auth_headers_user: dict,
+        payload: dict,
+        expected: int
+    ):
+        """Deve validar alvo (ids xor filter), período do filtro e status"""
+        client.headers.update(auth_headers_user)
+        response = client.patch("/financial/entries/bulk/status", json=payload)
+        
+        assert response.status_code == expected
+
+
 class TestDeleteFinancialEntry:
     """Testes para DELETE /financial/entries/{entry_id}"""
     
@@ -132,6 +132,50 @@ class TestListOrders:
         assert data["page"] == 1
         assert data["page_size"] == 2
         assert data["total"] == 5
+    
+    def test_list_orders_cursor_pagination(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Cursor deve continuar de onde a página anterior parou"""
+        for i in range(5):
+            db_session.add(Order(
+                user_id=seed_user_normal.id,
+                description=f"Order {i}",
+                total=100 * i
+            ))
+        db_session.commit()
+        
+        client.headers.update(auth_headers_user)
+        
+        first = client.get("/orders?page_size=3").json()
+        second = client.get(f"/orders?page_size=3&cursor={first['next_cursor']}").json()
+        
+        ids = [o["id"] for o in first["items"] + second["items"]]
+        assert len(set(ids)) == 5
+        assert second["next_cursor"] is None
+    
+    def test_list_orders_total_mode_none(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """total_mode=none não calcula total e indica has_more"""
+        for i in range(3):
+            db_session.add(Order(user_id=seed_user_normal.id, description=f"Order {i}", total=10))
+        db_session.commit()
+        
+        client.headers.update(auth_headers_user)
+        data = client.get("/orders?page_size=2&total_mode=none").json()
+        
+        assert data["total"] is None
+        assert data["total_mode"] == "none"
+        assert data["has_more"] is True
 
 
 class TestCreateOrder:
@@ -153,6 +153,79 @@ class TestCashflowDailyReport:
         assert "days" in data
 
 
+    def test_cashflow_monthly_fills_gaps(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """granularity=month: um item por mês, meses sem lançamentos com zeros"""
+        for occurred_at, kind, amount in [
+            (datetime(2025, 1, 15, 12), 'revenue', 100.0),
+            (datetime(2025, 1, 31, 23), 'expense', 30.0),
+            (datetime(2025, 4, 1, 8), 'revenue', 50.0),
+        ]:
+            db_session.add(FinancialEntry(
+                user_id=seed_user_normal.id, kind=kind, amount=amount,
+                description='Mensal', status='paid', occurred_at=occurred_at
+            ))
+        db_session.commit()
+
+        client.headers.update(auth_headers_user)
+        response = client.get(
+            "/reports/financial/cashflow/daily?date_from=2025-01-10&date_to=2025-05-20&granularity=month"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "month"
+        assert [(d["date"], d["net_paid"]) for d in data["days"]] == [
+            ("2025-01-01", 70.0),
+            ("2025-02-01", 0.0),
+            ("2025-03-01", 0.0),
+            ("2025-04-01", 50.0),
+            ("2025-05-01", 0.0),
+        ]
+
+    @pytest.mark.parametrize("granularity, expected", [
+        ("week", ["2025-03-31", "2025-04-07"]),
+        ("quarter", ["2025-01-01", "2025-04-01"]),
+    ])
+    def test_cashflow_week_and_quarter_buckets(
+        self,
+        client: TestClient,
+        auth_headers_user: dict,
+        granularity: str,
+        expected: list
+    ):
+        """Semana ISO (segunda) e trimestre: date é o início do período"""
+        client.headers.update(auth_headers_user)
+        date_from = "2025-03-31" if granularity == "week" else "2025-02-15"
+        response = client.get(
+            f"/reports/financial/cashflow/daily?date_from={date_from}&date_to=2025-04-10"
+            f"&granularity={granularity}"
+        )
+
+        assert response.status_code == 200
+        assert [d["date"] for d in response.json()["days"]] == expected
+
+    def test_cashflow_range_limit_depends_on_granularity(
+        self,
+        client: TestClient,
+        auth_headers_user: dict
+    ):
+        """5 anos: rejeitado por dia, aceito por mês; granularidade inválida → 400"""
+        client.headers.update(auth_headers_user)
+        url = "/reports/financial/cashflow/daily?date_from=2021-01-01&date_to=2025-12-31"
+
+        assert client.get(url).status_code == 400
+        monthly = client.get(f"{url}&granularity=month")
+        assert monthly.status_code == 200
+        assert len(monthly.json()["days"]) == 60
+        assert client.get(f"{url}&granularity=year").status_code == 400
+
+
 class TestPendingAgingReport:
     """Testes para GET /reports/pending/aging"""
     
@@ -214,6 +287,64 @@ class TestPendingAgingReport:
         data = response.json()
         assert "pending_revenue" in data
 
+    def test_aging_custom_buckets(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Deve distribuir pendências nas faixas informadas em buckets"""
+        reference = datetime(2026, 6, 30, 12, 0, 0)
+        for days_old, amount in [(10, 10.0), (40, 20.0), (90, 30.0), (120, 40.0)]:
+            db_session.add(FinancialEntry(
+                user_id=seed_user_normal.id,
+                kind='expense',
+                amount=amount,
+                description=f'Pendente {days_old} dias',
+                status='pending',
+                occurred_at=reference - timedelta(days=days_old)
+            ))
+        db_session.commit()
+
+        client.headers.update(auth_headers_user)
+        response = client.get(
+            "/reports/financial/pending/aging?date_from=2026-01-01&date_to=2026-06-30"
+            "&reference_date=2026-06-30&buckets=15,45,90"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["bucket_limits"] == [15, 45, 90]
+
+        expense = data["pending_expense"]
+        assert [(b["label"], b["amount"]) for b in expense["buckets"]] == [
+            ("0_15_days", 10.0),
+            ("16_45_days", 20.0),
+            ("46_90_days", 30.0),
+            ("91_plus_days", 40.0),
+        ]
+        assert expense["total"] == 100.0
+        # Faixas legadas continuam presentes
+        assert expense["0_7_days"] == 0.0
+        assert expense["8_30_days"] == 10.0
+        assert expense["31_plus_days"] == 90.0
+
+    @pytest.mark.parametrize("buckets", ["abc", "30,15", "0,10", "10,10"])
+    def test_aging_invalid_buckets(
+        self,
+        client: TestClient,
+        auth_headers_user: dict,
+        buckets: str
+    ):
+        """Deve retornar 400 para buckets inválido"""
+        client.headers.update(auth_headers_user)
+        response = client.get(
+            f"/reports/financial/pending/aging?date_from=2024-01-01&date_to=2024-12-31&buckets={buckets}"
+        )
+
+        assert response.status_code == 400
+
 
 class TestTopEntriesReport:
     """Testes para GET /reports/top"""
@@ -298,6 +429,48 @@ class TestTopEntriesReport:
         data = response.json()
         assert "items" in data
     
+    def test_top_groups_orders_by_normalized_description(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """Pedidos com a mesma descrição formam um grupo (UUID fora da chave); soft-deleted não entra"""
+        from app.services.order_service import OrderService
+
+        OrderService.create_order(db_session, seed_user_normal.id, "Mesa  de escritório", 100.0)
+        latest = OrderService.create_order(db_session, seed_user_normal.id, "Mesa de escritório", 250.0)
+        chair = OrderService.create_order(db_session, seed_user_normal.id, "Cadeira", 80.0)
+        db_session.add(FinancialEntry(
+            user_id=seed_user_normal.id,
+            kind='revenue',
+            amount=Decimal('999.00'),
+            description='Removido',
+            status='pending',
+            occurred_at=datetime.utcnow(),
+            deleted_at=datetime.utcnow()
+        ))
+        db_session.commit()
+
+        today = datetime.utcnow().date()
+        client.headers.update(auth_headers_user)
+        response = client.get(
+            f"/reports/financial/top?kind=revenue&status=pending&date_from={today - timedelta(days=1)}&date_to={today}"
+        )
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [(i["description_key"], i["total_amount"], i["count"]) for i in items] == [
+            ("Pedido - Mesa de escritório", 350.0, 2),
+            ("Pedido - Cadeira", 80.0, 1),
+        ]
+        # Descrição real: a do lançamento mais recente do grupo
+        assert [i["description"] for i in items] == [
+            f"Pedido {latest.id} - Mesa de escritório",
+            f"Pedido {chair.id} - Cadeira",
+        ]
+    
     def test_top_with_date_filters(
         self,
         client: TestClient,
@@ -365,3 +538,250 @@ class TestReportRoutesEdgeCases:
 
 
 
+
+
+class TestDashboardReport:
+    """Testes para GET /reports/financial/dashboard"""
+
+    @staticmethod
+    def _seed_mixed_entries(db_session: Session, user: User) -> None:
+        """Lançamentos em dias fechados (rollup) e hoje, todos os kinds/status."""
+        now = datetime.utcnow().replace(microsecond=0)
+        rows = [
+            (0, 'revenue', 'paid', 100.10), (0, 'expense', 'pending', 40.05),
+            (3, 'revenue', 'pending', 70.00), (3, 'expense', 'paid', 33.33),
+            (3, 'expense', 'canceled', 500.00), (12, 'revenue', 'paid', 250.25),
+            (45, 'expense', 'pending', 80.80), (45, 'revenue', 'canceled', 9.99),
+        ]
+        for days_ago, kind, status_, amount in rows:
+            db_session.add(FinancialEntry(
+                user_id=user.id,
+                kind=kind,
+                amount=amount,
+                description=f'{kind} {days_ago}',
+                status=status_,
+                occurred_at=now - timedelta(days=days_ago)
+            ))
+        db_session.commit()
+
+    def test_dashboard_requires_authentication(self, client: TestClient):
+        """Deve retornar 401 sem token"""
+        response = client.get("/reports/financial/dashboard")
+
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize("include_canceled", [False, True])
+    def test_dashboard_matches_individual_reports(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session,
+        include_canceled: bool
+    ):
+        """Cada parte do painel é idêntica à resposta do endpoint individual"""
+        from app.core.report_cache import report_cache
+
+        self._seed_mixed_entries(db_session, seed_user_normal)
+        today = datetime.utcnow().date()
+        period = f"date_from={today - timedelta(days=60)}&date_to={today}"
+        flag = f"&include_canceled={str(include_canceled).lower()}"
+
+        client.headers.update(auth_headers_user)
+        dashboard = client.get(
+            f"/reports/financial/dashboard?{period}{flag}&buckets=5,30&top_kind=expense&top_status=pending"
+        )
+        assert dashboard.status_code == 200
+        data = dashboard.json()
+
+        report_cache.clear()
+        individual = {
+            "dre": client.get(f"/reports/financial/dre?{period}{flag}").json(),
+            "cashflow": client.get(f"/reports/financial/cashflow/daily?{period}{flag}").json(),
+            "aging": client.get(f"/reports/financial/pending/aging?{period}&buckets=5,30").json(),
+            "top": client.get(f"/reports/financial/top?{period}&kind=expense&status=pending").json(),
+        }
+        for part, expected in individual.items():
+            assert data[part] == expected, part
+        assert data["dre"]["count_entries_total"] == (8 if include_canceled else 6)
+
+    @pytest.mark.parametrize("granularity", ["day", "week", "month", "quarter"])
+    def test_dashboard_single_daily_aggregation(
+        self,
+        seed_user_normal: User,
+        db_session: Session,
+        granularity: str
+    ):
+        """Duas consultas: vetor diário + cashflow agrupado no banco (CTE) e top lançamentos"""
+        from sqlalchemy import event
+        from app.repositories.financial_rollup_repository import FinancialRollupRepository
+        from app.repositories.report_repository import ReportRepository
+        from app.services.report_service import ReportService
+
+        self._seed_mixed_entries(db_session, seed_user_normal)
+        user_id = seed_user_normal.id
+        today = datetime.utcnow().date()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                statements.append(statement)
+
+        # Registro de timezones do rollup: lido uma vez por worker (TTL)
+        FinancialRollupRepository.built_timezones(db_session)
+        connection = db_session.connection()
+        event.listen(connection, "before_cursor_execute", record)
+        try:
+            dashboard = ReportService.get_dashboard(
+                db_session, today - timedelta(days=60), today, user_id=user_id, granularity=granularity
+            )
+        finally:
+            event.remove(connection, "before_cursor_execute", record)
+
+        assert len(statements) == 2
+        assert sum("description_key" in statement for statement in statements) == 1
+        assert sum(
+            "date_trunc" in statement and "generate_series" in statement for statement in statements
+        ) == 1
+        assert dashboard["cashflow"]["granularity"] == granularity
+        assert dashboard["cashflow"]["days"] == ReportRepository.cashflow_daily(
+            db_session, today - timedelta(days=60), today, user_id=user_id, granularity=granularity
+        )
+
+    def test_dashboard_invalid_top_kind(
+        self,
+        client: TestClient,
+        auth_headers_user: dict
+    ):
+        """Deve validar parâmetros do top antes de consultar"""
+        client.headers.update(auth_headers_user)
+        response = client.get(
+            "/reports/financial/dashboard?date_from=2026-01-01&date_to=2026-01-31&top_kind=invalid"
+        )
+
+        assert response.status_code == 400
+
+
+class TestReportTimezone:
+    """Parâmetro tz: dia local dos lançamentos em todos os relatórios"""
+
+    def test_cashflow_buckets_by_requested_timezone(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session
+    ):
+        """01:30 UTC de 10/03 cai em 09/03 em São Paulo (e não reaproveita o cache de UTC)"""
+        from datetime import timezone
+
+        db_session.add(FinancialEntry(
+            user_id=seed_user_normal.id,
+            kind='revenue',
+            amount=Decimal('120.00'),
+            description='Venda madrugada',
+            status='paid',
+            occurred_at=datetime(2026, 3, 10, 1, 30, tzinfo=timezone.utc)
+        ))
+        db_session.commit()
+
+        client.headers.update(auth_headers_user)
+        period = "date_from=2026-03-09&date_to=2026-03-10"
+
+        utc = client.get(f"/reports/financial/cashflow/daily?{period}").json()
+        local = client.get(f"/reports/financial/cashflow/daily?{period}&tz=America/Sao_Paulo").json()
+
+        assert utc["period"]["tz"] == "UTC"
+        assert local["period"]["tz"] == "America/Sao_Paulo"
+        assert [d["revenue_paid"] for d in utc["days"]] == [0.0, 120.0]
+        assert [d["revenue_paid"] for d in local["days"]] == [120.0, 0.0]
+
+        dre = client.get("/reports/financial/dre?date_from=2026-03-09&date_to=2026-03-09&tz=America/Sao_Paulo")
+        assert dre.json()["revenue_paid_total"] == 120.0
+
+    def test_default_timezone_sao_paulo_near_midnight(
+        self,
+        client: TestClient,
+        seed_user_normal: User,
+        auth_headers_user: dict,
+        db_session: Session,
+        monkeypatch
+    ):
+        """Sem tz, padrão America/Sao_Paulo (o da produção): 23:30 locais ficam no dia local (rollup e dia corrente)"""
+        from datetime import time, timezone
+        from zoneinfo import ZoneInfo
+        from app.models.rollup_timezone import RollupTimezone
+        from app.repositories.financial_rollup_repository import FinancialRollupRepository
+
+        # conftest/CI forçam UTC; aqui vale o padrão de app.config
+        sao_paulo = ZoneInfo("America/Sao_Paulo")
+        monkeypatch.setattr("app.services.report_service.REPORT_DEFAULT_TIMEZONE", "America/Sao_Paulo")
+        monkeypatch.setattr("app.repositories.report_repository.REPORT_DEFAULT_TIMEZONE", "America/Sao_Paulo")
+        monkeypatch.setattr(
+            "app.repositories.financial_rollup_repository.REPORT_TIMEZONES",
+            ["America/Sao_Paulo", "UTC"]
+        )
+
+        today = datetime.now(sao_paulo).date()
+        first_day = today - timedelta(days=2)
+
+        def local(day, hour, minute):
+            return datetime.combine(day, time(hour, minute), tzinfo=sao_paulo).astimezone(timezone.utc)
+
+        # Dias fechados (rollup) e dia corrente (scan); 23:xx locais = dia seguinte em UTC
+        for day, hour, minute, amount in [
+            (first_day, 23, 30, '10.00'),
+            (today - timedelta(days=1), 23, 30, '20.00'),
+            (today, 0, 10, '40.00'),
+            (today, 23, 50, '80.00'),
+        ]:
+            db_session.add(FinancialEntry(
+                user_id=seed_user_normal.id,
+                kind='revenue',
+                amount=Decimal(amount),
+                description='Venda noturna',
+                status='paid',
+                occurred_at=local(day, hour, minute)
+            ))
+        db_session.commit()
+        FinancialRollupRepository.rebuild(db_session, timezones=["America/Sao_Paulo"])
+        assert "America/Sao_Paulo" in FinancialRollupRepository.built_timezones(db_session)
+
+        try:
+            client.headers.update(auth_headers_user)
+            period = f"date_from={first_day.isoformat()}&date_to={today.isoformat()}"
+
+            cashflow = client.get(f"/reports/financial/cashflow/daily?{period}").json()
+            assert cashflow["period"]["tz"] == "America/Sao_Paulo"
+            assert [d["date"] for d in cashflow["days"]] == [
+                (first_day + timedelta(days=i)).isoformat() for i in range(3)
+            ]
+            assert [d["revenue_paid"] for d in cashflow["days"]] == [10.0, 20.0, 120.0]
+
+            closed = client.get(
+                f"/reports/financial/dre?date_from={first_day.isoformat()}&date_to={first_day.isoformat()}"
+            ).json()
+            assert closed["revenue_paid_total"] == 10.0
+
+            current = client.get(f"/reports/financial/dre?date_from={today.isoformat()}&date_to={today.isoformat()}")
+            assert current.json()["revenue_paid_total"] == 120.0
+        finally:
+            db_session.query(RollupTimezone).filter(RollupTimezone.tz == "America/Sao_Paulo").delete()
+            db_session.commit()
+            FinancialRollupRepository.clear_built_timezones_cache()
+
+    @pytest.mark.parametrize("path", ["dre", "cashflow/daily", "pending/aging", "dashboard"])
+    def test_invalid_timezone(
+        self,
+        client: TestClient,
+        auth_headers_user: dict,
+        path: str
+    ):
+        """tz fora da base IANA → 400"""
+        client.headers.update(auth_headers_user)
+        response = client.get(
+            f"/reports/financial/{path}?date_from=2026-01-01&date_to=2026-01-31&tz=Mars/Olympus"
+        )
+
+        assert response.status_code == 400
+        assert "tz" in response.json()["detail"]
@@ -151,3 +151,97 @@ class TestPasswordIntegration:
         assert verify_password(senha_comum, hash_user1)
         assert verify_password(senha_comum, hash_user2)
         assert verify_password(senha_comum, hash_user3)
+
+
+class TestPasswordHasherPool:
+    """Testes do pool dedicado de bcrypt (limite, métricas, rehash)"""
+    
+    def test_needs_rehash_when_cost_differs(self):
+        """Hash com custo diferente de BCRYPT_ROUNDS deve ser refeito"""
+        import bcrypt
+        from app.security.password import PasswordHasher
+        
+        hasher = PasswordHasher(workers=1, rounds=5)
+        assert not hasher.needs_rehash(hasher.hash("abc"))
+        assert hasher.needs_rehash(bcrypt.hashpw(b"abc", bcrypt.gensalt(4)).decode())
+        assert hasher.needs_rehash("hash-invalido")
+    
+    def test_rejects_when_pending_limit_reached(self):
+        """Acima de max_pending deve recusar (503) sem enfileirar"""
+        import threading
+        from prometheus_client import REGISTRY
+        from app.exceptions.errors import ServiceUnavailableError
+        from app.security.password import PasswordHasher
+        
+        hasher = PasswordHasher(workers=1, max_pending=2, rounds=4)
+        release = threading.Event()
+        started = threading.Event()
+        
+        def slow():
+            started.set()
+            release.wait(5)
+        
+        running = threading.Thread(target=hasher._run, args=("hash", slow))
+        queued = threading.Thread(target=hasher._run, args=("hash", lambda: None))
+        running.start()
+        started.wait(5)
+        queued.start()
+        try:
+            deadline = 50
+            while hasher._pending < 2 and deadline:
+                threading.Event().wait(0.01)
+                deadline -= 1
+            assert REGISTRY.get_sample_value("password_hash_queue_depth") >= 1
+            with pytest.raises(ServiceUnavailableError):
+                hasher.hash("abc")
+        finally:
+            release.set()
+            running.join(5)
+            queued.join(5)
+        
+        assert hasher._pending == 0
+        assert hasher.verify("abc", hasher.hash("abc"))
+
+
+@pytest.mark.auth
+class TestLoginRehash:
+    """Rehash transparente no login e 503 com pool cheio"""
+    
+    @pytest.fixture(autouse=True)
+    def reset_rate_limit(self):
+        """Logins destes testes não devem consumir o limite 5/minute dos demais"""
+        from app.auth.router import limiter
+        
+        yield
+        limiter.reset()
+    
+    def _login(self, client):
+        return client.post(
+            "/auth/login",
+            data={"username": "user@test.com", "password": "testpass123"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+    
+    def test_login_rehashes_old_cost(self, client, db_session, seed_user_normal):
+        """Senha com custo antigo é refeita com BCRYPT_ROUNDS no login"""
+        import bcrypt
+        from app.config import BCRYPT_ROUNDS
+        
+        seed_user_normal.password_hash = bcrypt.hashpw(b"testpass123", bcrypt.gensalt(4)).decode()
+        db_session.commit()
+        
+        assert self._login(client).status_code == 200
+        
+        db_session.refresh(seed_user_normal)
+        assert seed_user_normal.password_hash.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+        assert self._login(client).status_code == 200
+    
+    def test_login_returns_503_when_pool_full(self, client, seed_user_normal, monkeypatch):
+        """Pool de bcrypt saturado responde 503 em vez de prender threads"""
+        from app.security.password import password_hasher
+        
+        monkeypatch.setattr(password_hasher, "max_pending", 0)
+        
+        response = self._login(client)
+        assert response.status_code == 503
+        assert response.json()["error"] == "ServiceUnavailableError"
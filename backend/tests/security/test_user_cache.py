@@ -0,0 +1,139 @@
+"""
+Testes para o cache de usuário autenticado (app.security.user_cache).
+
+COBERTURA:
+1. Segundo request com o mesmo token não consulta core.users (hit)
+2. UserService.update_user/delete_user invalidam (inativação → 401)
+3. AuthService.change_password invalida
+4. TTL 0 desativa o cache
+5. Invalidação chega a outro worker (LISTEN/NOTIFY)
+6. Sem LISTEN ativo o cache não é servido
+"""
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.auth.service import AuthService
+from app.schemas.user_schema import UserUpdate
+from app.security.user_cache import AuthenticatedUser, AuthenticatedUserCache, auth_user_cache
+from app.services.user_service import UserService
+
+
+def _cache_counter(result):
+    return REGISTRY.get_sample_value("auth_user_cache_requests_total", {"result": result}) or 0.0
+
+
+class _UsersQueryCounter:
+    """Conta SELECTs em core.users executados em qualquer engine."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "core.users" in statement:
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self)
+
+
+@pytest.mark.auth
+def test_repeated_requests_skip_users_table(client: TestClient, seed_user_normal, auth_headers_user):
+    """Primeiro request busca o usuário (miss); os seguintes vêm do cache (hit)."""
+    hits, misses = _cache_counter("hit"), _cache_counter("miss")
+    client.headers.update(auth_headers_user)
+
+    with _UsersQueryCounter() as users_queries:
+        for _ in range(3):
+            assert client.get("/financial/entries").status_code == 200
+
+    assert users_queries.count == 1
+    assert _cache_counter("miss") == misses + 1
+    assert _cache_counter("hit") == hits + 2
+
+
+@pytest.mark.auth
+def test_update_user_invalidates_cache(client: TestClient, db_session, seed_user_normal, auth_headers_user):
+    """Inativar o usuário deve valer no próximo request (não esperar o TTL)."""
+    client.headers.update(auth_headers_user)
+    assert client.get("/financial/entries").status_code == 200
+    assert auth_user_cache.backend.get(str(seed_user_normal.id)) is not None
+
+    UserService(db_session).update_user(seed_user_normal.id, UserUpdate(is_active=False))
+
+    assert auth_user_cache.backend.get(str(seed_user_normal.id)) is None
+    assert client.get("/financial/entries").status_code == 401
+
+
+@pytest.mark.auth
+def test_delete_user_invalidates_cache(client: TestClient, db_session, seed_user_normal, auth_headers_user):
+    """Usuário removido não pode continuar autenticado pelo cache."""
+    client.headers.update(auth_headers_user)
+    assert client.get("/financial/entries").status_code == 200
+
+    UserService(db_session).delete_user(seed_user_normal.id)
+
+    assert client.get("/financial/entries").status_code == 401
+
+
+@pytest.mark.auth
+def test_change_password_invalidates_cache(db_session, seed_user_normal):
+    """Troca de senha remove o principal do cache."""
+    auth_user_cache.set(AuthenticatedUser(id=seed_user_normal.id, role="user", is_active=True))
+
+    AuthService.change_password(db_session, seed_user_normal, "testpass123", "nova-senha-123")
+
+    assert auth_user_cache.backend.get(str(seed_user_normal.id)) is None
+
+
+@pytest.mark.unit
+def test_zero_ttl_disables_cache():
+    """AUTH_USER_CACHE_TTL_SECONDS=0: nada é gravado nem servido."""
+    cache = AuthenticatedUserCache(ttl=0)
+    principal = AuthenticatedUser(id=uuid4(), role="admin", is_active=True)
+    cache.set(principal)
+
+    assert cache.get(principal.id) is None
+
+
+@pytest.mark.auth
+def test_invalidation_reaches_other_worker():
+    """Worker que invalida notifica os demais: nenhum segue servindo o principal antigo."""
+    writer, reader = AuthenticatedUserCache(), AuthenticatedUserCache()
+    principal = AuthenticatedUser(id=uuid4(), role="admin", is_active=True)
+    try:
+        assert reader.get(principal.id) is None  # inicia o LISTEN
+        reader.set(principal)
+        assert reader.get(principal.id) == principal
+
+        writer.invalidate(principal.id)
+
+        deadline = time.monotonic() + 5
+        while reader.backend.get(str(principal.id)) is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reader.get(principal.id) is None
+    finally:
+        writer.stop()
+        reader.stop()
+
+
+@pytest.mark.auth
+def test_cache_bypassed_without_listener(monkeypatch):
+    """LISTEN indisponível: o cache não é servido (core.users é a fonte)."""
+    cache = AuthenticatedUserCache()
+    monkeypatch.setattr(cache, "_connect", lambda: None)
+    principal = AuthenticatedUser(id=uuid4(), role="user", is_active=True)
+    try:
+        cache.backend.set(str(principal.id), str(principal.id), principal, 60)
+        assert cache.get(principal.id) is None
+    finally:
+        cache.stop()
@@ -0,0 +1,146 @@
+"""
+Testes para o caminho async de banco (AsyncSession + asyncpg).
+
+COBERTURA:
+1. async_database_url troca o driver e mapeia sslmode
+2. Variantes Async* retornam o mesmo que as versões sync
+3. Rotas de audit log (piloto async) respondem via get_async_db
+"""
+
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database import async_database_url
+from app.models.financial_entry import FinancialEntry
+from app.repositories.financial_repository import AsyncFinancialRepository, FinancialRepository
+from app.repositories.order_repository import AsyncOrderRepository, OrderRepository
+from app.repositories.report_repository import AsyncReportRepository, ReportRepository
+from app.services.audit_log_service import AsyncAuditLogService, AuditLogService
+from app.services.order_service import OrderService
+from tests.conftest import get_test_database_url
+
+
+PERIOD = {"date_from": date(2026, 1, 1), "date_to": date(2026, 1, 31)}
+
+
+def _run_async(call):
+    """Executa call(AsyncSession) num event loop próprio."""
+    async def main():
+        engine = create_async_engine(async_database_url(get_test_database_url()), poolclass=NullPool)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                return await call(session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+@pytest.mark.unit
+def test_async_database_url_uses_asyncpg():
+    """Driver vira asyncpg; sslmode vira ssl (asyncpg não aceita sslmode)."""
+    url = async_database_url("postgresql+psycopg2://u:p@db.example.com:5432/erp?sslmode=require")
+
+    assert url.drivername == "postgresql+asyncpg"
+    assert url.host == "db.example.com"
+    assert url.query == {"ssl": "require"}
+
+
+@pytest.mark.financial
+def test_async_financial_and_order_reads_match_sync(db_session, seed_user_normal):
+    """Leituras async de pedidos e lançamentos = leituras sync."""
+    order = OrderService.create_order(
+        db=db_session,
+        user_id=seed_user_normal.id,
+        description="Pedido async",
+        total=120.0
+    )
+    entry = FinancialRepository.get_by_order_id(db_session, order.id)
+
+    async def reads(session):
+        return (
+            await AsyncFinancialRepository.get_by_id(session, entry.id),
+            await AsyncFinancialRepository.list_paginated(session, page=1, page_size=10, user_id=seed_user_normal.id),
+            await AsyncFinancialRepository.count_total(session, user_id=seed_user_normal.id),
+            await AsyncOrderRepository.get_by_id_and_user(session, order.id, seed_user_normal.id),
+            await AsyncOrderRepository.count_by_user(session, user_id=seed_user_normal.id),
+        )
+
+    async_entry, async_page, async_count, async_order, async_order_count = _run_async(reads)
+
+    assert async_entry.id == entry.id
+    assert async_entry.amount == Decimal("120.00")
+    assert [e.id for e in async_page] == [
+        e.id for e in FinancialRepository.list_paginated(db_session, page=1, page_size=10, user_id=seed_user_normal.id)
+    ]
+    assert async_count == FinancialRepository.count_total(db_session, user_id=seed_user_normal.id) == 1
+    assert async_order.id == order.id
+    assert async_order_count == OrderRepository.count_by_user(db_session, user_id=seed_user_normal.id) == 1
+
+
+@pytest.mark.reports
+def test_async_reports_match_sync(db_session, seed_user_normal):
+    """DRE e top async = versões sync."""
+    FinancialRepository.create(
+        db=db_session,
+        entry=FinancialEntry(
+            user_id=seed_user_normal.id,
+            kind="revenue",
+            status="paid",
+            amount=Decimal("75.50"),
+            description="Async report",
+            occurred_at=datetime(2026, 1, 10, 12, 0, 0)
+        )
+    )
+
+    async def reports(session):
+        return (
+            await AsyncReportRepository.dre_summary(session, user_id=seed_user_normal.id, **PERIOD),
+            await AsyncReportRepository.top_entries(session, kind="revenue", status="paid", limit=5, user_id=seed_user_normal.id, **PERIOD),
+        )
+
+    dre, top = _run_async(reports)
+
+    assert dre == ReportRepository.dre_summary(db_session, user_id=seed_user_normal.id, **PERIOD)
+    assert top == ReportRepository.top_entries(db_session, kind="revenue", status="paid", limit=5, user_id=seed_user_normal.id, **PERIOD)
+    assert dre["revenue_paid_total"] == 75.5
+
+
+@pytest.mark.audit
+def test_async_audit_history_matches_sync(db_session, seed_user_admin):
+    """Histórico de entidade async = sync."""
+    entity_id = seed_user_admin.id
+    AuditLogService.log_action(
+        db=db_session,
+        user_id=seed_user_admin.id,
+        action="update",
+        entity_type="user",
+        entity_id=entity_id,
+        before={"name": "A"},
+        after={"name": "B"}
+    )
+    db_session.commit()
+
+    logs = _run_async(
+        lambda session: AsyncAuditLogService.get_entity_history(session, entity_type="user", entity_id=entity_id)
+    )
+
+    sync_logs = AuditLogService.get_entity_history(db_session, entity_type="user", entity_id=entity_id)
+    assert [log.id for log in logs] == [log.id for log in sync_logs]
+    assert len(logs) == 1
+
+
+@pytest.mark.audit
+def test_audit_routes_served_by_async_session(client_admin, seed_user_admin):
+    """Rotas piloto (async def + get_async_db) respondem normalmente."""
+    response = client_admin.get("/audit-logs", params={"total_mode": "exact"})
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+    response = client_admin.get("/audit-logs", params={"cursor": "invalido"})
+    assert response.status_code == 400
@@ -0,0 +1,137 @@
+"""
+Testes para o armazenamento compacto do audit log (app.core.audit_diff).
+
+COBERTURA:
+1. diff_fields: só campos alterados (incluindo removidos)
+2. Writer em modo diff: create completo, updates como diff, snapshot periódico
+3. get_entity_history reconstrói os mesmos estados do modo full
+4. Diff sem snapshot anterior (histórico truncado) volta como gravado
+5. log_action em modo diff + rota de histórico devolve estados completos
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core import audit_diff
+from app.core.audit_diff import diff_fields, rebuild_states
+from app.core.audit_writer import AuditLogWriter
+from app.models.audit_log import AuditLog
+from app.services.audit_log_service import AuditLogService
+from tests.conftest import get_test_database_url
+
+
+def _states(n):
+    """create + n updates de um pedido: lista de snapshots completos."""
+    states = [{"description": "Pedido", "total": 100.0, "status": "open", "notes": "x" * 200}]
+    for i in range(n):
+        states.append({**states[-1], "total": 100.0 + i + 1})
+    states[-1]["status"] = "closed"
+    return states
+
+
+def _write_history(writer, user_id, entity_id, states):
+    writer.enqueue(user_id, "create", "order", entity_id, "req-0", None, states[0])
+    assert writer.flush()
+    for i in range(1, len(states)):
+        writer.enqueue(user_id, "update", "order", entity_id, f"req-{i}", states[i - 1], states[i])
+    assert writer.flush()
+
+
+@pytest.fixture
+def writer_engine():
+    engine = create_engine(get_test_database_url())
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_diff_fields_only_changed():
+    """Campos iguais ficam de fora; removido vira None no lado novo."""
+    before = {"total": 100, "status": "open", "notes": "a"}
+    after = {"total": 150, "status": "open"}
+
+    assert diff_fields(before, after) == ({"total": 100, "notes": "a"}, {"total": 150, "notes": None})
+
+
+@pytest.mark.audit
+def test_writer_diff_mode_with_periodic_snapshot(db_session, seed_user_normal, writer_engine):
+    """snapshot_every=3: create completo, depois diff, diff, completo, diff, diff."""
+    writer = AuditLogWriter(engine=writer_engine, flush_interval_ms=60_000, storage="diff", snapshot_every=3)
+    entity_id = uuid4()
+    try:
+        _write_history(writer, seed_user_normal.id, entity_id, _states(5))
+    finally:
+        writer.stop()
+
+    logs = (
+        db_session.query(AuditLog)
+        .filter(AuditLog.entity_id == entity_id)
+        .order_by(AuditLog.created_at)
+        .all()
+    )
+    assert [log.storage for log in logs] == ["full", "diff", "diff", "full", "diff", "diff"]
+    assert logs[1].before == {"total": 100.0}
+    assert logs[1].after == {"total": 101.0}
+
+
+@pytest.mark.audit
+def test_entity_history_rebuilds_full_states(db_session, seed_user_normal, writer_engine):
+    """Histórico em modo diff reconstrói exatamente os snapshots do modo full."""
+    states = _states(6)
+    full_id, diff_id = uuid4(), uuid4()
+    full_writer = AuditLogWriter(engine=writer_engine, flush_interval_ms=60_000, storage="full")
+    diff_writer = AuditLogWriter(engine=writer_engine, flush_interval_ms=60_000, storage="diff", snapshot_every=4)
+    try:
+        _write_history(full_writer, seed_user_normal.id, full_id, states)
+        _write_history(diff_writer, seed_user_normal.id, diff_id, states)
+    finally:
+        full_writer.stop()
+        diff_writer.stop()
+
+    full = AuditLogService.get_entity_history(db_session, "order", full_id)
+    rebuilt = AuditLogService.get_entity_history(db_session, "order", diff_id)
+
+    assert [(log.before, log.after) for log in rebuilt] == [(log.before, log.after) for log in full]
+    assert rebuilt[-1].after == states[-1]
+    assert all(log.storage == "full" for log in rebuilt)
+
+
+@pytest.mark.unit
+def test_rebuild_keeps_diff_without_base_snapshot():
+    """Diff sem estado anterior (partição do snapshot já arquivada) não é inventado."""
+    logs = [
+        AuditLog(action="update", storage="diff", before={"total": 1}, after={"total": 2}),
+        AuditLog(action="update", storage="full", before={"total": 2, "s": "a"}, after={"total": 3, "s": "a"}),
+        AuditLog(action="update", storage="diff", before={"total": 3}, after={"total": 4}),
+    ]
+
+    rebuilt = rebuild_states(logs)
+
+    assert (rebuilt[0].storage, rebuilt[0].after) == ("diff", {"total": 2})
+    assert rebuilt[2].before == {"total": 3, "s": "a"}
+    assert rebuilt[2].after == {"total": 4, "s": "a"}
+
+
+@pytest.mark.audit
+def test_log_action_diff_mode_and_history_route(client, db_session, seed_user_admin, auth_headers_admin, monkeypatch):
+    """log_action compacta o update; GET /audit-logs/entity devolve estados completos."""
+    monkeypatch.setattr(audit_diff, "AUDIT_LOG_STORAGE", "diff")
+    order_id = uuid4()
+    before = {"description": "Pedido", "total": 100.0}
+    after = {"description": "Pedido", "total": 200.0}
+
+    AuditLogService.log_action(db_session, seed_user_admin.id, "create", "order", order_id, "req-1", after=before)
+    update = AuditLogService.log_action(
+        db_session, seed_user_admin.id, "update", "order", order_id, "req-2", before=before, after=after
+    )
+    assert (update.storage, update.after) == ("diff", {"total": 200.0})
+
+    response = client.get(f"/audit-logs/entity/order/{order_id}", headers=auth_headers_admin)
+
+    assert response.status_code == 200
+    history = response.json()
+    assert history[1]["before"] == before
+    assert history[1]["after"] == after
+    assert history[1]["storage"] == "full"
@@ -0,0 +1,168 @@
+"""
+Testes para o audit log particionado por mês (migration 006).
+
+COBERTURA:
+1. Eventos do mês corrente caem na partição do mês
+2. Consulta com período lê só as partições do período (pruning)
+3. ensure_partitions cria meses futuros e move linhas da partição default
+4. Retenção: export csv.gz conferido, partição removida, dry-run não altera
+5. Retenção retoma partição desanexada por execução interrompida
+6. drop recusa partição ainda anexada
+"""
+
+import csv
+import gzip
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.config import AUDIT_LOG_PARTITIONS_AHEAD
+from app.repositories.audit_log_partition_repository import (
+    AuditLogPartitionRepository,
+    partition_name,
+)
+from scripts.audit_log_retention import run_retention
+
+
+def _add_months(day: date, months: int) -> date:
+    total = day.year * 12 + day.month - 1 + months
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def _insert_log(db, user_id, created_at, after=None):
+    db.execute(
+        text("""
+            INSERT INTO core.audit_logs (user_id, action, entity_type, entity_id, request_id, after, created_at)
+            VALUES (:user_id, 'create', 'order', :entity_id, 'req-part', CAST(:after AS jsonb), :created_at)
+        """),
+        {"user_id": user_id, "entity_id": uuid4(), "after": after, "created_at": created_at}
+    )
+
+
+def _partition_of(db, created_at):
+    return db.execute(
+        text("SELECT tableoid::regclass::text FROM core.audit_logs WHERE created_at = :created_at"),
+        {"created_at": created_at}
+    ).scalar()
+
+
+@pytest.fixture
+def old_partition(db_session):
+    """Partição de 2020-01 (fora da retenção); removida no teardown se sobrar."""
+    db_session.execute(text(
+        "CREATE TABLE core.audit_logs_2020_01 PARTITION OF core.audit_logs "
+        "FOR VALUES FROM ('2020-01-01') TO ('2020-02-01')"
+    ))
+    db_session.commit()
+    yield "audit_logs_2020_01"
+    db_session.rollback()
+    db_session.execute(text("DROP TABLE IF EXISTS core.audit_logs_2020_01"))
+    db_session.commit()
+
+
+@pytest.fixture
+def drop_extra_partitions(db_session):
+    """Remove partições futuras criadas além de AUDIT_LOG_PARTITIONS_AHEAD."""
+    yield
+    db_session.rollback()
+    last_kept = _add_months(date.today(), AUDIT_LOG_PARTITIONS_AHEAD)
+    for partition in AuditLogPartitionRepository.list_partitions(db_session):
+        if partition["month"] > last_kept:
+            db_session.execute(text(f"DROP TABLE core.{partition['name']}"))
+    db_session.commit()
+
+
+@pytest.mark.audit_log
+def test_current_month_goes_to_monthly_partition(db_session, seed_user_normal):
+    """Partições do mês corrente até AUDIT_LOG_PARTITIONS_AHEAD existem e recebem as linhas."""
+    names = {p["name"] for p in AuditLogPartitionRepository.list_partitions(db_session)}
+    for months in range(AUDIT_LOG_PARTITIONS_AHEAD + 1):
+        assert partition_name(_add_months(date.today(), months)) in names
+
+    now = datetime.now().replace(microsecond=0)
+    _insert_log(db_session, seed_user_normal.id, now)
+    db_session.commit()
+
+    assert _partition_of(db_session, now) == f"core.{partition_name(now.date())}"
+
+
+@pytest.mark.audit_log
+def test_date_bounded_query_prunes_partitions(db_session):
+    """created_at entre duas datas do mês: plano só com a partição do mês."""
+    month = date.today().replace(day=1)
+    plan = "\n".join(db_session.execute(
+        text("EXPLAIN SELECT * FROM core.audit_logs WHERE created_at >= :date_from AND created_at <= :date_to"),
+        {"date_from": datetime(month.year, month.month, 2), "date_to": datetime(month.year, month.month, 20)}
+    ).scalars())
+
+    assert partition_name(month) in plan
+    assert partition_name(_add_months(month, 1)) not in plan
+    assert "audit_logs_default" not in plan
+
+
+@pytest.mark.audit_log
+def test_ensure_partitions_moves_rows_from_default(db_session, seed_user_normal, drop_extra_partitions):
+    """Linha além das partições existentes cai na default e é movida ao criar o mês."""
+    months_ahead = AUDIT_LOG_PARTITIONS_AHEAD + 2
+    future = _add_months(date.today(), months_ahead)
+    created_at = datetime(future.year, future.month, 10, 12, 0)
+    _insert_log(db_session, seed_user_normal.id, created_at)
+    db_session.commit()
+    assert _partition_of(db_session, created_at) == "core.audit_logs_default"
+
+    created = AuditLogPartitionRepository.ensure_partitions(db_session, months_ahead)
+    db_session.commit()
+
+    assert created == 2
+    assert _partition_of(db_session, created_at) == f"core.{partition_name(future)}"
+    assert AuditLogPartitionRepository.ensure_partitions(db_session, months_ahead) == 0
+
+
+@pytest.mark.audit_log
+def test_retention_exports_and_drops_old_partition(db_session, seed_user_normal, old_partition, tmp_path):
+    """Partição antiga vira csv.gz (JSON com quebra de linha preservado) e sai do banco."""
+    for day in (5, 6, 7):
+        _insert_log(db_session, seed_user_normal.id, datetime(2020, 1, day), after='{"obs": "linha 1\\nlinha 2"}')
+    recent = datetime.now().replace(microsecond=0)
+    _insert_log(db_session, seed_user_normal.id, recent)
+    db_session.commit()
+
+    planned = run_retention(db_session, keep_months=12, archive_dir=tmp_path, months_ahead=0, dry_run=True)
+    assert planned == [(old_partition, None)]
+    assert not list(tmp_path.iterdir())
+
+    archived = run_retention(db_session, keep_months=12, archive_dir=tmp_path, months_ahead=0)
+
+    assert archived == [(old_partition, 3)]
+    with gzip.open(tmp_path / f"{old_partition}.csv.gz", "rt", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["created_at"][:10] for r in rows] == ["2020-01-05", "2020-01-06", "2020-01-07"]
+    assert rows[0]["after"] == '{"obs": "linha 1\\nlinha 2"}'
+
+    assert db_session.execute(text("SELECT to_regclass('core.audit_logs_2020_01')")).scalar() is None
+    assert db_session.execute(text("SELECT count(*) FROM core.audit_logs")).scalar() == 1
+
+
+@pytest.mark.audit_log
+def test_retention_resumes_detached_partition(db_session, seed_user_normal, old_partition, tmp_path):
+    """Execução anterior parou após o detach: a próxima exporta e remove."""
+    _insert_log(db_session, seed_user_normal.id, datetime(2020, 1, 15))
+    AuditLogPartitionRepository.detach(db_session, old_partition)
+    db_session.commit()
+    assert AuditLogPartitionRepository.list_detached(db_session) == [old_partition]
+
+    archived = run_retention(db_session, keep_months=12, archive_dir=tmp_path, months_ahead=0)
+
+    assert archived == [(old_partition, 1)]
+    assert AuditLogPartitionRepository.list_detached(db_session) == []
+
+
+@pytest.mark.audit_log
+def test_drop_refuses_attached_partition(db_session, old_partition):
+    """DROP só depois do detach (e do export)."""
+    with pytest.raises(ValueError):
+        AuditLogPartitionRepository.drop(db_session, old_partition)
+    with pytest.raises(ValueError):
+        AuditLogPartitionRepository.drop(db_session, "audit_logs; DROP TABLE core.users")
@@ -370,6 +370,58 @@ def test_audit_logs_pagination(
     assert data["total"] >= 25
 
 
+@pytest.mark.audit
+def test_audit_logs_cursor_pagination(
+    client: TestClient,
+    db_session: Session,
+    seed_user_normal: User,
+    auth_headers_admin: dict
+):
+    """Test keyset pagination returns every log exactly once."""
+    for i in range(7):
+        AuditLogService.log_action(
+            db=db_session,
+            user_id=seed_user_normal.id,
+            action="create",
+            entity_type="order",
+            entity_id=uuid4(),
+            request_id=f"req-cursor-{i}",
+            after={}
+        )
+    
+    seen = []
+    url = f"/audit-logs?user_id={seed_user_normal.id}&page_size=3"
+    cursor = None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=auth_headers_admin)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    
+    response = client.get("/audit-logs?cursor=invalid", headers=auth_headers_admin)
+    assert response.status_code == 400
+
+
+@pytest.mark.audit
+def test_audit_logs_total_mode_estimate(
+    client: TestClient,
+    auth_headers_admin: dict
+):
+    """Test total_mode=estimate returns planner estimate without COUNT(*)."""
+    response = client.get("/audit-logs?total_mode=estimate", headers=auth_headers_admin)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_mode"] == "estimate"
+    assert data["total"] >= 0
+
+
 @pytest.mark.audit
 def test_entity_history_endpoint(
     client: TestClient,
@@ -0,0 +1,155 @@
+"""
+Testes para a gravação em lote do audit log (app.core.audit_writer).
+
+COBERTURA:
+1. enqueue_action + flush grava com request_id do contexto
+2. Lotes: um INSERT multi-linha por batch_size eventos
+3. Thread de fundo grava após o intervalo, sem flush explícito
+4. stop() grava o que ficou na fila
+5. Fila cheia: o chamador grava o próprio evento
+6. log_action(commit=False) segue a transação do chamador
+"""
+
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from app.core.audit_writer import AuditLogWriter
+from app.core.request_context import request_id_var
+from app.models.audit_log import AuditLog
+from app.services.audit_log_service import AuditLogService
+from tests.conftest import get_test_database_url
+
+
+@pytest.fixture
+def writer_engine():
+    engine = create_engine(get_test_database_url())
+    yield engine
+    engine.dispose()
+
+
+def _enqueue(writer, user_id, entity_id, n=1):
+    for i in range(n):
+        writer.enqueue(
+            user_id=user_id,
+            action="update",
+            entity_type="order",
+            entity_id=entity_id,
+            request_id=f"req-{i}",
+            before={"total": i},
+            after={"total": i + 1}
+        )
+
+
+def _count_logs(db_session, entity_id):
+    db_session.expire_all()
+    return db_session.query(AuditLog).filter(AuditLog.entity_id == entity_id).count()
+
+
+@pytest.mark.audit
+def test_enqueue_action_uses_context_request_id(db_session, seed_user_normal):
+    """enqueue_action grava depois do flush, com o request_id do contexto."""
+    from app.core.audit_writer import audit_writer
+
+    entity_id = uuid4()
+    token = request_id_var.set("ctx-req-1")
+    try:
+        AuditLogService.enqueue_action(
+            user_id=seed_user_normal.id,
+            action="create",
+            entity_type="order",
+            entity_id=entity_id,
+            after={"total": 10}
+        )
+    finally:
+        request_id_var.reset(token)
+
+    assert audit_writer.flush()
+    log = db_session.query(AuditLog).filter(AuditLog.entity_id == entity_id).one()
+    assert log.request_id == "ctx-req-1"
+    assert log.after == {"total": 10}
+    assert log.created_at is not None
+
+
+@pytest.mark.audit
+def test_flush_uses_multi_row_insert_per_batch(db_session, seed_user_normal, writer_engine):
+    """7 eventos com batch_size=3 → 3 INSERTs."""
+    statements = []
+    event.listen(
+        writer_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+    writer = AuditLogWriter(engine=writer_engine, batch_size=3, flush_interval_ms=60_000)
+    entity_id = uuid4()
+    try:
+        _enqueue(writer, seed_user_normal.id, entity_id, n=7)
+        assert writer.flush()
+    finally:
+        writer.stop()
+
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 3
+    assert _count_logs(db_session, entity_id) == 7
+
+
+@pytest.mark.audit
+def test_background_thread_flushes_after_interval(db_session, seed_user_normal, writer_engine):
+    """Sem flush explícito: thread de fundo grava em ~flush_interval."""
+    writer = AuditLogWriter(engine=writer_engine, batch_size=100, flush_interval_ms=20)
+    entity_id = uuid4()
+    try:
+        _enqueue(writer, seed_user_normal.id, entity_id, n=2)
+        deadline = time.monotonic() + 5
+        while _count_logs(db_session, entity_id) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        writer.stop()
+
+    assert _count_logs(db_session, entity_id) == 2
+
+
+@pytest.mark.audit
+def test_stop_flushes_pending_events(db_session, seed_user_normal, writer_engine):
+    """Shutdown: stop() grava eventos ainda na fila."""
+    writer = AuditLogWriter(engine=writer_engine, batch_size=1000, flush_interval_ms=60_000)
+    entity_id = uuid4()
+    _enqueue(writer, seed_user_normal.id, entity_id, n=5)
+
+    writer.stop()
+
+    assert _count_logs(db_session, entity_id) == 5
+
+
+@pytest.mark.audit
+def test_full_queue_writes_in_caller(db_session, seed_user_normal, writer_engine, monkeypatch):
+    """Fila cheia não descarta: o evento excedente é gravado na hora."""
+    writer = AuditLogWriter(engine=writer_engine, max_queue=1)
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)  # sem thread: fila não esvazia
+    entity_id = uuid4()
+
+    _enqueue(writer, seed_user_normal.id, entity_id, n=2)
+    assert _count_logs(db_session, entity_id) == 1  # excedente gravado direto
+
+    writer.flush()
+    assert _count_logs(db_session, entity_id) == 2
+
+
+@pytest.mark.audit
+def test_log_action_without_commit_follows_caller_transaction(db_session, seed_user_normal):
+    """commit=False: log some junto com o rollback do chamador."""
+    entity_id = uuid4()
+    log = AuditLogService.log_action(
+        db=db_session,
+        user_id=seed_user_normal.id,
+        action="delete",
+        entity_type="order",
+        entity_id=entity_id,
+        before={"total": 1},
+        commit=False
+    )
+    assert log.id is not None
+
+    db_session.rollback()
+    assert _count_logs(db_session, entity_id) == 0
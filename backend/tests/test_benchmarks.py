@@ -0,0 +1,106 @@
+"""
+Testes da suíte de benchmarks (gerador de dados + runner).
+
+Dataset pequeno no banco de teste; não mede desempenho, só a forma dos
+dados e do resultado.
+
+COBERTURA:
+1. Seed: contagens, pedidos com lançamento vinculado, rollup consistente
+2. Seed determinístico (mesma config → mesmo fingerprint) e recusa sem reset
+3. Runner: cenários HTTP/service sem erros, JSON com percentis
+4. compare: fingerprint divergente gera aviso
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.runner import build_context, compare, run_suite
+from benchmarks.scenarios import scenario_matrix
+from benchmarks.seed import SeedConfig, describe_dataset, seed_database
+
+TINY = SeedConfig(entries=300, users=4, months=1, audit_updates_per_order=1, seed=7, anchor=date.today())
+
+
+@pytest.fixture
+def bench_dataset(db_session):
+    seed_database(db_session, TINY, reset=True)
+    return TINY
+
+
+@pytest.mark.slow
+def test_seed_builds_linked_multi_tenant_dataset(db_session, bench_dataset):
+    """Contagens batem com a config e cada pedido tem seu lançamento de receita."""
+    counts = describe_dataset(db_session)
+    orders = int(TINY.entries * TINY.order_ratio)
+    assert counts["users"] == TINY.users + 1
+    assert counts["orders"] == orders
+    assert counts["financial_entries"] == TINY.entries
+    assert counts["audit_logs"] == orders * (1 + TINY.audit_updates_per_order)
+
+    unlinked = db_session.execute(text("""
+        SELECT count(*) FROM core.orders o
+        LEFT JOIN core.financial_entries f ON f.order_id = o.id AND f.kind = 'revenue'
+        WHERE f.id IS NULL
+    """)).scalar()
+    assert unlinked == 0
+
+    # Rollup recalculado após o COPY = agregação direta da tabela
+    expected = db_session.execute(text(
+        "SELECT coalesce(sum(amount), 0) FROM core.financial_entries WHERE deleted_at IS NULL"
+    )).scalar()
+    rolled = db_session.execute(text(
+        "SELECT coalesce(sum(amount_total), 0) FROM core.financial_daily_rollup"
+    )).scalar()
+    assert rolled == expected
+
+
+@pytest.mark.slow
+def test_seed_is_deterministic_and_requires_reset(db_session, bench_dataset):
+    """Mesma config → mesmo fingerprint; sem reset, banco com dados é recusado."""
+    first = describe_dataset(db_session)
+
+    with pytest.raises(ValueError, match="reset"):
+        seed_database(db_session, TINY)
+
+    seed_database(db_session, TINY, reset=True)
+    assert describe_dataset(db_session) == first
+
+
+@pytest.mark.slow
+def test_runner_reports_percentiles(client, db_session, bench_dataset):
+    """Cenários HTTP e de service rodam sem erros e produzem p50/p95/p99."""
+    session_factory = sessionmaker(bind=db_session.get_bind())
+    ctx = build_context(client, session_factory)
+    scenarios = [
+        s for s in scenario_matrix()
+        if s.name in ("http:reports/dre/30d", "http:financial/entries/keyset", "service:order.list/page1")
+    ]
+
+    results = run_suite(ctx, scenarios, iterations=3, warmup=1)
+
+    assert set(results) == {s.key for s in scenarios}
+    for result in results.values():
+        assert result["errors"] == 0, result.get("first_error")
+        assert set(result["latency_ms"]) == {"p50", "p95", "p99", "mean", "max"}
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+        assert result["throughput_rps"] > 0
+
+
+def test_compare_warns_on_different_dataset():
+    """Fingerprints diferentes: comparação marcada como não confiável."""
+    run = {"iterations": 10, "concurrency": 1}
+    latency = {"p50": 10.0, "p95": 12.0}
+    baseline = {"metadata": {"dataset": {"orders": 1}}, "run": run,
+                "results": {"a[user]": {"latency_ms": latency}}}
+    current = {"metadata": {"dataset": {"orders": 2}}, "run": run,
+               "results": {"a[user]": {"latency_ms": {"p50": 15.0, "p95": 12.0}}, "b[user]": {}}}
+
+    report = compare(baseline, current)
+
+    assert not report["comparable"]
+    assert report["scenarios"]["a[user]"]["status"] == "regression"
+    assert report["scenarios"]["a[user]"]["p50"]["change_pct"] == 50.0
+    assert report["scenarios"]["b[user]"]["status"] == "missing"
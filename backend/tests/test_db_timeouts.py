@@ -0,0 +1,136 @@
+"""
+Testes para pool configurável e timeouts por statement (app.database).
+
+COBERTURA:
+1. Pool esgotado → ServiceUnavailableError rápido + métrica
+2. statement_timeout estourado → ServiceUnavailableError + métrica
+3. Rotas de relatório elevam o statement_timeout (SET LOCAL); CRUD não
+4. Timeout dentro de uma rota → 503 com Retry-After
+5. Manutenção (without_timeouts) sem statement/lock timeout
+"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.config import DB_LOCK_TIMEOUT_MS, DB_REPORT_STATEMENT_TIMEOUT_MS, DB_STATEMENT_TIMEOUT_MS
+from app.core import metrics
+from app.database import GuardedQueuePool, without_timeouts
+from app.exceptions.errors import ServiceUnavailableError
+from app.services.order_service import OrderService
+from app.services.report_service import ReportService
+from tests.conftest import get_test_database_url
+
+
+DRE_PARAMS = {"date_from": "2026-01-01", "date_to": "2026-01-31"}
+
+
+def _unavailable_count(reason: str) -> float:
+    return metrics.DB_UNAVAILABLE.labels(reason)._value.get()
+
+
+@pytest.mark.integration
+def test_pool_exhausted_raises_service_unavailable_fast():
+    """Sem conexão livre em pool_timeout: 503 em vez de esperar indefinidamente."""
+    engine = create_engine(
+        get_test_database_url(),
+        poolclass=GuardedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1
+    )
+    before = _unavailable_count("pool_timeout")
+    try:
+        with engine.connect():
+            start = time.perf_counter()
+            with pytest.raises(ServiceUnavailableError):
+                engine.connect()
+            assert time.perf_counter() - start < 1
+    finally:
+        engine.dispose()
+
+    assert _unavailable_count("pool_timeout") == before + 1
+
+
+@pytest.mark.integration
+def test_statement_timeout_raises_service_unavailable():
+    """QueryCanceled (statement_timeout) vira ServiceUnavailableError."""
+    engine = create_engine(get_test_database_url(), connect_args={"options": "-c statement_timeout=50"})
+    before = _unavailable_count("statement_timeout")
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(ServiceUnavailableError):
+                conn.execute(text("SELECT pg_sleep(1)"))
+    finally:
+        engine.dispose()
+
+    assert _unavailable_count("statement_timeout") == before + 1
+
+
+@pytest.mark.reports
+def test_report_routes_use_report_statement_timeout(client_authenticated, db_session, monkeypatch):
+    """Rotas /reports aplicam DB_REPORT_STATEMENT_TIMEOUT_MS; CRUD mantém o padrão."""
+    seen = {}
+
+    def fake_get_dre(db, **kwargs):
+        seen["report"] = db.execute(text("SHOW statement_timeout")).scalar()
+        raise ValueError("capturado")
+
+    def fake_list_orders(db, **kwargs):
+        seen["crud"] = db.execute(text("SHOW statement_timeout")).scalar()
+        raise ValueError("capturado")
+
+    baseline = db_session.execute(text("SHOW statement_timeout")).scalar()
+    db_session.commit()
+    monkeypatch.setattr(ReportService, "get_dre", fake_get_dre)
+    monkeypatch.setattr(OrderService, "list_orders", fake_list_orders)
+
+    assert client_authenticated.get("/reports/financial/dre", params=DRE_PARAMS).status_code == 400
+    db_session.rollback()  # sessão compartilhada pelo client: encerra a transação do relatório
+    assert client_authenticated.get("/orders").status_code == 400
+
+    assert seen["report"] == f"{DB_REPORT_STATEMENT_TIMEOUT_MS // 1000}s"
+    assert seen["crud"] == baseline
+
+
+@pytest.mark.reports
+def test_timeout_inside_route_returns_503(client_authenticated, monkeypatch):
+    """Timeout de statement numa rota (que captura Exception) ainda responde 503."""
+    def slow_get_dre(db, **kwargs):
+        db.execute(text("SET LOCAL statement_timeout = 50"))
+        db.execute(text("SELECT pg_sleep(1)"))
+
+    monkeypatch.setattr(ReportService, "get_dre", slow_get_dre)
+
+    response = client_authenticated.get("/reports/financial/dre", params=DRE_PARAMS)
+
+    assert response.status_code == 503
+    assert response.json()["error"] == "ServiceUnavailableError"
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.integration
+def test_without_timeouts_lifts_connection_timeouts():
+    """Scripts/startup: SET LOCAL 0 nas transações do bloco; fora dele, padrões da conexão."""
+    engine = create_engine(
+        get_test_database_url(),
+        connect_args={
+            "options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS} -c lock_timeout={DB_LOCK_TIMEOUT_MS}"
+        }
+    )
+
+    def timeouts():
+        with engine.begin() as conn:
+            return (
+                conn.execute(text("SHOW statement_timeout")).scalar(),
+                conn.execute(text("SHOW lock_timeout")).scalar()
+            )
+
+    try:
+        defaults = timeouts()
+        with without_timeouts():
+            assert timeouts() == ("0", "0")
+        assert timeouts() == defaults
+    finally:
+        engine.dispose()
@@ -0,0 +1,161 @@
+"""
+Testes para os índices de cobertura de financial_entries (migrations 008 a 010).
+
+Com poucos dados o planner prefere seq scan: os testes desligam seq/bitmap
+scan na transação para verificar que o índice atende o formato da consulta
+(filtros + colunas lidas) com index-only scan.
+
+COBERTURA:
+1. count_total por usuário → Index Only Scan em um índice parcial de ativos
+2. Parte "dia corrente" de dre_summary → Index Only Scan
+3. list_paginated admin → Index Scan ordenado (sem Sort)
+4. Dia local (timezone padrão, rollup registrado) do admin → índice de expressão da 009
+5. top_entries por usuário → agregação com Index Only Scan (description_key no índice da 010)
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import event, text
+
+from app.config import REPORT_DEFAULT_TIMEZONE
+
+from app.models.financial_entry import FinancialEntry
+from app.repositories.financial_repository import FinancialRepository
+from app.repositories.financial_rollup_repository import FinancialRollupRepository
+from app.repositories.report_repository import ReportRepository
+
+
+def _plans(db_session, func):
+    """EXPLAIN de cada SELECT em financial_entries emitido por func(db_session)."""
+    connection = db_session.connection()
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    connection.execute(text("SET LOCAL enable_bitmapscan = off"))
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        # Consultas auxiliares (ex.: registro core.rollup_timezones) ficam de fora
+        if statement.lstrip().upper().startswith("SELECT") and "financial_entries" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        func(db_session)
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+
+    plans = []
+    cursor = connection.connection.cursor()
+    for statement, parameters in statements:
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        plans.append("\n".join(row[0] for row in cursor.fetchall()))
+    cursor.close()
+    return plans
+
+
+def _active_indexes(db_session):
+    """Índices parciais de lançamentos ativos (WHERE deleted_at IS NULL)."""
+    return db_session.execute(text("""
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = 'core' AND tablename = 'financial_entries'
+          AND indexdef LIKE '%WHERE (deleted_at IS NULL)%'
+    """)).scalars().all()
+
+
+def _scans(plan, scan="Index Only Scan"):
+    """Índices lidos com o tipo de scan informado."""
+    return set(re.findall(rf"{scan} using (\w+)", plan))
+
+
+@pytest.mark.financial
+def test_count_total_uses_index_only_scan(db_session, seed_user_normal):
+    """Contagem de ativos do usuário lida só de um índice parcial (por usuário)."""
+    plans = _plans(db_session, lambda db: FinancialRepository.count_total(db, user_id=seed_user_normal.id))
+
+    # Qualquer índice parcial de ativos atende sem ir à tabela (008, 009 ou
+    # 010; a escolha depende das estatísticas)
+    scans = _scans(plans[0])
+    assert scans and scans <= set(_active_indexes(db_session))
+
+
+@pytest.mark.financial
+def test_dre_current_day_uses_index_only_scan(db_session, seed_user_normal):
+    """Parte "dia corrente" do DRE (soma de amount) sem acessar a tabela."""
+    today = date.today()
+
+    plans = _plans(db_session, lambda db: ReportRepository.dre_summary(db, today, today, seed_user_normal.id))
+
+    # Índices de cobertura (008) ou de dia local (009), conforme as estatísticas
+    scans = _scans(plans[0])
+    assert scans and scans <= set(_active_indexes(db_session))
+
+
+@pytest.mark.financial
+def test_admin_listing_reads_index_in_order(db_session):
+    """ORDER BY occurred_at DESC, id DESC segue a ordem do índice (sem Sort)."""
+    plans = _plans(db_session, lambda db: FinancialRepository.list_paginated(db, 1, 20))
+
+    # Qualquer índice parcial de ativos que entregue a ordem (008 hoje)
+    scans = _scans(plans[0], scan="Index (?:Only )?Scan")
+    assert scans and scans <= set(_active_indexes(db_session))
+    assert "Sort" not in plans[0]
+
+
+@pytest.mark.financial
+def test_admin_current_day_uses_local_day_index(db_session, seed_user_normal):
+    """Faixa por dia local (timezone(tz, occurred_at)::date) bate com o índice de expressão."""
+    now = datetime.now(ZoneInfo(REPORT_DEFAULT_TIMEZONE))
+    today = now.date()
+    slug = re.sub(r"[^a-z0-9]+", "_", REPORT_DEFAULT_TIMEZONE.lower()).strip("_")
+
+    # Histórico de 200 dias: "dia corrente" seletivo como em produção
+    db_session.add_all(
+        FinancialEntry(
+            user_id=seed_user_normal.id, kind="revenue", status="paid", amount=Decimal("1.00"),
+            description="Histórico", occurred_at=now - timedelta(days=days)
+        )
+        for days in range(200)
+    )
+    db_session.commit()
+    # Timezone com rollup registrado: a parte do dia corrente usa a expressão
+    FinancialRollupRepository.rebuild(db_session, timezones=[REPORT_DEFAULT_TIMEZONE])
+
+    plans = _plans(db_session, lambda db: ReportRepository.dre_summary(db, today, today, tz=REPORT_DEFAULT_TIMEZONE))
+
+    # Índice de dia local da timezone, admin ou por usuário (conforme estatísticas)
+    assert re.search(rf"Index (Only )?Scan using ix_financial_entries_(user_)?day_{slug}\b", plans[0])
+    assert ReportRepository.dre_summary(
+        db_session, today, today, tz=REPORT_DEFAULT_TIMEZONE
+    )["revenue_paid_total"] == 1.0
+
+
+@pytest.mark.financial
+def test_top_entries_uses_index_only_scan(db_session, seed_user_normal):
+    """Top lançamentos agrupa description_key lida do índice, sem acessar a tabela."""
+    now = datetime.now(ZoneInfo(REPORT_DEFAULT_TIMEZONE))
+    today = now.date()
+
+    # Kinds/status/dias variados: os 4 filtros só batem juntos no índice da 010
+    db_session.add_all(
+        FinancialEntry(
+            user_id=seed_user_normal.id, kind=("revenue", "expense")[i % 2],
+            status=("paid", "pending", "canceled")[i % 3], amount=Decimal("1.00"),
+            description=f"Item {i % 7}", occurred_at=now - timedelta(days=i % 90)
+        )
+        for i in range(300)
+    )
+    db_session.commit()
+    # Estatísticas da transação do teste (desfeitas no rollback do fixture)
+    db_session.execute(text("ANALYZE core.financial_entries"))
+
+    plans = _plans(db_session, lambda db: ReportRepository.top_entries(
+        db, "revenue", "paid", today, today, 10, user_id=seed_user_normal.id
+    ))
+
+    # Agregação em um dos dois índices da 010 (depende das estatísticas); a
+    # subconsulta da descrição (só os grupos retornados) lê a tabela
+    aggregate = plans[0].split("SubPlan")[0]
+    assert _scans(aggregate) & {"ix_financial_entries_active_user_top", "ix_financial_entries_active_top"}
@@ -0,0 +1,403 @@
+"""
+Testes para o rollup diário financeiro (core.financial_daily_rollup).
+
+COBERTURA:
+1. FinancialRepository.create soma no rollup
+2. update_status move valor entre status
+3. soft_delete remove e restore devolve a contribuição
+4. OrderService.update_order sincroniza amount e status
+5. rebuild recalcula o mesmo resultado da manutenção incremental
+6. DRE/cashflow (rollup + dia corrente) batem com o scan bruto
+7. DRE/aging (vetor diário) e cashflow = agregação direta
+8. Vetor diário memoizado entre relatórios e descartado em escrita
+9. Rollup por timezone: dia local, rebuild e relatórios com/sem rollup
+10. Relatórios só leem o rollup de timezones com rebuild completo registrado
+11. Timezone incluída depois das migrations ganha os índices de dia local
+"""
+
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.config import REPORT_DEFAULT_TIMEZONE
+
+from app.models.financial_entry import FinancialEntry
+from app.models.financial_daily_rollup import FinancialDailyRollup
+from app.repositories.financial_repository import FinancialRepository
+from app.repositories.financial_rollup_repository import FinancialRollupRepository
+from app.repositories.report_repository import ReportRepository, GRANULARITY_STEPS
+from app.services.order_service import OrderService
+
+
+PAST_DAY = datetime(2026, 1, 10, 12, 0, 0)
+
+
+def _rollup_rows(db_session, user_id):
+    """Snapshot do rollup de um usuário (timezone padrão): {(day, kind, status): (amount, count)}."""
+    rows = (
+        db_session.query(FinancialDailyRollup)
+        .filter(
+            FinancialDailyRollup.user_id == user_id,
+            FinancialDailyRollup.tz == REPORT_DEFAULT_TIMEZONE
+        )
+        .all()
+    )
+    return {
+        (r.day, r.kind, r.status): (Decimal(r.amount_total), r.entry_count)
+        for r in rows
+        if r.entry_count != 0
+    }
+
+
+def _create_entry(db_session, user_id, amount, kind="revenue", status="pending", occurred_at=PAST_DAY):
+    return FinancialRepository.create(
+        db=db_session,
+        entry=FinancialEntry(
+            user_id=user_id,
+            kind=kind,
+            status=status,
+            amount=Decimal(str(amount)),
+            description="Rollup test",
+            occurred_at=occurred_at
+        )
+    )
+
+
+@pytest.mark.reports
+def test_create_entry_updates_rollup(db_session, seed_user_normal):
+    """create deve somar amount e contagem no dia/kind/status."""
+    _create_entry(db_session, seed_user_normal.id, 100)
+    _create_entry(db_session, seed_user_normal.id, 50)
+
+    rows = _rollup_rows(db_session, seed_user_normal.id)
+    assert rows == {(date(2026, 1, 10), "revenue", "pending"): (Decimal("150.00"), 2)}
+
+
+@pytest.mark.reports
+def test_update_status_moves_amount_between_statuses(db_session, seed_user_normal):
+    """pending → paid deve sair de pending e entrar em paid."""
+    entry = _create_entry(db_session, seed_user_normal.id, 80)
+
+    FinancialRepository.update_status(db=db_session, entry=entry, new_status="paid")
+
+    rows = _rollup_rows(db_session, seed_user_normal.id)
+    assert rows == {(date(2026, 1, 10), "revenue", "paid"): (Decimal("80.00"), 1)}
+
+
+@pytest.mark.reports
+@pytest.mark.soft_delete
+def test_soft_delete_and_restore_keep_rollup_correct(db_session, seed_user_normal):
+    """soft_delete remove a contribuição; restore devolve."""
+    entry = _create_entry(db_session, seed_user_normal.id, 60, kind="expense")
+
+    FinancialRepository.soft_delete(db=db_session, entry=entry, deleted_by_user_id=seed_user_normal.id)
+    assert _rollup_rows(db_session, seed_user_normal.id) == {}
+
+    FinancialRepository.restore(db=db_session, entry=entry)
+    rows = _rollup_rows(db_session, seed_user_normal.id)
+    assert rows == {(date(2026, 1, 10), "expense", "pending"): (Decimal("60.00"), 1)}
+
+
+@pytest.mark.reports
+@pytest.mark.orders
+def test_update_order_syncs_rollup(db_session, seed_user_normal):
+    """update_order deve refletir novo total e cancelamento (total=0) no rollup."""
+    order = OrderService.create_order(
+        db=db_session,
+        user_id=seed_user_normal.id,
+        description="Pedido rollup",
+        total=100.0
+    )
+    entry_day = FinancialRepository.get_by_order_id(db_session, order.id).occurred_at.date()
+
+    OrderService.update_order(db=db_session, order_id=order.id, user_id=seed_user_normal.id, total=Decimal("250.00"))
+    rows = _rollup_rows(db_session, seed_user_normal.id)
+    assert rows == {(entry_day, "revenue", "pending"): (Decimal("250.00"), 1)}
+
+    OrderService.update_order(db=db_session, order_id=order.id, user_id=seed_user_normal.id, total=Decimal("0"))
+    rows = _rollup_rows(db_session, seed_user_normal.id)
+    assert rows == {(entry_day, "revenue", "canceled"): (Decimal("250.00"), 1)}
+
+
+@pytest.mark.reports
+def test_rebuild_matches_incremental_rollup(db_session, seed_user_normal, seed_user_other):
+    """rebuild deve reproduzir exatamente o rollup incremental."""
+    _create_entry(db_session, seed_user_normal.id, 10)
+    paid = _create_entry(db_session, seed_user_normal.id, 20, kind="expense")
+    FinancialRepository.update_status(db=db_session, entry=paid, new_status="paid")
+    _create_entry(db_session, seed_user_other.id, 30, occurred_at=PAST_DAY - timedelta(days=3))
+
+    before = {
+        user_id: _rollup_rows(db_session, user_id)
+        for user_id in (seed_user_normal.id, seed_user_other.id)
+    }
+
+    # Corromper e recalcular
+    db_session.query(FinancialDailyRollup).delete()
+    db_session.commit()
+    rows_written = FinancialRollupRepository.rebuild(db_session)
+
+    after = {
+        user_id: _rollup_rows(db_session, user_id)
+        for user_id in (seed_user_normal.id, seed_user_other.id)
+    }
+    assert rows_written == 3
+    assert after == before
+
+
+@pytest.mark.reports
+def test_reports_combine_rollup_and_current_day(db_session, seed_user_normal):
+    """DRE e cashflow devem somar dias fechados (rollup) e o dia corrente (scan)."""
+    today = datetime.now()
+    yesterday = today - timedelta(days=1)
+
+    _create_entry(db_session, seed_user_normal.id, 100, status="paid", occurred_at=yesterday)
+    _create_entry(db_session, seed_user_normal.id, 40, status="paid", occurred_at=today)
+    _create_entry(db_session, seed_user_normal.id, 15, kind="expense", occurred_at=today)
+
+    dre = ReportRepository.dre_summary(
+        db=db_session,
+        date_from=yesterday.date(),
+        date_to=today.date(),
+        user_id=seed_user_normal.id
+    )
+    assert dre["revenue_paid_total"] == 140.0
+    assert dre["expense_pending_total"] == 15.0
+    assert dre["count_entries_total"] == 3
+
+    days = ReportRepository.cashflow_daily(
+        db=db_session,
+        date_from=yesterday.date(),
+        date_to=today.date(),
+        user_id=seed_user_normal.id
+    )
+    by_day = {d["date"]: d for d in days}
+    assert by_day[yesterday.date()]["revenue_paid"] == 100.0
+    assert by_day[today.date()]["revenue_paid"] == 40.0
+    assert by_day[today.date()]["expense_pending"] == 15.0
+
+
+@pytest.mark.reports
+def test_daily_vector_reductions_match_raw_aggregates(db_session, seed_user_normal):
+    """DRE/aging (vetor diário) e cashflow (série no banco) = agregação direta em financial_entries."""
+    from sqlalchemy import text
+
+    today = datetime.now()
+    amounts = ["10.01", "0.10", "0.20", "999.99", "33.33", "12.34", "0.07", "250.50"]
+    for i, amount in enumerate(amounts):
+        _create_entry(
+            db_session, seed_user_normal.id, amount,
+            kind=("revenue", "expense")[i % 2],
+            status=("paid", "pending", "canceled")[i % 3],
+            occurred_at=today - timedelta(days=(0, 1, 2, 9, 9, 40)[i % 6])
+        )
+    date_from, date_to = (today - timedelta(days=60)).date(), today.date()
+    vector = ReportRepository.daily_vector(db_session, date_from, date_to, user_id=seed_user_normal.id)
+
+    raw = db_session.execute(text("""
+        SELECT occurred_at::date AS day, kind, status, sum(amount) AS amount, count(*) AS n
+        FROM core.financial_entries
+        WHERE user_id = :user_id AND deleted_at IS NULL
+        GROUP BY 1, 2, 3
+    """), {"user_id": seed_user_normal.id}).all()
+
+    def raw_total(kind, status):
+        return float(sum((r.amount for r in raw if (r.kind, r.status) == (kind, status)), Decimal(0)))
+
+    for include_canceled in (False, True):
+        dre = ReportRepository.dre_from_daily(vector, include_canceled)
+        assert dre["revenue_paid_total"] == raw_total("revenue", "paid")
+        assert dre["expense_pending_total"] == raw_total("expense", "pending")
+        assert dre["count_entries_total"] == sum(
+            r.n for r in raw if include_canceled or r.status != "canceled"
+        )
+
+    days = {
+        d["date"]: d
+        for d in ReportRepository.cashflow_daily(db_session, date_from, date_to, user_id=seed_user_normal.id)
+    }
+    for r in raw:
+        if r.status != "canceled":
+            column = f"{r.kind}_{r.status}"
+            assert days[r.day][column] == float(r.amount)
+    # Painel: vetor + cashflow (agrupado sobre o vetor no banco) numa consulta
+    for granularity in GRANULARITY_STEPS:
+        combined_vector, periods = ReportRepository.daily_vector_with_cashflow(
+            db_session, date_from, date_to, granularity, user_id=seed_user_normal.id
+        )
+        assert combined_vector == vector
+        assert periods == ReportRepository.cashflow_daily(
+            db_session, date_from, date_to, user_id=seed_user_normal.id, granularity=granularity
+        )
+
+    aging = ReportRepository.aging_from_daily(vector, date_to, (5, 30))
+    assert aging == ReportRepository.aging_pending(
+        db_session, date_from, date_to, date_to, user_id=seed_user_normal.id, bucket_limits=(5, 30)
+    )
+
+
+@pytest.mark.reports
+def test_reports_share_memoized_daily_vector(db_session, seed_user_normal):
+    """DRE e aging do mesmo período: uma agregação; escrita descarta a memo."""
+    from app.core.report_cache import report_cache
+    from app.services.report_service import ReportService
+
+    today = datetime.now()
+    _create_entry(db_session, seed_user_normal.id, 100, status="paid", occurred_at=today)
+    user_id = seed_user_normal.id
+    date_from, date_to = (today - timedelta(days=30)).date(), today.date()
+    calls = []
+    original = ReportRepository.daily_vector
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ReportRepository, "daily_vector", staticmethod(counting))
+        ReportService.get_dre(db_session, date_from, date_to, user_id=user_id)
+        ReportService.get_cashflow_daily(db_session, date_from, date_to, user_id=user_id)
+        ReportService.get_aging_pending(db_session, date_from, date_to, user_id=user_id)
+        assert len(calls) == 1
+
+        # Sem report_cache: a memo da sessão ainda atende
+        report_cache.clear()
+        ReportService.get_dre(db_session, date_from, date_to, user_id=user_id, include_canceled=True)
+        assert len(calls) == 1
+
+        # Escrita (flush/commit) descarta memo e cache do tenant
+        _create_entry(db_session, user_id, 50, status="paid", occurred_at=today)
+        dre = ReportService.get_dre(db_session, date_from, date_to, user_id=user_id)
+        assert len(calls) == 2
+        assert dre["revenue_paid_total"] == 150.0
+
+
+@pytest.mark.reports
+def test_rollup_and_reports_keyed_by_timezone(db_session, seed_user_normal, monkeypatch):
+    """01:30 UTC de 10/01 é 09/01 em São Paulo: rollup, rebuild e relatórios por timezone."""
+    monkeypatch.setattr(
+        "app.repositories.financial_rollup_repository.REPORT_TIMEZONES",
+        ["UTC", "America/Sao_Paulo"]
+    )
+    _create_entry(
+        db_session, seed_user_normal.id, 70, status="paid",
+        occurred_at=datetime(2026, 1, 10, 1, 30, tzinfo=timezone.utc)
+    )
+
+    def rollup_days():
+        rows = db_session.query(FinancialDailyRollup).filter(
+            FinancialDailyRollup.user_id == seed_user_normal.id
+        ).all()
+        return {(r.tz, r.day): r.entry_count for r in rows if r.entry_count}
+
+    expected = {("UTC", date(2026, 1, 10)): 1, ("America/Sao_Paulo", date(2026, 1, 9)): 1}
+    assert rollup_days() == expected
+
+    FinancialRollupRepository.rebuild(db_session, user_id=seed_user_normal.id)
+    assert rollup_days() == expected
+
+    def paid_on(day, tz):
+        return ReportRepository.dre_summary(
+            db=db_session, date_from=day, date_to=day, user_id=seed_user_normal.id, tz=tz
+        )["revenue_paid_total"]
+
+    # Com rollup (UTC), São Paulo sem rebuild completo e Tóquio fora da
+    # configuração (scan com limites locais)
+    assert paid_on(date(2026, 1, 9), "America/Sao_Paulo") == 70.0
+    assert paid_on(date(2026, 1, 10), "America/Sao_Paulo") == 0.0
+    assert paid_on(date(2026, 1, 10), "UTC") == 70.0
+    assert paid_on(date(2026, 1, 10), "Asia/Tokyo") == 70.0
+    assert paid_on(date(2026, 1, 9), "Asia/Tokyo") == 0.0
+
+    days = ReportRepository.cashflow_daily(
+        db=db_session, date_from=date(2026, 1, 9), date_to=date(2026, 1, 10),
+        user_id=seed_user_normal.id, tz="America/Sao_Paulo"
+    )
+    assert [d["revenue_paid"] for d in days] == [70.0, 0.0]
+
+
+@pytest.mark.reports
+def test_reports_read_rollup_only_of_built_timezones(db_session, seed_user_normal, monkeypatch):
+    """Timezone nova em REPORT_TIMEZONES: scan até o rebuild completo registrá-la."""
+    from sqlalchemy import update
+    from app.models.rollup_timezone import RollupTimezone
+
+    # Banco migrado com outra configuração: partir só de UTC registrada
+    monkeypatch.setattr("app.repositories.financial_rollup_repository.REPORT_TIMEZONES", ["UTC"])
+    FinancialRollupRepository.forget_unmaintained_timezones(db_session)
+    db_session.commit()
+
+    monkeypatch.setattr(
+        "app.repositories.financial_rollup_repository.REPORT_TIMEZONES",
+        ["UTC", "America/Sao_Paulo"]
+    )
+    assert "America/Sao_Paulo" not in FinancialRollupRepository.built_timezones(db_session)
+
+    yesterday = (datetime.now(timezone.utc) - timedelta(days=2)).replace(hour=15)
+    _create_entry(db_session, seed_user_normal.id, 70, status="paid", occurred_at=yesterday)
+    day = yesterday.date()
+
+    def paid_on_sao_paulo():
+        return ReportRepository.dre_summary(
+            db=db_session, date_from=day, date_to=day, user_id=seed_user_normal.id, tz="America/Sao_Paulo"
+        )["revenue_paid_total"]
+
+    # Rollup parcial (só deltas desde a inclusão da timezone) não é lido
+    db_session.execute(
+        update(FinancialDailyRollup)
+        .where(FinancialDailyRollup.tz == "America/Sao_Paulo")
+        .values(amount_total=999)
+    )
+    assert paid_on_sao_paulo() == 70.0
+
+    # Rebuild filtrado não registra; completo registra e passa a ser lido
+    FinancialRollupRepository.rebuild(db_session, user_id=seed_user_normal.id, timezones=["America/Sao_Paulo"])
+    assert "America/Sao_Paulo" not in FinancialRollupRepository.built_timezones(db_session)
+    FinancialRollupRepository.rebuild(db_session, timezones=["America/Sao_Paulo"])
+    assert "America/Sao_Paulo" in FinancialRollupRepository.built_timezones(db_session)
+    assert paid_on_sao_paulo() == 70.0
+
+    # Fora de REPORT_TIMEZONES: não é mais mantida, sai do registro
+    monkeypatch.setattr("app.repositories.financial_rollup_repository.REPORT_TIMEZONES", ["UTC"])
+    assert FinancialRollupRepository.forget_unmaintained_timezones(db_session) == 1
+    db_session.commit()
+    assert not db_session.query(RollupTimezone).filter(RollupTimezone.tz == "America/Sao_Paulo").count()
+    assert not db_session.query(FinancialDailyRollup).filter(FinancialDailyRollup.tz == "America/Sao_Paulo").count()
+
+
+@pytest.mark.reports
+def test_ensure_local_day_indexes_for_new_timezone(monkeypatch):
+    """Índices de dia local de timezone fora das migrations: criados uma vez, só para REPORT_TIMEZONES."""
+    from sqlalchemy import create_engine, text
+    from tests.conftest import get_test_database_url
+
+    monkeypatch.setattr(
+        "app.repositories.financial_rollup_repository.REPORT_TIMEZONES",
+        ["UTC", "America/Manaus"]
+    )
+    engine = create_engine(get_test_database_url())
+    expected = {"ix_financial_entries_user_day_america_manaus", "ix_financial_entries_day_america_manaus"}
+
+    def manaus_indexes():
+        with engine.connect() as conn:
+            return set(conn.execute(text("""
+                SELECT c.relname FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE i.indrelid = 'core.financial_entries'::regclass
+                  AND i.indisvalid AND c.relname LIKE '%america_manaus'
+            """)).scalars())
+
+    try:
+        assert FinancialRollupRepository.ensure_local_day_indexes(["America/Manaus"], engine=engine) == 2
+        assert manaus_indexes() == expected
+        # UTC (migration 009) e Manaus já existem
+        assert FinancialRollupRepository.ensure_local_day_indexes(engine=engine) == 0
+
+        with pytest.raises(ValueError):
+            FinancialRollupRepository.ensure_local_day_indexes(["Asia/Tokyo"], engine=engine)
+    finally:
+        with engine.connect() as conn:
+            for name in expected:
+                conn.execute(text(f"DROP INDEX IF EXISTS core.{name}"))
+            conn.commit()
+        engine.dispose()
@@ -0,0 +1,113 @@
+"""
+Testes para as métricas Prometheus (app.core.metrics, GET /metrics).
+
+COBERTURA:
+1. Requests rotulados por template de rota e status
+2. Queries SQL contadas por request
+3. Gauges/histograma do pool (TimedQueuePool + checkout/checkin)
+4. Token opcional em /metrics
+5. Modo multiprocess: /metrics agrega valores de vários workers
+"""
+import os
+import subprocess
+import sys
+import textwrap
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core import metrics
+from app.routers import metrics_routes
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.unit
+def test_requests_labeled_by_route_template(client: TestClient, auth_headers_user: dict):
+    """IDs no path não viram labels: a rota é o template."""
+    labels = {"method": "GET", "route": "/orders/{order_id}", "status": "404"}
+    before = _sample("http_requests_total", **labels)
+
+    client.headers.update(auth_headers_user)
+    client.get(f"/orders/{uuid4()}")
+    client.get(f"/orders/{uuid4()}")
+    client.get("/nao-existe")
+
+    assert _sample("http_requests_total", **labels) == before + 2
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 2
+    assert _sample("http_requests_total", method="GET", route=metrics.UNMATCHED_ROUTE, status="404") >= 1
+
+
+@pytest.mark.unit
+def test_db_queries_counted_per_request(client: TestClient):
+    """GET /health executa SELECT 1: ao menos uma query e tempo de banco > 0."""
+    before_count = _sample("http_request_db_queries_count", route="/health")
+    before_sum = _sample("http_request_db_queries_sum", route="/health")
+
+    client.get("/health")
+
+    assert _sample("http_request_db_queries_count", route="/health") == before_count + 1
+    assert _sample("http_request_db_queries_sum", route="/health") >= before_sum + 1
+    assert _sample("http_request_db_duration_seconds_sum", route="/health") > 0
+
+
+@pytest.mark.integration
+def test_pool_gauges_and_wait_time(setup_test_database):
+    """Checkout/checkin atualizam conexões em uso; cada connect mede a espera."""
+    engine = create_engine(os.getenv("DATABASE_URL_TEST"), poolclass=metrics.TimedQueuePool, pool_size=2)
+    metrics.instrument_engine(engine)
+    try:
+        checked_out = _sample("db_pool_checked_out")
+        waits = _sample("db_pool_wait_seconds_count")
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert _sample("db_pool_checked_out") == checked_out + 1
+            assert _sample("db_pool_size") == 2
+
+        assert _sample("db_pool_checked_out") == checked_out
+        assert _sample("db_pool_wait_seconds_count") == waits + 1
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.unit
+def test_metrics_token(client: TestClient, monkeypatch):
+    """Com METRICS_TOKEN definido, /metrics exige Bearer token."""
+    monkeypatch.setattr(metrics_routes, "METRICS_TOKEN", "s3cret")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer errado"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+
+@pytest.mark.integration
+def test_multiprocess_metrics_aggregate_workers(tmp_path):
+    """Dois processos (workers) gravam; a exposição soma os dois."""
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    worker = textwrap.dedent("""
+        from app.core import metrics
+        metrics.observe_request("GET", "/health", 200, 0.01, metrics.QueryStats())
+    """)
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, cwd=backend_dir, check=True)
+
+    scrape = textwrap.dedent("""
+        from app.core import metrics
+        print(metrics.render_metrics()[0].decode())
+    """)
+    output = subprocess.run(
+        [sys.executable, "-c", scrape], env=env, cwd=backend_dir, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert 'http_requests_total{method="GET",route="/health",status="200"} 2.0' in output
@@ -0,0 +1,93 @@
+"""
+Testes para os middlewares ASGI (RequestIDMiddleware e LoggingMiddleware).
+
+COBERTURA:
+1. X-Request-ID e X-Process-Time nas respostas da aplicação
+2. request_id visível via contextvar no handler (sync) e igual ao header
+3. StreamingResponse passa pelos middlewares sem perder chunks
+4. AuditLogService.log_action usa o request_id do contexto por padrão
+"""
+import logging
+import uuid
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.request_context import get_request_id
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+from app.services.audit_log_service import AuditLogService
+
+
+@pytest.fixture
+def middleware_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ctx")
+    def ctx(request: Request):
+        return {"context": get_request_id(), "state": request.state.request_id}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"chunk-{i}\n" for i in range(3)), media_type="text/plain")
+
+    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+@pytest.mark.unit
+def test_headers_on_app_responses(client: TestClient):
+    """Toda resposta da aplicação deve trazer X-Request-ID (UUID) e X-Process-Time."""
+    first = client.get("/health")
+    second = client.get("/health")
+
+    uuid.UUID(first.headers["X-Request-ID"])
+    assert first.headers["X-Request-ID"] != second.headers["X-Request-ID"]
+    assert float(first.headers["X-Process-Time"]) >= 0
+
+
+@pytest.mark.unit
+def test_request_id_in_context_matches_header(middleware_app, caplog):
+    """Handler lê o mesmo request_id do contextvar e do request.state; o log também."""
+    with caplog.at_level(logging.INFO, logger="app.middleware.logging"):
+        response = TestClient(middleware_app).get("/ctx")
+
+    request_id = response.headers["X-Request-ID"]
+    assert response.json() == {"context": request_id, "state": request_id}
+    assert f"[{request_id}] GET /ctx | status=200" in caplog.text
+    assert get_request_id() is None  # contexto restaurado após o request
+
+
+@pytest.mark.unit
+def test_streaming_response_passes_through(middleware_app):
+    """Respostas em streaming chegam completas e com os headers."""
+    response = TestClient(middleware_app).get("/stream")
+
+    assert response.status_code == 200
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert "X-Request-ID" in response.headers
+    assert "X-Process-Time" in response.headers
+
+
+@pytest.mark.audit_log
+def test_log_action_defaults_to_context_request_id(db_session, seed_user_normal):
+    """Sem request_id explícito, log_action grava o do contexto corrente."""
+    from app.core.request_context import request_id_var
+
+    token = request_id_var.set("ctx-request-1")
+    try:
+        log = AuditLogService.log_action(
+            db=db_session,
+            user_id=seed_user_normal.id,
+            action="create",
+            entity_type="order",
+            entity_id=uuid.uuid4(),
+            after={"total": 10}
+        )
+    finally:
+        request_id_var.reset(token)
+
+    assert log.request_id == "ctx-request-1"
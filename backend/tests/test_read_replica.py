@@ -0,0 +1,169 @@
+"""
+Testes para o roteamento de leituras para réplica (app.core.db_routing).
+
+A "réplica" aqui é um segundo pool no mesmo banco de teste.
+
+COBERTURA:
+1. RecentWriters: marca com janela; janela 0 desativa; marca em
+   core.replica_write_marks vista por outro worker e fora do cache de
+   relatórios (evicção/limpeza do cache não apaga marcas)
+2. Sem réplica configurada: leituras vão para o primário
+3. Com réplica: leitura vai para a réplica; após commit do usuário, primário
+4. Commit em sessão da réplica não marca o usuário
+5. Fluxo HTTP: GET /orders na réplica, POST /orders, GET seguinte no primário
+"""
+
+from uuid import UUID
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.core import db_routing
+from app.core.db_routing import MemoryWriteMarks, PostgresWriteMarks, RecentWriters, read_sessionmaker
+from app.core.report_cache import PostgresCacheBackend
+from app.core.request_context import current_user_id_var
+from app.main import app
+from app.security.deps import get_read_db
+from app.security.user_cache import AuthenticatedUser
+from tests.conftest import get_test_database_url
+
+
+class RecordingSessionmaker:
+    """sessionmaker que registra quantas sessões abriu (primário ou réplica)."""
+
+    def __init__(self, factory, name, calls):
+        self.factory = factory
+        self.name = name
+        self.calls = calls
+
+    def __call__(self):
+        self.calls.append(self.name)
+        return self.factory()
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Ativa réplica (segundo pool) e primário no banco de teste; registra o uso."""
+    primary_engine = create_engine(get_test_database_url())
+    replica_engine = create_engine(get_test_database_url())
+    calls = []
+
+    monkeypatch.setattr(database, "SessionLocal", RecordingSessionmaker(
+        sessionmaker(bind=primary_engine), "primary", calls
+    ))
+    monkeypatch.setattr(database, "ReplicaSessionLocal", RecordingSessionmaker(
+        sessionmaker(bind=replica_engine, info={"replica": True}), "replica", calls
+    ))
+    monkeypatch.setattr(db_routing, "recent_writers", RecentWriters(MemoryWriteMarks(), window_seconds=60))
+
+    yield calls
+
+    primary_engine.dispose()
+    replica_engine.dispose()
+
+
+def _read_target(user_id, calls):
+    """Abre a sessão de leitura como get_read_db e retorna para onde foi."""
+    dependency = get_read_db(AuthenticatedUser(id=user_id, role="user", is_active=True))
+    db = next(dependency)
+    dependency.close()
+    return calls[-1], db
+
+
+@pytest.mark.unit
+def test_recent_writers_window():
+    """mark → wrote_recently por window_seconds; janela 0 desativa."""
+    writers = RecentWriters(MemoryWriteMarks(), window_seconds=60)
+    user_id = UUID(int=1)
+    assert writers.wrote_recently(user_id) is False
+    writers.mark(user_id)
+    assert writers.wrote_recently(user_id) is True
+
+    disabled = RecentWriters(MemoryWriteMarks(), window_seconds=0)
+    disabled.mark(user_id)
+    assert disabled.wrote_recently(user_id) is False
+
+
+@pytest.mark.integration
+def test_recent_writers_shared_between_workers():
+    """Marca gravada por um worker (core.replica_write_marks) vale no outro."""
+    engine = create_engine(get_test_database_url())
+    writer_worker = RecentWriters(PostgresWriteMarks(engine), window_seconds=60)
+    reader_worker = RecentWriters(PostgresWriteMarks(engine), window_seconds=60)
+    user_id = UUID(int=2)
+    try:
+        writer_worker.mark(user_id)
+        assert reader_worker.wrote_recently(user_id) is True
+
+        # Lotar e limpar o cache de relatórios não afeta as marcas
+        cache = PostgresCacheBackend(engine, max_entries=1)
+        for i in range(3):
+            cache.set(f"report:{i}", "*", i, 60)
+        cache.clear()
+        assert reader_worker.wrote_recently(user_id) is True
+
+        # Marca vencida (expires_at no passado) não vale
+        writer_worker.marks.mark(user_id, -1)
+        assert reader_worker.wrote_recently(user_id) is False
+    finally:
+        writer_worker.clear()
+        engine.dispose()
+
+
+@pytest.mark.unit
+def test_without_replica_reads_use_primary(monkeypatch):
+    """Sem DATABASE_URL_REPLICA: fábrica de leitura é a do primário."""
+    monkeypatch.setattr(database, "ReplicaSessionLocal", None)
+    assert read_sessionmaker(None) is database.SessionLocal
+
+
+@pytest.mark.integration
+def test_reads_go_to_primary_after_user_write(replica, db_session, seed_user_normal):
+    """Commit no primário marca o usuário; leituras dele voltam ao primário."""
+    user_id = seed_user_normal.id
+    assert _read_target(user_id, replica)[0] == "replica"
+
+    token = current_user_id_var.set(user_id)
+    try:
+        primary = database.SessionLocal()
+        primary.commit()
+        primary.close()
+    finally:
+        current_user_id_var.reset(token)
+
+    assert _read_target(user_id, replica)[0] == "primary"
+    assert _read_target(UUID(int=1), replica)[0] == "replica"
+
+
+@pytest.mark.integration
+def test_replica_commit_does_not_mark_user(replica, seed_user_normal):
+    """Sessão da réplica (info['replica']) não conta como escrita."""
+    token = current_user_id_var.set(seed_user_normal.id)
+    try:
+        target, db = _read_target(seed_user_normal.id, replica)
+        db.commit()
+        db.close()
+    finally:
+        current_user_id_var.reset(token)
+
+    assert target == "replica"
+    assert _read_target(seed_user_normal.id, replica)[0] == "replica"
+
+
+@pytest.mark.orders
+def test_http_read_your_writes(replica, client_authenticated):
+    """Listagem na réplica até o usuário criar um pedido; depois, primário."""
+    app.dependency_overrides.pop(get_read_db)
+
+    assert client_authenticated.get("/orders").status_code == 200
+    assert replica[-1] == "replica"
+
+    response = client_authenticated.post("/orders", json={"description": "Pedido réplica", "total": 10.0})
+    assert response.status_code == 201
+
+    response = client_authenticated.get("/orders")
+    assert response.status_code == 200
+    assert replica[-1] == "primary"
+    assert response.json()["total"] == 1
@@ -0,0 +1,149 @@
+"""
+Testes para o cache de resultados de relatórios (app.core.report_cache).
+
+COBERTURA:
+1. MemoryCacheBackend: LRU e TTL
+2. Relatório em cache é reaproveitado e invalidado por escrita do tenant
+3. Escrita de um tenant não invalida outro (mas invalida relatórios de admin)
+4. Rollback não invalida
+5. PostgresCacheBackend compartilhado: get/set/invalidate
+"""
+
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.config import REPORT_DEFAULT_TIMEZONE
+from app.core.report_cache import (
+    ADMIN_TENANT,
+    MemoryCacheBackend,
+    PostgresCacheBackend,
+    ReportCache,
+    report_cache,
+)
+from app.models.financial_entry import FinancialEntry
+from app.repositories.financial_repository import FinancialRepository
+from app.services.report_service import ReportService
+
+
+PERIOD = {"date_from": date(2026, 1, 1), "date_to": date(2026, 1, 31)}
+
+
+def _create_paid_revenue(db_session, user_id, amount):
+    return FinancialRepository.create(
+        db=db_session,
+        entry=FinancialEntry(
+            user_id=user_id,
+            kind="revenue",
+            status="paid",
+            amount=Decimal(str(amount)),
+            description="Cache test",
+            occurred_at=datetime(2026, 1, 10, 12, 0, 0)
+        )
+    )
+
+
+@pytest.mark.unit
+def test_memory_backend_lru_and_ttl():
+    """Excedente remove o menos usado; TTL expira a entrada."""
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", "t1", 1, ttl=60)
+    backend.set("b", "t1", 2, ttl=60)
+    assert backend.get("a") == 1  # "a" passa a ser o mais recente
+    backend.set("c", "t2", 3, ttl=60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+
+    backend.invalidate_tenants({"t2"})
+    assert backend.get("c") is None
+    assert backend.get("a") == 1
+
+    backend.set("d", "t2", 4, ttl=0)
+    assert backend.get("d") is None
+
+
+@pytest.mark.reports
+def test_report_cached_until_tenant_writes(db_session, seed_user_normal):
+    """DRE é servida do cache até um lançamento do tenant ser criado."""
+    _create_paid_revenue(db_session, seed_user_normal.id, 100)
+
+    first = ReportService.get_dre(db=db_session, user_id=seed_user_normal.id, **PERIOD)
+    key = ReportCache.make_key("dre", seed_user_normal.id, {**PERIOD, "include_canceled": False, "tz": REPORT_DEFAULT_TIMEZONE})
+    assert report_cache.backend.get(key) is not None
+
+    _create_paid_revenue(db_session, seed_user_normal.id, 50)
+    assert report_cache.backend.get(key) is None
+
+    second = ReportService.get_dre(db=db_session, user_id=seed_user_normal.id, **PERIOD)
+    assert first["revenue_paid_total"] == 100.0
+    assert second["revenue_paid_total"] == 150.0
+
+
+@pytest.mark.reports
+def test_write_invalidates_own_tenant_and_admin_only(db_session, seed_user_normal, seed_user_other):
+    """Escrita de um usuário não derruba o cache de outro usuário."""
+    ReportService.get_dre(db=db_session, user_id=seed_user_normal.id, **PERIOD)
+    ReportService.get_dre(db=db_session, user_id=seed_user_other.id, **PERIOD)
+    ReportService.get_dre(db=db_session, user_id=None, **PERIOD)
+
+    params = {**PERIOD, "include_canceled": False, "tz": REPORT_DEFAULT_TIMEZONE}
+    _create_paid_revenue(db_session, seed_user_normal.id, 10)
+
+    assert report_cache.backend.get(ReportCache.make_key("dre", seed_user_normal.id, params)) is None
+    assert report_cache.backend.get(ReportCache.make_key("dre", None, params)) is None
+    assert report_cache.backend.get(ReportCache.make_key("dre", seed_user_other.id, params)) is not None
+
+
+@pytest.mark.reports
+def test_rollback_does_not_invalidate(db_session, seed_user_normal):
+    """Flush seguido de rollback não invalida o cache."""
+    ReportService.get_dre(db=db_session, user_id=seed_user_normal.id, **PERIOD)
+    key = ReportCache.make_key("dre", seed_user_normal.id, {**PERIOD, "include_canceled": False, "tz": REPORT_DEFAULT_TIMEZONE})
+
+    db_session.add(FinancialEntry(
+        user_id=seed_user_normal.id,
+        kind="expense",
+        status="pending",
+        amount=Decimal("5"),
+        description="Rollback",
+        occurred_at=datetime(2026, 1, 10)
+    ))
+    db_session.flush()
+    db_session.rollback()
+
+    assert report_cache.backend.get(key) is not None
+
+
+@pytest.mark.integration
+def test_postgres_backend_shared_cache(db_session):
+    """Backend postgres: duas instâncias (workers) enxergam o mesmo cache."""
+    engine = create_engine(os.getenv("DATABASE_URL_TEST"))
+    worker_a = PostgresCacheBackend(engine=engine, max_entries=2)
+    worker_b = PostgresCacheBackend(engine=engine, max_entries=2)
+    try:
+        worker_a.clear()
+        worker_a.set("k1", "tenant-1", {"total": Decimal("1.50"), "day": date(2026, 1, 1)}, ttl=60)
+        assert worker_b.get("k1") == {"total": Decimal("1.50"), "day": date(2026, 1, 1)}
+
+        worker_b.set("k2", ADMIN_TENANT, [1, 2], ttl=60)
+        time.sleep(0.01)
+        worker_a.get("k1")  # k1 mais recente que k2
+        worker_a.set("k3", "tenant-2", "x", ttl=60)
+        assert worker_b.get("k2") is None  # LRU
+        assert worker_b.get("k1") is not None
+
+        worker_b.invalidate_tenants({"tenant-1"})
+        assert worker_a.get("k1") is None
+        assert worker_a.get("k3") == "x"
+
+        worker_a.set("k4", "tenant-2", "y", ttl=0)
+        assert worker_b.get("k4") is None
+    finally:
+        worker_a.clear()
+        engine.dispose()
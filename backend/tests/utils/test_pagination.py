@@ -2,13 +2,21 @@
 Testes para app/utils/pagination.py
 
 Coverage target: 100%
-Covers: validate_pagination, calculate_skip, paginate_response
+Covers: validate_pagination, calculate_skip, paginate_response, cursores keyset
 """
 import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
 from app.utils.pagination import (
     validate_pagination,
     calculate_skip,
-    paginate_response
+    paginate_response,
+    encode_cursor,
+    decode_cursor,
+    keyset_page,
+    validate_total_mode
 )
 from app.config import MAX_PAGE_SIZE
 
@@ -201,3 +209,57 @@ class TestPaginationIntegration:
         assert response["items"] == []
         assert response["page"] == 10
         assert response["total"] == 50
+
+
+
+class TestKeysetCursor:
+    """Testes para encode_cursor(), decode_cursor() e keyset_page()"""
+    
+    def test_cursor_roundtrip(self):
+        """Deve recuperar o mesmo (valor, id) codificado"""
+        value = datetime(2026, 3, 1, 10, 30, tzinfo=timezone.utc)
+        row_id = uuid4()
+        
+        assert decode_cursor(encode_cursor(value, row_id)) == (value, row_id)
+    
+    def test_cursor_is_url_safe(self):
+        """Cursor não deve conter caracteres que exigem escape em query string"""
+        cursor = encode_cursor(datetime(2026, 3, 1), uuid4())
+        
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+    
+    @pytest.mark.parametrize("cursor", ["", "abc", "!!!", encode_cursor(datetime(2026, 1, 1), uuid4())[:-4]])
+    def test_decode_invalid_cursor(self, cursor):
+        """Deve rejeitar cursor malformado"""
+        with pytest.raises(ValueError, match="cursor inválido"):
+            decode_cursor(cursor)
+    
+    def test_keyset_page_with_more_rows(self):
+        """Linha extra indica próxima página; cursor aponta para o último item"""
+        rows = [SimpleNamespace(id=uuid4(), created_at=datetime(2026, 1, i + 1)) for i in range(3)]
+        
+        items, next_cursor = keyset_page(rows, 2, "created_at")
+        
+        assert items == rows[:2]
+        assert decode_cursor(next_cursor) == (rows[1].created_at, rows[1].id)
+    
+    def test_keyset_page_last_page(self):
+        """Sem linha extra não há próximo cursor"""
+        rows = [SimpleNamespace(id=uuid4(), created_at=datetime(2026, 1, 1))]
+        
+        assert keyset_page(rows, 2, "created_at") == (rows, None)
+
+
+
+class TestValidateTotalMode:
+    """Testes para validate_total_mode()"""
+    
+    @pytest.mark.parametrize("mode", ["exact", "estimate", "none"])
+    def test_valid_modes(self, mode):
+        """Deve aceitar modos conhecidos"""
+        assert validate_total_mode(mode) == mode
+    
+    def test_invalid_mode(self):
+        """Deve rejeitar modo desconhecido"""
+        with pytest.raises(ValueError, match="total_mode inválido"):
+            validate_total_mode("approx")